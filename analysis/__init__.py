@@ -0,0 +1 @@
+"""Analysis code for the thesis experiments: figure export and data loaders."""
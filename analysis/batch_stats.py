@@ -0,0 +1,249 @@
+"""Batched statistics for feature and condition comparisons.
+
+The figure scripts used to call scipy once per feature or condition.  The
+functions here work on whole arrays instead:
+
+- ``spearman_matrix``: ranks every column once and gets the full
+  feature x feature (or feature x target) Spearman matrix from one matrix
+  product, with the same t-distribution p-values as ``scipy.stats.spearmanr``;
+- ``spearman_by_group``: the same for every group at once, as a
+  (group, feature, feature) tensor;
+- ``ks_statistic``: two-sample Kolmogorov-Smirnov statistics of all
+  columns from one sort of the pooled samples;
+- ``seed_matrix``: a (condition, seed) array of per-seed values, NaN-padded;
+- ``bootstrap_ci`` and ``permutation_test``: percentile CIs of the mean and
+  two-sided difference-in-means tests against a baseline for all
+  conditions in one NumPy pass.  Both take a ``seed`` (default ``SEED``),
+  so the numbers in the thesis are reproducible;
+- ``holm``: Holm-Bonferroni adjustment.
+
+Rows with NaN are dropped listwise in the correlation functions (callers
+already pass complete-case data); the KS statistic ignores NaN per column.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+SEED = 42
+N_RESAMPLES = 10_000
+
+
+# ---------------------------------------------------------------------------
+# Correlations
+# ---------------------------------------------------------------------------
+
+def _complete(*arrays):
+    arrays = [np.asarray(a, dtype=float) for a in arrays]
+    arrays = [a[:, None] if a.ndim == 1 else a for a in arrays]
+    keep = np.all([~np.isnan(a).any(axis=1) for a in arrays], axis=0)
+    return [a[keep] for a in arrays]
+
+
+def _unit_columns(ranks, axis=0):
+    """Centre and scale columns to unit norm (constant columns become NaN)."""
+    centred = ranks - ranks.mean(axis=axis, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return centred / np.sqrt((centred ** 2).sum(axis=axis, keepdims=True))
+
+
+def _spearman_p(rho, n):
+    """Two-sided p-values of ``scipy.stats.spearmanr`` (t approximation)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = rho * np.sqrt((n - 2) / ((1.0 - rho) * (1.0 + rho)))
+    return 2 * stats.t.sf(np.abs(t), n - 2)
+
+
+def spearman_matrix(x, y=None):
+    """Spearman rho and p-values between the columns of ``x`` (and ``y``).
+
+    Args:
+        x: (n, p) array.
+        y: optional (n, q) array; default: ``x`` itself.
+
+    Returns:
+        tuple: (rho, p), each (p, q); NaN for constant columns.
+    """
+    if y is None:
+        (x,) = _complete(x)
+        zx = _unit_columns(stats.rankdata(x, axis=0))
+        zy = zx
+    else:
+        x, y = _complete(x, y)
+        zx = _unit_columns(stats.rankdata(x, axis=0))
+        zy = _unit_columns(stats.rankdata(y, axis=0))
+    rho = np.clip(zx.T @ zy, -1.0, 1.0)
+    return rho, _spearman_p(rho, len(x))
+
+
+def spearman_by_group(x, groups):
+    """Feature x feature Spearman matrices of every group.
+
+    Ranks are taken within each group in one ``groupby().rank()``; the
+    groups are then stacked into a zero-padded (group, row, feature) tensor
+    and multiplied in one ``einsum``.
+
+    Args:
+        x: (n, p) array.
+        groups: (n,) group labels.
+
+    Returns:
+        tuple: (labels, rho (g, p, p), p-values (g, p, p), rows per group).
+    """
+    x = np.asarray(x, dtype=float)
+    keep = ~np.isnan(x).any(axis=1)
+    codes, labels = pd.factorize(np.asarray(groups)[keep], sort=True)
+    frame = pd.DataFrame(x[keep])
+    ranks = frame.groupby(codes).rank().to_numpy()
+    pos = frame.groupby(codes).cumcount().to_numpy()
+    n = np.bincount(codes, minlength=len(labels))
+
+    dense = np.zeros((len(labels), n.max(initial=0), x.shape[1]))
+    dense[codes, pos] = ranks
+    in_group = (np.arange(dense.shape[1]) < n[:, None])[:, :, None]
+    centred = np.where(in_group, dense - dense.sum(axis=1, keepdims=True) / n[:, None, None], 0.0)
+    norm = np.sqrt((centred ** 2).sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = centred / norm[:, None, :]
+    constant = norm == 0
+    rho = np.clip(np.einsum("gnp,gnq->gpq", np.nan_to_num(z), np.nan_to_num(z)), -1.0, 1.0)
+    rho[constant[:, :, None] | constant[:, None, :]] = np.nan
+    return list(labels), rho, _spearman_p(rho, n[:, None, None].astype(float)), n
+
+
+# ---------------------------------------------------------------------------
+# Distribution differences
+# ---------------------------------------------------------------------------
+
+def ks_statistic(a, b):
+    """Two-sample KS statistic of every column of ``a`` against ``b``.
+
+    Equal to ``scipy.stats.ks_2samp(a[:, j], b[:, j]).statistic`` on the
+    non-NaN values of each column.
+
+    Returns:
+        tuple: (statistic (p,), non-NaN counts of a (p,), of b (p,)).
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    pooled = np.concatenate([a, b])
+    from_a = np.zeros(pooled.shape, dtype=bool)
+    from_a[:len(a)] = True
+    order = np.argsort(pooled, axis=0, kind="stable")  # NaN sorts last
+    values = np.take_along_axis(pooled, order, axis=0)
+    from_a = np.take_along_axis(from_a, order, axis=0)
+    valid = ~np.isnan(values)
+    n_a = (valid & from_a).sum(axis=0)
+    n_b = (valid & ~from_a).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diff = np.abs(np.cumsum(valid & from_a, axis=0) / n_a
+                      - np.cumsum(valid & ~from_a, axis=0) / n_b)
+    # Evaluate the ECDFs only after the last of a run of tied values.
+    last_of_tie = valid & np.vstack([values[1:] != values[:-1],
+                                     np.ones((1, values.shape[1]), dtype=bool)])
+    d = np.where(last_of_tie, diff, -np.inf).max(axis=0, initial=-np.inf)
+    d[(n_a == 0) | (n_b == 0)] = np.nan
+    return d, n_a, n_b
+
+
+# ---------------------------------------------------------------------------
+# Per-seed comparisons
+# ---------------------------------------------------------------------------
+
+def seed_matrix(df, group_col, value_col, groups=None):
+    """(group, seed) array of ``value_col``, NaN-padded to the largest group.
+
+    Returns:
+        tuple: (group labels, (g, s) array).
+    """
+    groups = list(groups) if groups is not None else list(pd.unique(df[group_col]))
+    sub = df[df[group_col].isin(groups)]
+    codes = pd.Index(groups).get_indexer(sub[group_col])
+    pos = sub.groupby(codes).cumcount().to_numpy()
+    out = np.full((len(groups), int(pos.max(initial=-1)) + 1), np.nan)
+    out[codes, pos] = sub[value_col].to_numpy(dtype=float)
+    return groups, out
+
+
+def _compact(samples):
+    """Move each row's non-NaN values to the front; return (array, counts)."""
+    x = np.asarray(samples, dtype=float)
+    if x.ndim == 1:
+        x = x[None, :]
+    order = np.argsort(np.isnan(x), axis=1, kind="stable")
+    x = np.take_along_axis(x, order, axis=1)
+    return x, (~np.isnan(x)).sum(axis=1)
+
+
+def bootstrap_ci(samples, ci=0.95, n_resamples=N_RESAMPLES, seed=SEED):
+    """Percentile bootstrap CIs of the mean of every row.
+
+    Args:
+        samples: (g, s) array, NaN-padded (e.g. from ``seed_matrix``).
+
+    Returns:
+        dict: ``mean``, ``low``, ``high``, each (g,); NaN for empty rows.
+    """
+    x, n = _compact(samples)
+    rng = np.random.default_rng(seed)
+    idx = (rng.random((len(x), n_resamples, x.shape[1])) * n[:, None, None]).astype(int)
+    draws = np.take_along_axis(x[:, None, :], idx, axis=2)
+    in_sample = np.arange(x.shape[1]) < n[:, None, None]
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        means = np.where(in_sample, draws, 0.0).sum(axis=2) / n[:, None]
+        low, high = np.nanpercentile(means, [50 * (1 - ci), 50 * (1 + ci)], axis=1)
+        mean = np.nanmean(x, axis=1)
+    return {"mean": mean, "low": low, "high": high}
+
+
+def permutation_test(samples, baseline, n_resamples=N_RESAMPLES, seed=SEED):
+    """Two-sided permutation tests of mean(row) - mean(baseline), all rows at once.
+
+    Args:
+        samples: (g, s) array, NaN-padded.
+        baseline: 1-D array of baseline values (NaN ignored).
+
+    Returns:
+        dict: ``diff`` (observed differences) and ``p`` (each (g,)); the
+        p-value is (1 + #|permuted| >= |observed|) / (1 + n_resamples).
+    """
+    x, n = _compact(samples)
+    base = np.asarray(baseline, dtype=float)
+    base = base[~np.isnan(base)]
+    m = len(base)
+    pool = np.concatenate([x, np.broadcast_to(base, (len(x), m))], axis=1)
+    valid = np.concatenate([np.arange(x.shape[1]) < n[:, None],
+                            np.ones((len(x), m), dtype=bool)], axis=1)
+
+    rng = np.random.default_rng(seed)
+    keys = rng.random((len(x), n_resamples, pool.shape[1]))
+    keys[~np.broadcast_to(valid[:, None, :], keys.shape)] = 2.0  # padding sorts last
+    permuted = np.take_along_axis(pool[:, None, :], np.argsort(keys, axis=2), axis=2)
+    k = np.arange(pool.shape[1])
+    to_group = k < n[:, None, None]
+    to_base = ~to_group & (k < (n + m)[:, None, None])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diffs = (np.where(to_group, permuted, 0.0).sum(axis=2) / n[:, None]
+                 - np.where(to_base, permuted, 0.0).sum(axis=2) / m)
+        observed = np.where(np.arange(x.shape[1]) < n[:, None], x, 0.0).sum(axis=1) / n - base.mean()
+    # Tolerance so that permutations equal to the observed split count.
+    extreme = np.abs(diffs) >= np.abs(observed)[:, None] - 1e-12
+    p = (1 + extreme.sum(axis=1)) / (1 + n_resamples)
+    p = np.where((n == 0) | (m == 0), np.nan, p)
+    return {"diff": observed, "p": p}
+
+
+def holm(pvalues):
+    """Holm-Bonferroni adjusted p-values (NaN entries are left out)."""
+    p = np.asarray(pvalues, dtype=float)
+    adjusted = np.full_like(p, np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    order = valid[np.argsort(p[valid])]
+    running = 0.0
+    for rank, i in enumerate(order):
+        running = max(running, min(1.0, (len(order) - rank) * p[i]))
+        adjusted[i] = running
+    return adjusted
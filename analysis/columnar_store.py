@@ -0,0 +1,467 @@
+"""Columnar (Parquet) store of the candidate logs of a results root.
+
+Figures and summaries used to re-parse every run's ``log.jsonl`` line by
+line, including each candidate's full code and feedback.  ``ingest``
+converts the logs once into two hive-partitioned Parquet datasets under
+``<results_root>/.columnar/``::
+
+    scalars/phase=phase3/condition=<tag>/seed=<n>/part-<run>-<k>.parquet
+    text/phase=phase3/condition=<tag>/seed=<n>/part-<run>-<k>.parquet
+
+``scalars`` holds the typed per-candidate columns (``evaluation``, ``run``,
+``id``, ``name``, ``generation``, ``fitness``, ``failed``,
+``evaluation_time_s``), ``aucs`` as a fixed-size list of the per-run AOCCs
+(NaN-padded for candidates scored on part of the runs, all NaN for those
+without any: null fixed-size lists do not survive a Parquet round trip)
+and one float column per
+behavioural feature (``bf_<name>``) and per feature std (``bfstd_<name>``).
+``text`` holds ``code``, ``feedback`` and ``error`` keyed by the same
+(condition, seed, run, evaluation), so loaders that only need numbers never
+read them.  ``read`` projects to the requested columns.
+
+Ingestion is incremental.  ``manifest.json`` records, per log, its size
+and mtime at the last ingest, the byte offset consumed so far and a hash of
+the bytes just before it.  A log whose size and mtime are unchanged is
+skipped without being opened; otherwise new complete lines become a new
+part, and a log that no longer starts with what was ingested (rewritten on
+resume) is re-ingested from scratch.  Changed logs are parsed in parallel
+(``workers``).  The ``aucs`` width is the longest list seen so far (the
+manifest's ``n_runs``); when a longer one shows up, e.g. after the first
+candidates were only scored on the runs that finished before a timeout,
+the logs written with a narrower width are re-ingested.  The parts of a log are compacted into one once there are
+more than ``MAX_PARTS``.
+
+    python -m analysis.columnar_store ingest results_phase1 results_phase3
+    python -m analysis.columnar_store show results_phase3
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+STORE_DIRNAME = ".columnar"
+MANIFEST_FILE = "manifest.json"
+
+# Bump when the column layout changes; older stores are rebuilt.
+STORE_VERSION = 2
+
+GROUPS = ("scalars", "text")
+
+# Parts per log before they are compacted into one.
+MAX_PARTS = 16
+
+# Bytes before the consumed offset that must be unchanged on the next ingest.
+TAIL_BYTES = 1024
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("phase", pa.string()), ("condition", pa.string()), ("seed", pa.int32())]),
+    flavor="hive",
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def store_dir(results_root):
+    return Path(results_root) / STORE_DIRNAME
+
+
+def phase_name(results_root):
+    """``results_phase3`` -> ``phase3`` (other names are used as is)."""
+    name = Path(results_root).resolve().name
+    return name[len("results_"):] if name.startswith("results_") else name
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _atomic_write_json(path, data):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(store):
+    store.mkdir(parents=True, exist_ok=True)
+    with open(store / f"{MANIFEST_FILE}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _tail_hash(log_path, offset):
+    start = max(0, offset - TAIL_BYTES)
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _read_new_entries(log_path, offset):
+    """Parse the complete lines after ``offset``; return (entries, new offset)."""
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    entries = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries, offset + end
+
+
+def _float(val, default=None):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return default
+
+
+# ---------------------------------------------------------------------------
+# Log entries -> Arrow tables
+# ---------------------------------------------------------------------------
+
+def n_runs_of(entries):
+    """Length of the longest ``aucs`` list, or None if there is none."""
+    longest = max((len((entry.get("metadata") or {}).get("aucs") or [])
+                   for entry in entries), default=0)
+    return longest or None
+
+
+def entries_to_tables(entries, start, run, n_runs):
+    """Build the ``scalars`` and ``text`` tables for consecutive log entries.
+
+    Args:
+        entries: parsed ``log.jsonl`` lines.
+        start: ``evaluation`` index of the first entry within its log.
+        run: run directory name.
+        n_runs: size of the ``aucs`` list column (None: no ``aucs`` column);
+            shorter lists are NaN-padded, longer ones dropped.
+
+    Returns:
+        dict: {"scalars": pa.Table, "text": pa.Table}.
+    """
+    n = len(entries)
+    missing = [float("nan")] * (n_runs or 0)
+    fitness, generation, eval_time, aucs, features = [], [], [], [], []
+    for entry in entries:
+        meta = entry.get("metadata") or {}
+        fitness.append(_float(entry.get("fitness"), float("-inf")))
+        gen = entry.get("generation")
+        generation.append(gen if isinstance(gen, int) else None)
+        eval_time.append(_float(meta.get("evaluation_time_s")))
+        run_aucs = meta.get("aucs") or []
+        if run_aucs and len(run_aucs) <= (n_runs or 0):
+            aucs.append([float(a) for a in run_aucs] + missing[len(run_aucs):])
+        else:
+            aucs.append(missing)
+        row = {}
+        for prefix, key in (("bf_", "behavioral_features"), ("bfstd_", "behavioral_features_std")):
+            for name, value in (meta.get(key) or {}).items():
+                row[prefix + name] = _float(value)
+        features.append(row)
+
+    evaluation = pa.array(range(start, start + n), pa.int32())
+    columns = {
+        "evaluation": evaluation,
+        "run": pa.array([run] * n, pa.string()).dictionary_encode(),
+        "id": pa.array([str(e.get("id", "")) for e in entries], pa.string()),
+        "name": pa.array([e.get("name", "") or "" for e in entries], pa.string()),
+        "generation": pa.array(generation, pa.int32()),
+        "fitness": pa.array(fitness, pa.float64()),
+        "failed": pa.array([not (f > float("-inf") and f < float("inf")) for f in fitness]),
+        "evaluation_time_s": pa.array(eval_time, pa.float64()),
+    }
+    if n_runs:
+        columns["aucs"] = pa.array(aucs, pa.list_(pa.float64(), n_runs))
+    for name in sorted({k for row in features for k in row}):
+        columns[name] = pa.array([row.get(name) for row in features], pa.float64())
+
+    text = {
+        "evaluation": evaluation,
+        "run": columns["run"],
+        "code": pa.array([e.get("code", "") or "" for e in entries], pa.string()),
+        "feedback": pa.array([e.get("feedback", "") or "" for e in entries], pa.string()),
+        "error": pa.array([e.get("error", "") or "" for e in entries], pa.string()),
+    }
+    return {"scalars": pa.table(columns), "text": pa.table(text)}
+
+
+# ---------------------------------------------------------------------------
+# Ingest
+# ---------------------------------------------------------------------------
+
+def _partition_dir(phase, condition, seed):
+    return (Path(f"phase={quote(phase, safe='')}")
+            / f"condition={quote(condition, safe='')}" / f"seed={seed}")
+
+
+def _write_parts(store, rel, tables):
+    for group in GROUPS:
+        path = store / group / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Dot-prefixed files are ignored by dataset discovery until renamed.
+        tmp = path.with_name(f".{path.name}")
+        pq.write_table(tables[group], tmp, compression="zstd")
+        os.replace(tmp, path)
+
+
+def _remove_parts(store, parts):
+    for group in GROUPS:
+        for rel in parts:
+            try:
+                os.remove(store / group / rel)
+            except FileNotFoundError:
+                pass
+
+
+def _compact(store, state, part_dir, run):
+    """Rewrite a log's parts as a single part."""
+    tables = {group: pa.concat_tables(
+        [pq.ParquetFile(store / group / rel).read() for rel in state["parts"]],
+        promote_options="default")
+        for group in GROUPS}
+    rel = str(part_dir / f"part-{run}-{state['next_part']:05d}.parquet")
+    _write_parts(store, rel, tables)
+    _remove_parts(store, state["parts"])
+    state["parts"] = [rel]
+    state["next_part"] += 1
+
+
+def _ingest_log(store, root, key, condition, seed, state, phase, n_runs):
+    """Bring one log's parts up to date.
+
+    Touches only this log's part files, so logs can be ingested in parallel
+    processes; the caller merges the returned state into the manifest.
+
+    Returns:
+        tuple: (new state, candidates added, longest ``aucs`` list of the
+        new entries or None).
+    """
+    store, log_path = Path(store), Path(root) / key
+    stat = log_path.stat()
+    if state and (stat.st_size < state["offset"]
+                  or _tail_hash(log_path, state["offset"]) != state["tail"]):
+        _remove_parts(store, state["parts"])
+        state = None
+    state = state or {"offset": 0, "tail": _tail_hash(log_path, 0),
+                      "rows": 0, "parts": [], "next_part": 0}
+    added, longest = 0, None
+    if stat.st_size > state["offset"]:
+        entries, offset = _read_new_entries(log_path, state["offset"])
+        if entries:
+            longest = n_runs_of(entries)
+            if n_runs is None:
+                n_runs = longest
+            if n_runs is not None:
+                state["n_runs"] = n_runs
+            run = log_path.parent.name
+            tables = entries_to_tables(entries, state["rows"], run, n_runs)
+            part_dir = _partition_dir(phase, condition, seed)
+            rel = str(part_dir / f"part-{run}-{state['next_part']:05d}.parquet")
+            _write_parts(store, rel, tables)
+            state["parts"].append(rel)
+            state["next_part"] += 1
+            state["rows"] += len(entries)
+            added = len(entries)
+            if len(state["parts"]) > MAX_PARTS:
+                _compact(store, state, part_dir, run)
+        state["offset"] = offset
+        state["tail"] = _tail_hash(log_path, offset)
+    # Recorded as of the stat above: a log appended meanwhile differs next time.
+    state["size"], state["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+    return state, added, longest
+
+
+def _run_jobs(jobs, workers):
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            return list(pool.map(_ingest_log, *zip(*jobs),
+                                 chunksize=max(1, len(jobs) // (4 * workers))))
+    return [_ingest_log(*job) for job in jobs]
+
+
+def ingest(results_root, phase=None, workers=1):
+    """Append new candidates of every ``*/seed-*/run-*/log.jsonl`` to the store.
+
+    Logs whose size and mtime match the manifest are skipped after one
+    ``stat``; the others are parsed, in a pool of ``workers`` processes when
+    there is more than one.
+
+    Args:
+        results_root: results directory laid out as ``{tag}/seed-{n}/run-*``.
+        phase: partition value (default: from the directory name).
+        workers: processes used to parse changed logs.
+
+    Returns:
+        int: number of candidates added.
+    """
+    root = Path(results_root)
+    store = store_dir(root)
+    phase = phase or phase_name(root)
+    added = 0
+    with _locked(store):
+        manifest = _read_json(store / MANIFEST_FILE) or {}
+        if manifest.get("version") != STORE_VERSION:
+            for state in manifest.get("logs", {}).values():
+                _remove_parts(store, state.get("parts", []))
+            manifest = {"version": STORE_VERSION, "n_runs": None, "logs": {}}
+        logs = manifest["logs"]
+
+        partitions, jobs = {}, []
+        for log_path in sorted(root.glob("*/seed-*/run-*/log.jsonl")):
+            seed_dir = log_path.parent.parent
+            try:
+                seed = int(seed_dir.name[len("seed-"):])
+            except ValueError:
+                continue
+            key = str(log_path.relative_to(root))
+            partitions[key] = (seed_dir.parent.name, seed)
+            stat = log_path.stat()
+            state = logs.get(key)
+            if (state and state.get("size") == stat.st_size
+                    and state.get("mtime_ns") == stat.st_mtime_ns):
+                continue
+            jobs.append((str(store), str(root), key, *partitions[key],
+                         state, phase, manifest["n_runs"]))
+
+        results = _run_jobs(jobs, workers)
+        widths = [manifest["n_runs"] or 0]
+        for job, (state, n, longest) in zip(jobs, results):
+            logs[job[2]] = state
+            added += n
+            widths.append(longest or 0)
+        manifest["n_runs"] = max(widths) or None
+
+        # Logs written with another aucs width are parsed again at the new one.
+        stale = [key for key, state in logs.items()
+                 if state.get("n_runs") not in (None, manifest["n_runs"])
+                 and key in partitions]
+        for key in stale:
+            _remove_parts(store, logs[key]["parts"])
+        rebuild = [(str(store), str(root), key, *partitions[key], None, phase,
+                    manifest["n_runs"]) for key in stale]
+        for job, (state, _, _) in zip(rebuild, _run_jobs(rebuild, workers)):
+            logs[job[2]] = state
+        if jobs or not (store / MANIFEST_FILE).exists():
+            _atomic_write_json(store / MANIFEST_FILE, manifest)
+    return added
+
+
+# ---------------------------------------------------------------------------
+# Read
+# ---------------------------------------------------------------------------
+
+def read_manifest(results_root):
+    """The store manifest of ``results_root`` ({} if nothing was ingested)."""
+    return _read_json(store_dir(results_root) / MANIFEST_FILE) or {}
+
+
+def dataset(results_root, group="scalars"):
+    """The ``group`` dataset of a store, or None if nothing was ingested.
+
+    Files may lack feature columns that later logs added; the dataset uses
+    the union of all file schemas (only the Parquet footers are read).
+    """
+    base = store_dir(results_root) / group
+    files = sorted(str(p) for p in base.rglob("part-*.parquet")) if base.is_dir() else []
+    if not files:
+        return None
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files] + [PARTITIONING.schema])
+    return ds.dataset(files, schema=schema, format="parquet",
+                      partitioning=PARTITIONING, partition_base_dir=str(base))
+
+
+def read(results_root, columns=None, group="scalars", filter=None):
+    """Read ``columns`` of a store as a DataFrame.
+
+    Args:
+        results_root: results directory (its store must have been ingested).
+        columns: column names, including partition columns ``phase``,
+            ``condition`` and ``seed`` (default: all).
+        group: "scalars" or "text".
+        filter: optional pyarrow expression, e.g.
+            ``ds.field("condition") == "vanilla"``.
+
+    Returns:
+        DataFrame sorted by condition, seed, run and evaluation where those
+        columns are selected.
+    """
+    data = dataset(results_root, group)
+    if data is None:
+        return pd.DataFrame(columns=columns or [])
+    df = data.to_table(columns=columns, filter=filter).to_pandas()
+    order = [c for c in ("condition", "seed", "run", "evaluation") if c in df.columns]
+    if order:
+        df = df.sort_values(order, kind="stable").reset_index(drop=True)
+    return df
+
+
+def column_names(results_root, group="scalars"):
+    """Column names of a store's ``group`` (empty if nothing was ingested)."""
+    data = dataset(results_root, group)
+    return [] if data is None else list(data.schema.names)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar store of candidate logs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="Append new log lines to each root's store")
+    p.add_argument("results_dirs", nargs="+")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                   help="Processes used to parse changed logs")
+
+    p = sub.add_parser("show", help="Print candidates per condition and seed")
+    p.add_argument("results_dir")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        for root in args.results_dirs:
+            n = ingest(root, workers=args.workers)
+            print(f"{root}: added {n} candidates")
+        return 0
+
+    df = read(args.results_dir, columns=["condition", "seed", "fitness", "failed"])
+    if df.empty:
+        print(f"{args.results_dir}: store is empty (run ingest first)")
+        return 1
+    summary = df.groupby(["condition", "seed"]).agg(
+        candidates=("fitness", "size"), failed=("failed", "sum"),
+        best=("fitness", lambda f: f[f > float("-inf")].max()))
+    print(summary.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
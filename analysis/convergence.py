@@ -0,0 +1,135 @@
+"""Vectorised best-so-far / convergence statistics for every phase.
+
+``ConvergenceTensor`` turns a candidate frame into a dense
+``(group, seed, evaluation)`` fitness array with one ``groupby`` and
+computes everything the convergence figures and tables need in NumPy:
+
+- ``best_so_far``: running maximum per (group, seed); failed candidates
+  (NaN or -inf fitness) do not count, and a seed's curve stays at its last
+  value past its final evaluation, which is how the figures used to pad
+  shorter runs;
+- ``band(group)``: mean, std, count and a t-based confidence interval
+  across seeds, over the group's own run length;
+- ``time_to_threshold``: first evaluation (1-based) at which each seed's
+  best-so-far reaches a threshold;
+- ``final_best``: best fitness per (group, seed).
+
+Groups are given explicitly (e.g. the models or the (feature, format)
+pairs in plotting order), so empty groups and seeds are represented as NaN.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def _index(keys):
+    keys = list(keys)
+    if keys and isinstance(keys[0], tuple):
+        return pd.MultiIndex.from_tuples(keys)
+    return pd.Index(keys)
+
+
+class ConvergenceTensor:
+    """Dense (group, seed, evaluation) fitness array of a candidate frame.
+
+    Args:
+        df: one row per candidate.
+        group_cols: column or list of columns identifying a group.
+        groups: group keys in output order (tuples for several columns);
+            rows of other groups are ignored.
+        seeds: seeds to include, in order (default: all, sorted).
+        seed_col, eval_col, value_col: column names.
+    """
+
+    def __init__(self, df, group_cols, groups, seeds=None, seed_col="seed",
+                 eval_col="evaluation", value_col="fitness"):
+        cols = [group_cols] if isinstance(group_cols, str) else list(group_cols)
+        self.groups = list(groups)
+        self.seeds = list(seeds) if seeds is not None else sorted(df[seed_col].unique())
+        group_index = _index(self.groups)
+        if len(cols) == 1:
+            g = group_index.get_indexer(df[cols[0]])
+        else:
+            g = group_index.get_indexer(pd.MultiIndex.from_frame(df[cols]))
+        s = pd.Index(self.seeds).get_indexer(df[seed_col])
+        keep = (g >= 0) & (s >= 0)
+
+        frame = pd.DataFrame({"g": g[keep], "s": s[keep],
+                              "e": df[eval_col].to_numpy()[keep],
+                              "v": df[value_col].to_numpy(dtype=float)[keep]})
+        frame = frame.sort_values(["g", "s", "e"], kind="stable")
+        pos = frame.groupby(["g", "s"], sort=False).cumcount().to_numpy()
+
+        n_groups, n_seeds = len(self.groups), len(self.seeds)
+        self.lengths = np.zeros((n_groups, n_seeds), dtype=int)
+        np.maximum.at(self.lengths, (frame["g"].to_numpy(), frame["s"].to_numpy()), pos + 1)
+        values = frame["v"].to_numpy()
+        values[~np.isfinite(values)] = np.nan
+        self.fitness = np.full((n_groups, n_seeds, int(self.lengths.max(initial=0))), np.nan)
+        self.fitness[frame["g"].to_numpy(), frame["s"].to_numpy(), pos] = values
+        self._group_pos = {key: i for i, key in enumerate(self.groups)}
+        self._bsf = None
+
+    # ------------------------------------------------------------------
+
+    def best_so_far(self):
+        """(group, seed, evaluation) running maximum, carried past each run's end."""
+        if self._bsf is None:
+            self._bsf = np.fmax.accumulate(self.fitness, axis=2) if self.fitness.size else self.fitness
+        return self._bsf
+
+    def band(self, group, ci=0.95):
+        """Across-seed statistics of one group's best-so-far curve.
+
+        Returns:
+            dict with ``x`` (1-based evaluations), ``mean``, ``std``, ``n``
+            (seeds with a value), ``ci_low`` and ``ci_high``, all of the
+            group's run length; None if the group has no candidates.
+        """
+        i = self._group_pos[group]
+        length = int(self.lengths[i].max(initial=0))
+        if length == 0:
+            return None
+        curves = self.best_so_far()[i, :, :length]
+        n = np.sum(~np.isnan(curves), axis=0)
+        # All-NaN columns (every seed failed so far) stay NaN, as before.
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(curves, axis=0)
+            std = np.nanstd(curves, axis=0)
+            sem = np.nanstd(curves, axis=0, ddof=1) / np.sqrt(n)
+            half = stats.t.ppf(0.5 + ci / 2, np.maximum(n - 1, 1)) * sem
+        return {"x": np.arange(1, length + 1), "mean": mean, "std": std, "n": n,
+                "ci_low": mean - half, "ci_high": mean + half}
+
+    def time_to_threshold(self, threshold):
+        """(group, seed) first 1-based evaluation with best-so-far >= threshold (NaN: never)."""
+        with np.errstate(invalid="ignore"):
+            reached = self.best_so_far() >= threshold
+        if not reached.size:
+            return np.full(self.lengths.shape, np.nan)
+        return np.where(reached.any(axis=2), reached.argmax(axis=2) + 1.0, np.nan)
+
+    def final_best(self):
+        """(group, seed) best fitness (NaN for empty or all-failed seeds)."""
+        bsf = self.best_so_far()
+        if not bsf.size:
+            return np.full(self.lengths.shape, np.nan)
+        return bsf[:, :, -1]
+
+    def table(self, thresholds=()):
+        """Long frame of final best and time-to-threshold per (group, seed)."""
+        index = pd.MultiIndex.from_product([range(len(self.groups)), range(len(self.seeds))])
+        out = pd.DataFrame({
+            "group": [self.groups[g] for g, _ in index],
+            "seed": [self.seeds[s] for _, s in index],
+            "evaluations": self.lengths.ravel(),
+            "best": self.final_best().ravel(),
+        })
+        for thr in thresholds:
+            out[f"evals_to_{thr:g}"] = self.time_to_threshold(thr).ravel()
+        return out
+
@@ -0,0 +1,134 @@
+"""Cached t-SNE maps of the behavioural feature space.
+
+``fit_map`` standardises a (candidates, features) array and embeds it in
+two dimensions with PCA-initialised Barnes–Hut t-SNE (sklearn).  The map is
+memoised with ``figure_build.cached``, keyed by a hash of the data and the
+parameters, so re-exporting figures over unchanged data reuses it instead
+of re-running t-SNE.
+
+Above ``MAX_FIT`` rows only a seeded random subsample (the *landmarks*) is
+optimised; every other row is placed out of sample.  ``place`` does the
+same for new points (e.g. Phase 4 candidates projected into the Phase 1
+map) without touching the map: each point goes to the kernel-weighted mean
+of the embeddings of its ``N_NEIGHBORS`` nearest landmarks in standardised
+feature space, the Gaussian kernel's width being the point's median
+neighbour distance.  Placed points land inside the existing clusters; they
+do not shift them.
+
+A map is a plain dict (``columns``, ``mean``, ``scale``, ``landmarks``,
+``landmark_index``, ``landmark_embedding``, ``embedding``, ``params``) so
+cached pickles do not depend on a class definition.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .figure_build import cached
+
+# Rows embedded with t-SNE itself; the rest are placed (ANALYSIS_TSNE_MAX_FIT).
+MAX_FIT = int(os.environ.get("ANALYSIS_TSNE_MAX_FIT", 5000))
+
+PERPLEXITY = 30
+SEED = 42
+
+# Landmarks averaged over when placing a point.
+N_NEIGHBORS = 10
+
+
+# ---------------------------------------------------------------------------
+# Fitting
+# ---------------------------------------------------------------------------
+
+def _as_array(X, columns=None):
+    if isinstance(X, pd.DataFrame):
+        return X[list(columns) if columns is not None else X.columns].to_numpy(dtype=float)
+    return np.asarray(X, dtype=float)
+
+
+def _fit(X, columns, perplexity, max_fit, seed):
+    from sklearn.manifold import TSNE
+
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = (X - mean) / scale
+
+    n = len(Z)
+    if n > max_fit:
+        index = np.sort(np.random.default_rng(seed).choice(n, max_fit, replace=False))
+    else:
+        index = np.arange(n)
+    landmarks = Z[index]
+    landmark_embedding = TSNE(
+        n_components=2, perplexity=min(perplexity, len(landmarks) - 1), init="pca",
+        method="barnes_hut", random_state=seed).fit_transform(landmarks)
+
+    tsne_map = {
+        "columns": columns, "mean": mean, "scale": scale,
+        "landmarks": landmarks, "landmark_index": index,
+        "landmark_embedding": landmark_embedding,
+        "params": {"perplexity": perplexity, "max_fit": max_fit, "seed": seed},
+    }
+    embedding = np.empty((n, 2))
+    embedding[index] = landmark_embedding
+    rest = np.setdiff1d(np.arange(n), index)
+    if len(rest):
+        embedding[rest] = _place_standardised(tsne_map, Z[rest])
+    tsne_map["embedding"] = embedding
+    return tsne_map
+
+
+def fit_map(X, name="tsne", perplexity=PERPLEXITY, max_fit=MAX_FIT, seed=SEED):
+    """Two-dimensional t-SNE map of ``X``, cached on disk.
+
+    Args:
+        X: (n, p) array, or a DataFrame whose columns are all features.
+        name: cache entry name (one cached map is kept per name).
+        perplexity: t-SNE perplexity (capped at the number of landmarks - 1).
+        max_fit: rows optimised by t-SNE; larger inputs are subsampled.
+        seed: seed of the subsample and of t-SNE.
+
+    Returns:
+        dict: the map; ``embedding`` is the (n, 2) position of every row.
+    """
+    columns = list(X.columns) if isinstance(X, pd.DataFrame) else None
+    X = _as_array(X)
+    params = {"columns": columns, "perplexity": perplexity, "max_fit": max_fit, "seed": seed}
+    return cached(name, (X, params), lambda: _fit(X, columns, perplexity, max_fit, seed))
+
+
+# ---------------------------------------------------------------------------
+# Out-of-sample placement
+# ---------------------------------------------------------------------------
+
+def _place_standardised(tsne_map, Z, k=N_NEIGHBORS):
+    from sklearn.neighbors import NearestNeighbors
+
+    landmarks = tsne_map["landmarks"]
+    k = min(k, len(landmarks))
+    dist, idx = NearestNeighbors(n_neighbors=k).fit(landmarks).kneighbors(Z)
+    width = np.maximum(np.median(dist, axis=1, keepdims=True), 1e-12)
+    weights = np.exp(-0.5 * (dist / width) ** 2)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.einsum("nk,nkd->nd", weights, tsne_map["landmark_embedding"][idx])
+
+
+def place(tsne_map, X, k=N_NEIGHBORS):
+    """Positions of new points in an existing map.
+
+    Args:
+        tsne_map: a map from ``fit_map``.
+        X: (m, p) array with the map's features in the same order, or a
+            DataFrame holding the map's ``columns``.
+        k: nearest landmarks averaged over.
+
+    Returns:
+        (m, 2) array.
+    """
+    X = _as_array(X, tsne_map["columns"])
+    if len(X) == 0:
+        return np.empty((0, 2))
+    Z = (X - tsne_map["mean"]) / tsne_map["scale"]
+    return _place_standardised(tsne_map, Z, k)
@@ -14,16 +14,32 @@ Produces:
   - fig_mabbob_instances.pdf      : MA-BBOB instance selection visualization (mabbob_instance_selection)
 
 Usage:
-    python export_figures.py
+    python export_figures.py                       # rebuild stale figures
+    python export_figures.py --only fig_tsne_behavioral
+    python export_figures.py --force --jobs 4      # rebuild everything
+    python export_figures.py --list
+
+Figures are rebuilt only when their data or their function changed, in
+parallel processes (analysis/figure_build.py); the t-SNE map
+(analysis/embedding.py), the Spearman tables and the RF importances are
+cached under analysis/.cache/.
 
 Data paths (relative to this script's directory):
     ../results_phase1/          — Phase 1 experiment results (10 models x 5 seeds)
     ../results_phase3/          — Phase 3 experiment results (29 conditions x 5 seeds)
     ../BLADE/iohblade/benchmarks/BBOB/mabbob/weights.csv  — MA-BBOB instance weights
+
+Run logs are read through analysis/loaders.py: new or changed logs are
+parsed in parallel into each root's columnar store (<root>/.columnar/) and
+only the needed columns are read, into compact frames (categorical labels,
+float32 features).  Code and feedback are fetched for the failed Phase 1
+candidates only, when fig_failure_modes needs them.  Best-so-far curves and their bands come
+from analysis/convergence.py.
 """
 
-import json
+import argparse
 import math
+import os
 import sys
 import warnings
 from datetime import datetime
@@ -35,8 +51,6 @@ import matplotlib.patches as mpatches
 import numpy as np
 import pandas as pd
 from scipy import stats
-from sklearn.manifold import TSNE
-from sklearn.preprocessing import StandardScaler
 
 warnings.filterwarnings("ignore")
 
@@ -53,6 +67,11 @@ WEIGHTS_CSV = REPO_ROOT / "BLADE" / "iohblade" / "benchmarks" / "BBOB" / "mabbob
 # Add repo root to path so we can import experiments.feedback
 sys.path.insert(0, str(REPO_ROOT))
 
+from analysis import batch_stats, embedding, figure_build  # noqa: E402
+from analysis.convergence import ConvergenceTensor  # noqa: E402
+from analysis.figure_build import cached  # noqa: E402
+from analysis.loaders import fingerprint, load_aucs, load_runs, load_text  # noqa: E402
+
 FIGURES_DIR.mkdir(parents=True, exist_ok=True)
 
 # ---------------------------------------------------------------------------
@@ -212,127 +231,70 @@ def categorize_failure(entry):
 # Data loaders
 # ===================================================================
 
-def load_phase1_run(model_tag, seed):
-    seed_dir = RESULTS_PHASE1 / model_tag / f"seed-{seed}"
-    run_dirs = sorted(seed_dir.glob("run-*"))
-    if not run_dirs:
-        return []
-    log_file = run_dirs[0] / "log.jsonl"
-    if not log_file.exists():
-        return []
-    entries = []
-    with open(log_file) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                entries.append(json.loads(line))
-    return entries
-
-
 def load_phase1():
-    """Load Phase 1 results into a DataFrame."""
-    rows = []
-    for model_tag in MODELS:
-        for seed in range(N_SEEDS):
-            entries = load_phase1_run(model_tag, seed)
-            for i, entry in enumerate(entries):
-                fitness = parse_fitness(entry.get("fitness"))
-                failed = np.isinf(fitness) and fitness < 0
-                meta = entry.get("metadata", {})
-                bf = meta.get("behavioral_features", {})
-                row = {
-                    "model": model_tag,
-                    "seed": seed,
-                    "evaluation": i,
-                    "fitness": fitness,
-                    "failed": failed,
-                    "name": entry.get("name", ""),
-                    "code": entry.get("code", ""),
-                    "feedback": entry.get("feedback", ""),
-                }
-                for k, v in bf.items():
-                    col_name = "fitness_autocorrelation" if k == "fitness_autocorrelation_lag1" else k
-                    row[f"bm_{col_name}"] = v
-                rows.append(row)
-    return pd.DataFrame(rows)
+    """Load Phase 1 results into a DataFrame.
 
+    ``model`` is categorical and the ``bm_`` features are float32; code and
+    feedback are not loaded (see ``load_text``).
+    """
+    df = load_runs(RESULTS_PHASE1, list(MODELS), ["fitness", "name"], seeds=range(N_SEEDS))
+    df = df.rename(columns={"condition": "model"})
+    df["failed"] = np.isinf(df["fitness"]) & (df["fitness"] < 0)
+    bf_cols = [c for c in df.columns if c.startswith("bf_") and df[c].notna().any()]
+    bm_cols = ["bm_" + ("fitness_autocorrelation" if c == "bf_fitness_autocorrelation_lag1"
+                        else c[len("bf_"):]) for c in bf_cols]
+    df = df.rename(columns=dict(zip(bf_cols, bm_cols)))
+    return df[["model", "seed", "evaluation", "fitness", "failed", "name", *bm_cols]]
 
-def load_phase3():
-    """Load Phase 3 results into a DataFrame."""
-    conditions = []
-    for feat in FEATURES:
-        for fmt in FORMATS:
-            if fmt == "comparative" and feat in COMPARATIVE_EXCLUDE:
-                continue
-            conditions.append(f"{fmt}-{feat}")
 
-    rows = []
-    for cond in conditions:
-        parts = cond.split("-", 1)
-        fmt, feat = parts[0], parts[1]
-        for seed in range(N_SEEDS):
-            seed_dir = RESULTS_PHASE3 / cond / f"seed-{seed}"
-            run_dirs = sorted(seed_dir.glob("run-*"))
-            if not run_dirs:
-                continue
-            log_file = run_dirs[0] / "log.jsonl"
-            if not log_file.exists():
-                continue
-            with open(log_file) as fh:
-                for i, line in enumerate(fh):
-                    entry = json.loads(line.strip())
-                    fitness = parse_fitness_nan(entry.get("fitness"))
-                    meta = entry.get("metadata", {})
-                    aucs = meta.get("aucs", [])
-                    bf = meta.get("behavioral_features", {})
-                    row = {
-                        "condition": cond,
-                        "format": fmt,
-                        "feature": feat,
-                        "seed": seed,
-                        "evaluation": i,
-                        "fitness": fitness,
-                        "failed": np.isnan(fitness),
-                        "name": entry.get("name", ""),
-                        "aucs": aucs,
-                    }
-                    for bk, bv in bf.items():
-                        row[f"bf_{bk}"] = bv
-                    rows.append(row)
-    return pd.DataFrame(rows)
+def load_phase3():
+    """Load Phase 3 results into a DataFrame.
+
+    ``condition``, ``format`` and ``feature`` are categorical and the ``bf_``
+    features are float32.  The per-run AOCCs are not a column; use
+    ``load_phase3_aucs(df)`` for the matching (candidates, runs) array.
+    """
+    conditions = [f"{fmt}-{feat}" for feat in FEATURES for fmt in formats_for_feature(feat)]
+    df = load_runs(RESULTS_PHASE3, conditions, ["fitness", "name"], seeds=range(N_SEEDS))
+    parts = df["condition"].cat.categories.str.split("-", n=1)
+    codes = df["condition"].cat.codes.to_numpy()
+    df.insert(1, "format", pd.Categorical(parts.str[0][codes], categories=FORMATS))
+    df.insert(2, "feature", pd.Categorical(parts.str[1][codes], categories=FEATURES))
+    df["fitness"] = df["fitness"].replace(-np.inf, np.nan)
+    df["failed"] = df["fitness"].isna()
+    bf_cols = [c for c in df.columns if c.startswith("bf_") and df[c].notna().any()]
+    return df[["condition", "format", "feature", "seed", "evaluation", "fitness",
+               "failed", "name", *bf_cols]]
+
+
+def load_phase3_aucs(df3):
+    """(len(df3), runs) AOCC array of Phase 3 candidates (NaN rows for failures)."""
+    return load_aucs(RESULTS_PHASE3, df3)
 
 
 # ===================================================================
 # Figure 1: Model Screening (ranking + convergence, combined)
 # ===================================================================
 
-def fig_model_screening(df):
-    """Combined figure: (a) bar chart of best AOCC, (b) convergence curves."""
-    # --- Compute ranking data ---
-    best_per_seed = df.groupby(["model", "seed"])["fitness"].max().reset_index()
+def model_summary(df):
+    """Mean/std of the best AOCC per seed for each model, best model first."""
+    best_per_seed = df.groupby(["model", "seed"], observed=True)["fitness"].max().reset_index()
     best_per_seed.columns = ["model", "seed", "best_aocc"]
     best_per_seed["best_aocc"] = best_per_seed["best_aocc"].replace(-np.inf, np.nan)
 
-    summary = best_per_seed.groupby("model")["best_aocc"].agg(["mean", "std"]).reset_index()
+    summary = (best_per_seed.groupby("model", observed=True)["best_aocc"]
+               .agg(["mean", "std"]).reset_index())
     summary.columns = ["model", "aocc_mean", "aocc_std"]
-    summary = summary.sort_values("aocc_mean", ascending=False).reset_index(drop=True)
+    return summary.sort_values("aocc_mean", ascending=False).reset_index(drop=True)
+
+
+def fig_model_screening(df):
+    """Combined figure: (a) bar chart of best AOCC, (b) convergence curves."""
+    # --- Compute ranking data ---
+    summary = model_summary(df)
 
     # --- Compute convergence data ---
-    def compute_best_so_far(model_tag):
-        curves = []
-        for seed in range(N_SEEDS):
-            sub = df[(df["model"] == model_tag) & (df["seed"] == seed)].sort_values("evaluation")
-            fitness_vals = sub["fitness"].values.copy().astype(float)
-            fitness_vals[np.isinf(fitness_vals) & (fitness_vals < 0)] = np.nan
-            best_so_far = pd.Series(fitness_vals).expanding().max().values
-            curves.append(best_so_far)
-        max_len = max(len(c) for c in curves) if curves else 0
-        padded = []
-        for c in curves:
-            if len(c) < max_len:
-                c = np.concatenate([c, np.full(max_len - len(c), c[-1] if len(c) > 0 else np.nan)])
-            padded.append(c)
-        return np.array(padded)
+    convergence = ConvergenceTensor(df, "model", groups=MODELS, seeds=range(N_SEEDS))
 
     # --- Combined figure ---
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 7),
@@ -353,12 +315,10 @@ def fig_model_screening(df):
 
     # Panel (b): Convergence curves
     for model_tag in MODELS:
-        curves = compute_best_so_far(model_tag)
-        if curves.size == 0:
+        band = convergence.band(model_tag)
+        if band is None:
             continue
-        mean_curve = np.nanmean(curves, axis=0)
-        std_curve = np.nanstd(curves, axis=0)
-        x = np.arange(1, len(mean_curve) + 1)
+        x, mean_curve, std_curve = band["x"], band["mean"], band["std"]
         color = MODEL_COLORS[model_tag]
         ax2.plot(x, mean_curve, label=model_tag, color=color, linewidth=1.5)
         ax2.fill_between(x, mean_curve - std_curve, mean_curve + std_curve,
@@ -394,20 +354,16 @@ def fig_tsne_behavioral(df):
     bm_cols = nan_frac[nan_frac <= 0.5].index.tolist()
     proj_data = df_valid[bm_cols + ["fitness", "model"]].dropna(subset=bm_cols)
 
-    X = proj_data[bm_cols].values
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    n_samples = X_scaled.shape[0]
-    perp = min(30, n_samples - 1)
-    tsne = TSNE(n_components=2, perplexity=perp, random_state=42, init="pca")
-    X_tsne = tsne.fit_transform(X_scaled)
+    # Standardised, cached and subsampled above embedding.MAX_FIT rows; other
+    # phases can be placed into the same map with embedding.place.
+    X_tsne = embedding.fit_map(proj_data[bm_cols], name="tsne_behavioral")["embedding"]
 
     model_list = proj_data["model"].values
     fitness_vals = proj_data["fitness"].values
 
     # Sort models by mean AOCC for legend ordering
-    model_means = proj_data.groupby("model")["fitness"].mean().sort_values(ascending=False)
+    model_means = (proj_data.groupby("model", observed=True)["fitness"].mean()
+                   .sort_values(ascending=False))
     models_sorted = model_means.index.tolist()
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
@@ -493,6 +449,26 @@ def _cat_legend(ax):
     ax.legend(handles=elems, loc="lower right", fontsize=FONT_SIZE_LEGEND)
 
 
+def spearman_with_fitness(corr_data, bm_cols):
+    """Spearman rho and p of each column with ``fitness`` (cached).
+
+    ``corr_data`` is complete-case, so all columns are ranked once and
+    correlated in one matrix product (analysis/batch_stats.py).
+
+    Returns:
+        DataFrame with ``feature``, ``rho`` and ``p`` (empty with 3 rows or
+        fewer).
+    """
+    def compute():
+        if len(corr_data) <= 3:
+            return pd.DataFrame(columns=["feature", "rho", "p"])
+        rho, p = batch_stats.spearman_matrix(corr_data[bm_cols].to_numpy(float),
+                                             corr_data["fitness"].to_numpy(float))
+        return pd.DataFrame({"feature": bm_cols, "rho": rho[:, 0], "p": p[:, 0]})
+
+    return cached("spearman_fitness", (corr_data[bm_cols + ["fitness"]], bm_cols), compute)
+
+
 def fig_spearman(df):
     """Spearman rho with AOCC, sorted by |rho|."""
     df_valid = df[~df["failed"]].copy()
@@ -503,14 +479,10 @@ def fig_spearman(df):
     bm_cols = nan_frac[nan_frac <= 0.5].index.tolist()
     corr_data = df_valid[bm_cols + ["fitness"]].dropna()
 
-    rows = []
-    for col in bm_cols:
-        valid = corr_data[[col, "fitness"]].dropna()
-        if len(valid) > 3:
-            r, p = stats.spearmanr(valid[col], valid["fitness"])
-            rows.append({"feature": col, "rho": r, "abs_rho": abs(r),
-                         "p_bonf": min(p * len(bm_cols), 1.0)})
-    rho_df = pd.DataFrame(rows).sort_values("abs_rho", ascending=False)
+    rho_df = spearman_with_fitness(corr_data, bm_cols)
+    rho_df["abs_rho"] = rho_df["rho"].abs()
+    rho_df["p_bonf"] = np.minimum(rho_df["p"] * len(bm_cols), 1.0)
+    rho_df = rho_df.sort_values("abs_rho", ascending=False)
     rho_df["sig"] = rho_df["p_bonf"].apply(
         lambda p: "***" if p < 0.001 else ("**" if p < 0.01 else ("*" if p < 0.05 else "")))
 
@@ -552,12 +524,15 @@ def fig_rf_importance(df):
     X = rf_data[bm_cols].values
     y = rf_data["fitness"].values
 
-    rf = RandomForestRegressor(n_estimators=200, random_state=42, oob_score=True, n_jobs=-1)
-    rf.fit(X, y)
-    perm_imp = permutation_importance(rf, X, y, n_repeats=10, random_state=42, n_jobs=-1)
+    def compute():
+        rf = RandomForestRegressor(n_estimators=200, random_state=42, oob_score=True, n_jobs=-1)
+        rf.fit(X, y)
+        perm_imp = permutation_importance(rf, X, y, n_repeats=10, random_state=42, n_jobs=-1)
+        return rf.oob_score_, perm_imp.importances_mean, perm_imp.importances_std
+
+    oob_score, imp_mean, imp_std = cached("rf_importance", (X, y, bm_cols), compute)
     perm_df = pd.DataFrame({
-        "feature": bm_cols, "importance": perm_imp.importances_mean,
-        "std": perm_imp.importances_std,
+        "feature": bm_cols, "importance": imp_mean, "std": imp_std,
     }).sort_values("importance", ascending=False)
 
     fig, ax = plt.subplots(figsize=(_FIG_W, _FIG_H))
@@ -568,7 +543,7 @@ def fig_rf_importance(df):
     ax.set_yticklabels([f.replace("bm_", "") for f in perm_df["feature"]],
                        fontsize=FONT_SIZE_TICK)
     ax.set_xlabel("Permutation Importance")
-    ax.set_title("RF Permutation Importance (OOB $R^2$ = {:.3f})".format(rf.oob_score_),
+    ax.set_title("RF Permutation Importance (OOB $R^2$ = {:.3f})".format(oob_score),
                  fontweight="bold")
     ax.invert_yaxis()
     _cat_legend(ax)
@@ -600,14 +575,11 @@ def fig_ks_effect(df):
     top25 = df_ks[df_ks["fitness"] >= q75]
     bot25 = df_ks[df_ks["fitness"] <= q25]
 
-    ks_list = []
-    for col in bm_cols:
-        t = top25[col].dropna()
-        b = bot25[col].dropna()
-        if len(t) > 3 and len(b) > 3:
-            ks_stat, _ = stats.ks_2samp(t, b)
-            ks_list.append({"feature": col, "ks_stat": ks_stat})
-    ks_df = pd.DataFrame(ks_list).sort_values("ks_stat", ascending=False)
+    ks_stat, n_top, n_bot = batch_stats.ks_statistic(top25[bm_cols].to_numpy(float),
+                                                     bot25[bm_cols].to_numpy(float))
+    enough = (n_top > 3) & (n_bot > 3)
+    ks_df = pd.DataFrame({"feature": bm_cols, "ks_stat": ks_stat})[enough]
+    ks_df = ks_df.sort_values("ks_stat", ascending=False)
 
     fig, ax = plt.subplots(figsize=(_FIG_W, _FIG_H))
     colors = [_cat_color(f) for f in ks_df["feature"]]
@@ -630,12 +602,17 @@ def fig_ks_effect(df):
 # Figure 3: Failure Modes (Phase 1)
 # ===================================================================
 
-def fig_failure_modes(df, summary):
+def fig_failure_modes(df, summary=None):
     """Stacked bar chart of failure categories per model."""
+    if summary is None:
+        summary = model_summary(df)
     failed_df = df[df["failed"]].copy()
+    if "code" not in failed_df.columns:
+        failed_df = failed_df.join(load_text(RESULTS_PHASE1, failed_df, condition_col="model"))
     failed_df["failure_type"] = failed_df.apply(categorize_failure, axis=1)
 
-    failure_counts = failed_df.groupby(["model", "failure_type"]).size().unstack(fill_value=0)
+    failure_counts = (failed_df.groupby(["model", "failure_type"], observed=True)
+                      .size().unstack(fill_value=0))
     failure_counts = failure_counts.reindex(summary["model"].tolist(), fill_value=0)
 
     # Use pastel palette for the stacked segments
@@ -723,19 +700,10 @@ def fig_spearman_heatmap(df):
 
     # Compute Spearman correlations with fitness
     corr_data = df_valid[bm_cols + ["fitness"]].dropna()
-    rho_list = []
-    for col in bm_cols:
-        valid = corr_data[[col, "fitness"]].dropna()
-        if len(valid) > 3:
-            r, p = stats.spearmanr(valid[col], valid["fitness"])
-            n_tests = len(bm_cols)
-            rho_list.append({
-                "feature": col, "rho": r, "p": p,
-                "p_bonf": min(p * n_tests, 1.0),
-                "category": feat_to_cat.get(col, "Unknown"),
-            })
-
-    rho_df = pd.DataFrame(rho_list).sort_values("rho", key=abs, ascending=False)
+    rho_df = spearman_with_fitness(corr_data, bm_cols)
+    rho_df["p_bonf"] = np.minimum(rho_df["p"] * len(bm_cols), 1.0)
+    rho_df["category"] = [feat_to_cat.get(col, "Unknown") for col in rho_df["feature"]]
+    rho_df = rho_df.sort_values("rho", key=abs, ascending=False)
     rho_df["sig"] = rho_df["p_bonf"].apply(
         lambda p: "***" if p < 0.001 else ("**" if p < 0.01 else ("*" if p < 0.05 else ""))
     )
@@ -771,10 +739,17 @@ def fig_spearman_heatmap(df):
 # Figure 5: Format Boxplot (Phase 3)
 # ===================================================================
 
+def best_aocc_per_seed(df3):
+    """Best AOCC of every (condition, seed) of Phase 3."""
+    best = (df3.groupby(["condition", "format", "feature", "seed"], observed=True)["fitness"]
+            .max().reset_index())
+    best.columns = ["condition", "format", "feature", "seed", "best_aocc"]
+    return best
+
+
 def fig_format_boxplot(df3):
     """Boxplot of best AOCC per seed, grouped by feedback format."""
-    best = df3.groupby(["condition", "format", "feature", "seed"])["fitness"].max().reset_index()
-    best.columns = ["condition", "format", "feature", "seed", "best_aocc"]
+    best = best_aocc_per_seed(df3)
 
     # Only use conditions where all 3 formats exist (exclude longest_no_improvement_streak)
     best_3fmt = best[~best["feature"].isin(COMPARATIVE_EXCLUDE)]
@@ -855,16 +830,22 @@ def fig_format_boxplot(df3):
 # Figure 6: Condition Ranking (Phase 3)
 # ===================================================================
 
-def fig_condition_ranking(df3, best):
+def fig_condition_ranking(df3, best=None):
     """Horizontal bar chart of all 29 conditions ranked by mean best AOCC."""
-    fail_per_seed = df3.groupby(["condition", "format", "feature", "seed"])["failed"].mean().reset_index()
+    if best is None:
+        best = best_aocc_per_seed(df3)
+    fail_per_seed = (df3.groupby(["condition", "format", "feature", "seed"], observed=True)
+                     ["failed"].mean().reset_index())
     fail_per_seed.columns = ["condition", "format", "feature", "seed", "failure_rate"]
 
-    cond_summary = best.groupby(["condition", "format", "feature"])["best_aocc"].agg(
-        ["mean", "std"]).reset_index()
-    cond_summary.columns = ["condition", "format", "feature", "aocc_mean", "aocc_std"]
+    cond_summary = best[["condition", "format", "feature"]].drop_duplicates("condition")
+    _, per_seed = batch_stats.seed_matrix(best.dropna(subset=["best_aocc"]), "condition",
+                                          "best_aocc", groups=cond_summary["condition"])
+    cond_summary = cond_summary.assign(aocc_mean=np.nanmean(per_seed, axis=1),
+                                       aocc_std=np.nanstd(per_seed, axis=1, ddof=1))
 
-    fail_agg = fail_per_seed.groupby("condition")["failure_rate"].mean().reset_index()
+    fail_agg = (fail_per_seed.groupby("condition", observed=True)["failure_rate"]
+                .mean().reset_index())
     fail_agg.columns = ["condition", "fail_rate"]
     cond_summary = cond_summary.merge(fail_agg, on="condition")
     cond_summary = cond_summary.sort_values("aocc_mean", ascending=False).reset_index(drop=True)
@@ -908,6 +889,10 @@ def fig_condition_ranking(df3, best):
 
 def fig_convergence_by_format(df3):
     """Per-feature convergence curves, one curve per format (2x5 grid)."""
+    convergence = ConvergenceTensor(
+        df3, ["feature", "format"], seeds=range(N_SEEDS),
+        groups=[(feat, fmt) for feat in FEATURES for fmt in formats_for_feature(feat)])
+
     fig, axes = plt.subplots(2, 5, figsize=(22, 10), sharey=True)
     axes_flat = axes.flatten()
 
@@ -915,25 +900,10 @@ def fig_convergence_by_format(df3):
         ax = axes_flat[idx]
         fmts = formats_for_feature(feat)
         for fmt in fmts:
-            curves = []
-            for seed in range(N_SEEDS):
-                sub = df3[(df3["feature"] == feat) & (df3["format"] == fmt) &
-                          (df3["seed"] == seed)]
-                sub = sub.sort_values("evaluation")
-                if sub.empty:
-                    continue
-                vals = sub["fitness"].values.copy()
-                bsf = pd.Series(vals).expanding().max().values
-                curves.append(bsf)
-
-            if not curves:
+            band = convergence.band((feat, fmt))
+            if band is None:
                 continue
-            max_len = max(len(c) for c in curves)
-            padded = [np.concatenate([c, np.full(max_len - len(c), c[-1])]) for c in curves]
-            arr = np.array(padded)
-            mean_c = np.nanmean(arr, axis=0)
-            std_c = np.nanstd(arr, axis=0)
-            x = np.arange(1, len(mean_c) + 1)
+            x, mean_c, std_c = band["x"], band["mean"], band["std"]
             ax.plot(x, mean_c, label=fmt, color=FORMAT_COLORS[fmt], linewidth=1.5)
             ax.fill_between(x, mean_c - std_c, mean_c + std_c,
                             alpha=0.15, color=FORMAT_COLORS[fmt])
@@ -1178,15 +1148,15 @@ def fig_steering_shifts(df3):
 # Figure 9: MA-BBOB Instance Selection (2-panel)
 # ===================================================================
 
-def fig_mabbob_instances():
+def fig_mabbob_instances(weights=None):
     """Per-function weight share and per-group weight share in selected MA-BBOB instances."""
     # weights.csv path: ../BLADE/iohblade/benchmarks/BBOB/mabbob/weights.csv
-    if not WEIGHTS_CSV.exists():
-        print(f"  WARNING: weights.csv not found at {WEIGHTS_CSV}")
-        print("  Skipping fig_mabbob_instances")
-        return
-
-    weights = pd.read_csv(WEIGHTS_CSV, index_col=0)
+    if weights is None:
+        if not WEIGHTS_CSV.exists():
+            print(f"  WARNING: weights.csv not found at {WEIGHTS_CSV}")
+            print("  Skipping fig_mabbob_instances")
+            return
+        weights = pd.read_csv(WEIGHTS_CSV, index_col=0)
     W = weights.values  # 1000 x 24
 
     GROUPS = {
@@ -1311,74 +1281,67 @@ def fig_mabbob_instances():
 # Main
 # ===================================================================
 
-def main():
-    print("=" * 60)
-    print("Exporting thesis figures to PDF")
-    print(f"Output directory: {FIGURES_DIR}")
-    print("=" * 60)
-
-    # --- Phase 1 figures ---
-    print("\n[Phase 1] Loading data...")
-    if RESULTS_PHASE1.exists():
-        df1 = load_phase1()
-        print(f"  Loaded {len(df1)} evaluations across {df1['model'].nunique()} models")
-
-        print("\n[Phase 1] fig_model_screening.pdf")
-        summary = fig_model_screening(df1)
-
-        print("[Phase 1] fig_tsne_behavioral.pdf")
-        fig_tsne_behavioral(df1)
-
-        print("[Phase 1] fig_spearman.pdf")
-        fig_spearman(df1)
-
-        print("[Phase 1] fig_rf_importance.pdf")
-        fig_rf_importance(df1)
-
-        print("[Phase 1] fig_ks_effect.pdf")
-        fig_ks_effect(df1)
-
-        print("[Phase 1] fig_failure_modes.pdf")
-        fig_failure_modes(df1, summary)
+def _file_fingerprint(path):
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
 
-        # spearman_heatmap superseded by fig_spearman above
-    else:
-        df1 = None
-        print(f"  WARNING: {RESULTS_PHASE1} not found -- skipping Phase 1 figures")
 
-    # --- Phase 3 figures ---
-    print("\n[Phase 3] Loading data...")
-    if RESULTS_PHASE3.exists():
-        df3 = load_phase3()
-        print(f"  Loaded {len(df3)} evaluations across {df3['condition'].nunique()} conditions")
-
-        print("\n[Phase 3] fig_format_boxplot.pdf")
-        best3 = fig_format_boxplot(df3)
+# Data each figure is drawn from (see analysis/figure_build.py).
+INPUTS = {
+    "phase1": {"fingerprint": lambda: fingerprint(RESULTS_PHASE1), "load": load_phase1},
+    "phase3": {"fingerprint": lambda: fingerprint(RESULTS_PHASE3), "load": load_phase3},
+    "mabbob_weights": {"fingerprint": lambda: _file_fingerprint(WEIGHTS_CSV),
+                       "load": lambda: pd.read_csv(WEIGHTS_CSV, index_col=0)},
+}
 
-        print("[Phase 3] fig_condition_ranking.pdf")
-        fig_condition_ranking(df3, best3)
+# (figure, function, inputs); fig_spearman_heatmap is superseded by fig_spearman.
+FIGURES = [
+    ("fig_model_screening", fig_model_screening, ("phase1",)),
+    ("fig_tsne_behavioral", fig_tsne_behavioral, ("phase1",)),
+    ("fig_spearman", fig_spearman, ("phase1",)),
+    ("fig_rf_importance", fig_rf_importance, ("phase1",)),
+    ("fig_ks_effect", fig_ks_effect, ("phase1",)),
+    ("fig_failure_modes", fig_failure_modes, ("phase1",)),
+    ("fig_format_boxplot", fig_format_boxplot, ("phase3",)),
+    ("fig_condition_ranking", fig_condition_ranking, ("phase3",)),
+    ("fig_convergence_by_format", fig_convergence_by_format, ("phase3",)),
+    ("fig_guided_medians", fig_guided_medians, ("phase3", "phase1")),
+    ("fig_steering_shifts", fig_steering_shifts, ("phase3",)),
+    ("fig_mabbob_instances", fig_mabbob_instances, ("mabbob_weights",)),
+]
 
-        print("[Phase 3] fig_convergence_by_format.pdf")
-        fig_convergence_by_format(df3)
 
-        print("[Phase 3] fig_guided_medians.pdf")
-        fig_guided_medians(df3, df1)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export thesis figures to PDF")
+    parser.add_argument("--only", nargs="+", metavar="FIG",
+                        help="Build only these figures (e.g. fig_tsne_behavioral)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild even if the figure is up to date")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Processes used to render figures")
+    parser.add_argument("--list", action="store_true", help="List figures and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, _, needs in FIGURES:
+            print(f"  {name:28s} {', '.join(needs)}")
+        return
 
-        print("[Phase 3] fig_steering_shifts.pdf")
-        fig_steering_shifts(df3)
-    else:
-        print(f"  WARNING: {RESULTS_PHASE3} not found -- skipping Phase 3 figures")
+    print("=" * 60)
+    print("Exporting thesis figures to PDF")
+    print(f"Output directory: {FIGURES_DIR}")
+    print("=" * 60)
 
-    # --- MA-BBOB figure ---
-    print("\n[MA-BBOB] fig_mabbob_instances.pdf")
-    fig_mabbob_instances()
+    report = figure_build.build(FIGURES, INPUTS, FIGURES_DIR, only=args.only,
+                                force=args.force, jobs=args.jobs)
 
-    # --- Summary ---
-    produced = list(FIGURES_DIR.glob("fig_*.pdf"))
     print("\n" + "=" * 60)
-    print(f"Done. Produced {len(produced)} figures:")
-    for p in sorted(produced):
-        print(f"  {p}")
+    print(f"Done. Built {len(report['built'])}, up to date {len(report['skipped'])}, "
+          f"missing inputs {len(report['missing_inputs'])}, failed {len(report['failed'])}.")
+    for name in report["built"]:
+        print(f"  {FIGURES_DIR / name}.pdf")
     print("=" * 60)
 
 
@@ -0,0 +1,194 @@
+"""Incremental, parallel figure builds with cached intermediate results.
+
+A figure script declares its *inputs* and its *figures*:
+
+    inputs = {"phase1": {"fingerprint": fp_fn, "load": load_fn}, ...}
+    figures = [("fig_x", fig_x, ("phase1",)), ...]
+
+``fingerprint()`` is cheap (a store manifest hash, a file stat) and returns
+None when the input is unavailable; ``load()`` produces the object passed to
+the figure functions, in the order of the figure's input names.
+
+``build`` stamps every figure with the hash of its function's source, its
+inputs' fingerprints and ``BUILD_VERSION``.  Figures whose stamp matches the
+build state (``.build_state.json`` next to the outputs) and whose PDF exists
+are skipped without loading any data.  Inputs of the stale figures are loaded
+once, and the figures are rendered in a process pool when ``jobs > 1``.
+Changes outside a figure's own function (shared helpers, style constants)
+are not tracked: use ``--force`` or bump ``BUILD_VERSION``.
+
+``cached`` memoises expensive intermediate results (t-SNE embeddings,
+correlation tables, ...) on disk under ``CACHE_DIR``, keyed by a hash of
+the data and parameters they are computed from.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Bump to rebuild every figure (e.g. after changing shared plot helpers).
+BUILD_VERSION = 1
+
+BUILD_STATE_FILE = ".build_state.json"
+
+CACHE_DIR = Path(os.environ.get("ANALYSIS_CACHE_DIR",
+                                Path(__file__).resolve().parent / ".cache"))
+
+
+# ---------------------------------------------------------------------------
+# Hashing and on-disk cache
+# ---------------------------------------------------------------------------
+
+def data_hash(*objs):
+    """Stable hash of arrays, frames and JSON-serialisable parameters."""
+    h = hashlib.sha1()
+    for obj in objs:
+        if isinstance(obj, pd.DataFrame):
+            h.update(json.dumps([str(c) for c in obj.columns]).encode())
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        elif isinstance(obj, pd.Series):
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        elif isinstance(obj, np.ndarray):
+            arr = np.ascontiguousarray(obj)
+            h.update(f"{arr.dtype}{arr.shape}".encode())
+            h.update(arr.tobytes())
+        else:
+            h.update(json.dumps(obj, sort_keys=True, default=str).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cached(name, key, compute):
+    """Return ``compute()``, memoised on disk under ``name`` and ``key``.
+
+    Args:
+        name: cache entry name; only the newest key of a name is kept.
+        key: tuple of the data and parameters the result depends on
+            (hashed with ``data_hash``).
+        compute: zero-argument callable producing a picklable result.
+    """
+    digest = data_hash(*key)[:16]
+    path = CACHE_DIR / f"{name}-{digest}.pkl"
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+    result = compute()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    with open(tmp, "wb") as f:
+        pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    for old in CACHE_DIR.glob(f"{name}-*.pkl"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _stamp(fn, fingerprints):
+    return data_hash(BUILD_VERSION, inspect.getsource(fn), fingerprints)
+
+
+def _render(fn, args):
+    fn(*args)
+
+
+def _read_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def build(figures, inputs, out_dir, only=None, force=False, jobs=1):
+    """Render the stale figures.
+
+    Args:
+        figures: list of (name, function, input names); the output is
+            ``out_dir / f"{name}.pdf"``.
+        inputs: {input name: {"fingerprint": callable, "load": callable}}.
+        out_dir: figure directory (also holds the build state).
+        only: figure names to consider (default: all).
+        force: rebuild even if up to date.
+        jobs: processes used to render figures.
+
+    Returns:
+        dict: {"built": [...], "skipped": [...], "missing_inputs": [...],
+        "failed": [...]} of figure names.
+    """
+    out_dir = Path(out_dir)
+    state_path = out_dir / BUILD_STATE_FILE
+    state = _read_state(state_path)
+    if only:
+        unknown = set(only) - {name for name, _, _ in figures}
+        if unknown:
+            raise ValueError(f"Unknown figures: {', '.join(sorted(unknown))}")
+        figures = [f for f in figures if f[0] in only]
+
+    report = {"built": [], "skipped": [], "missing_inputs": [], "failed": []}
+    fingerprints = {}
+    stale = []
+    for name, fn, needs in figures:
+        for need in needs:
+            if need not in fingerprints:
+                fingerprints[need] = inputs[need]["fingerprint"]()
+        if any(fingerprints[need] is None for need in needs):
+            print(f"  WARNING: input of {name} not available -- skipping")
+            report["missing_inputs"].append(name)
+            continue
+        stamp = _stamp(fn, [fingerprints[need] for need in needs])
+        if not force and state.get(name) == stamp and (out_dir / f"{name}.pdf").exists():
+            report["skipped"].append(name)
+            continue
+        stale.append((name, fn, needs, stamp))
+
+    loaded = {}
+    for _, _, needs, _ in stale:
+        for need in needs:
+            if need not in loaded:
+                print(f"[{need}] Loading data...")
+                loaded[need] = inputs[need]["load"]()
+
+    def done(name, stamp, error):
+        if error is None:
+            state[name] = stamp
+            report["built"].append(name)
+        else:
+            print(f"  ERROR in {name}: {error!r}")
+            report["failed"].append(name)
+
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(min(jobs, len(stale))) as pool:
+            futures = [(name, stamp, pool.submit(_render, fn, [loaded[n] for n in needs]))
+                       for name, fn, needs, stamp in stale]
+            for name, stamp, future in futures:
+                done(name, stamp, future.exception())
+    else:
+        for name, fn, needs, stamp in stale:
+            print(f"[{name}]")
+            try:
+                _render(fn, [loaded[n] for n in needs])
+            except Exception as e:
+                done(name, stamp, e)
+            else:
+                done(name, stamp, None)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_name(f"{BUILD_STATE_FILE}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, state_path)
+    return report
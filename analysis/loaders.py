@@ -0,0 +1,204 @@
+"""Shared run loaders for the analysis scripts.
+
+``load_runs`` returns the candidates of some conditions of a results root
+as a DataFrame, reading only the requested columns.  Parsing goes through
+``analysis.columnar_store``: every run's ``log.jsonl`` is parsed once into
+Parquet parts, which act as that run's cached frame.  The cache is keyed in
+the store manifest by the log's path, size and mtime.  On each call,
+unchanged runs cost one ``stat``, and new or changed runs are parsed in a
+pool of ``LOADER_WORKERS`` processes.  A regenerate-everything pass with no
+new data therefore only reads Parquet columns.
+
+Frames are compact by default: ``condition`` and ``name`` are
+categoricals and feature columns are ``float32``.  Large per-candidate data
+need not be in the frame at all; it is fetched by key when a figure needs it:
+``load_text`` returns ``code``/``feedback``/``error`` for some rows (e.g.
+only the failed candidates), and ``load_aucs`` returns the per-run AOCCs as a
+dense ``(n_candidates, n_runs)`` array instead of one list per cell.
+
+Used by ``export_figures.py`` (Phase 1 and 3); ``phase4_analysis.py`` reads
+the same store one partition at a time.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from . import columnar_store
+
+# Processes used to parse changed logs (ANALYSIS_WORKERS overrides).
+LOADER_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", 0)) or os.cpu_count() or 1
+
+# Dtype of the feature columns of compact frames.
+FEATURE_DTYPE = np.float32
+
+# Columns identifying a candidate in the store.
+KEYS = ["condition", "seed", "run", "evaluation"]
+
+
+def refresh(results_root, workers=None):
+    """Parse new or changed run logs of ``results_root`` into its store.
+
+    Returns:
+        int: number of candidates added.
+    """
+    return columnar_store.ingest(results_root, workers=workers or LOADER_WORKERS)
+
+
+def fingerprint(results_root):
+    """Hash of what the store holds for ``results_root`` after a refresh.
+
+    Changes whenever a run gains or loses candidates; None if the results
+    root does not exist.  Used to decide whether derived figures are stale
+    without loading any data.
+    """
+    if not Path(results_root).is_dir():
+        return None
+    refresh(results_root)
+    manifest = columnar_store.read_manifest(results_root)
+    state = sorted((key, log["rows"], log["offset"])
+                   for key, log in manifest.get("logs", {}).items())
+    return hashlib.sha1(json.dumps(state).encode()).hexdigest()
+
+
+def load_runs(results_root, conditions, columns, text_columns=(), seeds=None,
+              features="bf_", compact=True):
+    """Candidates of ``conditions`` from a results root, in condition order.
+
+    Only the first run directory of each seed is used, as the original
+    per-run parsers did.
+
+    Args:
+        results_root: results directory (``{tag}/seed-{n}/run-*``).
+        conditions: condition tags, in the order rows should come out.
+        columns: scalar columns; those missing from the store are skipped.
+        text_columns: columns from the text group (``code``, ``feedback``,
+            ``error``), joined on (condition, seed, run, evaluation).
+        seeds: seeds to keep (default: all).
+        features: prefix of the feature columns to add (``"bf_"``,
+            ``"bfstd_"``), or None for none.
+        compact: make ``condition`` (categories in ``conditions`` order) and
+            ``name`` categorical and the feature columns ``FEATURE_DTYPE``.
+
+    Returns:
+        DataFrame with ``condition``, ``seed``, ``evaluation`` and the
+        requested columns.
+    """
+    refresh(results_root)
+    available = columnar_store.column_names(results_root)
+    if available:
+        columns = [c for c in columns if c in available]
+        if features:
+            columns += [c for c in available if c.startswith(features)]
+    selected = ds.field("condition").isin(list(conditions))
+    if seeds is not None:
+        selected &= ds.field("seed").isin(list(seeds))
+    df = columnar_store.read(results_root, columns=KEYS + list(columns), filter=selected)
+    if text_columns:
+        text = columnar_store.read(results_root, columns=KEYS + list(text_columns),
+                                   group="text", filter=selected)
+        df = df.merge(text, on=KEYS, how="left")
+    df["run"] = df["run"].astype(str)
+    first_run = df.groupby(["condition", "seed"])["run"].transform("min")
+    df = df[df["run"] == first_run].drop(columns="run")
+    order = {c: i for i, c in enumerate(conditions)}
+    df = df.sort_values(["condition", "seed", "evaluation"],
+                        key=lambda col: col.map(order) if col.name == "condition" else col,
+                        kind="stable")
+    df["seed"] = df["seed"].astype(int)
+    df["evaluation"] = df["evaluation"].astype(int)
+    if compact:
+        df["condition"] = pd.Categorical(df["condition"], categories=list(conditions))
+        if "name" in df.columns:
+            df["name"] = df["name"].astype("category")
+        if features:
+            feature_cols = [c for c in df.columns if c.startswith(features)]
+            df[feature_cols] = df[feature_cols].astype(FEATURE_DTYPE)
+    return df.reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------------
+# Lookups by key
+# ---------------------------------------------------------------------------
+
+def _lookup(results_root, keys, columns, group, condition_col):
+    """Yield (positions in ``keys``, pa.Table of ``columns`` for them).
+
+    Reads one (condition, seed) partition at a time, so memory is bounded by
+    the largest partition rather than by everything ``keys`` touches.
+    """
+    data = columnar_store.dataset(results_root, group)
+    if data is None:
+        return
+    wanted = pd.DataFrame({"condition": keys[condition_col].astype(str).to_numpy(),
+                           "seed": keys["seed"].to_numpy(dtype=int),
+                           "evaluation": keys["evaluation"].to_numpy(dtype=int),
+                           "pos": np.arange(len(keys))})
+    for (condition, seed), sub in wanted.groupby(["condition", "seed"], sort=False):
+        selected = (ds.field("condition") == condition) & (ds.field("seed") == int(seed))
+        table = data.to_table(columns=["run", "evaluation", *columns], filter=selected)
+        if not table.num_rows:
+            continue
+        # The first run directory of a seed, as in load_runs.
+        runs = pc.cast(table["run"], "string")
+        table = table.filter(pc.equal(runs, pc.min(runs)))
+        index = pd.Index(table["evaluation"].to_numpy()).get_indexer(sub["evaluation"])
+        found = index >= 0
+        yield sub["pos"].to_numpy()[found], table.select(list(columns)).take(index[found])
+
+
+def load_text(results_root, keys, columns=("code", "feedback"), condition_col="condition"):
+    """Text columns of some candidates, read from the store's ``text`` group.
+
+    Only the partitions of ``keys`` are read, one at a time, and only their
+    rows are kept, so asking for the failed candidates of a frame does not
+    hold everyone's code in memory.
+
+    Args:
+        results_root: results directory the frame was loaded from.
+        keys: frame with ``condition_col``, ``seed`` and ``evaluation``
+            (typically a slice of a ``load_runs`` frame).
+        columns: text columns (``code``, ``feedback``, ``error``).
+        condition_col: column of ``keys`` holding the condition tag.
+
+    Returns:
+        DataFrame with ``columns``, indexed like ``keys`` ("" where missing).
+    """
+    values = {col: np.full(len(keys), "", dtype=object) for col in columns}
+    for pos, table in _lookup(results_root, keys, columns, "text", condition_col):
+        for col in columns:
+            values[col][pos] = table[col].to_numpy(zero_copy_only=False)
+    return pd.DataFrame(values, index=keys.index)
+
+
+def load_aucs(results_root, keys, condition_col="condition"):
+    """Per-run AOCCs of some candidates as a dense array.
+
+    Args:
+        results_root: results directory the frame was loaded from.
+        keys: frame with ``condition_col``, ``seed`` and ``evaluation``.
+        condition_col: column of ``keys`` holding the condition tag.
+
+    Returns:
+        float array of shape (len(keys), n_runs), in the row order of
+        ``keys``; NaN rows for candidates without a full set of AOCCs.
+    """
+    n_runs = columnar_store.read_manifest(results_root).get("n_runs") or 0
+    out = np.full((len(keys), n_runs), np.nan)
+    if "aucs" not in columnar_store.column_names(results_root):
+        return out
+    for pos, table in _lookup(results_root, keys, ["aucs"], "scalars", condition_col):
+        column = table["aucs"].combine_chunks()
+        # Parts written before any candidate had AOCCs lack the column; the
+        # dataset reads them as nulls, which flatten() would skip.
+        valid = column.is_valid().to_numpy(zero_copy_only=False)
+        if valid.any():
+            values = column.filter(valid).flatten().to_numpy(zero_copy_only=False)
+            out[pos[valid]] = values.reshape(int(valid.sum()), -1)
+    return out
@@ -0,0 +1,272 @@
+"""Phase 4 analysis: condition comparison, convergence and per-instance AOCC.
+
+Phase 4 is 6 conditions x 10 seeds x 500 candidates, and every candidate
+carries 100 per-run AOCCs (instances x evaluation seeds) and ~32 features
+with their stds.  Nothing here loads it all at once: the results are
+ingested into the columnar store (analysis/loaders.py, cached by log size
+and mtime) and then read one (condition, seed) partition at a time, with
+only the columns each analysis needs and never the code or feedback text.
+Each partition is reduced to a few numbers before the next is read, so
+memory is bounded by one run (~500 x 100 AOCCs) plus the small fitness
+traces, whatever the number of conditions and seeds.
+
+Tables (CSV, under ``--out``):
+  - phase4_best_per_seed.csv       : best AOCC, failures and evaluations to
+                                     each threshold per (condition, seed)
+  - phase4_condition_comparison.csv: best-AOCC statistics per condition
+                                     (bootstrap 95% CI), permutation and
+                                     Mann-Whitney U tests against vanilla
+                                     (Holm-adjusted)
+  - phase4_convergence.csv         : best-so-far mean/std/95% CI per
+                                     condition and evaluation
+  - phase4_instance_aocc.csv       : per-instance AOCC of each seed's best
+                                     candidate, averaged over seeds
+
+Usage:
+    python -m analysis.phase4_analysis
+    python -m analysis.phase4_analysis --results results_phase4 --out analysis/phase4
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from scipy import stats
+
+from analysis import batch_stats, columnar_store, loaders
+from analysis.convergence import ConvergenceTensor
+from experiments.phase4_config import (
+    CONDITIONS,
+    DIMS,
+    EVAL_SEEDS,
+    RESULTS_DIR,
+    RUN_SEEDS,
+    TRAINING_INSTANCES,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_PHASE4 = REPO_ROOT / RESULTS_DIR
+OUTPUT_DIR = REPO_ROOT / "analysis" / "phase4"
+
+BASELINE = "vanilla"
+
+TABLES = ("best_per_seed", "condition_comparison", "convergence", "instance_aocc")
+
+# Best-so-far AOCC levels for the time-to-threshold columns.
+THRESHOLDS = (0.85, 0.9)
+
+
+# ---------------------------------------------------------------------------
+# Streaming reads
+# ---------------------------------------------------------------------------
+
+def iter_runs(results_root, columns, conditions=None, seeds=None):
+    """Yield (condition, seed, pa.Table) for each run, one partition at a time.
+
+    Only the first run directory of a seed is used, as in
+    ``loaders.load_runs``.  Rows are in evaluation order.
+    """
+    data = columnar_store.dataset(results_root)
+    if data is None:
+        return
+    present = set(data.schema.names)
+    columns = ["run", "evaluation"] + [c for c in columns if c in present]
+    for condition in conditions or CONDITIONS:
+        for seed in seeds if seeds is not None else RUN_SEEDS:
+            selected = (ds.field("condition") == condition) & (ds.field("seed") == seed)
+            table = data.to_table(columns=columns, filter=selected)
+            if not table.num_rows:
+                continue
+            runs = pc.cast(table["run"], "string")
+            table = table.filter(pc.equal(runs, pc.min(runs)))
+            table = table.take(pc.sort_indices(table["evaluation"]))
+            yield condition, seed, table
+
+
+def aucs_matrix(table):
+    """(candidates, runs) AOCC matrix of a table's ``aucs`` column."""
+    column = table["aucs"].combine_chunks()
+    return column.flatten().to_numpy(zero_copy_only=False).reshape(len(column), -1)
+
+
+def per_instance(aucs, n_instances=len(TRAINING_INSTANCES)):
+    """Average a candidate's AOCCs per training instance.
+
+    ``MaBBOBProblem.evaluate`` loops dims -> instances -> evaluation seeds,
+    so the runs reshape to (dims, instances, seeds).
+    """
+    return aucs.reshape(len(DIMS), n_instances, EVAL_SEEDS).mean(axis=(0, 2))
+
+
+# ---------------------------------------------------------------------------
+# Analyses
+# ---------------------------------------------------------------------------
+
+def scan(results_root, conditions=None, seeds=None):
+    """Reduce every run to its summary, fitness trace and best candidate's AOCCs.
+
+    Returns:
+        tuple: (per-seed DataFrame, fitness trace DataFrame, per-instance
+        DataFrame of the best candidates).
+    """
+    per_seed, traces, instances = [], [], []
+    for condition, seed, table in iter_runs(results_root, ["fitness", "aucs"],
+                                            conditions, seeds):
+        fitness = table["fitness"].to_numpy().astype(float)
+        fitness[~np.isfinite(fitness)] = np.nan
+        failed = int(np.isnan(fitness).sum())
+        best = int(np.nanargmax(fitness)) if failed < len(fitness) else None
+        per_seed.append({
+            "condition": condition, "seed": seed, "candidates": len(fitness),
+            "failed": failed,
+            "best_aocc": fitness[best] if best is not None else np.nan,
+            "best_evaluation": int(table["evaluation"][best].as_py()) if best is not None else -1,
+        })
+        traces.append(pd.DataFrame({"condition": condition, "seed": seed,
+                                    "evaluation": table["evaluation"].to_numpy(),
+                                    "fitness": fitness}))
+        if best is not None and "aucs" in table.column_names:
+            row = aucs_matrix(table.slice(best, 1))[0]
+            if not np.isnan(row).all():
+                for instance, aocc in zip(TRAINING_INSTANCES, per_instance(row)):
+                    instances.append({"condition": condition, "seed": seed,
+                                      "instance": instance, "aocc": aocc})
+    traces = pd.concat(traces, ignore_index=True) if traces else pd.DataFrame()
+    return pd.DataFrame(per_seed), traces, pd.DataFrame(instances)
+
+
+def condition_comparison(per_seed, conditions, baseline=BASELINE):
+    """Best-AOCC statistics per condition and tests against ``baseline``.
+
+    Bootstrap CIs of the mean and permutation tests of the difference in
+    means come from ``batch_stats`` (all conditions in one pass, seeded);
+    the Mann-Whitney U p-values are Holm-adjusted.
+    """
+    present = [c for c in conditions if (per_seed["condition"] == c).any()]
+    if not present:
+        return pd.DataFrame()
+    valid = per_seed.dropna(subset=["best_aocc"])
+    _, best = batch_stats.seed_matrix(valid, "condition", "best_aocc", groups=present)
+    base = valid.loc[valid["condition"] == baseline, "best_aocc"].to_numpy()
+    ci = batch_stats.bootstrap_ci(best)
+    perm = batch_stats.permutation_test(best, base)
+
+    rows = []
+    for i, condition in enumerate(present):
+        sub = per_seed[per_seed["condition"] == condition]
+        values = sub["best_aocc"].dropna()
+        p, p_perm = np.nan, np.nan
+        if condition != baseline and len(values) and len(base):
+            p = stats.mannwhitneyu(values, base, alternative="two-sided").pvalue
+            p_perm = perm["p"][i]
+        rows.append({
+            "condition": condition, "seeds": len(sub),
+            "aocc_mean": values.mean(), "aocc_std": values.std(),
+            "aocc_ci_low": ci["low"][i], "aocc_ci_high": ci["high"][i],
+            "aocc_median": values.median(), "aocc_min": values.min(), "aocc_max": values.max(),
+            "failure_rate": sub["failed"].sum() / sub["candidates"].sum(),
+            "diff_vs_baseline": perm["diff"][i] if len(base) else np.nan,
+            "p_perm": p_perm,
+            "p_vs_baseline": p,
+        })
+    out = pd.DataFrame(rows)
+    out["p_holm"] = batch_stats.holm(out["p_vs_baseline"])
+    return out
+
+
+def convergence_table(convergence):
+    """Long frame of best-so-far bands per condition and evaluation."""
+    frames = []
+    for condition in convergence.groups:
+        band = convergence.band(condition)
+        if band is None:
+            continue
+        frames.append(pd.DataFrame({
+            "condition": condition, "evaluation": band["x"], "seeds": band["n"],
+            "mean": band["mean"], "std": band["std"],
+            "ci_low": band["ci_low"], "ci_high": band["ci_high"],
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def instance_table(instances, conditions):
+    """Mean and std over seeds of the best candidates' per-instance AOCC."""
+    if instances.empty:
+        return instances
+    out = instances.groupby(["condition", "instance"])["aocc"].agg(["mean", "std", "count"])
+    out = out.reset_index().rename(columns={"count": "seeds"})
+    order = {c: i for i, c in enumerate(conditions)}
+    return out.sort_values(["condition", "instance"], kind="stable",
+                           key=lambda col: col.map(order) if col.name == "condition" else col,
+                           ).reset_index(drop=True)
+
+
+def analyse(results_root=RESULTS_PHASE4, conditions=None, seeds=None,
+            thresholds=THRESHOLDS):
+    """Run every Phase 4 analysis.
+
+    Returns:
+        dict: {name: DataFrame} for every name in ``TABLES`` (empty frames
+        if there are no results).
+    """
+    conditions = list(conditions or CONDITIONS)
+    seeds = list(seeds if seeds is not None else RUN_SEEDS)
+    empty = pd.DataFrame()
+    if not Path(results_root).is_dir():
+        return {name: empty for name in TABLES}
+    loaders.refresh(results_root)
+    per_seed, traces, instances = scan(results_root, conditions, seeds)
+    if per_seed.empty:
+        return {name: empty for name in TABLES}
+
+    convergence = ConvergenceTensor(traces, "condition", groups=conditions, seeds=seeds)
+    reach = convergence.table(thresholds).rename(columns={"group": "condition"})
+    per_seed = per_seed.merge(
+        reach.drop(columns=["evaluations", "best"]), on=["condition", "seed"], how="left")
+
+    comparison = condition_comparison(per_seed, conditions)
+    for thr in thresholds:
+        col = f"evals_to_{thr:g}"
+        grouped = per_seed.groupby("condition")[col]
+        comparison[f"{col}_median"] = comparison["condition"].map(grouped.median())
+        comparison[f"reached_{thr:g}"] = comparison["condition"].map(grouped.count())
+    return {"best_per_seed": per_seed, "condition_comparison": comparison,
+            "convergence": convergence_table(convergence),
+            "instance_aocc": instance_table(instances, conditions)}
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phase 4 analysis tables")
+    parser.add_argument("--results", default=str(RESULTS_PHASE4),
+                        help="Phase 4 results directory")
+    parser.add_argument("--out", default=str(OUTPUT_DIR), help="Output directory for the CSVs")
+    parser.add_argument("--thresholds", type=float, nargs="*", default=list(THRESHOLDS),
+                        help="Best-so-far AOCC levels for time-to-threshold")
+    args = parser.parse_args(argv)
+
+    tables = analyse(args.results, thresholds=args.thresholds)
+    if tables["best_per_seed"].empty:
+        print(f"{args.results}: no Phase 4 candidates")
+        return 1
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    for name, table in tables.items():
+        path = out / f"phase4_{name}.csv"
+        table.to_csv(path, index=False)
+        print(f"  Saved {path}")
+    print()
+    print(tables["condition_comparison"].to_string(index=False, float_format="%.4f"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
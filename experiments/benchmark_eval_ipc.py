@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""Benchmark: per-candidate IPC bytes and pickle time of pooled evaluation.
+
+Compares the two ways a problem can reach an evaluation worker:
+
+- ``object``: the whole ``MaBBOBProblem`` cloudpickled (pandas instance
+  tables, prompts, feedback closure), as the pool shipped it originally
+- ``descriptor``: ``MaBBOBProblem.descriptor()``, rebuilt in the worker
+
+For each it reports the problem payload (bytes, pickle seconds) and, from
+real pooled evaluations of the known-good RandomSearch, the per-candidate
+bytes on the pipe (solution out, result back) and parent-side pickling
+time.  The problem payload is sent once per worker, so its amortised
+per-candidate share is ``problem_bytes / max_evals`` with the default
+recycling interval.
+
+Usage:
+    python -m experiments.benchmark_eval_ipc
+    python -m experiments.benchmark_eval_ipc --evals 10 --output ipc.json
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_THESIS_ROOT = Path(__file__).resolve().parents[1]
+for p in [str(_THESIS_ROOT), str(_THESIS_ROOT / "LLaMEA"), str(_THESIS_ROOT / "BLADE")]:
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+import cloudpickle
+
+from iohblade.solution import Solution
+from experiments.benchmark_eval_overhead import _RANDOM_SEARCH_CODE
+from experiments.eval_workers import DEFAULT_MAX_EVALS, WorkerPool
+from experiments.feedback import make_multi_feature_directional_feedback, FEATURE_DIRECTIONS
+from experiments.mabbob_problem import MaBBOBProblem
+
+
+def make_problem():
+    return MaBBOBProblem(
+        make_feedback=make_multi_feature_directional_feedback(list(FEATURE_DIRECTIONS)),
+        training_instances=[0], eval_seeds=1, dims=[2], budget_factor=100,
+    )
+
+
+def _object_blob(problem):
+    """The payload the pool shipped before descriptors: the problem itself."""
+    problem = copy.copy(problem)
+    problem.logger = None
+    return cloudpickle.dumps(problem)
+
+
+def _timed(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        blob = fn()
+        times.append(time.perf_counter() - t0)
+    return blob, statistics.median(times)
+
+
+def benchmark_payload(mode, problem, n_evals=5):
+    print(f"\n  [{mode}]")
+    get_blob = problem._worker_blob if mode == "descriptor" else (lambda: _object_blob(problem))
+    blob, blob_s = _timed(get_blob)
+
+    pool = WorkerPool(standby=0, max_evals=10**6)
+    infos = []
+    try:
+        for _ in range(n_evals):
+            sol = Solution(code=_RANDOM_SEARCH_CODE, name="RandomSearch")
+            _, error, info = pool.evaluate(f"{mode}-{problem._worker_key}", get_blob,
+                                           sol, problem.eval_timeout)
+            if error:
+                raise RuntimeError(f"benchmark evaluation failed: {error}")
+            infos.append(info)
+    finally:
+        pool.shutdown()
+
+    ipc = pool.stats["ipc"]
+    steady = infos[1:] or infos
+    record = {
+        "payload": mode,
+        "problem_bytes": len(blob),
+        "problem_pickle_s": round(blob_s, 6),
+        "solution_bytes": ipc["solution_bytes"] // n_evals,
+        "result_bytes": ipc["result_bytes"] // n_evals,
+        "first_candidate_bytes": infos[0]["ipc_bytes"],
+        "first_candidate_pickle_s": round(infos[0]["pickle_s"], 6),
+        "candidate_bytes": int(statistics.median(i["ipc_bytes"] for i in steady)),
+        "candidate_pickle_s": round(statistics.median(i["pickle_s"] for i in steady), 6),
+        "amortised_candidate_bytes": round(
+            ipc["solution_bytes"] / n_evals + ipc["result_bytes"] / n_evals
+            + len(blob) / DEFAULT_MAX_EVALS),
+    }
+    print(f"    problem {record['problem_bytes']:,} B in {record['problem_pickle_s']*1e3:.2f} ms   "
+          f"first candidate {record['first_candidate_bytes']:,} B   "
+          f"steady {record['candidate_bytes']:,} B")
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluation IPC payload benchmark")
+    parser.add_argument("--evals", type=int, default=5, help="Evaluations per payload mode")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    print("Benchmark: evaluation IPC (RandomSearch, 1 instance, dim 2)")
+    problem = make_problem()
+    results = [benchmark_payload(m, problem, args.evals) for m in ("object", "descriptor")]
+
+    print(f"\n{'='*72}")
+    print(f"  {'payload':<11} {'problem B':>10} {'pickle ms':>10} {'1st cand B':>11} "
+          f"{'cand B':>8} {'amortised B':>12}")
+    for r in results:
+        print(f"  {r['payload']:<11} {r['problem_bytes']:>10,} {r['problem_pickle_s']*1e3:>10.2f} "
+              f"{r['first_candidate_bytes']:>11,} {r['candidate_bytes']:>8,} "
+              f"{r['amortised_candidate_bytes']:>12,}")
+    if args.output:
+        Path(args.output).write_text(json.dumps({"results": results}, indent=2))
+        print(f"\n  Results saved to: {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+"""Benchmark: end-to-end candidates/hour across a matrix of settings.
+
+``benchmark_eval_overhead.py`` times a fixed RandomSearch evaluation in
+isolation.  This harness times the *full loop* instead: LLM query, code
+extraction, evaluation, logging and checkpointing, by running real Phase 1
+seeds against a reproducible LLM:
+
+- the stand-in server (``experiments.standin_llm``, default), started
+  in-process with a fixed seed and latency distribution, or
+- a recorded response store (``--replay DIR``, ``experiments.llm_cache``)
+  for a registry model.
+
+Each setting of the matrix runs ``--parallel-seeds`` seeds as concurrent
+Phase 1 processes into a scratch results directory.  From the logs it
+reports:
+
+- candidates/hour (all seeds together, wall clock)
+- p50/p95 generation latency (prompt → response, from conversationlog)
+- p50/p95 evaluation latency (response → next prompt, i.e. everything
+  between two LLM calls) and in-worker evaluation time (log metadata)
+- CPU utilisation of the phase processes (child rusage / wall / cores)
+
+Results are written as JSON (with the git commit) for comparison across
+commits.  Matrix axes are the knobs the runners actually expose: worker
+pool on/off and parallel seeds.  All phases use a (1+1)-ES, so there is
+one evaluation in flight per run and in-run evaluation concurrency is
+covered by the parallel-seeds axis.
+
+Usage:
+    python -m experiments.benchmark_throughput --budget 20 \\
+        --worker-pool on off --parallel-seeds 1 4 --latency lognormal:1.5,0.4
+    python -m experiments.benchmark_throughput --replay llm_cache \\
+        --model qwen3.5-4b --budget 50
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+_THESIS_ROOT = Path(__file__).resolve().parents[1]
+
+STANDIN_MODEL = "standin"
+
+
+# ---------------------------------------------------------------------------
+# Matrix
+# ---------------------------------------------------------------------------
+
+def build_settings(worker_pool=(True,), parallel_seeds=(1,)):
+    """Cartesian product of the benchmark axes, as a list of dicts."""
+    return [
+        {"worker_pool": pool, "parallel_seeds": n}
+        for pool, n in itertools.product(worker_pool, parallel_seeds)
+    ]
+
+
+def setting_label(setting):
+    pool = "pool" if setting["worker_pool"] else "subprocess"
+    return f"{pool}-x{setting['parallel_seeds']}"
+
+
+def phase1_command(setting, seed, results_dir, args, port=None):
+    """Command line for one benchmark seed."""
+    cmd = [
+        sys.executable, str(_THESIS_ROOT / "run_phase1.py"), args.model,
+        "--seeds", str(seed),
+        "--budget", str(args.budget),
+        "--training-instances", str(args.training_instances),
+        "--eval-seeds", str(args.eval_seeds),
+        "--results-dir", str(results_dir),
+    ]
+    if port is not None:
+        cmd += ["--custom-ollama", STANDIN_MODEL, "--port", str(port)]
+    if not setting["worker_pool"]:
+        cmd.append("--no-worker-pool")
+    return cmd
+
+
+# ---------------------------------------------------------------------------
+# Metrics from the result logs
+# ---------------------------------------------------------------------------
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def percentiles(values):
+    """p50/p95/mean/n summary of a list of seconds (None entries if empty)."""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"p50": None, "p95": None, "mean": None, "n": 0}
+    arr = np.asarray(values, dtype=float)
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "mean": round(float(arr.mean()), 3),
+        "n": int(arr.size),
+    }
+
+
+def conversation_latencies(path):
+    """Generation and between-call latencies from one conversationlog.jsonl.
+
+    Returns:
+        tuple: (generation, evaluation) lists of seconds.  Generation is a
+        prompt → response gap; evaluation is a response → next prompt gap.
+    """
+    generation, evaluation = [], []
+    last_prompt = last_reply = None
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            t = _parse_time(entry.get("time"))
+            if t is None:
+                continue
+            if entry.get("role") == "client":
+                if last_reply is not None:
+                    evaluation.append(t - last_reply)
+                last_prompt, last_reply = t, None
+            elif last_prompt is not None:
+                generation.append(t - last_prompt)
+                last_prompt, last_reply = None, t
+    return generation, evaluation
+
+
+def collect_metrics(results_dir):
+    """Aggregate candidate counts and latencies over every run directory."""
+    candidates = 0
+    generation, evaluation, compute = [], [], []
+    for run_dir in sorted(Path(results_dir).glob("*/seed-*/run-*")):
+        log = run_dir / "log.jsonl"
+        if log.is_file():
+            with open(log) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    candidates += 1
+                    t = (entry.get("metadata") or {}).get("evaluation_time_s")
+                    if t is not None:
+                        compute.append(t)
+        conv = run_dir / "conversationlog.jsonl"
+        if conv.is_file():
+            g, e = conversation_latencies(conv)
+            generation += g
+            evaluation += e
+    return {
+        "candidates": candidates,
+        "generation_latency_s": percentiles(generation),
+        "evaluation_latency_s": percentiles(evaluation),
+        "evaluation_compute_s": percentiles(compute),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Running one setting
+# ---------------------------------------------------------------------------
+
+def _children_cpu():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_setting(setting, args, scratch, port=None, env=None, command=phase1_command):
+    """Run one setting and return its result record."""
+    results_dir = Path(scratch) / setting_label(setting)
+    shutil.rmtree(results_dir, ignore_errors=True)
+    log_dir = results_dir / "_logs"
+    log_dir.mkdir(parents=True)
+    seeds = list(range(setting["parallel_seeds"]))
+
+    print(f"\n  [{setting_label(setting)}] {len(seeds)} seed(s) x {args.budget} candidates")
+    cpu0 = _children_cpu()
+    t0 = time.perf_counter()
+    procs = []
+    for seed in seeds:
+        out = open(log_dir / f"seed-{seed}.log", "w")
+        procs.append((subprocess.Popen(
+            command(setting, seed, results_dir, args, port=port),
+            cwd=str(_THESIS_ROOT), env=env, stdout=out, stderr=subprocess.STDOUT,
+        ), out))
+    failed = 0
+    for proc, out in procs:
+        if proc.wait() != 0:
+            failed += 1
+        out.close()
+    wall = time.perf_counter() - t0
+    cpu = _children_cpu() - cpu0
+
+    record = {"setting": dict(setting), "label": setting_label(setting),
+              "wall_s": round(wall, 2), "failed_runs": failed}
+    record.update(collect_metrics(results_dir))
+    record["candidates_per_hour"] = (
+        round(record["candidates"] / wall * 3600, 1) if wall > 0 else None
+    )
+    record["cpu_utilisation"] = round(cpu / (wall * (os.cpu_count() or 1)), 3) if wall > 0 else None
+    print(f"    {record['candidates']} candidates in {wall:.1f}s "
+          f"→ {record['candidates_per_hour']}/h, cpu {record['cpu_utilisation']}")
+    return record
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=str(_THESIS_ROOT),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args, command=phase1_command):
+    """Run the whole matrix and return the JSON-serialisable report."""
+    settings = build_settings(args.worker_pool, args.parallel_seeds)
+    env = dict(os.environ)
+    server = None
+    if args.replay:
+        env.update(LLM_CACHE="replay", LLM_CACHE_DIR=str(args.replay))
+        llm = {"kind": "replay", "store": str(args.replay), "model": args.model}
+    else:
+        from .standin_llm import Corpus, StandinServer
+        server = StandinServer(
+            corpus=Corpus.load(args.corpus), latency=args.latency, seed=args.llm_seed,
+        ).start()
+        llm = {"kind": "standin", "latency": args.latency, "corpus": len(server.corpus),
+               "seed": args.llm_seed}
+    port = server.server_address[1] if server else None
+
+    scratch = Path(args.scratch or tempfile.mkdtemp(prefix="bench_throughput_"))
+    results = []
+    try:
+        for setting in settings:
+            results.append(run_setting(setting, args, scratch, port=port, env=env,
+                                       command=command))
+    finally:
+        if server is not None:
+            llm["server_stats"] = dict(server.stats)
+            server.stop()
+        if not args.keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "benchmark": "throughput",
+        "commit": _git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "model": args.model, "budget": args.budget,
+            "training_instances": args.training_instances,
+            "eval_seeds": args.eval_seeds,
+        },
+        "llm": llm,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="End-to-end candidates/hour benchmark (Phase 1 loop, reproducible LLM)"
+    )
+    parser.add_argument("--model", default="bench",
+                        help="Model tag (a registry tag with --replay)")
+    parser.add_argument("--budget", type=int, default=20, help="Candidates per seed")
+    parser.add_argument("--training-instances", type=int, default=2)
+    parser.add_argument("--eval-seeds", type=int, default=1)
+    parser.add_argument("--worker-pool", nargs="+", choices=["on", "off"], default=["on"])
+    parser.add_argument("--parallel-seeds", nargs="+", type=int, default=[1])
+    parser.add_argument("--replay", default=None,
+                        help="Replay responses from this llm_cache store instead of "
+                             "the stand-in server")
+    parser.add_argument("--corpus", nargs="*", default=[],
+                        help="Stand-in corpus sources (result dirs / llm_cache dirs)")
+    parser.add_argument("--latency", default="const:2",
+                        help="Stand-in latency spec (see experiments.standin_llm)")
+    parser.add_argument("--llm-seed", type=int, default=0)
+    parser.add_argument("--scratch", default=None, help="Scratch results directory")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch results")
+    parser.add_argument("--output", default=None,
+                        help="JSON output path (default: experiments/throughput_<commit>.json)")
+    args = parser.parse_args(argv)
+    args.worker_pool = [v == "on" for v in args.worker_pool]
+
+    report = run_benchmark(args)
+    out = Path(args.output or _THESIS_ROOT / "experiments" /
+               f"throughput_{(report['commit'] or 'unknown')[:8]}.json")
+    out.write_text(json.dumps(report, indent=2))
+
+    print(f"\n{'='*60}")
+    print(f"  {'setting':<18} {'cand/h':>9} {'gen p50/p95':>14} {'eval p50/p95':>14} {'cpu':>6}")
+    for r in report["results"]:
+        g, e = r["generation_latency_s"], r["evaluation_latency_s"]
+        print(f"  {r['label']:<18} {r['candidates_per_hour'] or 0:>9.1f} "
+              f"{g['p50'] or 0:>6.1f}/{g['p95'] or 0:<7.1f} "
+              f"{e['p50'] or 0:>6.1f}/{e['p95'] or 0:<7.1f} {r['cpu_utilisation'] or 0:>6.2f}")
+    print(f"\n  Results saved to: {out}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
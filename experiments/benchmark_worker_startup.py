@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Benchmark: evaluation-worker startup and first-evaluation latency.
+
+Compares the ``spawn`` and ``forkserver`` start methods of
+``experiments.eval_workers``:
+
+- ``ready_s``: worker creation until it has imported its preload modules
+  (median over ``--workers`` workers)
+- ``first_eval_cold_s``: first evaluation of the process (for forkserver
+  this includes starting the forkserver itself, once per process)
+- ``first_eval_s``: first evaluation on a further fresh pool without
+  standbys (worker start + problem transfer + evaluation)
+- ``steady_eval_s``: median of the following evaluations
+- ``startup_overhead_s``: first minus steady
+
+Uses the known-good RandomSearch on a small MA-BBOB setting so the numbers
+are dominated by infrastructure, not by the algorithm.
+
+Usage:
+    python -m experiments.benchmark_worker_startup
+    python -m experiments.benchmark_worker_startup --workers 8 --output startup.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_THESIS_ROOT = Path(__file__).resolve().parents[1]
+for p in [str(_THESIS_ROOT), str(_THESIS_ROOT / "LLaMEA"), str(_THESIS_ROOT / "BLADE")]:
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+from iohblade.solution import Solution
+from experiments.benchmark_eval_overhead import _RANDOM_SEARCH_CODE
+from experiments.eval_workers import PRELOAD, WorkerPool, _Worker
+from experiments.feedback import vanilla_feedback
+from experiments.mabbob_problem import MaBBOBProblem
+
+
+def make_problem():
+    return MaBBOBProblem(
+        make_feedback=vanilla_feedback, training_instances=[0], eval_seeds=1,
+        dims=[2], budget_factor=100,
+    )
+
+
+def _evaluate(pool, problem):
+    sol = Solution(code=_RANDOM_SEARCH_CODE, name="RandomSearch")
+    t0 = time.perf_counter()
+    result, error, _ = pool.evaluate(problem._worker_key, problem._worker_blob,
+                                     sol, problem.eval_timeout)
+    if error:
+        raise RuntimeError(f"benchmark evaluation failed: {error}")
+    return time.perf_counter() - t0
+
+
+def _fresh_pool_first_eval(method, problem, n_evals=0):
+    pool = WorkerPool(standby=0, start_method=method, max_evals=10**6)
+    try:
+        first = _evaluate(pool, problem)
+        steady = [_evaluate(pool, problem) for _ in range(n_evals)]
+    finally:
+        pool.shutdown()
+    return first, steady, pool
+
+
+def benchmark_method(method, n_workers=5, n_evals=5):
+    print(f"\n  [{method}]")
+    problem = make_problem()
+    cold, _, _ = _fresh_pool_first_eval(method, problem)
+    first, steady, pool = _fresh_pool_first_eval(method, problem, n_evals)
+
+    ready = []
+    for _ in range(n_workers):
+        t0 = time.perf_counter()
+        worker = _Worker(pool._ctx, PRELOAD, pool.limits)
+        worker.wait_ready()
+        ready.append(time.perf_counter() - t0)
+        worker.stop()
+        worker.process.join(5)
+
+    record = {
+        "start_method": method,
+        "first_eval_cold_s": round(cold, 3),
+        "first_eval_s": round(first, 3),
+        "steady_eval_s": round(statistics.median(steady), 3),
+        "startup_overhead_s": round(first - statistics.median(steady), 3),
+        "ready_s": round(statistics.median(ready), 3),
+    }
+    print(f"    ready {record['ready_s']:.3f}s   first eval {record['first_eval_s']:.3f}s   "
+          f"steady {record['steady_eval_s']:.3f}s")
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluation-worker startup benchmark")
+    parser.add_argument("--workers", type=int, default=5,
+                        help="Workers started per method for the ready-time median")
+    parser.add_argument("--evals", type=int, default=5,
+                        help="Steady-state evaluations per method")
+    parser.add_argument("--methods", nargs="+", default=None,
+                        help="Start methods (default: spawn and forkserver if available)")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    methods = args.methods or [
+        m for m in ("spawn", "forkserver") if m in multiprocessing.get_all_start_methods()
+    ]
+    print("Benchmark: evaluation-worker startup (RandomSearch, 1 instance, dim 2)")
+    results = [benchmark_method(m, args.workers, args.evals) for m in methods]
+
+    print(f"\n{'='*60}")
+    print(f"  {'method':<12} {'ready':>8} {'first eval':>11} {'steady':>8} {'overhead':>9}")
+    for r in results:
+        print(f"  {r['start_method']:<12} {r['ready_s']:>8.3f} {r['first_eval_s']:>11.3f} "
+              f"{r['steady_eval_s']:>8.3f} {r['startup_overhead_s']:>9.3f}")
+    if args.output:
+        Path(args.output).write_text(json.dumps({"results": results}, indent=2))
+        print(f"\n  Results saved to: {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
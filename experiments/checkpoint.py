@@ -0,0 +1,321 @@
+"""Delta checkpointing for long-running LLaMEA instances.
+
+LLaMEA's own ``pickle_archive()`` re-pickles the whole instance, including
+every candidate in ``run_history``, after every generation.  Over a 500
+candidate run that is quadratic in total and produces a very large file.
+
+``DeltaCheckpoint`` splits the state into three files inside the run
+directory:
+
+- ``llamea_history.pkl``: append-only stream of pickled lists of new
+  ``run_history`` entries.  Each candidate is written exactly once.
+- ``llamea_journal.pkl``: append-only stream of small per-generation
+  records (population and best-so-far as id references, plus the remaining
+  scalar/config attributes of the instance).
+- ``llamea_config.pkl``: periodic compacted snapshot of the same light
+  state.  Writing a snapshot truncates the journal.  The file name is kept
+  so existing "is there a checkpoint?" checks keep working, and a legacy
+  full pickle at this path is still accepted by ``load_checkpoint``.
+
+Each record also carries the byte sizes of the run's ``log.jsonl`` and
+``conversationlog.jsonl``, the ``random``/``numpy`` RNG states and, when the
+LLM exposes ``get_state()``, its state, so ``experiments.resume`` can
+continue a run in place without duplicated log lines.
+
+Per-generation cost is therefore proportional to the number of new
+candidates and the population size, not to the length of the run.
+
+A process killed mid-write can leave a torn record at the end of either
+stream; loading stops at the last complete record and ``DeltaCheckpoint``
+truncates the torn tail before appending again.
+"""
+
+import os
+import pickle
+import random
+
+import numpy as np
+
+from .progress import RunProgress
+
+SNAPSHOT_FILE = "llamea_config.pkl"
+HISTORY_FILE = "llamea_history.pkl"
+JOURNAL_FILE = "llamea_journal.pkl"
+
+CHECKPOINT_FORMAT = 1
+
+# Run-directory logs whose sizes are recorded with every checkpoint.
+TRACKED_FILES = ("log.jsonl", "conversationlog.jsonl")
+
+# Attributes that are never stored: run_history goes to the history stream,
+# the rest are live objects re-attached by the caller on resume.
+_EXCLUDED = ("run_history", "llm", "f", "logger", "pickle_archive")
+
+# Attributes stored as id references into run_history where possible.
+_REFERENCED = ("population", "best_so_far")
+
+
+# ---------------------------------------------------------------------------
+# Stream helpers
+# ---------------------------------------------------------------------------
+
+def _read_stream(path):
+    """Read consecutive pickle records from ``path``.
+
+    Returns:
+        tuple: (records, ends) where ``ends[i]`` is the byte offset just past
+        record ``i``.  A torn tail is not included.
+    """
+    records = []
+    ends = []
+    if not os.path.isfile(path):
+        return records, ends
+    with open(path, "rb") as fh:
+        while True:
+            try:
+                records.append(pickle.load(fh))
+            except EOFError:
+                break
+            except (pickle.UnpicklingError, AttributeError, ValueError, IndexError):
+                break  # torn tail from an interrupted append
+            ends.append(fh.tell())
+    return records, ends
+
+
+def _append(path, obj):
+    """Append one pickle record to ``path`` and flush it to disk."""
+    with open(path, "ab") as fh:
+        pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _truncate(path, size):
+    if os.path.isfile(path) and os.path.getsize(path) != size:
+        with open(path, "r+b") as fh:
+            fh.truncate(size)
+
+
+def _atomic_dump(path, obj):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# State encoding
+# ---------------------------------------------------------------------------
+
+def _encode(value, known_ids):
+    """Replace solutions already in the history stream by their id."""
+    if isinstance(value, list):
+        return [_encode(v, known_ids) for v in value]
+    sid = getattr(value, "id", None)
+    if sid is not None and sid in known_ids:
+        return ("ref", sid)
+    return ("obj", value)
+
+
+def _decode(value, by_id):
+    if isinstance(value, list):
+        return [_decode(v, by_id) for v in value]
+    kind, payload = value
+    if kind == "ref":
+        return by_id[payload]
+    return payload
+
+
+def _light_state(instance, known_ids):
+    state = {}
+    for key, value in instance.__dict__.items():
+        if key in _EXCLUDED:
+            continue
+        if key in _REFERENCED:
+            value = _encode(value, known_ids)
+        state[key] = value
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint writer
+# ---------------------------------------------------------------------------
+
+class DeltaCheckpoint:
+    """Append-only checkpoint writer for one LLaMEA run directory.
+
+    Call ``save(instance)`` once per generation (it is installed as the
+    instance's ``pickle_archive``).  Every ``snapshot_every`` saves a
+    compacted snapshot is written and the journal is reset.
+
+    Args:
+        dirname: Run directory to write the checkpoint files to.
+        snapshot_every: Number of generations between compacted snapshots.
+        n_history: When continuing a restored run in place, the number of
+            candidates the restored instance holds.  Stream records beyond
+            that point belong to the interrupted generation and are dropped.
+    """
+
+    def __init__(self, dirname, snapshot_every=25, n_history=None):
+        self.dirname = str(dirname)
+        self.snapshot_every = max(1, int(snapshot_every))
+        self.history_path = os.path.join(self.dirname, HISTORY_FILE)
+        self.journal_path = os.path.join(self.dirname, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(self.dirname, SNAPSHOT_FILE)
+        self._saves_since_snapshot = 0
+        self._known_ids = set()
+
+        # Continue an existing stream in place: drop torn tails and count
+        # the candidates that are already on disk.
+        chunks, ends = _read_stream(self.history_path)
+        self._n_saved = 0
+        keep_end = 0
+        for chunk, end in zip(chunks, ends):
+            if n_history is not None and self._n_saved + len(chunk) > n_history:
+                break
+            self._n_saved += len(chunk)
+            self._known_ids.update(getattr(s, "id", None) for s in chunk)
+            keep_end = end
+        _truncate(self.history_path, keep_end)
+
+        journal, ends = _read_stream(self.journal_path)
+        keep_end = 0
+        for record, end in zip(journal, ends):
+            if record["n_history"] > self._n_saved:
+                break
+            keep_end = end
+        _truncate(self.journal_path, keep_end)
+
+    def save(self, instance):
+        """Append the candidates added since the last save and a state record."""
+        history = instance.run_history
+        if len(history) < self._n_saved:
+            # The instance was restored from an older point than the stream;
+            # rewrite the stream from scratch rather than mixing timelines.
+            for path in (self.history_path, self.journal_path):
+                if os.path.isfile(path):
+                    os.remove(path)
+            self._n_saved = 0
+            self._known_ids = set()
+
+        new = list(history[self._n_saved:])
+        if new:
+            _append(self.history_path, new)
+            self._n_saved += len(new)
+            self._known_ids.update(getattr(s, "id", None) for s in new)
+
+        llm = getattr(instance, "llm", None)
+        record = {
+            "format": CHECKPOINT_FORMAT,
+            "cls": type(instance),
+            "n_history": self._n_saved,
+            "state": _light_state(instance, self._known_ids),
+            "offsets": self._offsets(),
+            "rng": (random.getstate(), np.random.get_state()),
+            "llm_state": llm.get_state() if hasattr(llm, "get_state") else None,
+        }
+        self._saves_since_snapshot += 1
+        if self._saves_since_snapshot >= self.snapshot_every:
+            self._snapshot(record)
+        else:
+            _append(self.journal_path, record)
+        RunProgress.for_dir(self.dirname).record_checkpoint(
+            getattr(instance, "generation", 0), self._n_saved,
+        )
+
+    def _offsets(self):
+        offsets = {}
+        for name in TRACKED_FILES:
+            path = os.path.join(self.dirname, name)
+            offsets[name] = os.path.getsize(path) if os.path.isfile(path) else 0
+        return offsets
+
+    def _snapshot(self, record):
+        _atomic_dump(self.snapshot_path, record)
+        # The snapshot supersedes every journal record written so far.
+        _truncate(self.journal_path, 0)
+        self._saves_since_snapshot = 0
+
+    def __call__(self, instance):
+        self.save(instance)
+
+
+# ---------------------------------------------------------------------------
+# Restore
+# ---------------------------------------------------------------------------
+
+def _progress(record):
+    return record["n_history"], record["state"].get("generation", 0)
+
+
+def has_checkpoint(dirname):
+    """True if ``dirname`` contains a (delta or legacy) LLaMEA checkpoint."""
+    return any(
+        os.path.isfile(os.path.join(dirname, name))
+        for name in (SNAPSHOT_FILE, JOURNAL_FILE)
+    )
+
+
+def load_checkpoint(dirname):
+    """Rebuild a LLaMEA instance from snapshot + journal in ``dirname``.
+
+    The returned instance has no ``llm``, ``f`` or ``logger``; the caller
+    re-attaches those live objects.
+
+    Returns:
+        The restored instance, or ``None`` if no usable checkpoint exists.
+    """
+    return read_checkpoint(dirname)[0]
+
+
+def read_checkpoint(dirname):
+    """Like ``load_checkpoint`` but also return the record metadata.
+
+    Returns:
+        tuple: (instance, meta).  ``meta`` holds ``offsets``, ``rng`` and
+        ``llm_state`` of the chosen record (empty for legacy pickles), or
+        ``(None, {})`` if no usable checkpoint exists.
+    """
+    snapshot_path = os.path.join(dirname, SNAPSHOT_FILE)
+    snapshot = None
+    if os.path.isfile(snapshot_path):
+        with open(snapshot_path, "rb") as fh:
+            snapshot = pickle.load(fh)
+    chunks, _ = _read_stream(os.path.join(dirname, HISTORY_FILE))
+    history = [s for chunk in chunks for s in chunk]
+    journal, _ = _read_stream(os.path.join(dirname, JOURNAL_FILE))
+
+    if snapshot is not None and not (isinstance(snapshot, dict) and "format" in snapshot):
+        # Legacy full pickle from LLaMEA.pickle_archive().  It is only
+        # authoritative until the delta journal has taken over.
+        if not journal:
+            return snapshot, {}
+        snapshot = None
+
+    # Latest record whose candidates are all present in the history stream.
+    candidates = ([snapshot] if snapshot else []) + journal
+    record = None
+    for rec in candidates:
+        if rec["n_history"] <= len(history):
+            if record is None or _progress(rec) >= _progress(record):
+                record = rec
+    if record is None:
+        return None, {}
+
+    history = history[:record["n_history"]]
+    by_id = {getattr(s, "id", None): s for s in history}
+    state = dict(record["state"])
+    for key in _REFERENCED:
+        if key in state:
+            state[key] = _decode(state[key], by_id)
+    state["run_history"] = history
+
+    cls = record["cls"]
+    instance = cls.__new__(cls)
+    instance.__dict__.update(state)
+    for attr in ("llm", "f", "logger"):
+        setattr(instance, attr, None)
+    meta = {key: record.get(key) for key in ("offsets", "rng", "llm_state")}
+    return instance, meta
@@ -0,0 +1,558 @@
+"""Persistent evaluation workers with memory-aware recycling and hot standby.
+
+``MaBBOBProblem`` with ``use_worker_pool=True`` evaluates candidates in
+long-lived worker processes instead of one fresh subprocess per candidate.
+A worker receives the problem once, then one solution per evaluation, and
+sends back the evaluated solution together with its captured output and its
+resident memory.  The problem arrives either as a pickled object or as a
+descriptor dict naming a ``factory`` class whose ``from_descriptor`` rebuilds
+it inside the worker (``MaBBOBProblem.descriptor``), which keeps pandas
+tables and prompts off the pipe.
+
+Messages are pickled explicitly so the pool can account for them:
+``stats["ipc"]`` holds the bytes sent/received and the parent-side
+pickling time, and each evaluation's ``info`` its own ``ipc_bytes`` and
+``pickle_s``.
+
+Workers are recycled (stopped and replaced) when any of these holds:
+
+- it has run ``max_evals`` evaluations (the old fixed
+  ``worker_recycle_interval``),
+- its RSS after an evaluation exceeds ``max_rss_mb``,
+- its RSS has grown by more than ``leak_mb`` since its first evaluation
+  (memory that candidate code leaked into the interpreter).
+
+Replacing a worker never makes an evaluation wait for interpreter startup:
+the pool keeps ``standby`` workers spawned ahead of time, which import the
+heavy modules (``ioh``, ``iohblade``, pandas, ...) in the background and
+then idle.  A recycled worker is swapped for a ready standby and a new
+standby is spawned behind it.
+
+Where available, workers are started from a forkserver that has imported
+``experiments.worker_preload`` (heavy modules, the ``llamea.utils`` shim,
+the MA-BBOB instance tables), so a new worker is a fork of an already warm
+interpreter.  ``WORKER_START_METHOD=spawn`` restores fresh interpreters.
+The forkserver is shared by all pools of the process and keeps the
+preload and BLAS thread environment of the first pool that starts it.
+
+A worker that exceeds the evaluation timeout is killed; one that dies
+(crash, OOM kill) is replaced.  Both are reported as the candidate's
+error/feedback rather than raised.  While evaluating, the problem can
+stream sub-results (one per instance/seed run) with ``report_partial``;
+the parent collects them and returns them in ``info["partial"]``, so a
+timed-out evaluation still hands back the runs that completed.
+
+Every worker runs under a governance profile (``experiments.governance``):
+BLAS/OpenMP threads, address-space and RSS caps, CPU affinity.  Limit
+violations are turned into feedback for the LLM.
+
+Pools are shared per process and per configuration (``get_pool``), since
+BLADE deep-copies the problem for every run; the problem itself only holds
+its configuration.
+"""
+
+import atexit
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import redirect_stderr, redirect_stdout
+from importlib import import_module
+
+from . import governance
+
+# Modules imported by every worker (or its forkserver) before it reports ready.
+PRELOAD = ("experiments.worker_preload",)
+
+DEFAULT_START_METHOD = os.environ.get("WORKER_START_METHOD") or (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+DEFAULT_MAX_EVALS = 50
+DEFAULT_MAX_RSS_MB = float(os.environ.get("WORKER_MAX_RSS_MB", 0)) or None
+DEFAULT_LEAK_MB = float(os.environ.get("WORKER_LEAK_MB", 0)) or None
+DEFAULT_STANDBY = int(os.environ.get("WORKER_STANDBY", 1))
+
+# Seconds a worker may take to import PRELOAD before it is considered broken.
+STARTUP_TIMEOUT = 300
+
+# Captured candidate output kept per evaluation.
+OUTPUT_LIMIT = 20_000
+
+# Seconds between RSS samples of an evaluating worker (with rss_limit_mb).
+RSS_POLL_INTERVAL = 0.25
+
+_spawn_env_lock = threading.Lock()
+
+# Set in worker processes: where report_partial sends sub-results.
+_partial_conn = None
+
+
+class WorkerError(RuntimeError):
+    """A worker could not be started."""
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+def _send(conn, msg):
+    """Pickle and send ``msg``; return (bytes, pickle seconds)."""
+    t0 = time.perf_counter()
+    data = pickle.dumps(msg, pickle.HIGHEST_PROTOCOL)
+    pickle_s = time.perf_counter() - t0
+    conn.send_bytes(data)
+    return len(data), pickle_s
+
+
+def _recv(conn):
+    """Receive and unpickle a message; return (msg, bytes, unpickle seconds)."""
+    data = conn.recv_bytes()
+    t0 = time.perf_counter()
+    msg = pickle.loads(data)
+    return msg, len(data), time.perf_counter() - t0
+
+
+def report_partial(record):
+    """Stream one completed sub-result of the running evaluation to the parent.
+
+    A no-op outside pool workers (in-process or subprocess evaluation).
+    """
+    if _partial_conn is not None:
+        _send(_partial_conn, ("partial", record))
+
+
+def build_problem(payload):
+    """Problem object from a worker payload: a descriptor dict or the problem."""
+    if isinstance(payload, dict) and "factory" in payload:
+        module, _, name = payload["factory"].rpartition(".")
+        return getattr(import_module(module), name).from_descriptor(payload)
+    return payload
+
+
+def _worker_main(conn, preload, gov=None, cpus=None):
+    """Worker loop: import ``preload``, then serve problem/eval messages."""
+    global _partial_conn
+    _partial_conn = conn
+    gov = gov or governance.resolve("off")
+    t0 = time.monotonic()
+    os.environ.update(governance.thread_env(gov))
+    for name in preload:
+        try:
+            import_module(name)
+        except ImportError:
+            pass
+    # Limits go on after the imports so they only constrain candidate code.
+    skipped = governance.apply_in_worker(gov, cpus)
+    _send(conn, ("ready", {"pid": os.getpid(), "startup_s": time.monotonic() - t0,
+                           "rss_mb": current_rss_mb(), "skipped_limits": skipped}))
+    address_space = gov.get("address_space_mb")
+
+    import cloudpickle
+
+    problems = {}
+    while True:
+        try:
+            msg, _, _ = _recv(conn)
+        except (EOFError, OSError):
+            return
+        kind = msg[0]
+        if kind == "stop":
+            return
+        if kind == "problem":
+            _, key, blob = msg
+            problems[key] = build_problem(cloudpickle.loads(blob))
+            continue
+
+        _, key, solution = msg
+        out, err = io.StringIO(), io.StringIO()
+        violation = None
+        t0 = time.monotonic()
+        try:
+            with redirect_stdout(out), redirect_stderr(err):
+                result = problems[key].evaluate(solution)
+            if address_space and governance.is_memory_error(result):
+                violation = "address_space"
+                message = governance.violation_feedback("memory", address_space)
+                result.set_scores(float("-inf"), message, message)
+            reply = ("result", result)
+        except MemoryError:
+            violation = "address_space"
+            reply = ("error", governance.violation_feedback("memory", address_space))
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=3)}")
+        info = {
+            "stdout": out.getvalue()[-OUTPUT_LIMIT:],
+            "stderr": err.getvalue()[-OUTPUT_LIMIT:],
+            "eval_s": time.monotonic() - t0,
+            "rss_mb": current_rss_mb(),
+            "violation": violation,
+        }
+        _send(conn, reply + (info,))
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, ctx, preload, gov=None, cpus=None):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, preload, gov, cpus),
+                                   daemon=True)
+        # BLAS reads its thread count when NumPy is first imported, which
+        # can happen before _worker_main runs, so start with it in the env.
+        env = governance.thread_env(gov or {})
+        with _spawn_env_lock:
+            saved = {var: os.environ.get(var) for var in env}
+            os.environ.update(env)
+            try:
+                self.process.start()
+            finally:
+                for var, value in saved.items():
+                    if value is None:
+                        os.environ.pop(var, None)
+                    else:
+                        os.environ[var] = value
+        child.close()
+        self.spawned = time.monotonic()
+        self.info = None
+        self.problems = set()
+        self.evals = 0
+        self.baseline_rss = None
+        self.rss = None
+
+    @property
+    def ready(self):
+        return self.info is not None or self.conn.poll()
+
+    def wait_ready(self, timeout=STARTUP_TIMEOUT):
+        """Block until the worker has imported its modules; return seconds waited."""
+        if self.info is not None:
+            return 0.0
+        t0 = time.monotonic()
+        try:
+            if not self.conn.poll(timeout):
+                raise WorkerError(f"worker did not start within {timeout}s")
+            (kind, self.info), _, _ = _recv(self.conn)
+        except (EOFError, OSError):
+            raise WorkerError(f"worker exited during startup "
+                              f"(exit code {self.process.exitcode})") from None
+        self.rss = self.info["rss_mb"]
+        return time.monotonic() - t0
+
+    def stop(self):
+        try:
+            _send(self.conn, ("stop",))
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(5)
+        self.conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+class WorkerPool:
+    """Evaluation workers with recycling and pre-spawned standbys.
+
+    Args:
+        size: maximum number of workers evaluating at once.
+        standby: number of pre-spawned, pre-imported spare workers.
+        max_evals: recycle a worker after this many evaluations.
+        max_rss_mb: recycle a worker whose RSS exceeds this (None: off).
+        leak_mb: recycle a worker whose RSS grew by more than this since its
+            first evaluation (None: off).
+        preload: modules every worker imports before reporting ready.
+        start_method: multiprocessing start method for the workers
+            (default: forkserver where available).
+        limits: governance profile for every worker (dict or profile
+            name; None reads ``EVAL_GOVERNANCE``).
+    """
+
+    def __init__(self, size=1, standby=DEFAULT_STANDBY, max_evals=DEFAULT_MAX_EVALS,
+                 max_rss_mb=DEFAULT_MAX_RSS_MB, leak_mb=DEFAULT_LEAK_MB,
+                 preload=PRELOAD, start_method=DEFAULT_START_METHOD, limits=None):
+        self.size = size
+        self.standby_target = standby
+        self.max_evals = max_evals
+        self.max_rss_mb = max_rss_mb
+        self.leak_mb = leak_mb
+        self.preload = tuple(preload)
+        self.limits = (dict(limits) if isinstance(limits, dict)
+                       else governance.resolve(limits))
+        self.start_method = start_method
+        self._ctx = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            # Only takes effect if the forkserver is not running yet.
+            self._ctx.set_forkserver_preload(list(self.preload))
+        self._lock = threading.Condition()
+        self._idle = []
+        self._busy = 0
+        self._standby = deque()
+        self._retired = []
+        self._closed = False
+        self.stats = {
+            "evaluations": 0, "spawned": 0, "standby_used": 0, "cold_starts": 0,
+            "startup_wait_s": 0.0, "timeouts": 0, "crashes": 0,
+            "recycled": {"evals": 0, "rss": 0, "leak": 0},
+            "limit_violations": {"rss": 0, "address_space": 0, "killed": 0},
+            "partial_results": 0,
+            "ipc": {"problem_bytes": 0, "solution_bytes": 0, "result_bytes": 0,
+                    "pickle_s": 0.0},
+        }
+
+    # ---------- worker lifecycle ----------
+    def _spawn(self):
+        cpus = governance.worker_cpus(self.limits, self.stats["spawned"])
+        self.stats["spawned"] += 1
+        return _Worker(self._ctx, self.preload, self.limits, cpus)
+
+    def _refill_standby(self):
+        while len(self._standby) < self.standby_target and not self._closed:
+            self._standby.append(self._spawn())
+
+    def _take_worker(self):
+        """A fresh worker: a standby if one exists, else a cold start."""
+        if self._standby:
+            worker = self._standby.popleft()
+            self.stats["standby_used"] += 1
+        else:
+            worker = self._spawn()
+            self.stats["cold_starts"] += 1
+        self._refill_standby()
+        return worker
+
+    def start(self):
+        """Spawn the standby workers now instead of on first use."""
+        with self._lock:
+            self._refill_standby()
+        return self
+
+    def _acquire(self):
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise WorkerError("worker pool is shut down")
+                if self._idle:
+                    worker = self._idle.pop()
+                    break
+                if self._busy < self.size:
+                    worker = self._take_worker()
+                    break
+                self._lock.wait()
+            self._busy += 1
+        return worker
+
+    def _release(self, worker, reason=None):
+        with self._lock:
+            self._busy -= 1
+            if reason is None and not self._closed:
+                self._idle.append(worker)
+            else:
+                if reason in self.stats["recycled"]:
+                    self.stats["recycled"][reason] += 1
+                worker.stop()
+                self._retired.append(worker)
+            self._reap()
+            self._lock.notify()
+
+    def _reap(self):
+        self._retired = [w for w in self._retired if w.process.is_alive()]
+
+    def recycle_reason(self, worker):
+        """Why ``worker`` should be replaced after its last evaluation, or None."""
+        if self.max_evals and worker.evals >= self.max_evals:
+            return "evals"
+        if self.max_rss_mb and worker.rss is not None and worker.rss > self.max_rss_mb:
+            return "rss"
+        if (self.leak_mb and worker.baseline_rss is not None and worker.rss is not None
+                and worker.rss - worker.baseline_rss > self.leak_mb):
+            return "leak"
+        return None
+
+    # ---------- evaluation ----------
+    def evaluate(self, key, get_blob, solution, timeout):
+        """Evaluate ``solution`` with the problem identified by ``key``.
+
+        Args:
+            key: identifier of the problem; ``get_blob()`` is called to get
+                its cloudpickled bytes the first time a worker needs it.
+            get_blob: callable returning the cloudpickled problem or
+                problem descriptor (see ``build_problem``).
+            solution: the Solution to evaluate.
+            timeout: seconds before the worker is killed.
+
+        Returns:
+            tuple: (solution, error, info).  ``solution`` is the evaluated
+            Solution or None; ``error`` is a message when the evaluation
+            failed in the worker, timed out or the worker died.  ``info``
+            carries the streamed sub-results as ``partial`` and, after a
+            timeout, ``timed_out=True``.
+        """
+        worker = self._acquire()
+        reason = "failed"
+        try:
+            waited = worker.wait_ready()
+            self.stats["startup_wait_s"] += waited
+            ipc = self.stats["ipc"]
+            sent = pickle_s = 0
+            partial = []
+            try:
+                if key not in worker.problems:
+                    t0 = time.perf_counter()
+                    blob = get_blob()
+                    pickle_s += time.perf_counter() - t0
+                    nbytes, dt = _send(worker.conn, ("problem", key, blob))
+                    pickle_s += dt
+                    ipc["problem_bytes"] += nbytes
+                    sent += nbytes
+                    worker.problems.add(key)
+                nbytes, dt = _send(worker.conn, ("eval", key, solution))
+                pickle_s += dt
+                ipc["solution_bytes"] += nbytes
+                sent += nbytes
+            except (OSError, EOFError):
+                # The worker died while idle: the pipe is broken.
+                outcome, reply, received, dt = "died", None, 0, 0.0
+            else:
+                outcome, reply, received, dt = self._wait(worker, timeout, partial)
+            self.stats["partial_results"] += len(partial)
+            ipc["result_bytes"] += received
+            if outcome == "timeout":
+                self.stats["timeouts"] += 1
+                worker.kill()
+                return (None, f"Evaluation timed out after {timeout} seconds.",
+                        {"partial": partial, "timed_out": True})
+            if outcome == "rss":
+                self.stats["limit_violations"]["rss"] += 1
+                worker.kill()
+                limit = self.limits["rss_limit_mb"]
+                return None, governance.violation_feedback("memory", limit), {"partial": partial}
+            if outcome == "died":
+                worker.process.join(5)
+                self.stats["crashes"] += 1
+                code = worker.process.exitcode
+                info = {"exitcode": code, "partial": partial}
+                if code == -9:
+                    self.stats["limit_violations"]["killed"] += 1
+                    return None, governance.violation_feedback("killed"), info
+                return None, f"Evaluation worker died (exit code {code}).", info
+
+            kind, payload, info = reply
+            self.stats["evaluations"] += 1
+            worker.evals += 1
+            worker.rss = info.get("rss_mb")
+            if worker.baseline_rss is None:
+                worker.baseline_rss = worker.rss
+            pickle_s += dt
+            ipc["pickle_s"] += pickle_s
+            info.update(startup_wait_s=waited, ipc_bytes=sent + received,
+                        pickle_s=pickle_s, partial=partial)
+            reason = self.recycle_reason(worker)
+            if info.get("violation"):
+                self.stats["limit_violations"][info["violation"]] += 1
+            if kind == "error":
+                return None, payload, info
+            return payload, None, info
+        except WorkerError as e:
+            return None, f"Evaluation worker failed to start: {e}", {}
+        finally:
+            if reason == "failed":
+                worker.kill()
+            self._release(worker, reason)
+
+    def _wait(self, worker, timeout, partial):
+        """Wait for the final reply, collecting streamed sub-results in ``partial``.
+
+        Returns:
+            tuple: (outcome, reply, bytes received, unpickle seconds);
+            outcome is "reply", "timeout", "rss" (over rss_limit_mb) or
+            "died".
+        """
+        limit = self.limits.get("rss_limit_mb")
+        deadline = time.monotonic() + timeout
+        received = unpickle_s = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "timeout", None, received, unpickle_s
+            if worker.conn.poll(min(RSS_POLL_INTERVAL, remaining) if limit else remaining):
+                try:
+                    msg, nbytes, dt = _recv(worker.conn)
+                except (EOFError, OSError):
+                    return "died", None, received, unpickle_s
+                received += nbytes
+                unpickle_s += dt
+                if msg[0] == "partial":
+                    partial.append(msg[1])
+                    continue
+                return "reply", msg, received, unpickle_s
+            if limit:
+                rss = governance.process_rss_mb(worker.process.pid)
+                if rss is not None and rss > limit:
+                    return "rss", None, received, unpickle_s
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers = self._idle + list(self._standby) + self._retired
+            self._idle, self._standby, self._retired = [], deque(), []
+            self._lock.notify_all()
+        for worker in workers:
+            worker.stop()
+        for worker in workers:
+            worker.process.join(2)
+            if worker.process.is_alive():
+                worker.process.kill()
+
+
+# ---------------------------------------------------------------------------
+# Shared pools
+# ---------------------------------------------------------------------------
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(**config):
+    """Return the process-wide pool for this configuration, creating it."""
+    key = json.dumps(config, sort_keys=True, default=str)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = _pools[key] = WorkerPool(**config).start()
+        return pool
+
+
+def shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_pools)
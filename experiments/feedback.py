@@ -106,6 +106,9 @@ def vanilla_feedback(name, auc_mean, auc_std, _metrics, _metrics_std=None):
     )
 
 
+vanilla_feedback.feedback_spec = {"name": "vanilla", "args": []}
+
+
 def _metric_sentence(feature_name, value, std, description):
     """Build the common metric sentence: 'It achieved a {name} of {val} (std {std}), which measures {desc}.'"""
     fmt_val = _fmt_value(feature_name, value)
@@ -127,6 +130,7 @@ def make_single_feature_feedback(feature_name):
         std = metrics_std.get(feature_name) if metrics_std else None
         return f"{base} {_metric_sentence(feature_name, value, std, description)}"
 
+    feedback_fn.feedback_spec = {"name": "single", "args": [feature_name]}
     return feedback_fn
 
 
@@ -144,6 +148,7 @@ def make_directional_feature_feedback(feature_name):
         sentence = _metric_sentence(feature_name, value, std, description)
         return f"{base} {sentence} {guidance}"
 
+    feedback_fn.feedback_spec = {"name": "directional", "args": [feature_name]}
     return feedback_fn
 
 
@@ -162,6 +167,7 @@ def make_multi_feature_neutral_feedback(feature_names):
             parts.append(_metric_sentence(feat, value, std, descriptions[feat]))
         return " ".join(parts)
 
+    feedback_fn.feedback_spec = {"name": "multi_neutral", "args": [list(feature_names)]}
     return feedback_fn
 
 
@@ -183,6 +189,7 @@ def make_multi_feature_directional_feedback(feature_names):
             parts.append(f"{sentence} {guidance}")
         return " ".join(parts)
 
+    feedback_fn.feedback_spec = {"name": "multi_directional", "args": [list(feature_names)]}
     return feedback_fn
 
 
@@ -234,4 +241,47 @@ def make_comparative_feature_feedback(feature_name):
 
         return f"{base} {sentence} {comparison}"
 
+    feedback_fn.feedback_spec = {"name": "comparative", "args": [feature_name]}
     return feedback_fn
+
+
+# ---------------------------------------------------------------------------
+# Feedback specs
+# ---------------------------------------------------------------------------
+# Every formatter above carries a ``feedback_spec`` ({"name", "args"}) from
+# which it can be rebuilt.  Evaluation workers receive the spec instead of
+# the pickled closure (see MaBBOBProblem.descriptor).
+
+FEEDBACK_FACTORIES = {
+    "vanilla": lambda: vanilla_feedback,
+    "single": make_single_feature_feedback,
+    "directional": make_directional_feature_feedback,
+    "multi_neutral": make_multi_feature_neutral_feedback,
+    "multi_directional": make_multi_feature_directional_feedback,
+    "comparative": make_comparative_feature_feedback,
+}
+
+
+def feedback_spec(feedback_fn):
+    """The spec of a formatter from this module, or None for custom callables."""
+    spec = getattr(feedback_fn, "feedback_spec", None)
+    if spec is None or spec.get("name") not in FEEDBACK_FACTORIES:
+        return None
+    return {"name": spec["name"], "args": list(spec["args"])}
+
+
+def feedback_from_spec(spec):
+    """Rebuild a formatter from its ``feedback_spec``."""
+    try:
+        factory = FEEDBACK_FACTORIES[spec["name"]]
+    except KeyError:
+        raise ValueError(f"Unknown feedback spec {spec!r}") from None
+    return factory(*spec.get("args", []))
+
+
+def feedback_features(spec):
+    """Behavioural features a spec reports (empty for vanilla/custom)."""
+    features = []
+    for arg in (spec or {}).get("args", []):
+        features.extend(arg if isinstance(arg, list) else [arg])
+    return features
@@ -0,0 +1,176 @@
+"""Resource governance for evaluation workers.
+
+LLM-generated algorithms call NumPy linear algebra (``eigh`` and friends in
+CMA-like code).  With default BLAS threading every worker grabs all cores,
+which oversubscribes the node badly under parallel seeds, and a candidate
+that builds a huge matrix can take the whole node down.  A governance
+profile bounds what one evaluation may use:
+
+- ``blas_threads``: BLAS/OpenMP threads per worker (``*_NUM_THREADS`` in
+  the worker's environment, plus ``threadpoolctl`` when available).
+- ``address_space_mb``: ``RLIMIT_AS`` of the worker; allocations beyond it
+  fail with ``MemoryError`` inside the candidate.
+- ``rss_limit_mb``: resident memory cap, enforced by the parent sampling
+  the worker's RSS while it evaluates and killing it when exceeded.
+- ``cpu_affinity``: ``"spread"`` pins worker *i* to core *i* modulo the
+  available cores; a list such as ``"0-3,8"`` pins every worker to that set.
+
+Limit violations become the candidate's feedback (``violation_feedback``),
+so the LLM is told what went wrong instead of the job crashing.
+
+Select a profile with ``EVAL_GOVERNANCE`` (``off``, ``default``, ``strict``)
+and override single limits with ``EVAL_BLAS_THREADS``,
+``EVAL_ADDRESS_SPACE_MB``, ``EVAL_RSS_LIMIT_MB`` and ``EVAL_CPU_AFFINITY``.
+"""
+
+import os
+
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+PROFILES = {
+    "off": {"blas_threads": None, "address_space_mb": None,
+            "rss_limit_mb": None, "cpu_affinity": None},
+    "default": {"blas_threads": 1, "address_space_mb": None,
+                "rss_limit_mb": None, "cpu_affinity": None},
+    "strict": {"blas_threads": 1, "address_space_mb": 16384,
+               "rss_limit_mb": 4096, "cpu_affinity": "spread"},
+}
+
+_ENV_OVERRIDES = {
+    "blas_threads": ("EVAL_BLAS_THREADS", int),
+    "address_space_mb": ("EVAL_ADDRESS_SPACE_MB", float),
+    "rss_limit_mb": ("EVAL_RSS_LIMIT_MB", float),
+    "cpu_affinity": ("EVAL_CPU_AFFINITY", str),
+}
+
+
+def resolve(profile=None, **overrides):
+    """Build a governance dict from a profile name/dict, env vars and overrides.
+
+    Args:
+        profile: profile name, dict, or None for ``EVAL_GOVERNANCE``
+            (default ``"default"``).
+        **overrides: individual limits; None values are ignored.
+
+    Returns:
+        dict with the keys of ``PROFILES["off"]``.
+    """
+    if profile is None:
+        profile = os.environ.get("EVAL_GOVERNANCE", "default")
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown governance profile {profile!r} "
+                             f"(expected one of {list(PROFILES)})")
+        gov = dict(PROFILES[profile])
+    else:
+        gov = dict(PROFILES["off"], **profile)
+    for key, (var, cast) in _ENV_OVERRIDES.items():
+        value = os.environ.get(var)
+        if value:
+            gov[key] = None if value.lower() in ("0", "none", "off") else cast(value)
+    gov.update({k: v for k, v in overrides.items() if v is not None})
+    return gov
+
+
+def thread_env(gov):
+    """Environment variables a worker must start with for ``gov``."""
+    n = gov.get("blas_threads")
+    return {var: str(n) for var in THREAD_ENV_VARS} if n else {}
+
+
+def parse_cpus(spec):
+    """Parse ``"0-3,8"`` into ``[0, 1, 2, 3, 8]``."""
+    cpus = []
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def worker_cpus(gov, index):
+    """CPU set for the ``index``-th worker, or None for no pinning."""
+    spec = gov.get("cpu_affinity")
+    if not spec or not hasattr(os, "sched_getaffinity"):
+        return None
+    if spec == "spread":
+        available = sorted(os.sched_getaffinity(0))
+        return [available[index % len(available)]]
+    return parse_cpus(spec)
+
+
+def apply_in_worker(gov, cpus=None):
+    """Apply ``gov`` to the current (worker) process.
+
+    Returns:
+        list of str: limits that could not be applied on this platform.
+    """
+    skipped = []
+    for var, value in thread_env(gov).items():
+        os.environ[var] = value
+    if gov.get("blas_threads"):
+        try:
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(gov["blas_threads"])
+        except ImportError:
+            pass
+    if cpus:
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (AttributeError, OSError):
+            skipped.append("cpu_affinity")
+    if gov.get("address_space_mb"):
+        try:
+            import resource
+            limit = int(gov["address_space_mb"] * 2**20)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            skipped.append("address_space_mb")
+    return skipped
+
+
+def process_rss_mb(pid):
+    """Current RSS of process ``pid`` in MB, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def violation_feedback(kind, limit=None):
+    """Feedback for the LLM when an evaluation broke a resource limit."""
+    if kind == "memory":
+        cap = f" of {limit:.0f} MB" if limit else ""
+        return (f"The algorithm exceeded the memory limit{cap} and was stopped. "
+                "Avoid allocating large matrices or storing every evaluated "
+                "point; keep memory use independent of the budget.")
+    if kind == "killed":
+        return ("The evaluation process was killed by the system, most likely "
+                "because the algorithm used too much memory. Reduce memory use.")
+    raise ValueError(f"Unknown violation kind: {kind!r}")
+
+
+_MEMORY_MARKERS = ("MemoryError", "Unable to allocate", "Cannot allocate memory")
+
+
+def is_memory_error(solution):
+    """True if a failed evaluation's feedback looks like an allocation failure.
+
+    ``MaBBOBProblem.evaluate`` stores ``str(e)`` as feedback, which is empty
+    for a bare ``MemoryError``; other candidate exceptions carry a message.
+    """
+    if getattr(solution, "fitness", None) != float("-inf"):
+        return False
+    text = f"{getattr(solution, 'error', '') or ''} {getattr(solution, 'feedback', '') or ''}"
+    return any(m in text for m in _MEMORY_MARKERS) or not text.strip()
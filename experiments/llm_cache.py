@@ -0,0 +1,199 @@
+"""Deterministic record/replay cache for LLM calls.
+
+Re-running a phase to test a changed evaluation setting (a new metric,
+different ``eval_seeds``) should not mean paying for every Gemini/Ollama
+call again.  ``RecordReplayLLM`` wraps an LLM from ``make_llm``:
+
+- ``record``: every query goes to the real LLM and the response is stored.
+- ``replay``: responses are served from the store with no LLM (and no API
+  key or server) at all; a query that was never recorded raises
+  ``ReplayMissError``.
+
+The store is content addressed: an entry's key is the SHA-256 of the
+model type and name, the registry's generation config, the full message
+history and the occurrence number of that exact request within the run.
+The occurrence number keeps the sampling of repeated identical prompts
+(e.g. the initial population) deterministic: the n-th identical request
+replays the n-th recorded response.  The per-request counters are exposed
+through ``get_state()``/``set_state()`` so checkpoints carry them and a
+resumed replay continues where it stopped.
+
+Layout::
+
+    {cache_dir}/objects/ab/abcdef....json   # one entry per response
+
+Entries are written atomically, so concurrent runs can share a store.
+Conversation logging and BLADE's budget check are unchanged, since the
+wrapper is itself a BLADE ``LLM`` and only replaces ``_query``.
+
+Select the mode with ``LLM_CACHE=record|replay`` and the store with
+``LLM_CACHE_DIR`` (see ``phase1_config``).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from iohblade.llm import LLM
+
+MODES = ("record", "replay")
+
+CACHE_FORMAT = 1
+
+
+class ReplayMissError(BaseException):
+    """Raised in replay mode for a request that was never recorded.
+
+    Derives from BaseException so LLaMEA's broad ``except Exception``
+    around LLM calls does not turn a miss into a silently failed candidate.
+    """
+
+
+def request_key(model_id, messages, occurrence=0):
+    """Content address of one LLM request.
+
+    Args:
+        model_id: dict identifying the model (type, name, generation config).
+        messages: list of ``{"role", "content"}`` dicts sent to the LLM.
+        occurrence: how many identical requests preceded this one in the run.
+
+    Returns:
+        str: hex SHA-256 digest.
+    """
+    payload = {
+        "format": CACHE_FORMAT,
+        "model": model_id,
+        "messages": [{"role": m.get("role"), "content": m.get("content")}
+                     for m in messages],
+        "occurrence": occurrence,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """On-disk content-addressed response store."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, key):
+        return self.root / "objects" / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the stored entry for ``key``, or None."""
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key, entry):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return sum(1 for _ in (self.root / "objects").glob("*/*.json"))
+
+
+def model_identity(model_cfg):
+    """The part of a registry entry that determines the model's responses."""
+    return {
+        "type": model_cfg.get("type"),
+        "model": model_cfg.get("model"),
+        "generation_config": model_cfg.get("generation_config"),
+    }
+
+
+class RecordReplayLLM(LLM):
+    """BLADE LLM that records or replays the responses of another LLM.
+
+    Args:
+        llm: the real LLM (may be None in replay mode).
+        model_cfg: the registry entry the LLM was built from; its type,
+            model and generation config are part of every cache key.
+        cache_dir: root of the response store.
+        mode: ``"record"`` or ``"replay"``.
+    """
+
+    def __init__(self, llm, model_cfg, cache_dir, mode="replay"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode!r} (expected one of {MODES})")
+        if llm is None and mode == "record":
+            raise ValueError("Record mode needs a real LLM to query.")
+        super().__init__("", model_cfg["model"], None)
+        if llm is not None:
+            for attr in ("code_pattern", "name_pattern", "desc_pattern", "cs_pattern"):
+                setattr(self, attr, getattr(llm, attr))
+        self.llm = llm
+        self.mode = mode
+        self.model_id = model_identity(model_cfg)
+        self.cache = LLMCache(cache_dir)
+        self.counts = {}
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def generation_config(self):
+        return getattr(self.llm, "generation_config", None)
+
+    def _next_key(self, session):
+        base = request_key(self.model_id, session)
+        with self._lock:
+            occurrence = self.counts.get(base, 0)
+            self.counts[base] = occurrence + 1
+        return request_key(self.model_id, session, occurrence), occurrence
+
+    def _query(self, session, **kwargs):
+        key, occurrence = self._next_key(session)
+        if self.mode == "replay":
+            entry = self.cache.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                raise ReplayMissError(
+                    f"No recorded response for {self.model_id['model']} request "
+                    f"{key[:12]} (occurrence {occurrence}, {len(session)} messages) "
+                    f"in {self.cache.root}"
+                )
+            self.stats["hits"] += 1
+            return entry["response"]
+
+        start = time.time()
+        response = self.llm._query(session, **kwargs)
+        self.cache.put(key, {
+            "key": key,
+            "model": self.model_id,
+            "occurrence": occurrence,
+            "n_messages": len(session),
+            "response": response,
+            "latency": time.time() - start,
+            "recorded": start,
+        })
+        self.stats["recorded"] += 1
+        return response
+
+    # ---------- checkpoint state ----------
+    def get_state(self):
+        with self._lock:
+            return {"counts": dict(self.counts)}
+
+    def set_state(self, state):
+        with self._lock:
+            self.counts = dict((state or {}).get("counts", {}))
+
+    # ---------- pickling / deepcopy helpers ----------
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -6,20 +6,104 @@ ManyAffine setup, AOCC scoring, prompts) from BLADE's MA_BBOB class. Adds:
 - compute_behavior_metrics for 11 behavioral features
 - Pluggable feedback formatting via make_feedback()
 - prepare_namespace() for safer code compilation
+- Persistent evaluation workers (experiments.eval_workers) when
+  use_worker_pool is set
+- Opt-in target-hit short-circuit (experiments.target_hit) when
+  stop_on_target is set
+- Per-run results streamed to the pool parent, so a timed-out evaluation
+  can be scored on its completed runs (timeout_policy="partial")
+
+Workers do not receive the pickled problem (pandas instance tables, prompts,
+feedback closure).  They receive ``descriptor()``: a small versioned dict of
+instance ids, dims, budget factor, seeds, bounds, the behavioural features
+the feedback needs and the feedback spec by name, and rebuild the problem
+with ``MaBBOBProblem.from_descriptor`` from per-process caches
+(``load_instance_data``, ``llamea_utils``).
 """
 
-import os
+import atexit
+import functools
+import hashlib
+import importlib.util
+import inspect
+import json
 import random
+import shutil
 import sys
 import tempfile
+import uuid
 from pathlib import Path
 
+import cloudpickle
 import numpy as np
+import pandas as pd
 
 from iohblade.benchmarks.BBOB.mabbob import MA_BBOB
 
+from . import eval_workers, governance
+from .feedback import feedback_features, feedback_from_spec, feedback_spec
+
 _THESIS_ROOT = Path(__file__).resolve().parents[1]
 
+# Bump when the descriptor layout changes; workers reject other versions.
+PROBLEM_DESCRIPTOR_VERSION = 1
+
+# What a pooled evaluation that times out scores (see _score_timeout).
+TIMEOUT_POLICIES = ("fail", "partial")
+
+_llamea_utils = None
+
+
+def llamea_utils():
+    """Load ``llamea/utils.py`` once per process, without ``llamea/__init__``.
+
+    Importing the ``llamea`` package pulls in lizard, networkx, etc.; the
+    evaluation only needs ``prepare_namespace``/``clean_local_namespace``.
+    Uses the LLaMEA submodule if present, else the installed package's file.
+    """
+    global _llamea_utils
+    if _llamea_utils is None:
+        path = _THESIS_ROOT / "LLaMEA" / "llamea" / "utils.py"
+        if not path.is_file():
+            path = Path(importlib.util.find_spec("llamea").origin).parent / "utils.py"
+        spec = importlib.util.spec_from_file_location("llamea.utils", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _llamea_utils = module
+    return _llamea_utils
+
+
+@functools.lru_cache(maxsize=None)
+def load_instance_data():
+    """MA-BBOB instance tables (weights, iids, opt_locs), read once per process."""
+    base = Path(inspect.getfile(MA_BBOB)).parent / "mabbob"
+    return tuple(
+        pd.read_csv(base / f"{name}.csv", index_col=0)
+        for name in ("weights", "iids", "opt_locs")
+    )
+
+
+_env_dirs = {}
+
+
+def _shared_env_dir(key):
+    """Scratch dir for the subprocess evaluator, one per problem config and process.
+
+    BLADE's subprocess path writes ``problem.pkl`` into it once, so problems
+    only share a dir when their descriptors (and feedback) are identical.
+    """
+    path = _env_dirs.get(key)
+    if path is None or not path.is_dir():
+        path = _env_dirs[key] = Path(tempfile.mkdtemp(prefix=f"blade_env_{key[:12]}_"))
+    return path
+
+
+@atexit.register
+def _remove_env_dirs():
+    for path in _env_dirs.values():
+        shutil.rmtree(path, ignore_errors=True)
+    _env_dirs.clear()
+
 
 class MaBBOBProblem(MA_BBOB):
     """Extend MA_BBOB with behavioral metrics collection and custom feedback."""
@@ -36,8 +120,19 @@ class MaBBOBProblem(MA_BBOB):
         allowed_imports=None,
         use_worker_pool=True,
         worker_recycle_interval=50,
+        worker_max_rss_mb=eval_workers.DEFAULT_MAX_RSS_MB,
+        worker_leak_mb=eval_workers.DEFAULT_LEAK_MB,
+        worker_standby=eval_workers.DEFAULT_STANDBY,
+        eval_governance=None,
+        stop_on_target=False,
+        timeout_policy="fail",
+        timeout_penalty=0.1,
+        timeout_min_completed=0.5,
         eval_timeout=6000,
     ):
+        if timeout_policy not in TIMEOUT_POLICIES:
+            raise ValueError(f"Unknown timeout_policy {timeout_policy!r}; "
+                             f"expected one of {TIMEOUT_POLICIES}")
         if bbob_bounds is None:
             bbob_bounds = [(-5.0, 5.0)]
         if allowed_imports is None:
@@ -57,6 +152,14 @@ class MaBBOBProblem(MA_BBOB):
         # Worker pool settings — not accepted by MA_BBOB.__init__, set directly.
         self.use_worker_pool = use_worker_pool
         self.worker_recycle_interval = worker_recycle_interval
+        self.worker_max_rss_mb = worker_max_rss_mb
+        self.worker_leak_mb = worker_leak_mb
+        self.worker_standby = worker_standby
+        # Resource limits for pooled workers (experiments.governance)
+        self.eval_governance = governance.resolve(eval_governance)
+        # Distinguishes custom (spec-less) feedback callables in _worker_key;
+        # shared by BLADE's deep copies, which carry the same callable.
+        self._feedback_id = uuid.uuid4().hex
         self.extra_pythonpath = [
             str(_THESIS_ROOT),
             str(_THESIS_ROOT / "LLaMEA"),
@@ -68,6 +171,11 @@ class MaBBOBProblem(MA_BBOB):
         self.bbob_bounds = bbob_bounds
         self.allowed_imports = allowed_imports
         self.eval_seeds = eval_seeds
+        self.stop_on_target = stop_on_target
+        # Applied by the parent to pooled timeouts; workers never see them.
+        self.timeout_policy = timeout_policy
+        self.timeout_penalty = timeout_penalty
+        self.timeout_min_completed = timeout_min_completed
 
     def _ensure_env(self):
         """Skip virtualenv creation — use the current conda Python directly.
@@ -79,39 +187,171 @@ class MaBBOBProblem(MA_BBOB):
         """
         if self._env_path is not None:
             return
-        self._env_path = Path(tempfile.mkdtemp(prefix="blade_env_"))
+        self._env_path = _shared_env_dir(self._worker_key)
         self._python_bin = Path(sys.executable)
 
+    def cleanup(self):
+        """Shared env dirs outlive single experiments; removed at exit."""
+
     def __call__(self, solution, logger=None):
         """Override to prevent LLaMEA's ExperimentLogger from being assigned
         to BLADE's logger slot (which expects .log_individual())."""
-        return super().__call__(solution, logger=None)
+        if not self.use_worker_pool:
+            return super().__call__(solution, logger=None)
+        return self._call_in_pool(solution)
+
+    # ---------- worker pool ----------
+    def _worker_pool(self):
+        return eval_workers.get_pool(
+            standby=self.worker_standby,
+            max_evals=self.worker_recycle_interval,
+            max_rss_mb=self.worker_max_rss_mb,
+            leak_mb=self.worker_leak_mb,
+            limits=self.eval_governance,
+        )
+
+    def descriptor(self):
+        """Compact, versioned description the workers rebuild the problem from.
+
+        Custom feedback callables (without a ``feedback_spec``) have
+        ``"feedback": None`` and are shipped pickled by ``_worker_blob``.
+        """
+        spec = feedback_spec(self.make_feedback)
+        return {
+            "factory": f"{__name__}.{type(self).__name__}",
+            "version": PROBLEM_DESCRIPTOR_VERSION,
+            "name": self.name,
+            "training_instances": [int(i) for i in self.training_instances],
+            "dims": [int(d) for d in self.dims],
+            "budget_factor": self.budget_factor,
+            "eval_seeds": self.eval_seeds,
+            "bbob_bounds": [list(b) for b in self.bbob_bounds],
+            "allowed_imports": list(self.allowed_imports),
+            "stop_on_target": self.stop_on_target,
+            "features": feedback_features(spec),
+            "feedback": spec,
+        }
+
+    @property
+    def _worker_key(self):
+        """Identifies this problem inside the workers: equal descriptors share it."""
+        desc = self.descriptor()
+        if desc["feedback"] is None:
+            desc["feedback_id"] = self._feedback_id
+        blob = json.dumps(desc, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _worker_blob(self):
+        desc = self.descriptor()
+        if desc["feedback"] is None:
+            desc["feedback_fn"] = self.make_feedback
+        return cloudpickle.dumps(desc)
+
+    @classmethod
+    def from_descriptor(cls, desc):
+        """Rebuild an evaluation-ready problem from ``descriptor()`` output.
+
+        Skips ``MA_BBOB.__init__``: the instance tables come from the
+        per-process ``load_instance_data`` cache and the prompts, logger and
+        worker settings are not needed to evaluate.
+        """
+        if desc.get("version") != PROBLEM_DESCRIPTOR_VERSION:
+            raise ValueError(f"Unsupported problem descriptor version "
+                             f"{desc.get('version')!r} (expected "
+                             f"{PROBLEM_DESCRIPTOR_VERSION})")
+        problem = cls.__new__(cls)
+        problem.weights, problem.iids, problem.opt_locs = load_instance_data()
+        problem.name = desc["name"]
+        problem.training_instances = list(desc["training_instances"])
+        problem.dims = list(desc["dims"])
+        problem.budget_factor = desc["budget_factor"]
+        problem.eval_seeds = desc["eval_seeds"]
+        problem.bbob_bounds = [tuple(b) for b in desc["bbob_bounds"]]
+        problem.allowed_imports = list(desc["allowed_imports"])
+        problem.stop_on_target = desc["stop_on_target"]
+        problem.make_feedback = (desc.get("feedback_fn")
+                                 or feedback_from_spec(desc["feedback"]))
+        problem.logger = None
+        return problem
+
+    def _call_in_pool(self, solution):
+        """Problem.__call__ with the evaluation run in a pooled worker."""
+        if self.logger is not None and self.logger.budget_exhausted():
+            solution.set_scores(-np.inf, feedback="Budget is exhausted.",
+                                error="Budget is exhausted.")
+            return solution
+
+        result, error, info = self._worker_pool().evaluate(
+            self._worker_key, self._worker_blob, solution, self.eval_timeout,
+        )
+        if error is not None and info.get("timed_out"):
+            solution = self._score_timeout(solution, error, info.get("partial", []))
+        elif error is not None:
+            solution.set_scores(-np.inf, feedback=error, error=error)
+        else:
+            solution = result
+        self._last_stdout = info.get("stdout", "")
+        self._last_stderr = info.get("stderr", "")
+        if self.logger is not None:
+            self.logger.log_individual(solution)
+        return solution
+
+    def _score_timeout(self, solution, error, partial):
+        """Score a timed-out evaluation from the runs its worker streamed.
+
+        With ``timeout_policy="partial"`` and at least
+        ``timeout_min_completed`` of the instance/seed runs completed, the
+        fitness is their mean AOCC reduced by ``timeout_penalty`` (a
+        fraction), and the feedback covers the completed runs plus a note on
+        the timeout.  Otherwise the candidate fails with -inf as before.
+        """
+        total = len(self.dims) * len(self.training_instances) * self.eval_seeds
+        if (getattr(self, "timeout_policy", "fail") != "partial" or not partial
+                or len(partial) < self.timeout_min_completed * total):
+            solution.set_scores(-np.inf, feedback=error, error=error)
+            return solution
+
+        aucs = [run["auc"] for run in partial]
+        avg_met, std_met = self._summarise_metrics(
+            [run["metrics"] for run in partial if run["metrics"]])
+        fitness = float(np.mean(aucs)) * (1 - self.timeout_penalty)
+        feedback = self.make_feedback(solution.name, fitness, float(np.std(aucs)),
+                                      avg_met, std_met)
+        note = (f"{error} The score covers the {len(partial)} of {total} runs that "
+                f"completed and is reduced by {self.timeout_penalty:.0%}; "
+                f"make the algorithm faster.")
+        solution.set_scores(fitness, f"{feedback}\n{note}")
+        solution.add_metadata("aucs", aucs)
+        solution.add_metadata("behavioral_features", avg_met)
+        solution.add_metadata("behavioral_features_std", std_met)
+        solution.add_metadata("timeout_partial", {
+            "completed": len(partial), "total": total,
+            "penalty": self.timeout_penalty,
+        })
+        return solution
 
     def evaluate(self, solution):
         """Run inside subprocess: compile, smoke-test, evaluate with behavioral metrics.
 
-        Reuses parent's self.weights, self.iids, self.opt_locs (loaded by
-        MA_BBOB.__init__) for MA-BBOB instance data. Adds TrajectoryLogger
+        Reuses self.weights, self.iids, self.opt_locs (loaded by
+        MA_BBOB.__init__, or from the process cache in from_descriptor) for
+        MA-BBOB instance data. Adds TrajectoryLogger
         and compute_behavior_metrics on top of standard AOCC evaluation.
         """
         # Lazy imports — must resolve inside the venv subprocess
         import ioh
         from ioh import get_problem, logger as ioh_logger
 
-        # Import llamea.utils directly to avoid triggering llamea/__init__.py
-        # which pulls in lizard, networkx, etc.
-        import importlib.util as _ilu
-        _spec = _ilu.spec_from_file_location(
-            "llamea.utils",
-            os.path.join(str(_THESIS_ROOT), "LLaMEA", "llamea", "utils.py"),
-        )
-        _llamea_utils = _ilu.module_from_spec(_spec)
-        _spec.loader.exec_module(_llamea_utils)
-        prepare_namespace = _llamea_utils.prepare_namespace
-        clean_local_namespace = _llamea_utils.clean_local_namespace
+        # llamea.utils without llamea/__init__.py, loaded once per process
+        utils = llamea_utils()
+        prepare_namespace = utils.prepare_namespace
+        clean_local_namespace = utils.clean_local_namespace
 
-        from iohblade.utils import aoc_logger, correct_aoc, OverBudgetException
+        from iohblade.utils import (
+            aoc_logger, correct_aoc, OverBudgetException, ThresholdReachedException,
+        )
         from iohblade.behaviour_metrics import compute_behavior_metrics
+        from experiments.target_hit import TARGET_ERROR, saturate_trajectory
         from experiments.trajectory_logger import TrajectoryLogger
 
         code = solution.code
@@ -153,6 +393,8 @@ class MaBBOBProblem(MA_BBOB):
         _behavior_time = 0.0
         aucs = []
         all_metrics = []
+        target_hits = 0
+        stop_on_target = getattr(self, "stop_on_target", False)
 
         for dim in self.dims:
             budget = self.budget_factor * dim
@@ -171,15 +413,20 @@ class MaBBOBProblem(MA_BBOB):
                     f_new.set_instance(idx)
 
                     l_aoc = aoc_logger(
-                        budget, upper=1e2,
+                        budget, lower=TARGET_ERROR, upper=1e2,
+                        stop_on_threshold=stop_on_target,
                         triggers=[ioh_logger.trigger.ALWAYS],
                     )
                     l_traj = TrajectoryLogger(
                         dim, triggers=[ioh_logger.trigger.ALWAYS],
                     )
-                    combined = ioh_logger.Combine([l_aoc, l_traj])
+                    # With stop_on_target the trajectory logger goes first so
+                    # it records the evaluation that hits the target.
+                    loggers = [l_traj, l_aoc] if stop_on_target else [l_aoc, l_traj]
+                    combined = ioh_logger.Combine(loggers)
                     f_new.attach_logger(combined)
 
+                    hit = False
                     try:
                         algorithm = local_ns[algorithm_name](budget=budget, dim=dim)
                         _algo_t0 = _time.monotonic()
@@ -187,6 +434,12 @@ class MaBBOBProblem(MA_BBOB):
                         _algo_time += _time.monotonic() - _algo_t0
                     except OverBudgetException:
                         _algo_time += _time.monotonic() - _algo_t0
+                    except ThresholdReachedException:
+                        # AOCC for the rest of the budget is filled in by
+                        # correct_aoc; metrics use the saturated trajectory.
+                        _algo_time += _time.monotonic() - _algo_t0
+                        target_hits += 1
+                        hit = True
                     except Exception as e:
                         solution.set_scores(float("-inf"), str(e))
                         return solution
@@ -195,6 +448,9 @@ class MaBBOBProblem(MA_BBOB):
                     aucs.append(auc)
 
                     df = l_traj.to_dataframe()
+                    if hit:
+                        df = saturate_trajectory(df, budget)
+                    metrics = {}
                     if len(df) > 1:
                         _bm_t0 = _time.monotonic()
                         metrics = compute_behavior_metrics(
@@ -203,6 +459,15 @@ class MaBBOBProblem(MA_BBOB):
                         _behavior_time += _time.monotonic() - _bm_t0
                         all_metrics.append(metrics)
 
+                    # Kept by the pool parent if a later run times out.
+                    eval_workers.report_partial({
+                        "dim": dim, "instance": idx, "seed": seed,
+                        "auc": float(auc),
+                        "metrics": {k: float(v) for k, v in metrics.items()},
+                        "algorithm_s": round(_algo_time, 3),
+                        "behavior_s": round(_behavior_time, 3),
+                    })
+
                     f_new.reset()
 
         _eval_time = _time.monotonic() - _eval_t0
@@ -219,6 +484,8 @@ class MaBBOBProblem(MA_BBOB):
         solution.add_metadata("evaluation_time_s", round(_eval_time, 3))
         solution.add_metadata("algorithm_execution_time_s", round(_algo_time, 3))
         solution.add_metadata("behavior_metrics_time_s", round(_behavior_time, 3))
+        if stop_on_target:
+            solution.add_metadata("target_hits", target_hits)
 
         return solution
 
@@ -234,6 +501,11 @@ class MaBBOBProblem(MA_BBOB):
             "budget_factor": self.budget_factor,
             "bbob_bounds": self.bbob_bounds,
             "eval_seeds": self.eval_seeds,
+            "eval_governance": self.eval_governance,
+            "stop_on_target": self.stop_on_target,
+            "timeout_policy": self.timeout_policy,
+            "timeout_penalty": self.timeout_penalty,
+            "timeout_min_completed": self.timeout_min_completed,
         }
 
     @staticmethod
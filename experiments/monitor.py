@@ -0,0 +1,294 @@
+"""Live progress table of a results root, from incrementally tailed run logs.
+
+    python -m experiments.monitor results_phase4              # refresh every 60 s
+    python -m experiments.monitor results_phase3 --once
+
+Every ``*/seed-*/run-*/log.jsonl`` is read from the byte offset reached on
+the previous poll, in chunks of at most ``READ_CHUNK`` bytes, and folded
+into a fixed-size record per run (offset, candidates, failures, best
+fitness, first/last write).  The records are saved in
+``<results_root>/.monitor.json``, so a restarted monitor continues where it
+stopped instead of re-reading the logs.  A log that shrank (rewritten on
+resume) is read again from the start.  Memory is therefore one small record
+per run plus one chunk, however large the logs grow.
+
+The table has one row per (condition, seed): candidates done out of the
+budget, best AOCC, failure rate, evaluations per hour and ETA.  The rate is
+measured from the run's ``start_time`` in BLADE's seed-level
+``progress.json`` (or the first time the monitor saw the run) to the last
+write of its log.  A resumed run (e.g. after a SLURM requeue) gets a fresh
+``start_time``; the rate then only counts the candidates logged since, so
+time spent in the queue does not lengthen the ETA.  Runs whose log has not
+changed for ``STALL_AFTER`` seconds are marked ``stalled``.
+
+Like ``experiments.progress``, this only uses the standard library so it
+can run next to the experiments without importing BLADE.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .progress import PROGRESS_FILE, _atomic_write_json, _budget_from_blade, _read_json
+
+STATE_FILE = ".monitor.json"
+
+# Bump when the record layout changes; older state files are discarded.
+STATE_VERSION = 2
+
+# Largest read per log and poll (a single longer line is still read whole).
+READ_CHUNK = 4 * 1024 * 1024
+
+# Seconds without a log write before a run counts as stalled.
+STALL_AFTER = int(os.environ.get("MONITOR_STALL_AFTER", 3600))
+
+
+# ---------------------------------------------------------------------------
+# Tailing
+# ---------------------------------------------------------------------------
+
+def _new_record():
+    return {"offset": 0, "candidates": 0, "failed": 0, "best": None,
+            "start": None, "started_with": 0, "progress_start": None,
+            "last_write": None, "budget": None}
+
+
+def _start_time(run_dir):
+    """``start_time`` of ``run_dir`` in BLADE's seed-level progress.json."""
+    data = _read_json(os.path.join(run_dir.parent, PROGRESS_FILE)) or {}
+    for run in data.get("runs", []):
+        if run.get("log_dir") == run_dir.name and run.get("start_time"):
+            try:
+                return datetime.fromisoformat(run["start_time"]).timestamp()
+            except ValueError:
+                return None
+    return None
+
+
+def _fold(record, line):
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return
+    record["candidates"] += 1
+    try:
+        fitness = float(entry.get("fitness"))
+    except (TypeError, ValueError):
+        fitness = math.nan
+    if not math.isfinite(fitness):
+        record["failed"] += 1
+    elif record["best"] is None or fitness > record["best"]:
+        record["best"] = fitness
+
+
+def tail_log(log_path, record, chunk=READ_CHUNK):
+    """Fold the complete lines appended since ``record["offset"]`` into it.
+
+    Returns:
+        int: bytes consumed.
+    """
+    size = os.path.getsize(log_path)
+    if size < record["offset"]:
+        record.update(_new_record(), **{k: record[k] for k in (
+            "start", "started_with", "progress_start", "budget")})
+    start = record["offset"]
+    with open(log_path, "rb") as f:
+        f.seek(record["offset"])
+        pending = b""
+        while record["offset"] + len(pending) < size:
+            data = pending + f.read(chunk)
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                if len(data) == len(pending):
+                    break  # incomplete last line: read it next time
+                pending = data
+                continue
+            for line in data[:end].splitlines():
+                if line.strip():
+                    _fold(record, line)
+            record["offset"] += end
+            pending = data[end:]
+    return record["offset"] - start
+
+
+def _run_budget(run_dir):
+    data = _read_json(os.path.join(run_dir, PROGRESS_FILE)) or {}
+    return data.get("budget") or _budget_from_blade(run_dir.parent)
+
+
+def poll(results_root, state, now=None):
+    """Update ``state["runs"]`` from every run log under ``results_root``.
+
+    Returns:
+        int: bytes read.
+    """
+    root = Path(results_root)
+    now = time.time() if now is None else now
+    runs = state.setdefault("runs", {})
+    seen = set()
+    read = 0
+    for log_path in sorted(root.glob("*/seed-*/run-*/log.jsonl")):
+        key = str(log_path.parent.relative_to(root))
+        seen.add(key)
+        record = runs.get(key)
+        start = _start_time(log_path.parent)
+        if record is None:
+            record = runs[key] = _new_record()
+            record["start"] = start or now
+        elif start is not None and start != record["progress_start"]:
+            if record["progress_start"] is not None:
+                # Resumed: measure the rate from the new start only.
+                record["started_with"] = record["candidates"]
+            record["start"] = start
+        record["progress_start"] = start or record["progress_start"]
+        if not record["budget"]:
+            record["budget"] = _run_budget(log_path.parent)
+        mtime = os.path.getmtime(log_path)
+        if mtime != record["last_write"]:
+            read += tail_log(log_path, record)
+            record["last_write"] = mtime
+    for key in set(runs) - seen:
+        del runs[key]
+    return read
+
+
+def load_state(results_root):
+    state = _read_json(os.path.join(results_root, STATE_FILE))
+    if not state or state.get("version") != STATE_VERSION:
+        state = {"version": STATE_VERSION, "runs": {}}
+    return state
+
+
+def save_state(results_root, state):
+    _atomic_write_json(os.path.join(results_root, STATE_FILE), state)
+
+
+# ---------------------------------------------------------------------------
+# Table
+# ---------------------------------------------------------------------------
+
+def seed_rows(state, now=None):
+    """One row per (condition, seed), summing the seed's run directories.
+
+    Returns:
+        list of dicts with ``condition``, ``seed``, ``candidates``,
+        ``budget``, ``best``, ``failure_rate``, ``per_hour``, ``eta_s`` and
+        ``status``.
+    """
+    now = time.time() if now is None else now
+    seeds = {}
+    for key, rec in state.get("runs", {}).items():
+        condition, seed_dir, _ = key.split(os.sep)
+        row = seeds.setdefault((condition, seed_dir), {
+            "condition": condition, "seed": seed_dir[len("seed-"):], "candidates": 0,
+            "since_start": 0, "failed": 0, "budget": None, "best": None, "start": None,
+            "last_write": None})
+        row["candidates"] += rec["candidates"]
+        row["since_start"] += max(rec["candidates"] - rec["started_with"], 0)
+        row["failed"] += rec["failed"]
+        row["budget"] = row["budget"] or rec["budget"]
+        if rec["best"] is not None and (row["best"] is None or rec["best"] > row["best"]):
+            row["best"] = rec["best"]
+        for field, pick in (("start", min), ("last_write", max)):
+            if rec[field] is not None:
+                row[field] = rec[field] if row[field] is None else pick(row[field], rec[field])
+
+    rows = []
+    for (condition, seed_dir), row in sorted(seeds.items(), key=lambda kv: (
+            kv[0][0], int(kv[0][1][5:]) if kv[0][1][5:].isdigit() else kv[0][1])):
+        n, budget = row["candidates"], row["budget"]
+        hours = ((row["last_write"] or now) - (row["start"] or now)) / 3600
+        per_hour = row["since_start"] / hours if hours > 0 and row["since_start"] else None
+        complete = bool(budget) and n >= budget
+        eta = None
+        if budget and not complete and per_hour:
+            eta = (budget - n) / per_hour * 3600
+        if complete:
+            status = "done"
+        elif row["last_write"] is not None and now - row["last_write"] > STALL_AFTER:
+            status = "stalled"
+        else:
+            status = "running"
+        rows.append({
+            "condition": condition, "seed": row["seed"], "candidates": n, "budget": budget,
+            "best": row["best"], "failure_rate": row["failed"] / n if n else None,
+            "per_hour": per_hour, "eta_s": eta, "status": status,
+        })
+    return rows
+
+
+def _duration(seconds):
+    if seconds is None:
+        return "-"
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h{minutes % 60:02d}m" if minutes >= 60 else f"{minutes}m"
+
+
+def render(rows, results_root=""):
+    """The table as text."""
+    width = max([len(r["condition"]) for r in rows] + [len("condition")])
+    lines = [f"{results_root}  {datetime.now():%Y-%m-%d %H:%M:%S}",
+             f"{'condition':{width}s} {'seed':>4s} {'done':>9s} {'best':>7s} "
+             f"{'fail%':>6s} {'eval/h':>7s} {'ETA':>7s}  status"]
+    done = total = 0
+    for r in rows:
+        budget = r["budget"] or "?"
+        best = f"{r['best']:.4f}" if r["best"] is not None else "-"
+        fail = f"{100 * r['failure_rate']:.1f}" if r["failure_rate"] is not None else "-"
+        rate = f"{r['per_hour']:.1f}" if r["per_hour"] is not None else "-"
+        lines.append(f"{r['condition']:{width}s} {r['seed']:>4s} "
+                     f"{str(r['candidates']) + '/' + str(budget):>9s} {best:>7s} "
+                     f"{fail:>6s} {rate:>7s} {_duration(r['eta_s']):>7s}  {r['status']}")
+        done += r["candidates"]
+        total += r["budget"] or 0
+    finished = sum(r["status"] == "done" for r in rows)
+    lines.append(f"{len(rows)} seeds ({finished} done), {done}"
+                 + (f"/{total}" if total else "") + " candidates")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live progress table of a results root")
+    parser.add_argument("results_dir")
+    parser.add_argument("--interval", type=float, default=60,
+                        help="Seconds between polls (default: 60)")
+    parser.add_argument("--once", action="store_true", help="Print the table once and exit")
+    parser.add_argument("--budget", type=int, default=None,
+                        help="Budget to assume where none is recorded")
+    args = parser.parse_args(argv)
+
+    root = args.results_dir
+    if not os.path.isdir(root):
+        print(f"{root}: not found", file=sys.stderr)
+        return 1
+    state = load_state(root)
+    while True:
+        poll(root, state)
+        if args.budget:
+            for rec in state["runs"].values():
+                rec["budget"] = rec["budget"] or args.budget
+        save_state(root, state)
+        table = render(seed_rows(state), root)
+        if args.once:
+            print(table)
+            return 0
+        if sys.stdout.isatty():
+            sys.stdout.write("\033[H\033[2J")
+        print(table, flush=True)
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,19 @@ ALLOWED_IMPORTS = ["numpy"]
 # Prevents runaway candidates from blocking the evolutionary loop.
 EVAL_TIMEOUT = 600
 
+# Opt-in target-hit short-circuit (experiments/target_hit.py): stop an inner
+# run once its error is below the AOCC floor and fill AOCC in analytically.
+# AOCC is unchanged; behavioural metrics use the saturated trajectory, so
+# keep it off for runs compared with results produced without it.
+STOP_ON_TARGET = os.environ.get("STOP_ON_TARGET", "0") == "1"
+
+# What a pooled evaluation that hits EVAL_TIMEOUT scores: "fail" (-inf) or
+# "partial" (mean AOCC of the completed instance/seed runs, reduced by
+# EVAL_TIMEOUT_PENALTY, if at least EVAL_TIMEOUT_MIN_COMPLETED of them finished).
+EVAL_TIMEOUT_POLICY = os.environ.get("EVAL_TIMEOUT_POLICY", "fail")
+EVAL_TIMEOUT_PENALTY = float(os.environ.get("EVAL_TIMEOUT_PENALTY", 0.1))
+EVAL_TIMEOUT_MIN_COMPLETED = float(os.environ.get("EVAL_TIMEOUT_MIN_COMPLETED", 0.5))
+
 # ---------------------------------------------------------------------------
 # Evolution settings — (1+1)-ES
 # ---------------------------------------------------------------------------
@@ -43,6 +56,11 @@ ELITISM = True            # (mu + lambda) strategy
 # With (1+1)-ES this means 1 initial + 99 generations = 100 total candidates
 LLAMEA_BUDGET = 100
 
+# Delta checkpointing (experiments/checkpoint.py): new candidates and a small
+# state record are appended every generation; a compacted snapshot is
+# written every CHECKPOINT_SNAPSHOT_EVERY generations.
+CHECKPOINT_SNAPSHOT_EVERY = int(os.environ.get("CHECKPOINT_SNAPSHOT_EVERY", 25))
+
 # ---------------------------------------------------------------------------
 # Mutation prompts — 90% refinement, 10% exploration
 # ---------------------------------------------------------------------------
@@ -78,6 +96,14 @@ OLLAMA_PORT = int(os.environ.get("OLLAMA_PORT", 11434))
 # ---------------------------------------------------------------------------
 VLLM_BASE_URL = os.environ.get("VLLM_BASE_URL", "http://localhost:8000/v1")
 
+# ---------------------------------------------------------------------------
+# LLM record/replay cache (experiments/llm_cache.py)
+# ---------------------------------------------------------------------------
+# LLM_CACHE=record stores every response; LLM_CACHE=replay serves them back
+# without contacting the model and fails on an unrecorded request.
+LLM_CACHE_MODE = os.environ.get("LLM_CACHE", "") or None
+LLM_CACHE_DIR = os.environ.get("LLM_CACHE_DIR", "llm_cache")
+
 # ---------------------------------------------------------------------------
 # Model registry
 # ---------------------------------------------------------------------------
@@ -11,31 +11,25 @@ the feature-selection experiment:
 The module exposes:
   - run_model()        — run all seeds for one model
   - run_single_seed()  — run one (model, seed) pair
-  - summarise_run()    — extract summary CSV from a finished run directory
+  - summarise_run()    — extract summary records from a run directory
+                         (from ``experiments.summary``)
   - main()             — CLI entry point
+
+Only the standard library and the config are imported at module level, so
+``--list`` and ``--summarise`` start instantly.  Backend SDKs (via
+``iohblade.llm``), BLADE's experiment machinery, LLaMEA and NumPy are
+imported inside the functions that start a run; the method class lives in
+``experiments.phase1_method``.
 """
 
 import argparse
-import csv
-import json
-import math
 import os
 import sys
 import time
-from pathlib import Path
-
-import numpy as np
-
-from iohblade.experiment import Experiment
-from iohblade.llm import Gemini_LLM, Ollama_LLM, VLLM_LLM
-from iohblade.loggers import ExperimentLogger
-from iohblade.methods import LLaMEA as BladeLLaMEA
-from llamea import LLaMEA as LLaMEA_Algorithm
-from iohblade.solution import Solution
 
+from . import shutdown
 from .feedback import vanilla_feedback
-from .initial_population import get_initial_solutions
-from .mabbob_problem import MaBBOBProblem
+from .summary import summarise_results, summarise_run, write_summary_csv  # noqa: F401
 from .phase1_config import (
     ALLOWED_IMPORTS,
     BBOB_BOUNDS,
@@ -45,139 +39,67 @@ from .phase1_config import (
     ELITISM,
     EVAL_SEEDS,
     EVAL_TIMEOUT,
+    EVAL_TIMEOUT_MIN_COMPLETED,
+    EVAL_TIMEOUT_PENALTY,
+    EVAL_TIMEOUT_POLICY,
     LLAMEA_BUDGET,
+    LLM_CACHE_DIR,
+    LLM_CACHE_MODE,
     MUTATION_PROMPTS,
     N_OFFSPRING,
     N_PARENTS,
     OLLAMA_PORT,
     RESULTS_DIR,
     RUN_SEEDS,
+    STOP_ON_TARGET,
     TRAINING_INSTANCES,
     VLLM_BASE_URL,
 )
 
 
-# ---------------------------------------------------------------------------
-# Custom method: LLaMEA with injected initial population
-# ---------------------------------------------------------------------------
-
-class Phase1LLaMEA(BladeLLaMEA):
-    """BLADE LLaMEA wrapper that injects a fixed initial algorithm.
-
-    Instead of letting LLaMEA generate the initial solution via the LLM,
-    we pre-evaluate a known algorithm (RandomSearch) and inject it so every
-    model and seed starts from the same baseline.
-
-    Supports resuming from a pickle checkpoint saved by LLaMEA's
-    ``pickle_archive()`` (called every generation).
-    """
-
-    def __init__(self, llm, budget, name, initial_solutions=None,
-                 resume_dir=None, **kwargs):
-        super().__init__(llm, budget, name, **kwargs)
-        self._initial_solutions = initial_solutions or []
-        self._resume_dir = resume_dir
-
-    def _enable_checkpoint(self, llamea_instance):
-        """Enable pickle checkpointing by giving LLaMEA a logger with dirname.
-
-        BLADE sets ``method.llm.set_logger(logger)`` before calling the method,
-        so we can grab the run directory from the LLM's logger.
-        """
-        llm_logger = getattr(self.llm, 'logger', None)
-        if llm_logger and hasattr(llm_logger, 'dirname'):
-            # Minimal logger stub: only provides dirname for pickle_archive()
-            # and no-ops for log_population() which BLADE handles separately.
-            class _CheckpointLogger:
-                def __init__(self, dirname):
-                    self.dirname = dirname
-                def log_population(self, population):
-                    pass  # BLADE's logger handles this
-                def log_individual(self, individual):
-                    pass
-            llamea_instance.log = True
-            llamea_instance.logger = _CheckpointLogger(llm_logger.dirname)
-
-    def __call__(self, problem):
-        """Create the LLaMEA instance, inject initial population, then run.
-
-        If ``_resume_dir`` points to a run directory containing
-        ``llamea_config.pkl``, the full evolutionary state is restored and
-        the run continues from where it left off.
-        """
-        import pickle
-
-        pkl_path = (os.path.join(self._resume_dir, "llamea_config.pkl")
-                    if self._resume_dir else None)
-
-        if pkl_path and os.path.isfile(pkl_path):
-            # --- Resume from checkpoint ---
-            with open(pkl_path, "rb") as fh:
-                self.llamea_instance = pickle.load(fh)
-
-            # Re-attach live objects that cannot be pickled reliably
-            self.llamea_instance.llm = self.llm
-            self.llamea_instance.f = problem
-            self._enable_checkpoint(self.llamea_instance)
-
-            n_done = len(self.llamea_instance.run_history)
-            print(f"  Resumed from checkpoint: {n_done}/{self.budget} candidates, "
-                  f"generation {self.llamea_instance.generation}")
-
-            return self.llamea_instance.run()
-
-        # --- Fresh run ---
-        self.llamea_instance = LLaMEA_Algorithm(
-            f=problem,
-            llm=self.llm,
-            role_prompt="You are an excellent Python programmer.",
-            task_prompt=problem.task_prompt,
-            example_prompt=problem.example_prompt,
-            output_format_prompt=problem.format_prompt,
-            log=None,   # BLADE handles logging, not LLaMEA's native logger
-            budget=self.budget,
-            max_workers=1,  # no parallelisation inside LLaMEA (BLADE manages it)
-            **self.kwargs,
-        )
-        self._enable_checkpoint(self.llamea_instance)
-
-        if self._initial_solutions:
-            # Evaluate each initial solution through the problem's full pipeline
-            # (compile → smoke test → MA-BBOB eval, all in subprocess).
-            evaluated = []
-            for sol in self._initial_solutions:
-                # Deep-copy so original templates are not mutated
-                import copy
-                s = copy.deepcopy(sol)
-                s.task_prompt = problem.task_prompt
-                s.generation = 0
-                s = problem(s)  # full evaluation via BLADE subprocess
-                if math.isnan(s.fitness):
-                    s.fitness = -np.inf
-                evaluated.append(s)
-
-            # Inject into the LLaMEA instance; initialize() will skip LLM
-            # generation because len(population) == n_parents already.
-            self.llamea_instance.population = evaluated
-
-        return self.llamea_instance.run()
+def __getattr__(name):
+    # Phase1LLaMEA used to be defined here; keep the old import path working.
+    if name == "Phase1LLaMEA":
+        from .phase1_method import Phase1LLaMEA
+        return Phase1LLaMEA
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ---------------------------------------------------------------------------
 # Factory helpers
 # ---------------------------------------------------------------------------
 
-def make_llm(model_cfg, port=None, base_url=None):
+def make_llm(model_cfg, port=None, base_url=None, cache_mode=None, cache_dir=None):
     """Instantiate an LLM object from a model registry entry.
 
     Args:
         model_cfg: dict with 'type' and 'model' keys (from CANDIDATE_MODELS).
         port: Ollama port override (ignored for API models).
         base_url: vLLM base URL override (ignored for non-vllm models).
+        cache_mode: "record" or "replay" to wrap the LLM in a
+            RecordReplayLLM (default: LLM_CACHE env var; unset disables).
+        cache_dir: response store for the cache (default: LLM_CACHE_DIR).
 
     Returns:
-        An LLM instance (Ollama_LLM, VLLM_LLM, or Gemini_LLM).
+        An LLM instance (Ollama_LLM, VLLM_LLM, or Gemini_LLM), or a
+        RecordReplayLLM around one.
     """
+    cache_mode = cache_mode or LLM_CACHE_MODE
+    if cache_mode:
+        from .llm_cache import RecordReplayLLM
+
+        cache_dir = cache_dir or LLM_CACHE_DIR
+        # Replay never contacts the model, so no client (or API key) is needed.
+        llm = None if cache_mode == "replay" else _make_backend_llm(model_cfg, port, base_url)
+        print(f"  LLM cache: {cache_mode} ({cache_dir})")
+        return RecordReplayLLM(llm, model_cfg, cache_dir, mode=cache_mode)
+    return _make_backend_llm(model_cfg, port, base_url)
+
+
+def _make_backend_llm(model_cfg, port=None, base_url=None):
+    """Build the real Ollama/vLLM/Gemini client for ``make_llm``."""
+    from iohblade.llm import Gemini_LLM, Ollama_LLM, VLLM_LLM
+
     mtype = model_cfg["type"]
     model = model_cfg["model"]
 
@@ -214,6 +136,8 @@ def make_llm(model_cfg, port=None, base_url=None):
 
 def make_problem(use_worker_pool=True, eval_seeds=None, training_instances=None, eval_timeout=None):
     """Create a vanilla MaBBOBProblem with Phase 1 evaluation config."""
+    from .mabbob_problem import MaBBOBProblem
+
     return MaBBOBProblem(
         make_feedback=vanilla_feedback,
         training_instances=training_instances if training_instances is not None else TRAINING_INSTANCES,
@@ -223,17 +147,25 @@ def make_problem(use_worker_pool=True, eval_seeds=None, training_instances=None,
         bbob_bounds=BBOB_BOUNDS,
         allowed_imports=ALLOWED_IMPORTS,
         use_worker_pool=use_worker_pool,
+        stop_on_target=STOP_ON_TARGET,
+        timeout_policy=EVAL_TIMEOUT_POLICY,
+        timeout_penalty=EVAL_TIMEOUT_PENALTY,
+        timeout_min_completed=EVAL_TIMEOUT_MIN_COMPLETED,
         eval_timeout=eval_timeout or EVAL_TIMEOUT,
     )
 
 
-def make_method(model_tag, llm, budget=None, initial_solutions=None):
+def make_method(model_tag, llm, budget=None, initial_solutions=None,
+                resume_dir=None):
     """Create a Phase1LLaMEA method configured for the (1+1) strategy."""
+    from .phase1_method import Phase1LLaMEA
+
     return Phase1LLaMEA(
         llm=llm,
         budget=budget or LLAMEA_BUDGET,
         name=model_tag,
         initial_solutions=initial_solutions,
+        resume_dir=resume_dir,
         n_parents=N_PARENTS,
         n_offspring=N_OFFSPRING,
         elitism=ELITISM,
@@ -266,6 +198,11 @@ def run_single_seed(
     Returns:
         str: path to the result directory.
     """
+    from iohblade.experiment import Experiment
+
+    from .initial_population import get_initial_solutions
+    from .resume import make_experiment_logger
+
     if model_cfg is None:
         model_cfg = CANDIDATE_MODELS[model_tag]
     if results_dir is None:
@@ -273,6 +210,9 @@ def run_single_seed(
 
     result_dir = f"{results_dir}/{model_tag}/seed-{seed}"
 
+    # Continue an interrupted run in place if it left a checkpoint
+    logger, resume_dir = make_experiment_logger(result_dir, budget or LLAMEA_BUDGET)
+
     llm = make_llm(model_cfg, port=port, base_url=base_url)
     problem = make_problem(
         use_worker_pool=use_worker_pool,
@@ -283,9 +223,8 @@ def run_single_seed(
     initial_solutions = get_initial_solutions()
     method = make_method(
         model_tag, llm, budget=budget, initial_solutions=initial_solutions,
+        resume_dir=resume_dir,
     )
-    os.makedirs(result_dir, exist_ok=True)
-    logger = ExperimentLogger(result_dir)
 
     experiment = Experiment(
         methods=[method],
@@ -307,7 +246,8 @@ def run_single_seed(
     print(f"  Results: {result_dir}")
     start = time.time()
 
-    experiment()
+    with shutdown.graceful():
+        experiment()
 
     elapsed = time.time() - start
     print(f"  Completed seed {seed} in {elapsed/3600:.2f}h")
@@ -327,16 +267,25 @@ def run_model(
     use_worker_pool=True,
     show_stdout=True,
     results_dir=None,
+    skip_complete=False,
 ):
     """Run all seeds for one model sequentially.
 
     Returns:
         list of result directory paths.
     """
+    from .resume import is_seed_complete
+
     if seeds is None:
         seeds = RUN_SEEDS
+    results_dir = results_dir or RESULTS_DIR
     dirs = []
     for seed in seeds:
+        seed_dir = f"{results_dir}/{model_tag}/seed-{seed}"
+        if skip_complete and is_seed_complete(seed_dir, budget or LLAMEA_BUDGET):
+            print(f"  SKIP {model_tag}/seed-{seed} (already complete)")
+            continue
+        shutdown.exit_if_requested()
         d = run_single_seed(
             model_tag=model_tag,
             seed=seed,
@@ -355,99 +304,6 @@ def run_model(
     return dirs
 
 
-# ---------------------------------------------------------------------------
-# Summary extraction
-# ---------------------------------------------------------------------------
-
-def summarise_run(result_dir):
-    """Extract a summary from a finished run's log.jsonl.
-
-    Scans the result directory for the run sub-directory containing log.jsonl,
-    then extracts per-candidate records.
-
-    Returns:
-        list of dicts, one per candidate evaluated.
-    """
-    result_path = Path(result_dir)
-    records = []
-
-    # Find run sub-directories (pattern: run-{method}-{problem}-{seed}/)
-    run_dirs = sorted(result_path.glob("run-*/"))
-    if not run_dirs:
-        return records
-
-    for run_dir in run_dirs:
-        log_file = run_dir / "log.jsonl"
-        if not log_file.exists():
-            continue
-
-        # Parse the directory name: run-{method_tag}-{problem}-{seed}
-        parts = run_dir.name.split("-")
-        # Seed is the last part
-        dir_seed = parts[-1] if parts else "?"
-
-        with open(log_file) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                try:
-                    fitness = float(entry.get("fitness", "nan"))
-                except (TypeError, ValueError):
-                    fitness = float("nan")
-                status = "success" if not math.isinf(fitness) and not math.isnan(fitness) else "failure"
-                aucs = entry.get("metadata", {}).get("aucs", [])
-                behavioral = entry.get("metadata", {}).get("behavioral_features", {})
-
-                records.append({
-                    "model_name": parts[1] if len(parts) > 1 else "unknown",
-                    "seed": dir_seed,
-                    "generation": entry.get("generation", "?"),
-                    "algorithm_name": entry.get("name", ""),
-                    "AOCC": fitness if status == "success" else "",
-                    "final_best_value": fitness,
-                    "run_status": status,
-                    "error": entry.get("error", ""),
-                    "n_aucs": len(aucs),
-                    **{f"bm_{k}": v for k, v in behavioral.items()},
-                })
-
-    return records
-
-
-def write_summary_csv(result_dir, output_path=None):
-    """Write a summary CSV for one run directory.
-
-    Args:
-        result_dir: path to the seed-level result directory.
-        output_path: where to write the CSV; defaults to {result_dir}/summary.csv.
-
-    Returns:
-        str: path to the written CSV.
-    """
-    records = summarise_run(result_dir)
-    if not records:
-        print(f"  WARNING: no records found in {result_dir}")
-        return None
-
-    if output_path is None:
-        output_path = str(Path(result_dir) / "summary.csv")
-
-    fieldnames = list(records[0].keys())
-    with open(output_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(records)
-
-    print(f"  Summary CSV: {output_path} ({len(records)} records)")
-    return output_path
-
-
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -548,6 +404,14 @@ examples:
         "--results-dir", type=str, default=None,
         help=f"Base results directory (default: {RESULTS_DIR})",
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processes used by --summarise (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--skip-complete", action="store_true",
+        help="Skip seeds whose results already reach the budget",
+    )
     args = parser.parse_args()
 
     if args.list:
@@ -555,12 +419,7 @@ examples:
         return
 
     if args.summarise:
-        base = Path(args.results_dir or RESULTS_DIR)
-        for model_dir in sorted(base.iterdir()):
-            if not model_dir.is_dir():
-                continue
-            for seed_dir in sorted(model_dir.glob("seed-*")):
-                write_summary_csv(str(seed_dir))
+        summarise_results(args.results_dir or RESULTS_DIR, workers=args.workers)
         return
 
     if not args.models:
@@ -622,6 +481,7 @@ examples:
             use_worker_pool=not args.no_worker_pool,
             show_stdout=True,
             results_dir=results_dir,
+            skip_complete=args.skip_complete,
         )
 
         # Generate summary CSVs for finished runs
@@ -0,0 +1,145 @@
+"""Phase1LLaMEA: BLADE's LLaMEA method with an injected initial population.
+
+Shared by Phases 1, 3 and 4.  Kept apart from ``phase1_experiment`` because
+it subclasses BLADE's method and drives ``llamea.LLaMEA``, whose imports
+cost seconds; the phase CLIs import this module only when a run starts.
+"""
+
+import copy
+import math
+
+import numpy as np
+
+from iohblade.methods import LLaMEA as BladeLLaMEA
+from llamea import LLaMEA as LLaMEA_Algorithm
+
+from . import shutdown
+from .checkpoint import DeltaCheckpoint
+from .phase1_config import CHECKPOINT_SNAPSHOT_EVERY
+from .progress import RunProgress
+from .resume import restore
+
+
+class Phase1LLaMEA(BladeLLaMEA):
+    """BLADE LLaMEA wrapper that injects a fixed initial algorithm.
+
+    Instead of letting LLaMEA generate the initial solution via the LLM,
+    we pre-evaluate a known algorithm (RandomSearch) and inject it so every
+    model and seed starts from the same baseline.
+
+    Supports resuming from the delta checkpoint (``experiments.checkpoint``)
+    written every generation, or from a legacy ``llamea_config.pkl`` saved
+    by LLaMEA's own ``pickle_archive()``.
+    """
+
+    def __init__(self, llm, budget, name, initial_solutions=None,
+                 resume_dir=None, **kwargs):
+        super().__init__(llm, budget, name, **kwargs)
+        self._initial_solutions = initial_solutions or []
+        self._resume_dir = resume_dir
+        self._flush_hook = None
+
+    def _enable_checkpoint(self, llamea_instance, n_history=None):
+        """Replace LLaMEA's full-state pickling with a delta checkpoint.
+
+        BLADE sets ``method.llm.set_logger(logger)`` before calling the method,
+        so we can grab the run directory from the LLM's logger.  LLaMEA calls
+        ``pickle_archive()`` at the end of every generation; shadowing it on
+        the instance routes that call to ``DeltaCheckpoint.save``.  That is
+        also the safe point at which a pending shutdown signal stops the run.
+        The run's progress record is flushed on a forced exit until
+        ``__call__`` returns.
+        """
+        llm_logger = getattr(self.llm, 'logger', None)
+        if llm_logger and hasattr(llm_logger, 'dirname'):
+            checkpoint = DeltaCheckpoint(
+                llm_logger.dirname, snapshot_every=CHECKPOINT_SNAPSHOT_EVERY,
+                n_history=n_history,
+            )
+
+            def archive():
+                checkpoint.save(llamea_instance)
+                shutdown.check()
+
+            llamea_instance.pickle_archive = archive
+            self._flush_hook = shutdown.register_flush(
+                RunProgress.for_dir(llm_logger.dirname).write)
+
+    def __call__(self, problem):
+        """Create the LLaMEA instance, inject initial population, then run.
+
+        If ``_resume_dir`` points to a run directory containing a checkpoint,
+        the evolutionary state is rebuilt from snapshot + journal and the run
+        continues from where it left off, in the same run directory (see
+        ``experiments.resume``).
+        """
+        try:
+            return self._run(problem)
+        finally:
+            # A CLI running several seeds must not flush finished runs.
+            if self._flush_hook is not None:
+                shutdown.unregister_flush(self._flush_hook)
+                self._flush_hook = None
+
+    def _run(self, problem):
+        restored = (restore(self._resume_dir, llm=self.llm)
+                    if self._resume_dir else None)
+
+        if restored is not None:
+            # --- Resume from checkpoint ---
+            self.llamea_instance = restored
+
+            # Re-attach live objects that are not stored in the checkpoint
+            self.llamea_instance.llm = shutdown.GatedLLM(self.llm)
+            self.llamea_instance.f = problem
+            self.llamea_instance.log = None
+            self.llamea_instance.logger = None
+            # The population is already evaluated: without this, run() calls
+            # initialize() again, re-logging it and bumping the generation.
+            self.llamea_instance.warm_started = True
+            self._enable_checkpoint(
+                self.llamea_instance,
+                n_history=len(self.llamea_instance.run_history),
+            )
+
+            n_done = len(self.llamea_instance.run_history)
+            print(f"  Resumed from checkpoint: {n_done}/{self.budget} candidates, "
+                  f"generation {self.llamea_instance.generation}")
+
+            return self.llamea_instance.run()
+
+        # --- Fresh run ---
+        self.llamea_instance = LLaMEA_Algorithm(
+            f=problem,
+            llm=shutdown.GatedLLM(self.llm),
+            role_prompt="You are an excellent Python programmer.",
+            task_prompt=problem.task_prompt,
+            example_prompt=problem.example_prompt,
+            output_format_prompt=problem.format_prompt,
+            log=None,   # BLADE handles logging, not LLaMEA's native logger
+            budget=self.budget,
+            max_workers=1,  # no parallelisation inside LLaMEA (BLADE manages it)
+            **self.kwargs,
+        )
+        self._enable_checkpoint(self.llamea_instance)
+
+        if self._initial_solutions:
+            # Evaluate each initial solution through the problem's full pipeline
+            # (compile → smoke test → MA-BBOB eval, all in subprocess).
+            evaluated = []
+            for sol in self._initial_solutions:
+                shutdown.check()
+                # Deep-copy so original templates are not mutated
+                s = copy.deepcopy(sol)
+                s.task_prompt = problem.task_prompt
+                s.generation = 0
+                s = problem(s)  # full evaluation via BLADE subprocess
+                if math.isnan(s.fitness):
+                    s.fitness = -np.inf
+                evaluated.append(s)
+
+            # Inject into the LLaMEA instance; initialize() will skip LLM
+            # generation because len(population) == n_parents already.
+            self.llamea_instance.population = evaluated
+
+        return self.llamea_instance.run()
@@ -29,6 +29,10 @@ from .phase1_config import (
     ELITISM,
     LLAMEA_BUDGET,
     MUTATION_PROMPTS,
+    STOP_ON_TARGET,
+    EVAL_TIMEOUT_MIN_COMPLETED,
+    EVAL_TIMEOUT_PENALTY,
+    EVAL_TIMEOUT_POLICY,
     RUN_SEEDS,
 )
 
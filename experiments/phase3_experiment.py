@@ -7,24 +7,24 @@ The module exposes:
   - run_condition()      — run all seeds for one condition
   - run_single_seed()    — run one (condition, seed) pair
   - main()               — CLI entry point
+
+As in ``phase1_experiment``, BLADE, LLaMEA and the LLM backends are imported
+only when a run starts, so ``--list`` and ``--summarise`` stay fast.
 """
 
 import argparse
-import os
 import sys
 import time
-from pathlib import Path
 
+from . import shutdown
 from .feedback import (
     make_comparative_feature_feedback,
     make_directional_feature_feedback,
     make_single_feature_feedback,
 )
-from .initial_population import get_initial_solutions
-from .mabbob_problem import MaBBOBProblem
 from .phase1_experiment import (
-    Phase1LLaMEA,
     make_llm,
+    summarise_results,
     summarise_run,
     write_summary_csv,
 )
@@ -36,6 +36,9 @@ from .phase3_config import (
     ELITISM,
     EVAL_SEEDS,
     EVAL_TIMEOUT,
+    EVAL_TIMEOUT_MIN_COMPLETED,
+    EVAL_TIMEOUT_PENALTY,
+    EVAL_TIMEOUT_POLICY,
     LLAMEA_BUDGET,
     MODEL_CFG,
     MODEL_TAG,
@@ -44,13 +47,11 @@ from .phase3_config import (
     N_PARENTS,
     RESULTS_DIR,
     RUN_SEEDS,
+    STOP_ON_TARGET,
     TRAINING_INSTANCES,
     get_conditions,
 )
 
-from iohblade.experiment import Experiment
-from iohblade.loggers import ExperimentLogger
-
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -73,6 +74,8 @@ def make_feedback_fn(condition_tag):
 def make_problem(condition_tag, use_worker_pool=True, eval_seeds=None,
                  training_instances=None, eval_timeout=None):
     """Create a MaBBOBProblem with the feedback formatter for this condition."""
+    from .mabbob_problem import MaBBOBProblem
+
     feedback_fn = make_feedback_fn(condition_tag)
     return MaBBOBProblem(
         make_feedback=feedback_fn,
@@ -83,17 +86,25 @@ def make_problem(condition_tag, use_worker_pool=True, eval_seeds=None,
         bbob_bounds=BBOB_BOUNDS,
         allowed_imports=ALLOWED_IMPORTS,
         use_worker_pool=use_worker_pool,
+        stop_on_target=STOP_ON_TARGET,
+        timeout_policy=EVAL_TIMEOUT_POLICY,
+        timeout_penalty=EVAL_TIMEOUT_PENALTY,
+        timeout_min_completed=EVAL_TIMEOUT_MIN_COMPLETED,
         eval_timeout=eval_timeout or EVAL_TIMEOUT,
     )
 
 
-def make_method(condition_tag, llm, budget=None, initial_solutions=None):
+def make_method(condition_tag, llm, budget=None, initial_solutions=None,
+                resume_dir=None):
     """Create a Phase1LLaMEA method for the given condition."""
+    from .phase1_method import Phase1LLaMEA
+
     return Phase1LLaMEA(
         llm=llm,
         budget=budget or LLAMEA_BUDGET,
         name=condition_tag,
         initial_solutions=initial_solutions,
+        resume_dir=resume_dir,
         n_parents=N_PARENTS,
         n_offspring=N_OFFSPRING,
         elitism=ELITISM,
@@ -123,9 +134,17 @@ def run_single_seed(
     Returns:
         str: path to the result directory.
     """
+    from iohblade.experiment import Experiment
+
+    from .initial_population import get_initial_solutions
+    from .resume import make_experiment_logger
+
     results_dir = results_dir or RESULTS_DIR
     result_dir = f"{results_dir}/{condition_tag}/seed-{seed}"
 
+    # Continue an interrupted run in place if it left a checkpoint
+    logger, resume_dir = make_experiment_logger(result_dir, budget or LLAMEA_BUDGET)
+
     llm = make_llm(MODEL_CFG)
     problem = make_problem(
         condition_tag,
@@ -137,9 +156,8 @@ def run_single_seed(
     initial_solutions = get_initial_solutions()
     method = make_method(
         condition_tag, llm, budget=budget, initial_solutions=initial_solutions,
+        resume_dir=resume_dir,
     )
-    os.makedirs(result_dir, exist_ok=True)
-    logger = ExperimentLogger(result_dir)
 
     experiment = Experiment(
         methods=[method],
@@ -160,7 +178,8 @@ def run_single_seed(
     print(f"  Results: {result_dir}")
     start = time.time()
 
-    experiment()
+    with shutdown.graceful():
+        experiment()
 
     elapsed = time.time() - start
     print(f"  Completed seed {seed} in {elapsed/3600:.2f}h")
@@ -177,15 +196,24 @@ def run_condition(
     use_worker_pool=True,
     show_stdout=True,
     results_dir=None,
+    skip_complete=False,
 ):
     """Run all seeds for one condition sequentially.
 
     Returns:
         list of result directory paths.
     """
+    from .resume import is_seed_complete
+
     seeds = seeds or RUN_SEEDS
+    results_dir = results_dir or RESULTS_DIR
     dirs = []
     for seed in seeds:
+        seed_dir = f"{results_dir}/{condition_tag}/seed-{seed}"
+        if skip_complete and is_seed_complete(seed_dir, budget or LLAMEA_BUDGET):
+            print(f"  SKIP {condition_tag}/seed-{seed} (already complete)")
+            continue
+        shutdown.exit_if_requested()
         d = run_single_seed(
             condition_tag=condition_tag,
             seed=seed,
@@ -291,6 +319,14 @@ examples:
         "--results-dir", type=str, default=None,
         help=f"Base results directory (default: {RESULTS_DIR})",
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processes used by --summarise (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--skip-complete", action="store_true",
+        help="Skip seeds whose results already reach the budget",
+    )
     args = parser.parse_args()
 
     if args.list:
@@ -300,12 +336,7 @@ examples:
     results_dir = args.results_dir or RESULTS_DIR
 
     if args.summarise:
-        base = Path(results_dir)
-        for cond_dir in sorted(base.iterdir()):
-            if not cond_dir.is_dir():
-                continue
-            for seed_dir in sorted(cond_dir.glob("seed-*")):
-                write_summary_csv(str(seed_dir))
+        summarise_results(results_dir, workers=args.workers)
         return
 
     if not args.conditions:
@@ -367,6 +398,7 @@ examples:
             use_worker_pool=not args.no_worker_pool,
             show_stdout=True,
             results_dir=results_dir,
+            skip_complete=args.skip_complete,
         )
 
         for d in result_dirs:
@@ -26,6 +26,10 @@ from .phase1_config import (
     N_OFFSPRING,
     ELITISM,
     MUTATION_PROMPTS,
+    STOP_ON_TARGET,
+    EVAL_TIMEOUT_MIN_COMPLETED,
+    EVAL_TIMEOUT_PENALTY,
+    EVAL_TIMEOUT_POLICY,
 )
 
 # Override Phase 1 timeout: 20 instances (2x Phase 1) + CPU contention headroom
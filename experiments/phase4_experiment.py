@@ -8,24 +8,25 @@ The module exposes:
   - run_single_seed()    — run one (condition, seed) pair
   - is_seed_complete()   — check if a seed has already finished
   - main()               — CLI entry point
+
+As in ``phase1_experiment``, BLADE, LLaMEA and the LLM backends are imported
+only when a run starts, so ``--list`` and ``--summarise`` stay fast.
 """
 
 import argparse
-import os
 import sys
 import time
 from pathlib import Path
 
+from . import shutdown
 from .feedback import (
     make_multi_feature_directional_feedback,
     make_multi_feature_neutral_feedback,
     vanilla_feedback,
 )
-from .initial_population import get_initial_solutions
-from .mabbob_problem import MaBBOBProblem
 from .phase1_experiment import (
-    Phase1LLaMEA,
     make_llm,
+    summarise_results,
     summarise_run,
     write_summary_csv,
 )
@@ -39,6 +40,9 @@ from .phase4_config import (
     ELITISM,
     EVAL_SEEDS,
     EVAL_TIMEOUT,
+    EVAL_TIMEOUT_MIN_COMPLETED,
+    EVAL_TIMEOUT_PENALTY,
+    EVAL_TIMEOUT_POLICY,
     LLAMEA_BUDGET,
     MODEL_CFG,
     MODEL_TAG,
@@ -48,12 +52,10 @@ from .phase4_config import (
     NEUTRAL_FEATURES,
     RESULTS_DIR,
     RUN_SEEDS,
+    STOP_ON_TARGET,
     TRAINING_INSTANCES,
 )
 
-from iohblade.experiment import Experiment
-from iohblade.loggers import ExperimentLogger
-
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -72,6 +74,8 @@ def make_feedback_fn(condition_tag):
 def make_problem(condition_tag, use_worker_pool=True, eval_seeds=None,
                  training_instances=None, eval_timeout=None):
     """Create a MaBBOBProblem with the feedback formatter for this condition."""
+    from .mabbob_problem import MaBBOBProblem
+
     feedback_fn = make_feedback_fn(condition_tag)
     return MaBBOBProblem(
         make_feedback=feedback_fn,
@@ -82,6 +86,10 @@ def make_problem(condition_tag, use_worker_pool=True, eval_seeds=None,
         bbob_bounds=BBOB_BOUNDS,
         allowed_imports=ALLOWED_IMPORTS,
         use_worker_pool=use_worker_pool,
+        stop_on_target=STOP_ON_TARGET,
+        timeout_policy=EVAL_TIMEOUT_POLICY,
+        timeout_penalty=EVAL_TIMEOUT_PENALTY,
+        timeout_min_completed=EVAL_TIMEOUT_MIN_COMPLETED,
         eval_timeout=eval_timeout or EVAL_TIMEOUT,
     )
 
@@ -89,6 +97,8 @@ def make_problem(condition_tag, use_worker_pool=True, eval_seeds=None,
 def make_method(condition_tag, llm, budget=None, initial_solutions=None,
                 resume_dir=None):
     """Create a Phase1LLaMEA method for the given condition."""
+    from .phase1_method import Phase1LLaMEA
+
     spec = CONDITIONS[condition_tag]
     return Phase1LLaMEA(
         llm=llm,
@@ -106,53 +116,27 @@ def make_method(condition_tag, llm, budget=None, initial_solutions=None,
 
 
 def _find_resume_dir(results_dir, condition_tag, seed, budget=None):
-    """Find an incomplete run directory with a pickle checkpoint to resume from.
+    """Find an incomplete run directory with a checkpoint to resume from.
 
     Returns the run directory path if a resumable checkpoint exists, else None.
     """
-    budget = budget or LLAMEA_BUDGET
+    from .resume import find_resume_dir
+
     seed_dir = Path(results_dir) / condition_tag / f"seed-{seed}"
-    best_candidate = None
-    best_count = 0
-    for run_dir in seed_dir.glob("run-*"):
-        pkl = run_dir / "llamea_config.pkl"
-        log = run_dir / "log.jsonl"
-        if not pkl.is_file():
-            continue
-        count = 0
-        if log.is_file():
-            with open(log) as f:
-                count = sum(1 for _ in f)
-        # Skip already-complete runs
-        if count >= budget:
-            continue
-        # Pick the run with the most progress
-        if count > best_count:
-            best_count = count
-            best_candidate = str(run_dir)
-    return best_candidate
+    return find_resume_dir(seed_dir, budget or LLAMEA_BUDGET)
 
 
 def is_seed_complete(results_dir, condition_tag, seed, budget=None):
     """Check if a (condition, seed) run is already complete.
 
-    A run is complete if any single run directory's log.jsonl has >= budget
-    lines, OR if the total across all run directories (from resume) reaches
-    the budget.
+    Counts distinct candidates across all run directories of the seed, so
+    results from older resumes that started a new ``run-*`` directory are
+    summed without double-counting.
     """
-    budget = budget or LLAMEA_BUDGET
+    from . import resume
+
     seed_dir = Path(results_dir) / condition_tag / f"seed-{seed}"
-    total = 0
-    for log_file in seed_dir.glob("run-*/log.jsonl"):
-        try:
-            with open(log_file) as f:
-                count = sum(1 for _ in f)
-            if count >= budget:
-                return True
-            total += count
-        except OSError:
-            pass
-    return total >= budget
+    return resume.is_seed_complete(seed_dir, budget or LLAMEA_BUDGET)
 
 
 # ---------------------------------------------------------------------------
@@ -175,13 +159,16 @@ def run_single_seed(
     Returns:
         str: path to the result directory.
     """
+    from iohblade.experiment import Experiment
+
+    from .initial_population import get_initial_solutions
+    from .resume import make_experiment_logger
+
     results_dir = results_dir or RESULTS_DIR
     result_dir = f"{results_dir}/{condition_tag}/seed-{seed}"
 
-    # Check for a resumable checkpoint from a previous interrupted run
-    resume_dir = _find_resume_dir(results_dir, condition_tag, seed, budget)
-    if resume_dir:
-        print(f"  Found checkpoint to resume: {resume_dir}")
+    # Continue an interrupted run in place if it left a checkpoint
+    logger, resume_dir = make_experiment_logger(result_dir, budget or LLAMEA_BUDGET)
 
     llm = make_llm(MODEL_CFG)
     problem = make_problem(
@@ -196,8 +183,6 @@ def run_single_seed(
         condition_tag, llm, budget=budget, initial_solutions=initial_solutions,
         resume_dir=resume_dir,
     )
-    os.makedirs(result_dir, exist_ok=True)
-    logger = ExperimentLogger(result_dir)
 
     experiment = Experiment(
         methods=[method],
@@ -220,7 +205,8 @@ def run_single_seed(
     print(f"  Results: {result_dir}")
     start = time.time()
 
-    experiment()
+    with shutdown.graceful():
+        experiment()
 
     elapsed = time.time() - start
     print(f"  Completed seed {seed} in {elapsed/3600:.2f}h")
@@ -251,6 +237,7 @@ def run_condition(
         if skip_complete and is_seed_complete(results_dir, condition_tag, seed, budget):
             print(f"  SKIP {condition_tag}/seed-{seed} (already complete)")
             continue
+        shutdown.exit_if_requested()
         d = run_single_seed(
             condition_tag=condition_tag,
             seed=seed,
@@ -350,6 +337,10 @@ examples:
         "--results-dir", type=str, default=None,
         help=f"Base results directory (default: {RESULTS_DIR})",
     )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processes used by --summarise (default: one per CPU)",
+    )
     args = parser.parse_args()
 
     if args.list:
@@ -359,12 +350,7 @@ examples:
     results_dir = args.results_dir or RESULTS_DIR
 
     if args.summarise:
-        base = Path(results_dir)
-        for cond_dir in sorted(base.iterdir()):
-            if not cond_dir.is_dir():
-                continue
-            for seed_dir in sorted(cond_dir.glob("seed-*")):
-                write_summary_csv(str(seed_dir))
+        summarise_results(results_dir, workers=args.workers)
         return
 
     if not args.conditions:
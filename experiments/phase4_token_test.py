@@ -23,15 +23,11 @@ import sys
 import time
 from pathlib import Path
 
-from google import genai
-from google.genai import types
-
 from .phase4_experiment import (
     make_feedback_fn,
     make_problem,
 )
-from .phase1_experiment import Phase1LLaMEA, make_llm
-from .initial_population import get_initial_solutions
+from .phase1_experiment import make_llm
 from .phase4_config import (
     CONDITIONS,
     MODEL_CFG,
@@ -43,157 +39,63 @@ from .phase4_config import (
     TRAINING_INSTANCES,
 )
 
-from iohblade.experiment import Experiment
-from iohblade.llm import Gemini_LLM
-from iohblade.loggers import ExperimentLogger
-
 
 # ---------------------------------------------------------------------------
 # Thinking configurations to test
 # ---------------------------------------------------------------------------
+# Thinking budgets; turned into google.genai ThinkingConfig objects by
+# token_tracking_llm.make_thinking_config when a config runs.
 THINKING_CONFIGS = {
     "default": None,  # no thinking_config at all
-    "disabled": types.ThinkingConfig(thinking_budget=0),
-    "minimal": types.ThinkingConfig(thinking_budget=1024),
-    "medium": types.ThinkingConfig(thinking_budget=8192),
+    "disabled": 0,
+    "minimal": 1024,
+    "medium": 8192,
 }
 
 
-# ---------------------------------------------------------------------------
-# Token-tracking wrapper
-# ---------------------------------------------------------------------------
-class TokenTrackingGeminiLLM(Gemini_LLM):
-    """Gemini LLM that captures per-call token usage metadata."""
-
-    def __init__(self, *args, thinking_config=None, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.thinking_config = thinking_config
-        self.call_log = []  # list of dicts with token counts per call
-
-    def _query(self, session_messages, max_retries=5, default_delay=10, **kwargs):
-        """Override to capture usage_metadata from each response."""
-        import re
-
-        history = [
-            {"role": m["role"], "parts": [m["content"]]} for m in session_messages[:-1]
-        ]
-        last = session_messages[-1]["content"]
-
-        attempt = 0
-        while True:
-            try:
-                config = self.generation_config.copy()
-                config.update(**kwargs)
-                # Inject thinking_config if set
-                if self.thinking_config is not None:
-                    config["thinking_config"] = self.thinking_config
-
-                chat = self.client.chats.create(
-                    model=self.model, history=history, config=config
-                )
-                response = chat.send_message(last)
-
-                # Capture token usage
-                usage = response.usage_metadata
-                entry = {
-                    "call_index": len(self.call_log),
-                    "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
-                    "candidates_tokens": getattr(usage, "candidates_token_count", 0) or 0,
-                    "thoughts_tokens": getattr(usage, "thoughts_token_count", 0) or 0,
-                    "total_tokens": getattr(usage, "total_token_count", 0) or 0,
-                    "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
-                }
-                # Measure visible output length
-                text = response.text
-                entry["visible_output_chars"] = len(text)
-                self.call_log.append(entry)
-
-                return text
-
-            except Exception as err:
-                attempt += 1
-                if attempt > max_retries:
-                    raise
-                delay = getattr(err, "retry_delay", None)
-                if delay is not None:
-                    wait = delay.seconds + 1
-                else:
-                    m = re.search(r"retry_delay\s*{\s*seconds:\s*(\d+)", str(err))
-                    wait = int(m.group(1)) if m else default_delay * attempt
-                time.sleep(wait)
-
-    def __getstate__(self):
-        state = super().__getstate__()
-        # thinking_config is a genai types object — not reliably picklable
-        # Store the budget int instead so we can reconstruct
-        tc = self.thinking_config
-        state["_thinking_budget_val"] = (
-            getattr(tc, "thinking_budget", None) if tc is not None else "NONE"
-        )
-        state.pop("thinking_config", None)
-        return state
-
-    def __setstate__(self, state):
-        budget_val = state.pop("_thinking_budget_val", "NONE")
-        super().__setstate__(state)
-        if budget_val == "NONE":
-            self.thinking_config = None
-        else:
-            self.thinking_config = types.ThinkingConfig(thinking_budget=budget_val)
-        if not hasattr(self, "call_log"):
-            self.call_log = []
-
-    def __deepcopy__(self, memo):
-        import copy
-        cls = self.__class__
-        new = cls.__new__(cls)
-        memo[id(self)] = new
-        for k, v in self.__dict__.items():
-            if k == "client":
-                continue
-            elif k == "thinking_config":
-                setattr(new, k, v)  # shared ref is fine, it's immutable
-            elif k == "call_log":
-                setattr(new, k, v)  # SHARE the list so copies log to same place
-            else:
-                setattr(new, k, copy.deepcopy(v, memo))
-        # Rebuild client
-        if getattr(new, 'vertexai', False):
-            new.client = genai.Client(
-                vertexai=True, project=new.project, location=new.location,
-            )
-        else:
-            new.client = genai.Client(api_key=new.api_key)
-        return new
+def __getattr__(name):
+    # TokenTrackingGeminiLLM used to be defined here; keep the old path working.
+    if name == "TokenTrackingGeminiLLM":
+        from .token_tracking_llm import TokenTrackingGeminiLLM
+        return TokenTrackingGeminiLLM
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 VERTEXAI_PROJECT = "thesis-mabbob-2026"
 VERTEXAI_LOCATION = "global"
 
 
-def make_tracking_llm(thinking_config=None):
+def make_tracking_llm(thinking_budget=None):
     """Create a TokenTrackingGeminiLLM using Vertex AI with ADC."""
+    from .token_tracking_llm import TokenTrackingGeminiLLM, make_thinking_config
+
     return TokenTrackingGeminiLLM(
         api_key="",
         model=MODEL_CFG["model"],
         vertexai=True,
         project=VERTEXAI_PROJECT,
         location=VERTEXAI_LOCATION,
-        thinking_config=thinking_config,
+        thinking_config=make_thinking_config(thinking_budget),
     )
 
 
 # ---------------------------------------------------------------------------
 # Run one thinking config
 # ---------------------------------------------------------------------------
-def run_config(config_name, thinking_config, budget=20, results_dir=None,
+def run_config(config_name, thinking_budget, budget=20, results_dir=None,
                condition_tag="vanilla", eval_seeds=None, training_instances=None,
                eval_timeout=None):
     """Run a mini LLaMEA experiment and return the token usage log."""
+    from iohblade.experiment import Experiment
+    from iohblade.loggers import ExperimentLogger
+
+    from .initial_population import get_initial_solutions
+    from .phase1_method import Phase1LLaMEA
+
     results_dir = results_dir or f"results_token_test/{config_name}"
     os.makedirs(results_dir, exist_ok=True)
 
-    llm = make_tracking_llm(thinking_config)
+    llm = make_tracking_llm(thinking_budget)
 
     spec = CONDITIONS[condition_tag]
     problem = make_problem(
@@ -434,12 +336,11 @@ def main():
 
     if args.list:
         print("Thinking configs:")
-        for name, cfg in THINKING_CONFIGS.items():
-            if cfg is None:
+        for name, thinking_budget in THINKING_CONFIGS.items():
+            if thinking_budget is None:
                 print(f"  {name:<12} — no thinking_config (model default)")
             else:
-                budget = getattr(cfg, "thinking_budget", "N/A")
-                print(f"  {name:<12} — thinking_budget={budget}")
+                print(f"  {name:<12} — thinking_budget={thinking_budget}")
         print("\nPhase 4 conditions:")
         for tag, spec in CONDITIONS.items():
             sage_str = " + SAGE" if spec["sage"] else ""
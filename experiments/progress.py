@@ -0,0 +1,370 @@
+"""O(1) run-progress records and a results-root index.
+
+Every run directory keeps a small ``progress.json`` that is rewritten
+atomically whenever a candidate is logged or a checkpoint is saved::
+
+    {"candidates": 137, "budget": 500, "best_fitness": 0.41,
+     "best_id": "...", "log_bytes": 9812345,
+     "checkpoint": {"generation": 137, "n_history": 137},
+     "complete": false, "updated": "2026-..."}
+
+and the results root keeps ``index.json`` mapping ``{tag}/seed-{seed}`` to
+the same summary for the most advanced run of that seed.
+
+Completion and resume checks read these files instead of counting the
+lines of multi-megabyte ``log.jsonl`` files.  A record is trusted only if
+``log_bytes`` still matches the size of ``log.jsonl`` (one ``stat``);
+otherwise the log is counted once and the record rewritten.  Trees written
+before this module existed can be indexed in one go with::
+
+    python -m experiments.progress rebuild results_phase3 results_phase4
+
+This module only depends on the standard library so the job runner and
+shell scripts can use it without importing BLADE.
+"""
+
+import argparse
+import fcntl
+import json
+import math
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROGRESS_FILE = "progress.json"
+INDEX_FILE = "index.json"
+
+# Files whose presence marks a resumable checkpoint (see experiments.checkpoint).
+_CHECKPOINT_FILES = ("llamea_config.pkl", "llamea_journal.pkl")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _atomic_write_json(path, data):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _finite(x):
+    try:
+        x = float(x)
+    except (TypeError, ValueError):
+        return None
+    return x if math.isfinite(x) else None
+
+
+def scan_log(log_path):
+    """Count distinct candidates in a ``log.jsonl`` (the slow path).
+
+    Returns:
+        dict with ``ids`` (ordered, de-duplicated), ``best_fitness``,
+        ``best_id`` and ``log_bytes``.
+    """
+    ids, seen = [], set()
+    best, best_id = None, None
+    log_bytes = 0
+    if os.path.isfile(log_path):
+        log_bytes = os.path.getsize(log_path)
+        with open(log_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                cid = entry.get("id")
+                if cid is None or cid in seen:
+                    continue
+                seen.add(cid)
+                ids.append(cid)
+                fit = _finite(entry.get("fitness"))
+                if fit is not None and (best is None or fit > best):
+                    best, best_id = fit, cid
+    return {"ids": ids, "best_fitness": best, "best_id": best_id,
+            "log_bytes": log_bytes}
+
+
+def has_checkpoint_files(run_dir):
+    return any(os.path.isfile(os.path.join(run_dir, name))
+               for name in _CHECKPOINT_FILES)
+
+
+def seed_key(run_dir):
+    """Return (results_root, "{tag}/seed-{n}") for a run directory.
+
+    Returns ``(None, None)`` if the directory is not laid out as
+    ``{results_root}/{tag}/seed-{n}/run-*``.
+    """
+    run_dir = Path(run_dir).resolve()
+    seed_dir = run_dir.parent
+    if not seed_dir.name.startswith("seed-"):
+        return None, None
+    return seed_dir.parent.parent, f"{seed_dir.parent.name}/{seed_dir.name}"
+
+
+# ---------------------------------------------------------------------------
+# Per-run progress
+# ---------------------------------------------------------------------------
+
+class RunProgress:
+    """In-process owner of one run directory's ``progress.json``.
+
+    Use ``RunProgress.for_dir(run_dir)`` so the run logger and the
+    checkpoint writer share a single instance.
+    """
+
+    _instances = {}
+
+    @classmethod
+    def for_dir(cls, run_dir, budget=None):
+        key = os.path.abspath(run_dir)
+        inst = cls._instances.get(key)
+        if inst is None:
+            inst = cls._instances[key] = cls(run_dir, budget=budget)
+        elif budget is not None:
+            inst.data["budget"] = int(budget)
+        return inst
+
+    @classmethod
+    def invalidate(cls, run_dir):
+        """Drop the cached instance after ``log.jsonl`` was rewritten."""
+        cls._instances.pop(os.path.abspath(run_dir), None)
+
+    def __init__(self, run_dir, budget=None):
+        self.run_dir = str(run_dir)
+        self.path = os.path.join(self.run_dir, PROGRESS_FILE)
+        self.log_path = os.path.join(self.run_dir, "log.jsonl")
+        scan = scan_log(self.log_path)
+        self._ids = set(scan["ids"])
+        previous = _read_json(self.path) or {}
+        self.data = {
+            "candidates": len(scan["ids"]),
+            "budget": int(budget) if budget is not None else previous.get("budget"),
+            "best_fitness": scan["best_fitness"],
+            "best_id": scan["best_id"],
+            "log_bytes": scan["log_bytes"],
+            "checkpoint": previous.get("checkpoint"),
+            "complete": False,
+            "updated": None,
+        }
+
+    def record_candidate(self, solution):
+        """Update after ``solution`` has been appended to ``log.jsonl``."""
+        cid = getattr(solution, "id", None)
+        if cid is not None and cid not in self._ids:
+            self._ids.add(cid)
+            self.data["candidates"] += 1
+            fit = _finite(getattr(solution, "fitness", None))
+            best = self.data["best_fitness"]
+            if fit is not None and (best is None or fit > best):
+                self.data["best_fitness"] = fit
+                self.data["best_id"] = cid
+        self.write()
+
+    def record_checkpoint(self, generation, n_history):
+        self.data["checkpoint"] = {"generation": int(generation),
+                                   "n_history": int(n_history)}
+        self.write()
+
+    def write(self):
+        d = self.data
+        d["log_bytes"] = (os.path.getsize(self.log_path)
+                          if os.path.isfile(self.log_path) else 0)
+        d["complete"] = bool(d["budget"]) and d["candidates"] >= d["budget"]
+        d["updated"] = datetime.now().isoformat(timespec="seconds")
+        _atomic_write_json(self.path, d)
+        root, key = seed_key(self.run_dir)
+        if root is not None:
+            update_index(root, key, dict(d, run_dir=os.path.basename(self.run_dir)))
+
+
+def read_run_progress(run_dir, budget=None):
+    """Return the progress record for ``run_dir``, rebuilding it if stale.
+
+    The fast path is one ``stat`` of ``log.jsonl`` plus reading
+    ``progress.json``.
+    """
+    log_path = os.path.join(run_dir, "log.jsonl")
+    log_bytes = os.path.getsize(log_path) if os.path.isfile(log_path) else 0
+    data = _read_json(os.path.join(run_dir, PROGRESS_FILE))
+    if data is not None and data.get("log_bytes") == log_bytes:
+        if budget is not None and data.get("budget") != budget:
+            data["budget"] = budget
+            data["complete"] = data["candidates"] >= budget
+        return data
+    if data is None and log_bytes == 0:
+        return {"candidates": 0, "budget": budget, "best_fitness": None,
+                "best_id": None, "log_bytes": 0, "checkpoint": None,
+                "complete": False}
+    prog = RunProgress(run_dir, budget=budget)
+    prog.write()
+    return prog.data
+
+
+def seed_summary(seed_dir, budget=None):
+    """Aggregate the run directories of one (tag, seed).
+
+    Older resumes started a new ``run-*`` directory.  A single directory is
+    counted from its ``progress.json``; when there are several, their logs
+    are scanned and the candidate ids merged, so a candidate logged in two
+    attempts is only counted once.
+
+    Returns:
+        dict with ``candidates``, ``best_fitness``, ``resume_dir`` (the
+        incomplete run with a checkpoint and the most candidates, or None)
+        and ``complete``.
+    """
+    run_dirs = [d for d in sorted(Path(seed_dir).glob("run-*")) if d.is_dir()]
+    total = 0
+    ids = set()
+    best = None
+    resume_dir, resume_count = None, 0
+    for run_dir in run_dirs:
+        data = read_run_progress(str(run_dir), budget=budget)
+        count = data["candidates"]
+        if len(run_dirs) > 1:
+            ids.update(scan_log(os.path.join(run_dir, "log.jsonl"))["ids"])
+        else:
+            total = count
+        fit = data.get("best_fitness")
+        if fit is not None and (best is None or fit > best):
+            best = fit
+        if (has_checkpoint_files(run_dir) and count > resume_count
+                and (budget is None or count < budget)):
+            resume_dir, resume_count = str(run_dir), count
+    if len(run_dirs) > 1:
+        total = len(ids)
+    return {
+        "candidates": total,
+        "best_fitness": best,
+        "resume_dir": resume_dir,
+        "complete": budget is not None and total >= budget,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Results-root index
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _locked(root):
+    lock_path = os.path.join(root, f"{INDEX_FILE}.lock")
+    with open(lock_path, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def read_index(results_root):
+    """Return the ``{key: entry}`` mapping of ``results_root/index.json``."""
+    return (_read_json(os.path.join(results_root, INDEX_FILE)) or {}).get("runs", {})
+
+
+def update_index(results_root, key, entry):
+    """Insert or replace one ``{tag}/seed-{n}`` entry under a file lock."""
+    results_root = str(results_root)
+    if not os.path.isdir(results_root):
+        return
+    path = os.path.join(results_root, INDEX_FILE)
+    with _locked(results_root):
+        index = _read_json(path) or {"runs": {}}
+        old = index["runs"].get(key)
+        # Keep the most advanced run of a seed when several run-* dirs exist.
+        if (old and old.get("run_dir") != entry.get("run_dir")
+                and old.get("candidates", 0) > entry.get("candidates", 0)):
+            return
+        index["runs"][key] = entry
+        index["updated"] = datetime.now().isoformat(timespec="seconds")
+        _atomic_write_json(path, index)
+
+
+def rebuild(results_root, budget=None):
+    """Recreate every run's ``progress.json`` and the root index from logs.
+
+    Returns:
+        int: number of run directories indexed.
+    """
+    root = Path(results_root)
+    n = 0
+    if not root.is_dir():
+        return n
+    for run_dir in sorted(root.glob("*/seed-*/run-*")):
+        if not run_dir.is_dir():
+            continue
+        run_budget = budget or _budget_from_blade(run_dir.parent)
+        RunProgress(run_dir, budget=run_budget).write()
+        n += 1
+    return n
+
+
+def _budget_from_blade(seed_dir):
+    """Read the run budget from BLADE's seed-level progress.json, if any."""
+    data = _read_json(os.path.join(seed_dir, PROGRESS_FILE)) or {}
+    for run in data.get("runs", []):
+        if run.get("budget"):
+            return int(run["budget"])
+    return None
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run-progress index: rebuild, show, or check completion",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("rebuild", help="Rebuild progress.json files and index.json")
+    p.add_argument("results_dirs", nargs="+")
+    p.add_argument("--budget", type=int, default=None,
+                   help="Budget to assume (default: read from BLADE progress.json)")
+
+    p = sub.add_parser("show", help="Print the index of a results directory")
+    p.add_argument("results_dir")
+
+    p = sub.add_parser("check", help="Exit 0 if a (tag, seed) is complete, else 1")
+    p.add_argument("results_dir")
+    p.add_argument("tag")
+    p.add_argument("seed", type=int)
+    p.add_argument("--budget", type=int, required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        for root in args.results_dirs:
+            n = rebuild(root, budget=args.budget)
+            print(f"{root}: indexed {n} run directories")
+        return 0
+
+    if args.command == "show":
+        for key, entry in sorted(read_index(args.results_dir).items()):
+            best = entry.get("best_fitness")
+            best = f"{best:.4f}" if best is not None else "-"
+            print(f"  {key:60s} {entry.get('candidates', 0):4d}/"
+                  f"{entry.get('budget') or '?':<4}  best={best}"
+                  f"{'  complete' if entry.get('complete') else ''}")
+        return 0
+
+    seed_dir = Path(args.results_dir) / args.tag / f"seed-{args.seed}"
+    return 0 if seed_summary(seed_dir, budget=args.budget)["complete"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
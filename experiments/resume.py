@@ -0,0 +1,242 @@
+"""Resume support shared by the Phase 1, 3 and 4 runners.
+
+A (condition, seed) result directory looks like::
+
+    {results_dir}/{tag}/seed-{seed}/
+        progress.json                  # BLADE ExperimentLogger
+        run-{tag}-{problem}-{seed}/    # one RunLogger directory
+            log.jsonl                  # one line per evaluated candidate
+            conversationlog.jsonl
+            llamea_*.pkl               # experiments.checkpoint files
+
+On restart the runner looks for a run directory with a checkpoint, restores
+the LLaMEA instance from it and keeps writing to the *same* run directory:
+
+- ``ResumableExperimentLogger`` hands BLADE a RunLogger bound to the
+  existing directory instead of creating ``run-...-1`` (and stops BLADE from
+  deleting the unfinished attempt).
+- ``reconcile_run_dir`` drops the log lines written after the last
+  checkpoint (the interrupted generation, which is redone) and any
+  duplicated candidate ids.  Dropped lines are kept in ``*.orphaned``.
+- The RNG states and LLM state stored with the checkpoint are restored.
+
+Older results with several ``run-*`` directories per seed (from the
+previous resume-into-a-new-directory behaviour) are still counted
+correctly: ``experiments.progress.seed_summary`` merges the candidate ids
+of all of them, so a candidate logged in two attempts is counted once.
+"""
+
+import json
+import os
+import random
+from pathlib import Path
+
+import numpy as np
+
+from iohblade.loggers import ExperimentLogger
+from iohblade.loggers.base import RunLogger
+
+from .checkpoint import read_checkpoint
+from .progress import RunProgress, read_run_progress, seed_summary
+
+ORPHAN_SUFFIX = ".orphaned"
+
+
+# ---------------------------------------------------------------------------
+# Progress on disk
+# ---------------------------------------------------------------------------
+
+def _line_id(line):
+    try:
+        return json.loads(line).get("id")
+    except (json.JSONDecodeError, AttributeError):
+        return None
+
+
+def candidate_ids(run_dir):
+    """Return the ordered, de-duplicated candidate ids in ``run_dir/log.jsonl``."""
+    log = Path(run_dir) / "log.jsonl"
+    ids = []
+    seen = set()
+    if not log.is_file():
+        return ids
+    with open(log) as f:
+        for line in f:
+            cid = _line_id(line)
+            if cid is None or cid in seen:
+                continue
+            seen.add(cid)
+            ids.append(cid)
+    return ids
+
+
+def seed_progress(seed_dir):
+    """Number of distinct candidates logged across all ``run-*`` directories."""
+    return seed_summary(seed_dir)["candidates"]
+
+
+def is_seed_complete(seed_dir, budget):
+    """True if the seed directory already holds ``budget`` distinct candidates."""
+    return seed_summary(seed_dir, budget=budget)["complete"]
+
+
+def find_resume_dir(seed_dir, budget):
+    """Find an incomplete run directory with a checkpoint to resume from.
+
+    Returns the run directory (str) with the most progress, or None.
+    """
+    return seed_summary(seed_dir, budget=budget)["resume_dir"]
+
+
+# ---------------------------------------------------------------------------
+# Restoring a run directory
+# ---------------------------------------------------------------------------
+
+def _move_tail(path, offset):
+    """Truncate ``path`` to ``offset`` bytes, appending the tail to the orphan file."""
+    if not path.is_file() or path.stat().st_size <= offset:
+        return 0
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        tail = fh.read()
+    with open(f"{path}{ORPHAN_SUFFIX}", "ab") as fh:
+        fh.write(tail)
+    with open(path, "r+b") as fh:
+        fh.truncate(offset)
+    return len(tail)
+
+
+def reconcile_run_dir(run_dir, run_history, offsets=None):
+    """Make the run directory's logs agree with a restored checkpoint.
+
+    ``log.jsonl`` keeps exactly one line per candidate in ``run_history``, in
+    file order; other lines (the interrupted generation, duplicates) are moved
+    to ``log.jsonl.orphaned``.  ``conversationlog.jsonl`` is truncated to the
+    size recorded with the checkpoint, if known.
+
+    Returns:
+        int: number of log lines moved out of ``log.jsonl``.
+    """
+    run_dir = Path(run_dir)
+    offsets = offsets or {}
+
+    conv = offsets.get("conversationlog.jsonl")
+    if conv is not None:
+        _move_tail(run_dir / "conversationlog.jsonl", conv)
+
+    log = run_dir / "log.jsonl"
+    if not log.is_file():
+        return 0
+    wanted = {getattr(s, "id", None) for s in run_history}
+    kept, dropped, seen = [], [], set()
+    with open(log) as f:
+        for line in f:
+            cid = _line_id(line)
+            if cid in wanted and cid not in seen:
+                seen.add(cid)
+                kept.append(line)
+            elif line.strip():
+                dropped.append(line)
+    if not dropped:
+        return 0
+    with open(f"{log}{ORPHAN_SUFFIX}", "a") as f:
+        f.writelines(dropped)
+    tmp = f"{log}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines(kept)
+    os.replace(tmp, log)
+    RunProgress.invalidate(run_dir)
+    return len(dropped)
+
+
+def restore(run_dir, llm=None):
+    """Load the checkpoint in ``run_dir`` and prepare to continue in place.
+
+    Reconciles the logs, restores the RNG states and, if the LLM supports
+    ``set_state()``, its state.
+
+    Returns:
+        The restored LLaMEA instance, or None if there is no usable checkpoint.
+    """
+    instance, meta = read_checkpoint(run_dir)
+    if instance is None:
+        return None
+    dropped = reconcile_run_dir(run_dir, instance.run_history, meta.get("offsets"))
+    if dropped:
+        print(f"  Resume: moved {dropped} log line(s) after the checkpoint "
+              f"to log.jsonl{ORPHAN_SUFFIX}")
+    rng = meta.get("rng")
+    if rng:
+        random.setstate(rng[0])
+        np.random.set_state(rng[1])
+    llm_state = meta.get("llm_state")
+    if llm_state is not None and hasattr(llm, "set_state"):
+        llm.set_state(llm_state)
+    return instance
+
+
+# ---------------------------------------------------------------------------
+# BLADE logger that continues an existing run directory
+# ---------------------------------------------------------------------------
+
+class _ProgressRunLogger(RunLogger):
+    """RunLogger that keeps the run's ``progress.json`` current."""
+
+    def log_individual(self, individual):
+        super().log_individual(individual)
+        RunProgress.for_dir(self.dirname, budget=self.budget).record_candidate(individual)
+
+
+class _ContinuedRunLogger(_ProgressRunLogger):
+    """RunLogger bound to an existing run directory."""
+
+    def __init__(self, dirname, budget=100, progress_callback=None):
+        self._existing = str(dirname)
+        super().__init__(name="", root_dir="", budget=budget,
+                         progress_callback=progress_callback)
+
+    def create_log_dir(self, name="", root_dir=""):
+        return self._existing
+
+
+class ResumableExperimentLogger(ExperimentLogger):
+    """ExperimentLogger that continues ``resume_dir`` instead of starting over.
+
+    BLADE's ``open_run`` would otherwise create a fresh ``run-...-N``
+    directory and delete the unfinished attempt it finds in progress.json.
+    """
+
+    def __init__(self, name="", resume_dir=None, **kwargs):
+        super().__init__(name, **kwargs)
+        self.resume_dir = str(resume_dir) if resume_dir else None
+
+    def _before_open_run(self, run_name, method, problem, budget, seed):
+        if not self.resume_dir:
+            return None
+        with self._lock:
+            entry = self._get_run_entry(method.name, problem.name, seed)
+            if entry is not None:
+                # Not an abandoned attempt: keep the directory.
+                entry["start_time"] = None
+                entry["evaluations"] = read_run_progress(self.resume_dir)["candidates"]
+        return None
+
+    def _create_run_logger(self, run_name, budget, progress_cb):
+        if self.resume_dir:
+            return _ContinuedRunLogger(self.resume_dir, budget=budget,
+                                       progress_callback=progress_cb)
+        return _ProgressRunLogger(name=run_name, root_dir=self.dirname,
+                                  budget=budget, progress_callback=progress_cb)
+
+
+def make_experiment_logger(seed_dir, budget):
+    """Create the experiment logger for a seed directory, resuming if possible.
+
+    Returns:
+        tuple: (logger, resume_dir) where ``resume_dir`` is None for a fresh run.
+    """
+    os.makedirs(seed_dir, exist_ok=True)
+    resume_dir = find_resume_dir(seed_dir, budget)
+    if resume_dir:
+        print(f"  Found checkpoint to resume: {resume_dir}")
+    return ResumableExperimentLogger(str(seed_dir), resume_dir=resume_dir), resume_dir
@@ -63,12 +63,12 @@ def make_method(name):
 
 
 def run_condition(condition_name, show_stdout=True,
-                  log_stdout=True, use_worker_pool=True):
+                  log_stdout=True, use_worker_pool=True, seeds=None):
     """Run a single condition using BLADE's Experiment.
 
     Results are saved to ``results/<condition_name>/`` with structured
     logging (experimentlog.jsonl, per-run directories with log.jsonl,
-    conversationlog.jsonl, progress.json).
+    conversationlog.jsonl, progress.json).  ``seeds`` defaults to ``[0]``.
     """
     cfg = CONDITIONS[condition_name]
 
@@ -80,7 +80,7 @@ def run_condition(condition_name, show_stdout=True,
         methods=[method],
         problems=[problem],
         budget=LLAMEA_BUDGET,
-        seeds=[0],
+        seeds=seeds or [0],
         show_stdout=show_stdout,
         log_stdout=log_stdout,
         exp_logger=logger,
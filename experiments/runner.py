@@ -0,0 +1,480 @@
+"""Job-matrix runner: fan (phase, condition, seed) runs out over one node.
+
+Replaces the bash fan-out in ``slurm/*.sbatch`` (``&`` + ``sleep`` stagger,
+``ls | head -1`` / ``wc -l`` completion checks, no retries) with a single
+Python process that:
+  - expands a job matrix of (phase, condition, seed, budget) entries
+  - classifies every job as complete / resumable / pending from the result tree
+  - runs pending and resumable jobs as subprocesses with a concurrency limit,
+    starting the next job as soon as a slot frees up
+  - retries jobs that exit before their budget is reached
+  - writes a machine-readable status file after every state change
+  - on SIGTERM/SIGUSR1 stops launching jobs, forwards SIGTERM to running
+    jobs (which checkpoint and exit, see ``experiments.shutdown``) and
+    exits with the requeue code 75
+
+Each job is executed through the phase's own CLI
+(``python -m experiments.phaseN_experiment <condition> --seeds <seed>``), so
+runs launched by the runner are identical to runs launched by hand.
+
+The module exposes:
+  - build_matrix()   — expand phases/conditions/seeds into job dicts
+  - load_matrix()    — read a JSON job matrix file
+  - job_state()      — classify one job from its result directory
+  - run_matrix()     — execute a job matrix
+  - main()           — CLI entry point
+"""
+
+import argparse
+import importlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from . import shutdown
+from .progress import seed_summary
+
+_THESIS_ROOT = Path(__file__).resolve().parents[1]
+
+# ---------------------------------------------------------------------------
+# Phase registry
+# ---------------------------------------------------------------------------
+# Each phase maps to the module whose CLI runs a single (condition, seed) and
+# the config module that defines its conditions, seeds, budget and results dir.
+PHASES = {
+    "phase1": {
+        "module": "experiments.phase1_experiment",
+        "config": "experiments.phase1_config",
+        "conditions": lambda cfg: list(cfg.CANDIDATE_MODELS),
+    },
+    "phase3": {
+        "module": "experiments.phase3_experiment",
+        "config": "experiments.phase3_config",
+        "conditions": lambda cfg: list(cfg.get_conditions()),
+    },
+    "phase4": {
+        "module": "experiments.phase4_experiment",
+        "config": "experiments.phase4_config",
+        "conditions": lambda cfg: list(cfg.CONDITIONS),
+    },
+}
+
+# Job states written to the status file
+PENDING = "pending"
+RESUMABLE = "resumable"
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _phase_config(phase):
+    if phase not in PHASES:
+        raise ValueError(f"Unknown phase {phase!r} (valid: {', '.join(PHASES)})")
+    return importlib.import_module(PHASES[phase]["config"])
+
+
+def job_key(job):
+    """Stable identifier for a job: ``{phase}/{condition}/seed-{seed}``."""
+    return f"{job['phase']}/{job['condition']}/seed-{job['seed']}"
+
+
+# ---------------------------------------------------------------------------
+# Matrix construction
+# ---------------------------------------------------------------------------
+
+def resolve_conditions(phase, requested):
+    """Expand ``all`` and Phase 3 format groups into explicit condition tags."""
+    cfg = _phase_config(phase)
+    known = PHASES[phase]["conditions"](cfg)
+    if not requested or requested == ["all"]:
+        return known
+    if phase == "phase3" and len(requested) == 1 and requested[0] in cfg.FEEDBACK_FORMATS:
+        return [t for t in known if t.startswith(f"{requested[0]}-")]
+    return list(requested)
+
+
+def build_matrix(phase, conditions=None, seeds=None, budget=None, results_dir=None):
+    """Expand one phase's (condition x seed) grid into a list of job dicts.
+
+    Args:
+        phase: key into PHASES ("phase1", "phase3", "phase4").
+        conditions: condition/model tags, ``["all"]`` or None for every condition.
+        seeds: run seeds; defaults to the phase's RUN_SEEDS.
+        budget: candidates per run; defaults to the phase's LLAMEA_BUDGET.
+        results_dir: results root; defaults to the phase's RESULTS_DIR.
+
+    Returns:
+        list of dicts with keys phase, condition, seed, budget, results_dir.
+    """
+    cfg = _phase_config(phase)
+    seeds = seeds if seeds is not None else cfg.RUN_SEEDS
+    budget = budget or cfg.LLAMEA_BUDGET
+    results_dir = results_dir or cfg.RESULTS_DIR
+    return [
+        {
+            "phase": phase,
+            "condition": cond,
+            "seed": int(seed),
+            "budget": int(budget),
+            "results_dir": str(results_dir),
+        }
+        for cond in resolve_conditions(phase, conditions)
+        for seed in seeds
+    ]
+
+
+def load_matrix(path):
+    """Read a JSON job matrix.
+
+    The file holds a list of entries, each expanded with build_matrix()::
+
+        [
+          {"phase": "phase4", "conditions": ["vanilla", "neutral"], "seeds": [0, 1, 2, 3, 4]},
+          {"phase": "phase4", "conditions": ["sage"], "seeds": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+           "budget": 500}
+        ]
+    """
+    with open(path) as f:
+        entries = json.load(f)
+    jobs = []
+    for entry in entries:
+        jobs.extend(build_matrix(
+            entry["phase"],
+            conditions=entry.get("conditions"),
+            seeds=entry.get("seeds"),
+            budget=entry.get("budget"),
+            results_dir=entry.get("results_dir"),
+        ))
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# Result-tree inspection
+# ---------------------------------------------------------------------------
+
+def job_state(job):
+    """Classify a job from its seed directory.
+
+    Returns:
+        (state, candidates): state is COMPLETE when the logged candidates across
+        all ``run-*`` directories reach the budget, RESUMABLE when a run has a
+        checkpoint to continue from, otherwise PENDING.  Reads the per-run
+        ``progress.json`` records (see ``experiments.progress``).
+    """
+    seed_dir = Path(job["results_dir"]) / job["condition"] / f"seed-{job['seed']}"
+    summary = seed_summary(seed_dir, budget=job["budget"])
+    total = summary["candidates"]
+    if summary["complete"]:
+        return COMPLETE, total
+    if summary["resume_dir"]:
+        return RESUMABLE, total
+    return PENDING, total
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def job_command(job, extra_args=()):
+    """Build the phase CLI invocation for one job."""
+    return [
+        sys.executable, "-m", PHASES[job["phase"]]["module"],
+        job["condition"],
+        "--seeds", str(job["seed"]),
+        "--budget", str(job["budget"]),
+        "--results-dir", job["results_dir"],
+        *extra_args,
+    ]
+
+
+def write_status(path, status):
+    """Atomically write the status dict as JSON."""
+    status["updated"] = _now()
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp, path)
+
+
+def run_matrix(
+    jobs,
+    max_concurrent=4,
+    retries=2,
+    retry_delay=30.0,
+    stagger=0.0,
+    status_file=None,
+    log_dir="logs/runner",
+    extra_args=(),
+    poll_interval=5.0,
+    dry_run=False,
+    child_grace=None,
+):
+    """Run every incomplete job in ``jobs``.
+
+    Args:
+        jobs: list of job dicts (see build_matrix()).
+        max_concurrent: maximum number of jobs running at once.
+        retries: extra attempts for a job that exits before reaching its budget.
+        retry_delay: seconds to wait before a failed job is eligible again.
+        stagger: minimum seconds between two job starts (spreads API bursts).
+        status_file: JSON status path (default: ``{log_dir}/status.json``).
+        log_dir: directory for per-job stdout/stderr logs.
+        extra_args: additional arguments forwarded to every phase CLI call.
+        poll_interval: seconds between process polls.
+        dry_run: only classify jobs and print the commands.
+        child_grace: after a shutdown signal, seconds to wait for running
+            jobs to checkpoint and exit before killing them (default: the
+            jobs' own ``SHUTDOWN_GRACE`` plus 60 s).
+
+    Returns:
+        dict: the final status (also written to ``status_file``).
+    """
+    if child_grace is None:
+        child_grace = shutdown.DEFAULT_GRACE + 60
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    status_file = status_file or str(log_dir / "status.json")
+
+    status = {"started": _now(), "max_concurrent": max_concurrent, "jobs": {}}
+    queue = []
+    for job in jobs:
+        state, count = job_state(job)
+        key = job_key(job)
+        status["jobs"][key] = {
+            **job,
+            "state": state,
+            "candidates": count,
+            "attempts": 0,
+            "returncode": None,
+            "started": None,
+            "ended": None,
+            "log": str(log_dir / f"{key.replace('/', '-')}.log"),
+        }
+        if state == COMPLETE:
+            print(f"  SKIP {key} (already complete, {count} candidates)")
+        else:
+            queue.append(job)
+            print(f"  QUEUE {key} ({state}, {count}/{job['budget']} candidates)")
+
+    if dry_run:
+        for job in queue:
+            print("  " + " ".join(job_command(job, extra_args)))
+        return status
+
+    write_status(status_file, status)
+    print(f"\nRunner: {len(queue)} job(s) to run, {max_concurrent} slot(s), "
+          f"{retries} retr{'y' if retries == 1 else 'ies'}")
+
+    running = {}        # key -> (Popen, log file handle)
+    not_before = {}     # key -> earliest restart time after a failure
+    last_start = 0.0
+    stopping_since = None
+
+    while (queue and stopping_since is None) or running:
+        # --- Shutdown: stop launching, forward the signal, bound the wait ---
+        if shutdown.requested():
+            if stopping_since is None:
+                stopping_since = time.monotonic()
+                print(f"[{_now()}] SHUTDOWN: forwarding SIGTERM to "
+                      f"{len(running)} job(s), not starting {len(queue)} queued")
+                for _, proc, _ in running.values():
+                    proc.send_signal(signal.SIGTERM)
+            elif time.monotonic() - stopping_since > child_grace:
+                for key, (_, proc, _) in running.items():
+                    if proc.poll() is None:
+                        print(f"[{_now()}] KILL  {key} (grace window exceeded)")
+                        proc.kill()
+
+        # --- Fill free slots ---
+        now = time.monotonic()
+        for job in ([] if stopping_since is not None else list(queue)):
+            if len(running) >= max_concurrent:
+                break
+            key = job_key(job)
+            if not_before.get(key, 0.0) > now:
+                continue
+            if stagger and now - last_start < stagger:
+                break
+            entry = status["jobs"][key]
+            entry["attempts"] += 1
+            entry["state"] = RUNNING
+            entry["started"] = _now()
+            entry["ended"] = None
+            log_fh = open(entry["log"], "a")
+            log_fh.write(f"\n=== attempt {entry['attempts']} at {entry['started']} ===\n")
+            log_fh.flush()
+            proc = subprocess.Popen(
+                job_command(job, extra_args),
+                cwd=str(_THESIS_ROOT),
+                stdout=log_fh,
+                stderr=subprocess.STDOUT,
+            )
+            running[key] = (job, proc, log_fh)
+            queue.remove(job)
+            last_start = now = time.monotonic()
+            print(f"[{_now()}] START {key} (attempt {entry['attempts']}, pid {proc.pid})")
+            write_status(status_file, status)
+
+        # --- Reap finished jobs ---
+        changed = False
+        for key, (job, proc, log_fh) in list(running.items()):
+            rc = proc.poll()
+            if rc is None:
+                continue
+            log_fh.close()
+            del running[key]
+            changed = True
+            entry = status["jobs"][key]
+            state, count = job_state(job)
+            entry["returncode"] = rc
+            entry["candidates"] = count
+            entry["ended"] = _now()
+            if state == COMPLETE:
+                entry["state"] = COMPLETE
+                print(f"[{_now()}] DONE  {key} ({count} candidates)")
+            elif stopping_since is not None:
+                # Stopped by our own shutdown, not failed: does not use up a
+                # retry.  A child exiting 75 on its own (watchdog, external
+                # kill) is retried below like any other failure.
+                entry["attempts"] -= 1
+                entry["state"] = state
+                print(f"[{_now()}] STOP  {key} (rc={rc}, {count}/{job['budget']} "
+                      f"candidates, resumable)")
+            elif entry["attempts"] <= retries:
+                entry["state"] = state
+                not_before[key] = time.monotonic() + retry_delay
+                queue.append(job)
+                print(f"[{_now()}] RETRY {key} (rc={rc}, {count}/{job['budget']} "
+                      f"candidates, attempt {entry['attempts']}/{retries + 1})")
+            else:
+                entry["state"] = FAILED
+                print(f"[{_now()}] FAIL  {key} (rc={rc}, {count}/{job['budget']} candidates)")
+
+        if changed:
+            write_status(status_file, status)
+        if (queue and stopping_since is None) or running:
+            time.sleep(poll_interval)
+
+    status["ended"] = _now()
+    status["interrupted"] = stopping_since is not None
+    write_status(status_file, status)
+
+    counts = {}
+    for entry in status["jobs"].values():
+        counts[entry["state"]] = counts.get(entry["state"], 0) + 1
+    print(f"\nRunner finished: " + ", ".join(f"{n} {s}" for s, n in sorted(counts.items())))
+    print(f"  Status: {status_file}")
+    return status
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a (phase x condition x seed) job matrix with a concurrency limit",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""\
+examples:
+  # All Phase 4 conditions x 10 seeds, 60 concurrent runs
+  python run_matrix.py phase4 all --max-concurrent 60
+
+  # Show what would run
+  python run_matrix.py phase4 all --dry-run
+
+  # Phase 3 neutral conditions, seeds 0-4
+  python run_matrix.py phase3 neutral --seeds 0 1 2 3 4
+
+  # Heterogeneous matrix from a JSON file
+  python run_matrix.py --matrix slurm/phase4_matrix.json --max-concurrent 30
+
+  # Forward extra arguments to every phase CLI call (after --)
+  python run_matrix.py phase1 qwen3.5-4b --max-concurrent 5 -- \\
+      --custom-vllm Qwen/Qwen3.5-4B --vllm-base-url http://localhost:8000/v1
+""",
+    )
+    parser.add_argument("phase", nargs="?", choices=list(PHASES), help="Phase to run")
+    parser.add_argument(
+        "conditions", nargs="*",
+        help="Condition/model tag(s), 'all', or a Phase 3 format group (e.g. 'neutral')",
+    )
+    parser.add_argument("--matrix", type=str, default=None,
+                        help="JSON job matrix file (overrides phase/conditions/seeds)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=None,
+                        help="Run seeds (default: the phase's RUN_SEEDS)")
+    parser.add_argument("--budget", type=int, default=None,
+                        help="Candidates per run (default: the phase's LLAMEA_BUDGET)")
+    parser.add_argument("--results-dir", type=str, default=None,
+                        help="Results root (default: the phase's RESULTS_DIR)")
+    parser.add_argument("--max-concurrent", type=int, default=4,
+                        help="Maximum simultaneously running jobs (default: 4)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Extra attempts for jobs that stop before their budget (default: 2)")
+    parser.add_argument("--retry-delay", type=float, default=30.0,
+                        help="Seconds before a failed job is restarted (default: 30)")
+    parser.add_argument("--stagger", type=float, default=0.0,
+                        help="Minimum seconds between job starts (default: 0)")
+    parser.add_argument("--status-file", type=str, default=None,
+                        help="Status JSON path (default: <log-dir>/status.json)")
+    parser.add_argument("--log-dir", type=str, default="logs/runner",
+                        help="Per-job log directory (default: logs/runner)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Classify jobs and print commands without running them")
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    extra_args = []
+    if "--" in argv:
+        idx = argv.index("--")
+        argv, extra_args = argv[:idx], argv[idx + 1:]
+    args = parser.parse_args(argv)
+
+    if args.matrix:
+        jobs = load_matrix(args.matrix)
+    elif args.phase:
+        jobs = build_matrix(
+            args.phase,
+            conditions=args.conditions,
+            seeds=args.seeds,
+            budget=args.budget,
+            results_dir=args.results_dir,
+        )
+        custom_model = any(a.startswith("--custom-") for a in extra_args)
+        known = resolve_conditions(args.phase, ["all"])
+        unknown = sorted({j["condition"] for j in jobs} - set(known))
+        if unknown and not custom_model:
+            print(f"ERROR: unknown {args.phase} condition(s): {', '.join(unknown)}",
+                  file=sys.stderr)
+            sys.exit(1)
+    else:
+        parser.error("Provide a phase or --matrix")
+
+    shutdown.install(force_exit=False)
+    status = run_matrix(
+        jobs,
+        max_concurrent=args.max_concurrent,
+        retries=args.retries,
+        retry_delay=args.retry_delay,
+        stagger=args.stagger,
+        status_file=args.status_file,
+        log_dir=args.log_dir,
+        extra_args=extra_args,
+        dry_run=args.dry_run,
+    )
+    if status.get("interrupted"):
+        sys.exit(shutdown.REQUEUE_EXIT_CODE)
+    if any(e["state"] == FAILED for e in status["jobs"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
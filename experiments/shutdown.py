@@ -0,0 +1,174 @@
+"""Graceful shutdown on SLURM preemption / time-limit signals.
+
+SLURM sends SIGTERM (or the signal chosen with ``--signal``) some time
+before killing a job.  Without handling, the phase runner and its
+evaluation subprocesses die mid-candidate.  With ``graceful()`` installed:
+
+1. The signal only sets a flag.  No new LLM call is started
+   (``GatedLLM`` raises ``ShutdownRequested`` instead of querying).
+2. The candidate already in flight is evaluated to completion, the
+   generation's delta checkpoint is written, and the run stops at that
+   generation boundary (``check()`` is called right after the checkpoint).
+3. If that does not happen within the grace window, a watchdog runs the
+   registered flush hooks and exits anyway; the last checkpoint is then at
+   most one generation old.
+4. The process exits with ``REQUEUE_EXIT_CODE`` (75, EX_TEMPFAIL).  The job
+   runner treats it as "interrupted, resume later" rather than a failure,
+   and the sbatch scripts requeue the job.
+
+Signals are best delivered to the Python processes only (``#SBATCH
+--signal=B:USR1@...`` plus a trap forwarding to the runner), so the
+evaluation workers are not killed along with the job step.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+REQUEUE_EXIT_CODE = 75
+
+# Seconds between the signal and the forced exit.
+DEFAULT_GRACE = float(os.environ.get("SHUTDOWN_GRACE", 480))
+
+_requested = threading.Event()
+_state = {"signal": None, "at": None, "grace": DEFAULT_GRACE, "installed": False}
+_flush_hooks = []
+
+
+class ShutdownRequested(BaseException):
+    """Raised at a safe point once a shutdown signal has been received.
+
+    Derives from BaseException so LLaMEA's broad ``except Exception``
+    handlers around LLM calls and evaluations do not swallow it.
+    """
+
+
+def requested():
+    """True once a shutdown signal has been received."""
+    return _requested.is_set()
+
+
+def check():
+    """Raise ShutdownRequested if a shutdown signal has been received."""
+    if _requested.is_set():
+        raise ShutdownRequested(_state["signal"])
+
+
+def register_flush(fn):
+    """Register a callable run before a forced exit (newest first)."""
+    _flush_hooks.append(fn)
+    return fn
+
+
+def unregister_flush(fn):
+    if fn in _flush_hooks:
+        _flush_hooks.remove(fn)
+
+
+def flush():
+    """Run the flush hooks, ignoring their errors."""
+    for fn in reversed(list(_flush_hooks)):
+        try:
+            fn()
+        except Exception as e:
+            print(f"  [shutdown] flush hook failed: {e}", file=sys.stderr)
+
+
+def _watchdog(grace):
+    if _requested.wait():
+        time.sleep(grace)
+        print(f"  [shutdown] grace window of {grace:.0f}s elapsed, forcing exit",
+              file=sys.stderr, flush=True)
+        flush()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(REQUEUE_EXIT_CODE)
+
+
+def _handler(signum, frame):
+    if _requested.is_set():
+        return
+    _state["signal"] = signal.Signals(signum).name
+    _state["at"] = time.time()
+    print(f"\n  [shutdown] received {_state['signal']}: finishing the current "
+          f"candidate, then checkpointing (grace {_state['grace']:.0f}s)",
+          file=sys.stderr, flush=True)
+    _requested.set()
+
+
+def install(grace=None, force_exit=True, signals=(signal.SIGTERM, signal.SIGUSR1)):
+    """Install the signal handlers and the grace-window watchdog (idempotent).
+
+    Must be called from the main thread.
+
+    Args:
+        grace: seconds before the forced exit (default: ``SHUTDOWN_GRACE``
+            env var, 480).
+        force_exit: start the watchdog that exits after ``grace``.  The job
+            runner disables it and manages its children's grace itself.
+        signals: signals to handle.
+    """
+    if _state["installed"]:
+        return
+    _state["grace"] = DEFAULT_GRACE if grace is None else grace
+    for sig in signals:
+        signal.signal(sig, _handler)
+    if force_exit:
+        threading.Thread(target=_watchdog, args=(_state["grace"],),
+                         name="shutdown-watchdog", daemon=True).start()
+    _state["installed"] = True
+
+
+def exit_for_requeue():
+    """Flush and exit with the requeue exit code."""
+    flush()
+    print(f"  [shutdown] stopped after {_state['signal'] or 'request'}; "
+          f"exiting with code {REQUEUE_EXIT_CODE} for requeue", flush=True)
+    sys.exit(REQUEUE_EXIT_CODE)
+
+
+@contextmanager
+def graceful(grace=None):
+    """Install the handlers and turn ShutdownRequested into a requeue exit."""
+    install(grace=grace)
+    try:
+        yield
+    except ShutdownRequested:
+        exit_for_requeue()
+
+
+def exit_if_requested():
+    """Between runs: exit for requeue instead of starting the next one."""
+    if requested():
+        exit_for_requeue()
+
+
+class GatedLLM:
+    """Proxy around an LLM that refuses new queries after a shutdown signal.
+
+    Everything except ``query``/``sample_solution`` is delegated to the
+    wrapped LLM.
+    """
+
+    def __init__(self, llm):
+        self.__dict__["_llm"] = llm
+
+    def query(self, *args, **kwargs):
+        check()
+        return self._llm.query(*args, **kwargs)
+
+    def sample_solution(self, *args, **kwargs):
+        check()
+        return self._llm.sample_solution(*args, **kwargs)
+
+    def __getattr__(self, name):
+        llm = self.__dict__.get("_llm")
+        if llm is None:
+            raise AttributeError(name)
+        return getattr(llm, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._llm, name, value)
@@ -0,0 +1,375 @@
+"""Local stand-in for the Ollama and OpenAI-compatible (vLLM) LLM servers.
+
+``tests/test_phase1_sanity.py`` uses BLADE's in-process ``Dummy_LLM``, so
+the HTTP client paths behind ``Ollama_LLM`` and ``VLLM_LLM`` (timeouts,
+retries on 429/5xx, concurrency) are never exercised.  This server speaks
+both APIs and answers every chat request with a valid MA-BBOB algorithm
+taken from a corpus, after a configurable delay and with configurable
+error and rate-limit rates, so the whole orchestration can be load-tested
+on a laptop with no GPU or network.
+
+Endpoints:
+
+- Ollama: ``POST /api/chat``, ``GET /api/tags``, ``GET /api/version``
+- OpenAI/vLLM: ``POST /v1/chat/completions``, ``GET /v1/models``
+- ``GET /stats``: request/response counters as JSON
+
+The corpus is mined from result directories (every ``log.jsonl`` line
+with code and a finite fitness), ``.jsonl`` files of such lines, or an
+``experiments.llm_cache`` store (recorded responses and their latencies).
+Without a corpus the shared initial RandomSearch is served.
+
+Latency specs (seconds):
+
+- ``0`` or ``const:S``
+- ``uniform:LO,HI``
+- ``lognormal:MU,SIGMA`` (of the natural log of the delay)
+- ``empirical`` — resample the latencies recorded in an llm_cache corpus
+
+Usage::
+
+    python -m experiments.standin_llm --corpus results_phase4 \\
+        --latency lognormal:2.3,0.5 --error-rate 0.02 --rate-limit 0.05 \\
+        --port 11434
+    OLLAMA_PORT=11434 python run_phase4.py ...
+    # or, for vLLM model entries:
+    VLLM_BASE_URL=http://localhost:8000/v1 python run_phase1.py ...
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from .initial_population import ALGORITHM_1_CODE, ALGORITHM_1_DESC
+
+DEFAULT_RETRY_AFTER = 1
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+def format_response(code, description=""):
+    """Render an algorithm the way LLaMEA's output format prompt asks for."""
+    description = " ".join((description or "").split()) or "A black-box optimizer."
+    return f"# Description: {description}\n# Code:\n```python\n{code.strip()}\n```\n"
+
+
+def _log_line_response(line):
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(entry, dict):
+        return None
+    code = entry.get("code")
+    fitness = entry.get("fitness")
+    if not code or not isinstance(fitness, (int, float)) or not math.isfinite(fitness):
+        return None
+    return format_response(code, entry.get("description"))
+
+
+class Corpus:
+    """Responses (and optionally recorded latencies) to serve."""
+
+    def __init__(self, responses=None, latencies=None):
+        self.responses = list(responses or [])
+        self.latencies = list(latencies or [])
+        if not self.responses:
+            self.responses = [format_response(ALGORITHM_1_CODE, ALGORITHM_1_DESC)]
+
+    @classmethod
+    def load(cls, sources, limit=None):
+        """Mine responses from result dirs, log files or llm_cache stores."""
+        responses, latencies, seen = [], [], set()
+
+        def add(text, latency=None):
+            if text and text not in seen:
+                seen.add(text)
+                responses.append(text)
+            if latency is not None:
+                latencies.append(latency)
+
+        for source in sources or ():
+            source = Path(source)
+            if (source / "objects").is_dir():
+                for path in sorted((source / "objects").glob("*/*.json")):
+                    try:
+                        entry = json.loads(path.read_text())
+                    except (OSError, json.JSONDecodeError):
+                        continue
+                    add(entry.get("response"), entry.get("latency"))
+                continue
+            logs = [source] if source.is_file() else sorted(source.rglob("log.jsonl"))
+            for log in logs:
+                with open(log) as f:
+                    for line in f:
+                        add(_log_line_response(line))
+                        if limit and len(responses) >= limit:
+                            return cls(responses, latencies)
+        return cls(responses, latencies)
+
+    def __len__(self):
+        return len(self.responses)
+
+
+# ---------------------------------------------------------------------------
+# Latency
+# ---------------------------------------------------------------------------
+
+def parse_latency(spec, corpus=None):
+    """Turn a latency spec into a ``sampler(rng) -> seconds`` callable."""
+    spec = str(spec).strip()
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()]
+    if kind in ("", "0", "none"):
+        return lambda rng: 0.0
+    if kind == "const":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        lo, hi = values
+        return lambda rng: rng.uniform(lo, hi)
+    if kind == "lognormal":
+        mu, sigma = values
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    if kind == "empirical":
+        samples = corpus.latencies if corpus is not None else []
+        if not samples:
+            raise ValueError("empirical latency needs an llm_cache corpus with latencies")
+        return lambda rng: rng.choice(samples)
+    try:
+        seconds = float(spec)
+    except ValueError:
+        raise ValueError(f"Unknown latency spec: {spec!r}") from None
+    return lambda rng: seconds
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the corpus, fault settings and counters.
+
+    Args:
+        address: ``(host, port)``; port 0 picks a free port.
+        corpus: Corpus to answer from.
+        latency: latency spec (see module docstring).
+        error_rate: probability of a 500 response.
+        rate_limit: probability of a 429 response.
+        retry_after: value of the Retry-After header on 429s.
+        seed: seed for response choice, latency and faults.
+        time_scale: multiplier on every sampled delay.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), corpus=None, latency="0",
+                 error_rate=0.0, rate_limit=0.0, retry_after=DEFAULT_RETRY_AFTER,
+                 seed=0, time_scale=1.0):
+        super().__init__(address, _Handler)
+        self.corpus = corpus or Corpus()
+        self.sample_latency = parse_latency(latency, self.corpus)
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.time_scale = time_scale
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0,
+                      "in_flight": 0, "max_in_flight": 0}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self):
+        """Decide the outcome of one chat request: (status, delay, response)."""
+        with self._lock:
+            self.stats["requests"] += 1
+            u = self._rng.random()
+            delay = max(0.0, self.sample_latency(self._rng)) * self.time_scale
+            response = self._rng.choice(self.corpus.responses)
+        if u < self.rate_limit:
+            return 429, 0.0, None
+        if u < self.rate_limit + self.error_rate:
+            return 500, delay, None
+        return 200, delay, response
+
+    def count(self, key, delta=1):
+        with self._lock:
+            self.stats[key] += delta
+            if key == "in_flight":
+                self.stats["max_in_flight"] = max(self.stats["max_in_flight"],
+                                                  self.stats["in_flight"])
+
+    def start(self):
+        """Serve in a daemon thread; returns self."""
+        threading.Thread(target=self.serve_forever, name="standin-llm",
+                         daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    # ---------- GET ----------
+    def do_GET(self):
+        server = self.server
+        if self.path.startswith("/api/tags"):
+            self._send(200, {"models": [{"name": "standin", "model": "standin"}]})
+        elif self.path.startswith("/api/version"):
+            self._send(200, {"version": "0.0.0-standin"})
+        elif self.path.startswith("/v1/models"):
+            self._send(200, {"object": "list",
+                             "data": [{"id": "standin", "object": "model"}]})
+        elif self.path.startswith("/stats"):
+            with server._lock:
+                self._send(200, dict(server.stats, corpus=len(server.corpus)))
+        elif self.path == "/":
+            self._send(200, {"status": "Ollama is running"})
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    # ---------- POST ----------
+    def do_POST(self):
+        if self.path.startswith("/api/chat"):
+            self._chat(openai=False)
+        elif self.path.startswith("/v1/chat/completions"):
+            self._chat(openai=True)
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def _chat(self, openai):
+        server = self.server
+        request = self._read_json()
+        model = request.get("model", "standin")
+        status, delay, content = server.draw()
+
+        if status == 429:
+            server.count("rate_limited")
+            self._send(429, _error_body("rate limit exceeded", "rate_limit_exceeded", openai),
+                       headers={"Retry-After": server.retry_after})
+            return
+
+        server.count("in_flight")
+        try:
+            time.sleep(delay)
+        finally:
+            server.count("in_flight", -1)
+
+        if status != 200:
+            server.count("errors")
+            self._send(status, _error_body("stand-in server error", "server_error", openai))
+            return
+
+        server.count("ok")
+        if openai:
+            body = {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+        else:
+            body = {
+                "model": model,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": content},
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int(delay * 1e9),
+            }
+        self._send(200, body)
+
+
+def _error_body(message, code, openai):
+    if openai:
+        return {"error": {"message": message, "type": code, "code": code}}
+    return {"error": message}
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stand-in Ollama / OpenAI-compatible LLM server for load tests"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--corpus", nargs="*", default=[],
+                        help="Result dirs, log.jsonl files or llm_cache dirs to mine")
+    parser.add_argument("--corpus-limit", type=int, default=None)
+    parser.add_argument("--latency", default="0",
+                        help="0 | const:S | uniform:LO,HI | lognormal:MU,SIGMA | empirical")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Multiply every sampled delay (e.g. 0.01 for smoke runs)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Probability of a 500 response")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Probability of a 429 response")
+    parser.add_argument("--retry-after", type=int, default=DEFAULT_RETRY_AFTER)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    corpus = Corpus.load(args.corpus, limit=args.corpus_limit)
+    server = StandinServer(
+        (args.host, args.port), corpus=corpus, latency=args.latency,
+        error_rate=args.error_rate, rate_limit=args.rate_limit,
+        retry_after=args.retry_after, seed=args.seed, time_scale=args.time_scale,
+    )
+    print(f"Stand-in LLM server on {server.url}  "
+          f"({len(corpus)} responses, latency={args.latency}, "
+          f"errors={args.error_rate}, 429s={args.rate_limit})")
+    print(f"  Ollama:  OLLAMA_PORT={server.server_address[1]}")
+    print(f"  vLLM:    VLLM_BASE_URL={server.url}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats))
+
+
+if __name__ == "__main__":
+    main()
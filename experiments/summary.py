@@ -0,0 +1,325 @@
+"""Per-seed summary CSVs of experiment results, kept up to date incrementally.
+
+``write_summary_csv`` turns a seed directory's ``run-*/log.jsonl`` into
+``summary.csv`` (one row per candidate).  It used to re-parse every log and
+rewrite the CSV from scratch; now a small state file next to the CSV
+(``.summary.csv.state.json``) records, per log, the byte offset consumed
+so far, a hash of the bytes just before it and its size and mtime, plus the
+candidate ids seen and the CSV header:
+
+  - a directory whose summary is newer than all of its logs, or whose logs
+    all have the recorded size and mtime, is skipped without opening any log;
+  - when only the newest run's log has grown, its new complete lines are
+    appended to the CSV;
+  - anything else (a log rewritten on resume, a new column, an older run
+    that changed, no state file) rewrites the CSV from scratch, giving the
+    same rows as a full parse.
+
+``summarise_results`` does this for every ``{tag}/seed-*`` directory of a
+results root in a process pool and then writes ``summary_all.csv`` at the
+root: all seed summaries concatenated, with a leading ``condition`` column
+(the ``{tag}`` directory).  It is used by ``--summarise`` in the Phase 1,
+3 and 4 CLIs.
+
+Only the standard library is imported, so the CLIs' ``--summarise`` stays
+fast.
+"""
+
+import csv
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SUMMARY_FILE = "summary.csv"
+SUMMARY_ALL_FILE = "summary_all.csv"
+
+# Bump when the record layout changes; older summaries are rewritten.
+STATE_VERSION = 1
+
+# Bytes before a log's consumed offset that must be unchanged to append.
+TAIL_BYTES = 1024
+
+
+# ---------------------------------------------------------------------------
+# Log parsing
+# ---------------------------------------------------------------------------
+
+def _records(run_dir, lines, seen_ids):
+    """Summary records of a run's log lines; ``seen_ids`` is updated in place."""
+    # Parse the directory name: run-{method_tag}-{problem}-{seed}
+    parts = run_dir.name.split("-")
+    # Seed is the last part
+    dir_seed = parts[-1] if parts else "?"
+
+    records = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        # Resumed runs may repeat a candidate; keep the first line per id.
+        cid = entry.get("id")
+        if cid is not None:
+            if cid in seen_ids:
+                continue
+            seen_ids.add(cid)
+
+        try:
+            fitness = float(entry.get("fitness", "nan"))
+        except (TypeError, ValueError):
+            fitness = float("nan")
+        status = "success" if not math.isinf(fitness) and not math.isnan(fitness) else "failure"
+        aucs = entry.get("metadata", {}).get("aucs", [])
+        behavioral = entry.get("metadata", {}).get("behavioral_features", {})
+
+        records.append({
+            "model_name": parts[1] if len(parts) > 1 else "unknown",
+            "seed": dir_seed,
+            "generation": entry.get("generation", "?"),
+            "algorithm_name": entry.get("name", ""),
+            "AOCC": fitness if status == "success" else "",
+            "final_best_value": fitness,
+            "run_status": status,
+            "error": entry.get("error", ""),
+            "n_aucs": len(aucs),
+            **{f"bm_{k}": v for k, v in behavioral.items()},
+        })
+    return records
+
+
+def summarise_run(result_dir):
+    """Extract a summary from a finished run's log.jsonl.
+
+    Scans the result directory for the run sub-directory containing log.jsonl,
+    then extracts per-candidate records.
+
+    Returns:
+        list of dicts, one per candidate evaluated.
+    """
+    records = []
+    seen_ids = set()
+    for run_dir in sorted(Path(result_dir).glob("run-*/")):
+        log_file = run_dir / "log.jsonl"
+        if not log_file.exists():
+            continue
+        with open(log_file) as f:
+            records.extend(_records(run_dir, f, seen_ids))
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Incremental per-seed summaries
+# ---------------------------------------------------------------------------
+
+def _state_path(output_path):
+    return output_path.with_name(f".{output_path.name}.state.json")
+
+
+def _tail_hash(log_file, offset):
+    start = max(0, offset - TAIL_BYTES)
+    with open(log_file, "rb") as f:
+        f.seek(start)
+        return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _read_state(path):
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def _write_atomic(path, write):
+    tmp = path.with_name(f".{path.name}.tmp.{os.getpid()}")
+    with open(tmp, "w", newline="") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _read_complete_lines(log_file, offset):
+    """Complete lines after ``offset`` and the offset after the last of them."""
+    with open(log_file, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    return data[:end].decode("utf-8", errors="replace").splitlines(), offset + end
+
+
+def _rewrite(result_dir, output_path, logs):
+    """Parse every log from the start and write the CSV and its state."""
+    records, seen_ids, offsets = [], set(), {}
+    for name, log_file in logs.items():
+        lines, offset = _read_complete_lines(log_file, 0)
+        records.extend(_records(log_file.parent, lines, seen_ids))
+        offsets[name] = {"offset": offset, "tail": _tail_hash(log_file, offset)}
+    if not records:
+        return None
+    fieldnames = list(records[0].keys())
+
+    def write(f):
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+
+    _write_atomic(output_path, write)
+    return {"version": STATE_VERSION, "logs": offsets, "seen_ids": sorted(seen_ids, key=str),
+            "fieldnames": fieldnames, "records": len(records)}
+
+
+def _append(output_path, state, logs):
+    """Append the newest log's new lines; None if a rewrite is needed."""
+    names = list(logs)
+    if sorted(state["logs"]) != sorted(names):
+        return None
+    for name, log_file in logs.items():
+        known = state["logs"][name]
+        size = log_file.stat().st_size
+        if size < known["offset"] or _tail_hash(log_file, known["offset"]) != known["tail"]:
+            return None
+        if size > known["offset"] and name != names[-1]:
+            return None  # appending would change the row order
+
+    log_file = logs[names[-1]]
+    known = state["logs"][names[-1]]
+    lines, offset = _read_complete_lines(log_file, known["offset"])
+    seen_ids = set(state["seen_ids"])
+    records = _records(log_file.parent, lines, seen_ids)
+    if any(set(r) - set(state["fieldnames"]) for r in records):
+        return None
+    if records:
+        with open(output_path, "a", newline="") as f:
+            csv.DictWriter(f, fieldnames=state["fieldnames"]).writerows(records)
+    state["logs"][names[-1]] = {"offset": offset, "tail": _tail_hash(log_file, offset)}
+    state["seen_ids"] = sorted(seen_ids, key=str)
+    state["records"] += len(records)
+    return state
+
+
+def update_summary(result_dir, output_path=None):
+    """Bring one seed directory's summary CSV up to date (no output).
+
+    Returns:
+        tuple: (path or None if there are no records, action, records), with
+        action one of "skipped", "appended", "rewritten".
+    """
+    result_dir = Path(result_dir)
+    output_path = Path(output_path) if output_path else result_dir / SUMMARY_FILE
+    logs = {d.name: d / "log.jsonl" for d in sorted(result_dir.glob("run-*/"))
+            if (d / "log.jsonl").exists()}
+    state_path = _state_path(output_path)
+    state = _read_state(state_path) if output_path.exists() else None
+
+    stats = {name: log.stat() for name, log in logs.items()}
+    if state is not None and sorted(state["logs"]) == sorted(logs):
+        newest_log = max((st.st_mtime_ns for st in stats.values()), default=0)
+        unchanged = all([state["logs"][name].get("size"), state["logs"][name].get("mtime_ns")]
+                        == [st.st_size, st.st_mtime_ns] for name, st in stats.items())
+        # Strictly newer: a log written in the same clock tick is re-checked.
+        if unchanged or output_path.stat().st_mtime_ns > newest_log:
+            return str(output_path), "skipped", state["records"]
+
+    action = "appended"
+    new_state = _append(output_path, state, logs) if state is not None else None
+    if new_state is None:
+        action = "rewritten"
+        new_state = _rewrite(result_dir, output_path, logs)
+        if new_state is None:
+            return None, action, 0
+    # Recorded as of the stat above: a log appended meanwhile differs next time.
+    for name, st in stats.items():
+        new_state["logs"][name].update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+    _write_atomic(state_path, lambda f: json.dump(new_state, f))
+    return str(output_path), action, new_state["records"]
+
+
+def write_summary_csv(result_dir, output_path=None):
+    """Write (or update) the summary CSV for one run directory.
+
+    Args:
+        result_dir: path to the seed-level result directory.
+        output_path: where to write the CSV; defaults to {result_dir}/summary.csv.
+
+    Returns:
+        str: path to the written CSV.
+    """
+    path, action, n = update_summary(result_dir, output_path)
+    if path is None:
+        print(f"  WARNING: no records found in {result_dir}")
+        return None
+    print(f"  Summary CSV: {path} ({n} records, {action})")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Whole results roots
+# ---------------------------------------------------------------------------
+
+def _merge(results_root, summaries):
+    """Write ``summary_all.csv`` from the (condition, path) seed summaries."""
+    fieldnames = ["condition"]
+    for _, path in summaries:
+        with open(path, newline="") as f:
+            header = next(csv.reader(f), [])
+        fieldnames += [c for c in header if c not in fieldnames]
+
+    def write(out):
+        writer = csv.DictWriter(out, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        for condition, path in summaries:
+            with open(path, newline="") as f:
+                for row in csv.DictReader(f):
+                    writer.writerow({"condition": condition, **row})
+
+    output = Path(results_root) / SUMMARY_ALL_FILE
+    _write_atomic(output, write)
+    return str(output)
+
+
+def summarise_results(results_root, workers=None):
+    """Update every seed summary of a results root and merge them.
+
+    Args:
+        results_root: directory laid out as ``{tag}/seed-{n}/run-*``.
+        workers: processes (default: one per CPU).
+
+    Returns:
+        str: path to ``summary_all.csv``, or None if there are no records.
+    """
+    root = Path(results_root)
+    seed_dirs = sorted(d for d in root.glob("*/seed-*") if d.is_dir())
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(seed_dirs) > 1:
+        with ProcessPoolExecutor(min(workers, len(seed_dirs))) as pool:
+            results = list(pool.map(update_summary, seed_dirs))
+    else:
+        results = [update_summary(d) for d in seed_dirs]
+
+    counts = {"skipped": 0, "appended": 0, "rewritten": 0}
+    summaries = []
+    for seed_dir, (path, action, _) in zip(seed_dirs, results):
+        if path is None:
+            print(f"  WARNING: no records found in {seed_dir}")
+            continue
+        counts[action] += 1
+        summaries.append((seed_dir.parent.name, path))
+    print(f"  Summaries: {counts['rewritten']} rewritten, {counts['appended']} appended, "
+          f"{counts['skipped']} up to date")
+    if not summaries:
+        return None
+
+    merged = root / SUMMARY_ALL_FILE
+    if (merged.exists() and counts["skipped"] == len(summaries)
+            and merged.stat().st_mtime_ns >= max(Path(p).stat().st_mtime_ns
+                                                 for _, p in summaries)):
+        return str(merged)
+    path = _merge(root, summaries)
+    print(f"  Merged summary: {path} ({len(summaries)} seeds)")
+    return path
@@ -0,0 +1,100 @@
+"""Target-hit short-circuit: stop an inner run once the AOCC floor is reached.
+
+``aoc_logger`` clips the error at ``lower`` (1e-8).  Once a run's best error
+is below it, every remaining evaluation adds exactly zero to the area over
+the convergence curve, so strong algorithms spend most of their budget on
+evaluations that cannot change their score.  With
+``MaBBOBProblem(stop_on_target=True)`` the logger raises
+``ThresholdReachedException`` at the first evaluation below the floor and
+``correct_aoc`` fills in the remaining budget analytically at the best
+value found, which is the floor, so AOCC is identical to a full run.
+
+Behavioural metrics are computed on the trajectory *saturated* to the full
+budget (``saturate_trajectory``): the evaluations after the hit are taken to
+sit at the best point found, which is the same convention ``correct_aoc``
+uses for AOCC.  ``TRUNCATION`` documents every behavioural feature:
+
+- ``"unaffected"``: the value on the truncated trajectory equals the value
+  on the saturated one (repeating the best point adds no coverage and no
+  improvement).
+- ``"recomputed"``: the value depends on the run length or on the
+  evaluations after the hit; it is computed on the saturated trajectory so
+  that it describes a full-budget run.
+
+Metrics are not comparable with runs evaluated without the short-circuit,
+where the algorithm keeps moving below the floor, so the mode is opt-in
+(``STOP_ON_TARGET=1``) and recorded in the problem's config and in each
+candidate's ``target_hits`` metadata.
+"""
+
+import numpy as np
+import pandas as pd
+
+# aoc_logger's default lower bound: the error at which AOCC saturates.
+TARGET_ERROR = 1e-8
+
+UNAFFECTED = "unaffected"
+RECOMPUTED = "recomputed"
+
+TRUNCATION = {
+    # Exploration & diversity
+    "avg_nearest_neighbor_distance": RECOMPUTED,   # tail steps have distance 0
+    "dispersion": UNAFFECTED,                      # duplicates add no coverage
+    "avg_exploration_pct": RECOMPUTED,             # chunk diversities change
+    "avg_exploitation_pct": RECOMPUTED,
+    # Exploitation
+    "avg_distance_to_best": RECOMPUTED,            # tail distances are 0
+    "intensification_ratio": RECOMPUTED,           # tail lies at the best point
+    # Convergence
+    "average_convergence_rate": RECOMPUTED,        # tail ratios are 1
+    "avg_improvement": UNAFFECTED,                 # mean over improving steps only
+    "success_rate": RECOMPUTED,                    # denominator is the run length
+    "half_convergence_time": RECOMPUTED,           # fraction of the budget
+    # Stagnation
+    "longest_no_improvement_streak": RECOMPUTED,   # tail is one long streak
+    "last_improvement_fraction": RECOMPUTED,
+    "fitness_plateau_fraction": RECOMPUTED,
+    # Step sizes and movement
+    "step_size_mean": RECOMPUTED,
+    "step_size_std": RECOMPUTED,
+    "step_size_trend": RECOMPUTED,
+    "step_size_autocorrelation": RECOMPUTED,
+    "directional_persistence": RECOMPUTED,
+    # Fitness time series
+    "fitness_sample_entropy": RECOMPUTED,
+    "fitness_permutation_entropy": RECOMPUTED,
+    "fitness_autocorrelation": RECOMPUTED,
+    "fitness_lempel_ziv_complexity": RECOMPUTED,
+    # Early/late phase (quarters of the run length)
+    "x_spread_early": RECOMPUTED,
+    "x_spread_late": RECOMPUTED,
+    "spread_ratio": RECOMPUTED,
+    "centroid_drift": RECOMPUTED,
+    "f_range_early": RECOMPUTED,
+    "f_range_late": RECOMPUTED,
+    "f_range_ratio": RECOMPUTED,
+    # Improvement structure
+    "improvement_spatial_correlation": RECOMPUTED,
+    "improvement_burstiness": RECOMPUTED,
+    "dimension_convergence_heterogeneity": RECOMPUTED,
+}
+
+
+def saturate_trajectory(df, budget):
+    """Pad a truncated trajectory to ``budget`` evaluations at its best point.
+
+    Args:
+        df: TrajectoryLogger frame (``evaluations``, ``raw_y``, ``x0``...).
+        budget: the run's evaluation budget.
+
+    Returns:
+        DataFrame with ``budget`` rows (``df`` unchanged if already full).
+    """
+    n_missing = budget - len(df)
+    if n_missing <= 0 or df.empty:
+        return df
+    best = df.iloc[[int(np.argmin(df["raw_y"].to_numpy()))]]
+    tail = best.loc[best.index.repeat(n_missing)].reset_index(drop=True)
+    last = int(df["evaluations"].iloc[-1])
+    tail["evaluations"] = np.arange(last + 1, last + 1 + n_missing)
+    return pd.concat([df, tail], ignore_index=True)
@@ -0,0 +1,123 @@
+"""Gemini LLM wrapper that records per-call token usage (Phase 4 token test).
+
+Split from ``phase4_token_test`` so that its ``--list`` does not import the
+Google GenAI SDK; the test imports this module only when a config runs.
+"""
+
+import copy
+import re
+import time
+
+from google import genai
+from google.genai import types
+
+from iohblade.llm import Gemini_LLM
+
+
+def make_thinking_config(thinking_budget):
+    """``types.ThinkingConfig`` for a budget, or None for the model default."""
+    if thinking_budget is None:
+        return None
+    return types.ThinkingConfig(thinking_budget=thinking_budget)
+
+
+class TokenTrackingGeminiLLM(Gemini_LLM):
+    """Gemini LLM that captures per-call token usage metadata."""
+
+    def __init__(self, *args, thinking_config=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.thinking_config = thinking_config
+        self.call_log = []  # list of dicts with token counts per call
+
+    def _query(self, session_messages, max_retries=5, default_delay=10, **kwargs):
+        """Override to capture usage_metadata from each response."""
+        history = [
+            {"role": m["role"], "parts": [m["content"]]} for m in session_messages[:-1]
+        ]
+        last = session_messages[-1]["content"]
+
+        attempt = 0
+        while True:
+            try:
+                config = self.generation_config.copy()
+                config.update(**kwargs)
+                # Inject thinking_config if set
+                if self.thinking_config is not None:
+                    config["thinking_config"] = self.thinking_config
+
+                chat = self.client.chats.create(
+                    model=self.model, history=history, config=config
+                )
+                response = chat.send_message(last)
+
+                # Capture token usage
+                usage = response.usage_metadata
+                entry = {
+                    "call_index": len(self.call_log),
+                    "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+                    "candidates_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+                    "thoughts_tokens": getattr(usage, "thoughts_token_count", 0) or 0,
+                    "total_tokens": getattr(usage, "total_token_count", 0) or 0,
+                    "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+                }
+                # Measure visible output length
+                text = response.text
+                entry["visible_output_chars"] = len(text)
+                self.call_log.append(entry)
+
+                return text
+
+            except Exception as err:
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                delay = getattr(err, "retry_delay", None)
+                if delay is not None:
+                    wait = delay.seconds + 1
+                else:
+                    m = re.search(r"retry_delay\s*{\s*seconds:\s*(\d+)", str(err))
+                    wait = int(m.group(1)) if m else default_delay * attempt
+                time.sleep(wait)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # thinking_config is a genai types object — not reliably picklable
+        # Store the budget int instead so we can reconstruct
+        tc = self.thinking_config
+        state["_thinking_budget_val"] = (
+            getattr(tc, "thinking_budget", None) if tc is not None else "NONE"
+        )
+        state.pop("thinking_config", None)
+        return state
+
+    def __setstate__(self, state):
+        budget_val = state.pop("_thinking_budget_val", "NONE")
+        super().__setstate__(state)
+        if budget_val == "NONE":
+            self.thinking_config = None
+        else:
+            self.thinking_config = types.ThinkingConfig(thinking_budget=budget_val)
+        if not hasattr(self, "call_log"):
+            self.call_log = []
+
+    def __deepcopy__(self, memo):
+        cls = self.__class__
+        new = cls.__new__(cls)
+        memo[id(self)] = new
+        for k, v in self.__dict__.items():
+            if k == "client":
+                continue
+            elif k == "thinking_config":
+                setattr(new, k, v)  # shared ref is fine, it's immutable
+            elif k == "call_log":
+                setattr(new, k, v)  # SHARE the list so copies log to same place
+            else:
+                setattr(new, k, copy.deepcopy(v, memo))
+        # Rebuild client
+        if getattr(new, 'vertexai', False):
+            new.client = genai.Client(
+                vertexai=True, project=new.project, location=new.location,
+            )
+        else:
+            new.client = genai.Client(api_key=new.api_key)
+        return new
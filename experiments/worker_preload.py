@@ -0,0 +1,34 @@
+"""Warm-up imported by evaluation workers before their first candidate.
+
+With the forkserver start method this module is imported once, in the
+forkserver process; every worker is forked from it with the heavy modules
+already imported, the ``llamea.utils`` shim loaded and the MA-BBOB
+instance tables in memory, so a new worker is ready in milliseconds.
+With spawn, each worker imports it at startup instead.
+"""
+
+from importlib import import_module
+
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "ioh",
+    "iohblade.utils",
+    "iohblade.behaviour_metrics",
+    "experiments.trajectory_logger",
+    "experiments.mabbob_problem",
+)
+
+for _name in HEAVY_MODULES:
+    try:
+        import_module(_name)
+    except ImportError:
+        pass
+
+try:
+    from .mabbob_problem import llamea_utils, load_instance_data
+    llamea_utils()
+    load_instance_data()
+except Exception:
+    # Workers fall back to loading on first use.
+    pass
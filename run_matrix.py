@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""Run a (phase x condition x seed) job matrix with a concurrency limit.
+
+Usage:
+    python run_matrix.py phase4 all --max-concurrent 60
+    python run_matrix.py phase4 all --dry-run
+    python run_matrix.py phase3 neutral --seeds 0 1 2 3 4
+    python run_matrix.py --matrix slurm/phase4_matrix.json --max-concurrent 30
+    python run_matrix.py phase1 qwen3.5-4b -- --custom-vllm Qwen/Qwen3.5-4B
+"""
+
+from experiments.runner import main
+
+if __name__ == "__main__":
+    main()
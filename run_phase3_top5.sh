@@ -3,7 +3,7 @@
 #
 # Uses a job queue: launches up to MAX_JOBS conditions in parallel, and starts
 # the next condition as soon as one finishes. Skips seed-runs that already
-# have >= BUDGET candidates in their log.
+# have >= BUDGET candidates (see experiments/progress.py).
 #
 # Top 5 by Borda count:
 #   1. avg_improvement           (Borda: 3)
@@ -53,16 +53,11 @@ FEATURES=(
 )
 FORMATS=(neutral directional comparative)
 
-# Check if a seed-run is already complete (>= BUDGET candidates in log)
+# Check if a seed-run is already complete (>= BUDGET candidates), reading the
+# run's progress.json instead of counting log lines
 is_complete() {
     local cond="$1" seed="$2"
-    local seed_dir="$RESULTS_DIR/$cond/seed-$seed"
-    local log
-    log=$(ls "$seed_dir"/run-*/log.jsonl 2>/dev/null | head -1)
-    [ -z "$log" ] && return 1
-    local count
-    count=$(wc -l < "$log")
-    [ "$count" -ge "$BUDGET" ]
+    python -m experiments.progress check "$RESULTS_DIR" "$cond" "$seed" --budget "$BUDGET"
 }
 
 # Wait until fewer than MAX_JOBS are running, return when a slot opens
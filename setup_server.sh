@@ -47,6 +47,7 @@ pip install \
     cloudpickle \
     numpy \
     "pandas>=2.2.3,<3" \
+    pyarrow \
     scipy \
     scikit-learn \
     ioh \
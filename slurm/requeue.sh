@@ -0,0 +1,43 @@
+# Shared helper for sbatch scripts: run a command (normally run_matrix.py) so
+# that a SLURM preemption / time-limit signal reaches it and the job is
+# requeued when it exits with the requeue code.
+#
+# Pair with:
+#   #SBATCH --signal=B:USR1@600   # signal only the batch shell, 10 min early
+#   #SBATCH --requeue
+#
+# The trap forwards the signal to the Python runner only, so evaluation
+# workers are not killed mid-candidate.  The runner forwards SIGTERM to its
+# phase processes, which finish the current candidate, checkpoint and exit
+# with code 75 (see experiments/shutdown.py).
+#
+# Usage (after cd "$REPO_DIR"):
+#   source slurm/requeue.sh
+#   run_with_requeue python run_matrix.py ...
+#   rc=$?
+
+REQUEUE_EXIT_CODE=75
+
+run_with_requeue() {
+    "$@" &
+    local pid=$!
+    trap 'echo "[$(date +%H:%M:%S)] Signal received, asking runner (pid '"$pid"') to stop"; kill -USR1 '"$pid"' 2>/dev/null' USR1 TERM
+
+    local rc
+    wait "$pid"
+    # wait returns early (128+sig) when a trapped signal arrives; keep waiting.
+    while kill -0 "$pid" 2>/dev/null; do
+        wait "$pid"
+    done
+    # The runner may exit between an interrupted wait and the kill -0 check;
+    # bash keeps the reaped child's status, so this is always its exit code.
+    wait "$pid"
+    rc=$?
+    trap - USR1 TERM
+
+    if [ "$rc" -eq "$REQUEUE_EXIT_CODE" ] && [ -n "${SLURM_JOB_ID:-}" ]; then
+        echo "[$(date +%H:%M:%S)] Runner stopped for requeue; requeueing job $SLURM_JOB_ID"
+        scontrol requeue "$SLURM_JOB_ID"
+    fi
+    return "$rc"
+}
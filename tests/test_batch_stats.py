@@ -0,0 +1,118 @@
+"""Tests for the batched statistics (analysis.batch_stats).
+
+Run with:
+    pytest tests/test_batch_stats.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from analysis import batch_stats
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(1)
+
+
+class TestSpearman:
+
+    def test_matches_scipy(self, rng):
+        x = rng.normal(size=(50, 4))
+        x[:, 2] = np.round(x[:, 2])  # ties
+        y = x[:, 0] + rng.normal(size=50)
+        rho, p = batch_stats.spearman_matrix(x, y)
+        for j in range(4):
+            ref = stats.spearmanr(x[:, j], y)
+            assert rho[j, 0] == pytest.approx(ref.statistic)
+            assert p[j, 0] == pytest.approx(ref.pvalue)
+
+    def test_square_matrix_and_constant_column(self, rng):
+        x = rng.normal(size=(30, 3))
+        x[:, 1] = 1.0
+        rho, _ = batch_stats.spearman_matrix(x)
+        assert rho.shape == (3, 3) and rho[0, 0] == pytest.approx(1.0)
+        assert np.isnan(rho[1]).all() and np.isnan(rho[:, 1]).all()
+
+    def test_by_group_matches_scipy(self, rng):
+        x = rng.normal(size=(50, 3))
+        x[3, 1] = np.nan
+        groups = np.repeat(["b", "a", "c"], [20, 20, 10])
+        labels, rho, p, n = batch_stats.spearman_by_group(x, groups)
+        assert labels == ["a", "b", "c"] and n.tolist() == [20, 19, 10]
+        for g, label in enumerate(labels):
+            sub = x[(groups == label) & ~np.isnan(x).any(axis=1)]
+            ref = stats.spearmanr(sub)
+            np.testing.assert_allclose(rho[g], ref.statistic)
+            np.testing.assert_allclose(p[g], ref.pvalue, atol=1e-12)
+
+
+class TestKS:
+
+    def test_matches_scipy_with_ties_and_nan(self, rng):
+        a = np.round(rng.normal(size=(30, 3)), 1)
+        b = np.round(rng.normal(0.5, 1, size=(25, 3)), 1)
+        a[:5, 1] = np.nan
+        d, n_a, n_b = batch_stats.ks_statistic(a, b)
+        assert n_a.tolist() == [30, 25, 30] and n_b.tolist() == [25, 25, 25]
+        for j in range(3):
+            ref = stats.ks_2samp(a[~np.isnan(a[:, j]), j], b[:, j]).statistic
+            assert d[j] == pytest.approx(ref)
+
+    def test_empty_column(self):
+        d, _, _ = batch_stats.ks_statistic(np.full((3, 1), np.nan), np.ones((3, 1)))
+        assert np.isnan(d[0])
+
+
+class TestResampling:
+
+    @pytest.fixture
+    def samples(self, rng):
+        s = np.full((3, 10), np.nan)
+        s[0] = rng.normal(1, 1, 10)
+        s[1, 5:] = rng.normal(0, 1, 5)  # padding first: rows are compacted
+        s[2, :8] = rng.normal(0.3, 1, 8)
+        return s
+
+    def test_seed_matrix(self):
+        df = pd.DataFrame({"cond": ["b", "a", "b", "c"], "v": [1.0, 2.0, 3.0, 4.0]})
+        groups, out = batch_stats.seed_matrix(df, "cond", "v", groups=["a", "b", "x"])
+        assert groups == ["a", "b", "x"]
+        np.testing.assert_array_equal(out, [[2.0, np.nan], [1.0, 3.0], [np.nan, np.nan]])
+
+    def test_bootstrap_matches_scipy_and_is_seeded(self, samples):
+        ci = batch_stats.bootstrap_ci(samples)
+        for g in range(3):
+            values = samples[g][~np.isnan(samples[g])]
+            ref = stats.bootstrap((values,), np.mean, method="percentile",
+                                  random_state=0).confidence_interval
+            assert ci["mean"][g] == pytest.approx(values.mean())
+            assert ci["low"][g] == pytest.approx(ref.low, abs=0.05)
+            assert ci["high"][g] == pytest.approx(ref.high, abs=0.05)
+        again = batch_stats.bootstrap_ci(samples)
+        np.testing.assert_array_equal(again["low"], ci["low"])
+        assert not np.array_equal(batch_stats.bootstrap_ci(samples, seed=1)["low"], ci["low"])
+
+    def test_permutation_matches_scipy(self, samples, rng):
+        base = rng.normal(0, 1, 10)
+        res = batch_stats.permutation_test(samples, base)
+        for g in range(3):
+            values = samples[g][~np.isnan(samples[g])]
+            ref = stats.permutation_test(
+                (values, base), lambda a, b, axis: a.mean(axis) - b.mean(axis),
+                vectorized=True, random_state=0)
+            assert res["diff"][g] == pytest.approx(ref.statistic)
+            assert res["p"][g] == pytest.approx(ref.pvalue, abs=0.03)
+
+    def test_permutation_empty_rows(self):
+        res = batch_stats.permutation_test(np.full((1, 3), np.nan), [1.0, 2.0])
+        assert np.isnan(res["p"][0])
+
+
+class TestHolm:
+
+    def test_adjustment(self):
+        adjusted = batch_stats.holm([0.01, np.nan, 0.04, 0.03])
+        np.testing.assert_allclose(adjusted, [0.03, np.nan, 0.06, 0.06])
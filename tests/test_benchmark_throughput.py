@@ -0,0 +1,78 @@
+"""Tests for the candidates/hour benchmark harness (experiments.benchmark_throughput).
+
+Run with:
+    pytest tests/test_benchmark_throughput.py -v
+"""
+
+import json
+import sys
+from types import SimpleNamespace
+
+from experiments import benchmark_throughput as bench
+
+# Stands in for one Phase 1 seed: three candidates, 0.2 s per LLM call.
+_FAKE_SEED = """
+import json, sys
+from pathlib import Path
+results_dir, seed = Path(sys.argv[1]), sys.argv[2]
+run = results_dir / "bench" / f"seed-{seed}" / "run-bench-0"
+run.mkdir(parents=True)
+with open(run / "log.jsonl", "w") as f:
+    for i in range(3):
+        f.write(json.dumps({"id": str(i), "metadata": {"evaluation_time_s": 1.0}}) + "\\n")
+with open(run / "conversationlog.jsonl", "w") as f:
+    for i in range(3):
+        f.write(json.dumps({"role": "client", "time": f"2026-01-01 00:00:{2 * i:02d}.000000"}) + "\\n")
+        f.write(json.dumps({"role": "m", "time": f"2026-01-01 00:00:{2 * i:02d}.200000"}) + "\\n")
+"""
+
+
+def _fake_command(setting, seed, results_dir, args, port=None):
+    return [sys.executable, "-c", _FAKE_SEED, str(results_dir), str(seed)]
+
+
+class TestMetrics:
+
+    def test_conversation_latencies(self, tmp_path):
+        conv = tmp_path / "conversationlog.jsonl"
+        conv.write_text("\n".join(json.dumps(e) for e in [
+            {"role": "client", "time": "2026-01-01 00:00:00.000000"},
+            {"role": "gemini", "time": "2026-01-01 00:00:03.000000"},
+            {"role": "client", "time": "2026-01-01 00:00:10.000000"},
+            {"role": "gemini", "time": "2026-01-01 00:00:11.000000"},
+        ]) + "\n")
+        generation, evaluation = bench.conversation_latencies(conv)
+        assert generation == [3.0, 1.0]
+        assert evaluation == [7.0]
+
+    def test_percentiles_handle_empty(self):
+        assert bench.percentiles([])["p50"] is None
+        assert bench.percentiles([1, 2, 3])["p50"] == 2.0
+
+    def test_settings_matrix(self):
+        settings = bench.build_settings([True, False], [1, 4])
+        assert len(settings) == 4
+        assert {bench.setting_label(s) for s in settings} == {
+            "pool-x1", "pool-x4", "subprocess-x1", "subprocess-x4"}
+
+
+class TestHarness:
+
+    def test_runs_matrix_and_reports(self, tmp_path):
+        args = SimpleNamespace(
+            model="bench", budget=3, training_instances=1, eval_seeds=1,
+            worker_pool=[True], parallel_seeds=[1, 2], replay=None, corpus=[],
+            latency="0", llm_seed=0, scratch=str(tmp_path), keep=True,
+        )
+        report = bench.run_benchmark(args, command=_fake_command)
+        assert report["llm"]["kind"] == "standin"
+        by_label = {r["label"]: r for r in report["results"]}
+        assert by_label["pool-x1"]["candidates"] == 3
+        assert by_label["pool-x2"]["candidates"] == 6
+        r = by_label["pool-x2"]
+        assert r["failed_runs"] == 0
+        assert r["candidates_per_hour"] > 0
+        assert r["generation_latency_s"]["p50"] == 0.2
+        assert r["evaluation_latency_s"]["p95"] == 1.8
+        assert r["evaluation_compute_s"]["mean"] == 1.0
+        json.dumps(report)
@@ -0,0 +1,132 @@
+"""Tests for delta checkpointing (experiments.checkpoint).
+
+Uses a small stand-in for the LLaMEA instance: only ``run_history``,
+``population``, ``best_so_far`` and a few scalar attributes matter to the
+checkpoint format.
+
+Run with:
+    pytest tests/test_checkpoint.py -v
+"""
+
+import os
+import pickle
+import uuid
+
+from experiments.checkpoint import (
+    HISTORY_FILE,
+    JOURNAL_FILE,
+    SNAPSHOT_FILE,
+    DeltaCheckpoint,
+    has_checkpoint,
+    load_checkpoint,
+)
+
+
+class _Sol:
+    def __init__(self, fitness):
+        self.id = str(uuid.uuid4())
+        self.fitness = fitness
+        self.code = "x" * 2000
+
+
+class _ES:
+    """Mimics the (1+1) LLaMEA loop: one offspring per generation."""
+
+    def __init__(self):
+        self.run_history = []
+        self.population = []
+        self.best_so_far = _Sol(-float("inf"))
+        self.generation = 0
+        self.budget = 100
+        self.llm = object()
+        self.f = object()
+        self.logger = None
+
+    def step(self):
+        child = _Sol(len(self.run_history) / 100)
+        self.run_history.append(child)
+        self.generation += 1
+        best = max(self.population + [child], key=lambda s: s.fitness)
+        self.population = [best]
+        self.best_so_far = best
+
+
+def _run(tmp_path, generations, snapshot_every=5):
+    es = _ES()
+    ckpt = DeltaCheckpoint(tmp_path, snapshot_every=snapshot_every)
+    for _ in range(generations):
+        es.step()
+        ckpt.save(es)
+    return es, ckpt
+
+
+class TestDeltaCheckpoint:
+
+    def test_round_trip(self, tmp_path):
+        es, _ = _run(tmp_path, 12)
+        restored = load_checkpoint(tmp_path)
+        assert [s.id for s in restored.run_history] == [s.id for s in es.run_history]
+        assert restored.generation == 12
+        assert restored.best_so_far.id == es.best_so_far.id
+        # Population is re-linked to the history objects, not copies.
+        assert restored.population[0] is restored.run_history[-1]
+        assert restored.llm is None and restored.f is None
+
+    def test_snapshot_compacts_journal(self, tmp_path):
+        _run(tmp_path, 10, snapshot_every=5)
+        assert os.path.getsize(tmp_path / JOURNAL_FILE) == 0
+        assert (tmp_path / SNAPSHOT_FILE).is_file()
+        assert load_checkpoint(tmp_path).generation == 10
+
+    def test_per_generation_cost_is_flat(self, tmp_path):
+        es = _ES()
+        ckpt = DeltaCheckpoint(tmp_path, snapshot_every=1000)
+        sizes = []
+        for _ in range(60):
+            es.step()
+            before = sum(os.path.getsize(tmp_path / f)
+                         for f in (HISTORY_FILE, JOURNAL_FILE)
+                         if (tmp_path / f).is_file())
+            ckpt.save(es)
+            after = sum(os.path.getsize(tmp_path / f)
+                        for f in (HISTORY_FILE, JOURNAL_FILE))
+            sizes.append(after - before)
+        assert max(sizes[10:]) <= 1.1 * sizes[1]
+
+    def test_torn_tail_is_ignored_and_truncated(self, tmp_path):
+        es, _ = _run(tmp_path, 7)
+        good = os.path.getsize(tmp_path / JOURNAL_FILE)
+        with open(tmp_path / JOURNAL_FILE, "ab") as fh:
+            fh.write(pickle.dumps({"n_history": 99})[:-7])
+        assert load_checkpoint(tmp_path).generation == 7
+
+        ckpt = DeltaCheckpoint(tmp_path, snapshot_every=5)
+        assert os.path.getsize(tmp_path / JOURNAL_FILE) == good
+        es.step()
+        ckpt.save(es)
+        assert len(load_checkpoint(tmp_path).run_history) == 8
+
+    def test_restore_then_continue_in_place(self, tmp_path):
+        _run(tmp_path, 8)
+        es = load_checkpoint(tmp_path)
+        ckpt = DeltaCheckpoint(tmp_path, snapshot_every=5)
+        for _ in range(4):
+            es.step()
+            ckpt.save(es)
+        restored = load_checkpoint(tmp_path)
+        assert len(restored.run_history) == 12
+        assert len({s.id for s in restored.run_history}) == 12
+
+    def test_legacy_full_pickle(self, tmp_path):
+        es = _ES()
+        es.llm = es.f = None
+        for _ in range(3):
+            es.step()
+        with open(tmp_path / SNAPSHOT_FILE, "wb") as fh:
+            pickle.dump(es, fh)
+        assert has_checkpoint(tmp_path)
+        assert len(load_checkpoint(tmp_path).run_history) == 3
+
+    def test_no_checkpoint(self, tmp_path):
+        assert not has_checkpoint(tmp_path)
+        assert load_checkpoint(tmp_path) is None
@@ -0,0 +1,64 @@
+"""Startup guard for the phase CLIs: ``--list``/``--summarise`` stay cheap.
+
+Runs each command under ``python -X importtime`` and checks that no backend
+SDK or evolutionary machinery is imported and that the thesis modules load
+within ``CLI_IMPORT_BUDGET_S`` (env override for slow machines).
+
+Run with:
+    pytest tests/test_cli_startup.py -v
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_THESIS_ROOT = Path(__file__).resolve().parents[1]
+
+CLI_IMPORT_BUDGET_S = float(os.environ.get("CLI_IMPORT_BUDGET_S", 0.5))
+
+# Top-level packages that only a real run may import.
+HEAVY = ("iohblade", "llamea", "numpy", "pandas", "google", "ollama", "openai", "ioh")
+
+
+def parse_importtime(stderr):
+    """``-X importtime`` output as a list of (module, self_us, cumulative_us, depth)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative), depth))
+    return rows
+
+
+def importtime(args):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=str(_THESIS_ROOT), capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return parse_importtime(proc.stderr)
+
+
+@pytest.mark.parametrize("args", [
+    ["run_phase1.py", "--list"],
+    ["run_phase3.py", "--list"],
+    ["run_phase4.py", "--list"],
+    ["run_phase1.py", "--summarise", "--results-dir", "{tmp}"],
+    ["run_phase3.py", "--summarise", "--results-dir", "{tmp}"],
+    ["-m", "experiments.phase4_token_test", "--list"],
+])
+def test_cli_startup_is_light(args, tmp_path):
+    rows = importtime([a.format(tmp=tmp_path) for a in args])
+    heavy = sorted({name for name, *_ in rows if name.split(".")[0] in HEAVY})
+    assert not heavy, f"{' '.join(args)} imports {heavy}"
+
+    thesis_s = sum(cum for name, _, cum, depth in rows
+                   if depth == 0 and name.split(".")[0] == "experiments") / 1e6
+    assert thesis_s < CLI_IMPORT_BUDGET_S, (
+        f"{' '.join(args)}: thesis imports took {thesis_s:.3f}s "
+        f"(budget {CLI_IMPORT_BUDGET_S}s)")
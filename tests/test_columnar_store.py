@@ -0,0 +1,120 @@
+"""Tests for the columnar results store (analysis.columnar_store).
+
+Run with:
+    pytest tests/test_columnar_store.py -v
+"""
+
+import json
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from analysis import columnar_store
+
+
+def _entry(i, n_runs=4, failed=False):
+    meta = {} if failed else {
+        "aucs": [0.1 * i + 0.01 * r for r in range(n_runs)],
+        "behavioral_features": {"dispersion": float(i), "success_rate": 0.5},
+        "behavioral_features_std": {"dispersion": 0.1, "success_rate": 0.0},
+    }
+    return {"id": f"c{i}", "name": f"Alg{i}", "generation": i,
+            "fitness": "-inf" if failed else 0.1 * i,
+            "code": f"class Alg{i}: pass", "feedback": "fb", "error": "",
+            "metadata": meta}
+
+
+def _write_log(root, cond, seed, entries, mode="w"):
+    run_dir = root / cond / f"seed-{seed}" / f"run-{cond}-MA_BBOB-{seed}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "log.jsonl", mode) as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return run_dir / "log.jsonl"
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "results_phase3"
+    _write_log(root, "vanilla", 0, [_entry(i) for i in range(3)] + [_entry(3, failed=True)])
+    _write_log(root, "neutral-x", 1, [_entry(i) for i in range(2)])
+    return root
+
+
+class TestIngest:
+
+    def test_typed_columns_and_partitions(self, root):
+        assert columnar_store.ingest(root) == 6
+        data = columnar_store.dataset(root)
+        schema = data.schema
+        assert schema.field("aucs").type == pa.list_(pa.float64(), 4)
+        assert schema.field("fitness").type == pa.float64()
+        assert "bfstd_dispersion" in schema.names and "code" not in schema.names
+
+        df = columnar_store.read(root, columns=["phase", "condition", "seed", "evaluation",
+                                                "fitness", "failed"])
+        assert set(df["phase"]) == {"phase3"}
+        vanilla = df[df["condition"] == "vanilla"]
+        assert list(vanilla["evaluation"]) == [0, 1, 2, 3]
+        assert list(vanilla["failed"]) == [False, False, False, True]
+        assert vanilla["fitness"].iloc[3] == float("-inf")
+
+        text = columnar_store.read(root, columns=["condition", "evaluation", "code"],
+                                   group="text", filter=ds.field("condition") == "neutral-x")
+        assert list(text["code"]) == ["class Alg0: pass", "class Alg1: pass"]
+
+    def test_appends_only_new_complete_lines(self, root):
+        columnar_store.ingest(root)
+        log = _write_log(root, "vanilla", 0, [_entry(4)], mode="a")
+        with open(log, "a") as f:
+            f.write('{"id": "partial')          # still being written
+        assert columnar_store.ingest(root) == 1
+        assert columnar_store.ingest(root) == 0
+        with open(log, "a") as f:
+            f.write('", "fitness": 0.9}\n')
+        assert columnar_store.ingest(root) == 1
+        df = columnar_store.read(root, columns=["condition", "evaluation", "id"],
+                                 filter=ds.field("condition") == "vanilla")
+        assert list(df["evaluation"]) == [0, 1, 2, 3, 4, 5]
+        assert list(df["id"])[-1] == "partial"
+
+    def test_rewritten_log_is_reingested(self, root):
+        columnar_store.ingest(root)
+        _write_log(root, "vanilla", 0, [_entry(7), _entry(8)])
+        assert columnar_store.ingest(root) == 2
+        df = columnar_store.read(root, columns=["condition", "name"],
+                                 filter=ds.field("condition") == "vanilla")
+        assert list(df["name"]) == ["Alg7", "Alg8"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_partial_aucs_first_are_padded(self, tmp_path, workers):
+        root = tmp_path / "results_phase4"
+        _write_log(root, "vanilla", 0, [_entry(1, n_runs=2)])
+        columnar_store.ingest(root, workers=workers)
+        assert columnar_store.read_manifest(root)["n_runs"] == 2
+
+        _write_log(root, "vanilla", 0, [_entry(2), _entry(3)], mode="a")
+        _write_log(root, "neutral", 0, [_entry(4, n_runs=3)])
+        assert columnar_store.ingest(root, workers=workers) == 3
+        assert columnar_store.read_manifest(root)["n_runs"] == 4
+        df = columnar_store.read(root, columns=["condition", "evaluation", "aucs"])
+        aucs = {(c, e): list(a) for c, e, a in zip(df["condition"], df["evaluation"],
+                                                    df["aucs"])}
+        assert aucs[("vanilla", 0)][:2] == pytest.approx([0.1, 0.11])
+        assert all(a != a for a in aucs[("vanilla", 0)][2:])  # NaN padding
+        assert aucs[("vanilla", 1)] == pytest.approx([0.2, 0.21, 0.22, 0.23])
+        assert aucs[("neutral", 0)][:3] == pytest.approx([0.4, 0.41, 0.42])
+        assert columnar_store.ingest(root, workers=workers) == 0
+
+    def test_parts_are_compacted(self, root, monkeypatch):
+        monkeypatch.setattr(columnar_store, "MAX_PARTS", 2)
+        columnar_store.ingest(root)
+        for i in range(4, 9):
+            _write_log(root, "vanilla", 0, [_entry(i)], mode="a")
+            columnar_store.ingest(root)
+        files = list((columnar_store.store_dir(root) / "scalars").rglob("part-*.parquet"))
+        assert len(files) <= 2 + 1
+        df = columnar_store.read(root, columns=["condition", "evaluation"],
+                                 filter=ds.field("condition") == "vanilla")
+        assert list(df["evaluation"]) == list(range(9))
@@ -0,0 +1,92 @@
+"""Tests for the vectorised convergence engine (analysis.convergence).
+
+Run with:
+    pytest tests/test_convergence.py -v
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.convergence import ConvergenceTensor
+
+
+def _frame(seed=0):
+    """Ragged runs: different lengths per seed, failures, an empty seed."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for model, lengths in (("a", (7, 5, 0)), ("b", (3, 3, 6))):
+        for s, n in enumerate(lengths):
+            for e in rng.permutation(n):
+                fit = rng.random()
+                if rng.random() < 0.2:
+                    fit = -np.inf if model == "a" else np.nan
+                rows.append({"model": model, "seed": s, "evaluation": e, "fitness": fit})
+    rows.append({"model": "other", "seed": 0, "evaluation": 0, "fitness": 1.0})
+    return pd.DataFrame(rows)
+
+
+def _reference(df, model, seeds):
+    """The per-(model, seed) loop the figures used before."""
+    curves = []
+    for seed in seeds:
+        sub = df[(df["model"] == model) & (df["seed"] == seed)].sort_values("evaluation")
+        vals = sub["fitness"].values.astype(float)
+        vals[np.isinf(vals)] = np.nan
+        curves.append(pd.Series(vals).expanding().max().values)
+    max_len = max(len(c) for c in curves)
+    padded = [np.concatenate([c, np.full(max_len - len(c), c[-1] if len(c) else np.nan)])
+              for c in curves]
+    return np.array(padded)
+
+
+class TestConvergenceTensor:
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference_loop(self, seed):
+        df = _frame(seed)
+        conv = ConvergenceTensor(df, "model", groups=["a", "b"], seeds=range(3))
+        for model in ("a", "b"):
+            ref = _reference(df, model, range(3))
+            band = conv.band(model)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                np.testing.assert_allclose(band["mean"], np.nanmean(ref, axis=0))
+                np.testing.assert_allclose(band["std"], np.nanstd(ref, axis=0))
+            np.testing.assert_array_equal(band["x"], np.arange(1, ref.shape[1] + 1))
+
+    def test_group_length_and_empty_group(self):
+        df = _frame()
+        conv = ConvergenceTensor(df, "model", groups=["a", "b", "missing"], seeds=range(3))
+        assert conv.fitness.shape == (3, 3, 7)
+        assert len(conv.band("b")["x"]) == 6
+        assert conv.band("missing") is None
+        assert conv.lengths.tolist()[0] == [7, 5, 0]
+
+    def test_multi_column_groups(self):
+        df = _frame().rename(columns={"model": "feature"}).assign(format="json")
+        conv = ConvergenceTensor(df, ["feature", "format"], groups=[("b", "json")], seeds=range(3))
+        ref = _reference(df.rename(columns={"feature": "model"}), "b", range(3))
+        np.testing.assert_allclose(conv.best_so_far()[0, :, :6], ref)
+
+    def test_time_to_threshold_and_table(self):
+        df = pd.DataFrame({"g": ["x"] * 4 + ["y"] * 2, "seed": [0] * 6,
+                           "evaluation": [0, 1, 2, 3, 0, 1],
+                           "fitness": [0.1, np.nan, 0.6, 0.5, 0.2, 0.3]})
+        conv = ConvergenceTensor(df, "g", groups=["x", "y"])
+        np.testing.assert_array_equal(conv.time_to_threshold(0.5), [[3.0], [np.nan]])
+        np.testing.assert_array_equal(conv.final_best(), [[0.6], [0.3]])
+        table = conv.table(thresholds=[0.25])
+        assert table["evals_to_0.25"].tolist()[1] == 2.0
+        assert table["evaluations"].tolist() == [4, 2]
+
+    def test_confidence_interval(self):
+        df = pd.DataFrame({"g": "x", "seed": [0, 1, 2], "evaluation": 0,
+                           "fitness": [0.2, 0.4, 0.6]})
+        band = ConvergenceTensor(df, "g", groups=["x"]).band("x")
+        half = 2.0 / np.sqrt(3) * 4.302652729911275 / 10
+        np.testing.assert_allclose(band["ci_low"], [0.4 - half])
+        np.testing.assert_allclose(band["ci_high"], [0.4 + half])
+        assert band["n"].tolist() == [3]
@@ -0,0 +1,76 @@
+"""Tests for the cached t-SNE maps (analysis.embedding).
+
+Run with:
+    pytest tests/test_embedding.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import embedding, figure_build
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(figure_build, "CACHE_DIR", tmp_path / "cache")
+
+
+@pytest.fixture
+def blobs():
+    rng = np.random.default_rng(0)
+    centres = np.array([[0.0, 0, 0, 0], [8, 8, 0, 0], [0, 8, 8, 8]])
+    labels = np.repeat([0, 1, 2], 40)
+    X = centres[labels] + rng.normal(size=(120, 4))
+    return pd.DataFrame(X, columns=["a", "b", "c", "d"]), labels
+
+
+def _separated(points, labels):
+    """Every point is closer to its own cluster's centroid than to the others."""
+    centroids = np.stack([points[labels == g].mean(axis=0) for g in np.unique(labels)])
+    nearest = np.linalg.norm(points[:, None] - centroids[None], axis=2).argmin(axis=1)
+    return (nearest == labels).mean()
+
+
+class TestFitMap:
+
+    def test_cached_by_data_and_params(self, blobs, monkeypatch):
+        X, labels = blobs
+        fits = []
+        real = embedding._fit
+        monkeypatch.setattr(embedding, "_fit", lambda *args: fits.append(1) or real(*args))
+        tsne_map = embedding.fit_map(X, perplexity=10)
+        assert tsne_map["embedding"].shape == (120, 2)
+        assert _separated(tsne_map["embedding"], labels) == 1.0
+
+        again = embedding.fit_map(X, perplexity=10)
+        np.testing.assert_array_equal(again["embedding"], tsne_map["embedding"])
+        assert len(fits) == 1
+        embedding.fit_map(X, perplexity=5)
+        embedding.fit_map(X.assign(a=X["a"] + 1), perplexity=5)
+        assert len(fits) == 3
+
+    def test_subsample_places_the_rest(self, blobs):
+        X, labels = blobs
+        tsne_map = embedding.fit_map(X, perplexity=10, max_fit=60)
+        index = tsne_map["landmark_index"]
+        assert len(index) == 60 and tsne_map["embedding"].shape == (120, 2)
+        np.testing.assert_array_equal(tsne_map["embedding"][index],
+                                      tsne_map["landmark_embedding"])
+        assert _separated(tsne_map["embedding"], labels) > 0.95
+
+
+class TestPlace:
+
+    def test_new_points_land_in_their_cluster(self, blobs):
+        X, labels = blobs
+        tsne_map = embedding.fit_map(X, perplexity=10)
+        rng = np.random.default_rng(1)
+        new = X.groupby(labels).mean().to_numpy()[labels] + 0.3 * rng.normal(size=(120, 4))
+        frame = pd.DataFrame(new, columns=X.columns)[["d", "c", "b", "a"]]
+        placed = embedding.place(tsne_map, frame)
+        centroids = np.stack([tsne_map["embedding"][labels == g].mean(axis=0)
+                              for g in range(3)])
+        nearest = np.linalg.norm(placed[:, None] - centroids[None], axis=2).argmin(axis=1)
+        assert (nearest == labels).mean() > 0.95
+        assert embedding.place(tsne_map, new[:0]).shape == (0, 2)
@@ -0,0 +1,159 @@
+"""Tests for the persistent evaluation workers (experiments.eval_workers).
+
+Run with:
+    pytest tests/test_eval_workers.py -v
+"""
+
+import os
+import time
+
+import cloudpickle
+import pytest
+
+from iohblade.solution import Solution
+
+from experiments.eval_workers import WorkerPool, report_partial
+
+_LEAK = []
+
+
+class _FakeProblem:
+    """Behaves according to the candidate's code string."""
+
+    def evaluate(self, solution):
+        if solution.code == "leak":
+            _LEAK.append(bytearray(60 * 2**20))
+        elif solution.code == "sleep":
+            time.sleep(60)
+        elif solution.code == "crash":
+            os._exit(3)
+        elif solution.code == "raise":
+            raise ValueError("broken problem")
+        elif solution.code == "hog":
+            _LEAK.append(bytearray(400 * 2**20))
+            time.sleep(10)
+        elif solution.code == "huge":
+            _LEAK.append(bytearray(64 * 2**30))
+        elif solution.code == "stream":
+            for seed in range(2):
+                report_partial({"seed": seed, "auc": 0.5})
+            time.sleep(60)
+        elif solution.code == "env":
+            solution.set_scores(1.0, os.environ.get("OMP_NUM_THREADS", ""))
+            return solution
+        print("evaluated", solution.code)
+        solution.set_scores(1.0, "fine")
+        return solution
+
+
+_BLOB = cloudpickle.dumps(_FakeProblem())
+
+
+def _eval(pool, code, timeout=30):
+    return pool.evaluate("fake", lambda: _BLOB, Solution(code=code), timeout)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        kwargs.setdefault("preload", ())
+        pool = WorkerPool(**kwargs).start()
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def _wait_for_standby(pool, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not all(w.ready for w in pool._standby):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+class TestRecycling:
+
+    def test_recycles_by_count_onto_ready_standby(self, make_pool):
+        pool = make_pool(max_evals=2, standby=1)
+        for _ in range(2):
+            result, error, info = _eval(pool, "ok")
+            assert error is None and result.fitness == 1.0
+            assert "evaluated ok" in info["stdout"]
+        assert pool.stats["recycled"]["evals"] == 1
+
+        _wait_for_standby(pool)
+        result, error, info = _eval(pool, "ok")
+        assert error is None
+        # The replacement was pre-spawned and pre-imported: no startup wait.
+        assert info["startup_wait_s"] < 0.5
+        assert pool.stats["cold_starts"] == 0
+
+    def test_recycles_on_leak_and_rss(self, make_pool):
+        pool = make_pool(max_evals=100, leak_mb=40)
+        _eval(pool, "ok")
+        _eval(pool, "leak")
+        assert pool.stats["recycled"]["leak"] == 1
+
+        pool = make_pool(max_evals=100, max_rss_mb=1)
+        _eval(pool, "ok")
+        assert pool.stats["recycled"]["rss"] == 1
+
+
+class TestFailures:
+
+    def test_timeout_kills_worker(self, make_pool):
+        pool = make_pool()
+        result, error, _ = _eval(pool, "sleep", timeout=1)
+        assert result is None and "timed out after 1 seconds" in error
+        assert _eval(pool, "ok")[1] is None
+        assert pool.stats["timeouts"] == 1
+
+    def test_timeout_keeps_streamed_results(self, make_pool):
+        pool = make_pool()
+        result, error, info = _eval(pool, "stream", timeout=2)
+        assert result is None and info["timed_out"]
+        assert info["partial"] == [{"seed": 0, "auc": 0.5}, {"seed": 1, "auc": 0.5}]
+        assert pool.stats["partial_results"] == 2
+        assert _eval(pool, "ok")[2]["partial"] == []
+
+    def test_crash_and_exception_are_reported(self, make_pool):
+        pool = make_pool()
+        result, error, info = _eval(pool, "crash")
+        assert result is None and "exit code 3" in error
+        result, error, info = _eval(pool, "raise")
+        assert "ValueError: broken problem" in error
+        assert _eval(pool, "ok")[1] is None
+
+    def test_idle_worker_killed_before_evaluate(self, make_pool):
+        pool = make_pool()
+        assert _eval(pool, "ok")[1] is None
+        worker = pool._idle[-1]
+        worker.process.terminate()
+        worker.process.join(5)
+        result, error, info = _eval(pool, "ok")
+        assert result is None and "worker died (exit code -15)" in error
+        assert info["partial"] == []
+        assert pool.stats["crashes"] == 1
+        assert _eval(pool, "ok")[1] is None
+
+
+class TestWarmStart:
+
+    def test_llamea_utils_shim_is_cached(self):
+        from experiments.mabbob_problem import llamea_utils
+        utils = llamea_utils()
+        assert utils is llamea_utils()
+        assert callable(utils.prepare_namespace)
+
+    def test_forkserver_workers_start_warm(self, make_pool):
+        pool = make_pool(start_method="forkserver", standby=0)
+        _eval(pool, "ok")                      # starts the forkserver
+        pool.max_evals = 1
+        _eval(pool, "ok")                      # recycles the worker
+        result, error, info = _eval(pool, "ok")
+        assert error is None
+        assert info["startup_wait_s"] < 1.0
@@ -0,0 +1,89 @@
+"""Tests for incremental figure builds (analysis.figure_build).
+
+Run with:
+    pytest tests/test_figure_build.py -v
+"""
+
+import numpy as np
+import pytest
+
+from analysis import figure_build
+
+
+# Inputs load as (output dir, version) so figures also work in pool workers.
+
+def fig_a(data):
+    (data[0] / "fig_a.pdf").write_text(str(data[1]))
+
+
+def fig_b(data, other):
+    (data[0] / "fig_b.pdf").write_text(f"{data[1]} {other[1]}")
+
+
+def fig_broken(data):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(figure_build, "CACHE_DIR", tmp_path / "cache")
+    version = {"x": 1, "y": 1}
+    loads = []
+
+    def source(name):
+        def load():
+            loads.append(name)
+            return tmp_path, version[name]
+        return {"fingerprint": lambda: version[name], "load": load}
+
+    inputs = {"x": source("x"), "y": source("y"),
+              "gone": {"fingerprint": lambda: None, "load": lambda: None}}
+    figures = [("fig_a", fig_a, ("x",)), ("fig_b", fig_b, ("x", "y"))]
+    return tmp_path, inputs, figures, version, loads
+
+
+class TestBuild:
+
+    def test_rebuilds_only_stale_figures(self, setup):
+        out, inputs, figures, version, loads = setup
+        assert figure_build.build(figures, inputs, out)["built"] == ["fig_a", "fig_b"]
+        loads.clear()
+        report = figure_build.build(figures, inputs, out)
+        assert report["skipped"] == ["fig_a", "fig_b"] and loads == []
+        version["y"] = 2
+        assert figure_build.build(figures, inputs, out)["built"] == ["fig_b"]
+        assert (out / "fig_b.pdf").read_text() == "1 2"
+        (out / "fig_a.pdf").unlink()
+        assert figure_build.build(figures, inputs, out)["built"] == ["fig_a"]
+
+    def test_only_force_missing_and_failures(self, setup):
+        out, inputs, figures, version, loads = setup
+        figures += [("fig_c", fig_a, ("gone",)), ("fig_broken", fig_broken, ("x",))]
+        report = figure_build.build(figures, inputs, out, only=["fig_a", "fig_c", "fig_broken"])
+        assert report == {"built": ["fig_a"], "skipped": [], "missing_inputs": ["fig_c"],
+                          "failed": ["fig_broken"]}
+        assert figure_build.build(figures, inputs, out, only=["fig_a"], force=True)["built"] == ["fig_a"]
+        with pytest.raises(ValueError):
+            figure_build.build(figures, inputs, out, only=["fig_z"])
+
+    def test_parallel_render(self, setup):
+        out, inputs, figures, version, loads = setup
+        report = figure_build.build(figures, inputs, out, jobs=2)
+        assert sorted(report["built"]) == ["fig_a", "fig_b"]
+        assert (out / "fig_b.pdf").read_text() == "1 1"
+
+
+class TestCached:
+
+    def test_keyed_by_data_and_params(self, setup):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        x = np.arange(10.0)
+        assert figure_build.cached("emb", (x, 30), compute) == 1
+        assert figure_build.cached("emb", (x.copy(), 30), compute) == 1
+        assert figure_build.cached("emb", (x, 5), compute) == 2
+        assert len(list(figure_build.CACHE_DIR.glob("emb-*.pkl"))) == 1
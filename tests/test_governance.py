@@ -0,0 +1,56 @@
+"""Tests for evaluation-worker resource governance (experiments.governance).
+
+Run with:
+    pytest tests/test_governance.py -v
+"""
+
+import pytest
+
+from experiments import governance
+
+from .test_eval_workers import _eval, make_pool  # noqa: F401  (fixture)
+
+
+class TestProfiles:
+
+    def test_resolve_profile_env_and_overrides(self, monkeypatch):
+        monkeypatch.delenv("EVAL_GOVERNANCE", raising=False)
+        assert governance.resolve()["blas_threads"] == 1
+        monkeypatch.setenv("EVAL_GOVERNANCE", "strict")
+        monkeypatch.setenv("EVAL_RSS_LIMIT_MB", "none")
+        gov = governance.resolve(address_space_mb=1024)
+        assert gov["rss_limit_mb"] is None
+        assert gov["address_space_mb"] == 1024
+        assert gov["cpu_affinity"] == "spread"
+        with pytest.raises(ValueError):
+            governance.resolve("lenient")
+
+    def test_cpu_sets(self):
+        assert governance.parse_cpus("0-2,5") == [0, 1, 2, 5]
+        cpus = governance.worker_cpus({"cpu_affinity": "spread"}, 7)
+        assert cpus is None or len(cpus) == 1
+
+
+class TestLimitsInWorkers:
+
+    def test_blas_threads_reach_worker(self, make_pool):
+        pool = make_pool(limits={"blas_threads": 2})
+        result, error, _ = _eval(pool, "env")
+        assert error is None and result.feedback == "2"
+
+    def test_rss_cap_becomes_feedback(self, make_pool):
+        pool = make_pool(limits={"rss_limit_mb": 250})
+        result, error, _ = _eval(pool, "hog")
+        assert result is None
+        assert error.startswith("The algorithm exceeded the memory limit of 250 MB")
+        assert pool.stats["limit_violations"]["rss"] == 1
+        assert _eval(pool, "ok")[1] is None
+
+    def test_address_space_cap_becomes_feedback(self, make_pool):
+        pool = make_pool(limits={"address_space_mb": 4096})
+        result, error, _ = _eval(pool, "huge")
+        assert "exceeded the memory limit of 4096 MB" in error
+        assert pool.stats["limit_violations"]["address_space"] == 1
+        # The worker survives an allocation failure.
+        assert _eval(pool, "ok")[1] is None
+        assert pool.stats["crashes"] == 0
@@ -0,0 +1,93 @@
+"""Tests for the LLM record/replay cache (experiments.llm_cache).
+
+Run with:
+    pytest tests/test_llm_cache.py -v
+"""
+
+import copy
+
+import pytest
+
+from iohblade.llm import LLM
+
+from experiments.llm_cache import LLMCache, RecordReplayLLM, ReplayMissError
+
+MODEL_CFG = {"type": "ollama", "model": "fake-model"}
+
+
+class _CountingLLM(LLM):
+    """Returns a different response on every call."""
+
+    def __init__(self):
+        super().__init__("", "fake-model", None)
+        self.calls = 0
+
+    def _query(self, session, **kwargs):
+        self.calls += 1
+        return f"response {self.calls} to {session[-1]['content']}"
+
+
+class _Logger:
+    def __init__(self):
+        self.conversation = []
+
+    def log_conversation(self, role, content, cost=0, tokens=0):
+        self.conversation.append((role, content))
+
+
+def _msg(text):
+    return [{"role": "user", "content": text}]
+
+
+class TestRecordReplay:
+
+    def test_replay_returns_recorded_responses(self, tmp_path):
+        real = _CountingLLM()
+        rec = RecordReplayLLM(real, MODEL_CFG, tmp_path, mode="record")
+        recorded = [rec.query(_msg("a")), rec.query(_msg("a")), rec.query(_msg("b"))]
+        assert real.calls == 3
+        assert len(LLMCache(tmp_path)) == 3
+
+        rep = RecordReplayLLM(None, MODEL_CFG, tmp_path, mode="replay")
+        replayed = [rep.query(_msg("a")), rep.query(_msg("a")), rep.query(_msg("b"))]
+        # Identical prompts replay in the order they were answered.
+        assert replayed == recorded
+        assert recorded[0] != recorded[1]
+        assert rep.stats == {"hits": 3, "misses": 0, "recorded": 0}
+
+    def test_miss_is_loud(self, tmp_path):
+        rep = RecordReplayLLM(None, MODEL_CFG, tmp_path, mode="replay")
+        with pytest.raises(ReplayMissError):
+            rep.query(_msg("never recorded"))
+        # Not an Exception, so LLaMEA's error handling cannot swallow it.
+        assert not issubclass(ReplayMissError, Exception)
+
+    def test_key_covers_model_and_config(self, tmp_path):
+        RecordReplayLLM(_CountingLLM(), MODEL_CFG, tmp_path, mode="record").query(_msg("a"))
+        other = dict(MODEL_CFG, generation_config={"temperature": 0.2})
+        rep = RecordReplayLLM(None, other, tmp_path, mode="replay")
+        with pytest.raises(ReplayMissError):
+            rep.query(_msg("a"))
+
+    def test_state_resumes_occurrence_counters(self, tmp_path):
+        rec = RecordReplayLLM(_CountingLLM(), MODEL_CFG, tmp_path, mode="record")
+        first, second = rec.query(_msg("a")), rec.query(_msg("a"))
+
+        rep = RecordReplayLLM(None, MODEL_CFG, tmp_path, mode="replay")
+        assert rep.query(_msg("a")) == first
+        state = rep.get_state()
+
+        resumed = RecordReplayLLM(None, MODEL_CFG, tmp_path, mode="replay")
+        resumed.set_state(state)
+        assert resumed.query(_msg("a")) == second
+
+    def test_logging_and_deepcopy(self, tmp_path):
+        rec = RecordReplayLLM(_CountingLLM(), MODEL_CFG, tmp_path, mode="record")
+        logger = _Logger()
+        rec.set_logger(logger)
+        reply = rec.query(_msg("a"))
+        assert logger.conversation[-1] == ("fake-model", reply)
+
+        clone = copy.deepcopy(rec)
+        assert clone.get_state() == rec.get_state()
+        clone.query(_msg("b"))
@@ -0,0 +1,111 @@
+"""Tests for the shared analysis loaders (analysis.loaders).
+
+Run with:
+    pytest tests/test_loaders.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import columnar_store, loaders
+
+from .test_columnar_store import _entry, _write_log
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "results_phase3"
+    for cond in ("b-feat", "a-feat"):
+        for seed in range(3):
+            _write_log(root, cond, seed, [_entry(i) for i in range(4)])
+    return root
+
+
+class TestLoadRuns:
+
+    def test_order_seeds_and_text(self, root):
+        df = loaders.load_runs(root, ["b-feat", "a-feat"], ["fitness", "name"],
+                               text_columns=["code"], seeds=range(2))
+        assert list(df["condition"].unique()) == ["b-feat", "a-feat"]
+        assert sorted(df["seed"].unique()) == [0, 1]
+        assert (df["code"] == "class " + df["name"].astype(str) + ": pass").all()
+        assert "bf_dispersion" in df.columns and "bfstd_dispersion" not in df.columns
+
+    def test_first_run_of_a_seed_only(self, root):
+        extra = root / "a-feat" / "seed-0" / "run-zz"
+        extra.mkdir()
+        (extra / "log.jsonl").write_text(
+            (root / "a-feat" / "seed-0" / "run-a-feat-MA_BBOB-0" / "log.jsonl").read_text())
+        df = loaders.load_runs(root, ["a-feat"], ["fitness"], seeds=[0])
+        assert len(df) == 4
+
+    def test_compact_dtypes(self, root):
+        df = loaders.load_runs(root, ["b-feat", "a-feat"], ["fitness", "name"])
+        assert list(df["condition"].cat.categories) == ["b-feat", "a-feat"]
+        assert isinstance(df["name"].dtype, pd.CategoricalDtype)
+        assert df["bf_dispersion"].dtype == np.float32
+        assert df["fitness"].dtype == np.float64
+
+        loose = loaders.load_runs(root, ["a-feat"], ["name"], compact=False)
+        assert loose["name"].dtype == object and loose["bf_dispersion"].dtype == np.float64
+
+
+class TestLookups:
+
+    def test_text_of_some_rows(self, root):
+        df = loaders.load_runs(root, ["b-feat", "a-feat"], ["name"])
+        some = df[df["evaluation"] % 2 == 1].rename(columns={"condition": "model"})
+        text = loaders.load_text(root, some, columns=["code"], condition_col="model")
+        assert text.index.equals(some.index)
+        assert (text["code"] == "class " + some["name"].astype(str) + ": pass").all()
+
+        missing = pd.DataFrame({"condition": ["a-feat"], "seed": [0], "evaluation": [99]})
+        assert loaders.load_text(root, missing)["feedback"].tolist() == [""]
+
+    def test_aucs_matrix_matches_rows(self, root):
+        _write_log(root, "a-feat", 0, [_entry(9, failed=True)], mode="a")
+        df = loaders.load_runs(root, ["a-feat"], ["fitness"], seeds=[0])
+        aucs = loaders.load_aucs(root, df.iloc[::-1])
+        assert aucs.shape == (5, 4)
+        assert np.isnan(aucs[0]).all()  # the failed candidate, now first
+        np.testing.assert_allclose(aucs[1:, 0], [0.3, 0.2, 0.1, 0.0])
+        np.testing.assert_allclose(aucs[-1], [0.0, 0.01, 0.02, 0.03])
+
+    def test_aucs_with_parts_lacking_the_column(self, tmp_path):
+        root = tmp_path / "results_phase3"
+        _write_log(root, "a-feat", 0, [_entry(0, failed=True), _entry(1, failed=True)])
+        loaders.refresh(root)  # no aucs known yet: these parts have no column
+        _write_log(root, "a-feat", 1, [_entry(2, n_runs=3), _entry(3, n_runs=3)])
+        _write_log(root, "a-feat", 0, [_entry(4, n_runs=3)], mode="a")
+        df = loaders.load_runs(root, ["a-feat"], ["fitness"])
+        aucs = loaders.load_aucs(root, df)
+        assert aucs.shape == (5, 3)
+        assert np.isnan(aucs[:2]).all()
+        np.testing.assert_allclose(aucs[2:, 0], [0.4, 0.2, 0.3])
+
+
+class TestCache:
+
+    def test_unchanged_logs_are_not_reopened(self, root, monkeypatch):
+        loaders.refresh(root)
+        opened = []
+        real = columnar_store._tail_hash
+        monkeypatch.setattr(columnar_store, "_tail_hash",
+                            lambda path, offset: opened.append(path) or real(path, offset))
+        assert loaders.refresh(root, workers=1) == 0
+        assert opened == []
+        log = _write_log(root, "a-feat", 1, [_entry(9)], mode="a")
+        assert loaders.refresh(root, workers=1) == 1
+        assert set(opened) == {log}
+
+    def test_parallel_ingest_matches_serial(self, root, tmp_path):
+        loaders.refresh(root, workers=1)
+        serial = columnar_store.read(root, columns=["condition", "seed", "evaluation", "aucs"])
+        other = tmp_path / "copy" / "results_phase3"
+        for cond in ("b-feat", "a-feat"):
+            for seed in range(3):
+                _write_log(other, cond, seed, [_entry(i) for i in range(4)])
+        loaders.refresh(other, workers=3)
+        parallel = columnar_store.read(other, columns=["condition", "seed", "evaluation", "aucs"])
+        pd.testing.assert_frame_equal(serial, parallel)
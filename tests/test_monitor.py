@@ -0,0 +1,107 @@
+"""Tests for the live run monitor (experiments.monitor).
+
+Run with:
+    pytest tests/test_monitor.py -v
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from experiments import monitor
+
+
+def _entry(i, failed=False):
+    return {"id": f"c{i}", "fitness": float("-inf") if failed else 0.1 * i}
+
+
+def _append(run_dir, entries, raw=""):
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "log.jsonl", "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+        f.write(raw)
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "results"
+    seed_dir = root / "vanilla" / "seed-0"
+    _append(seed_dir / "run-a", [_entry(1), _entry(2, failed=True)])
+    (seed_dir / "progress.json").write_text(json.dumps({"runs": [
+        {"log_dir": "run-a", "start_time": "2026-01-01T00:00:00", "budget": 10}]}))
+    return root
+
+
+class TestTail:
+
+    def test_reads_only_new_complete_lines(self, root):
+        run_dir = root / "vanilla" / "seed-0" / "run-a"
+        record = monitor._new_record()
+        assert monitor.tail_log(run_dir / "log.jsonl", record, chunk=7) > 0
+        assert (record["candidates"], record["failed"], record["best"]) == (2, 1, 0.1)
+
+        line = json.dumps(_entry(3))
+        _append(run_dir, [], raw=line[:5])
+        assert monitor.tail_log(run_dir / "log.jsonl", record) == 0
+        _append(run_dir, [], raw=line[5:] + "\n")
+        monitor.tail_log(run_dir / "log.jsonl", record)
+        assert (record["candidates"], record["best"]) == (3, pytest.approx(0.3))
+
+    def test_shrunk_log_is_read_again(self, root):
+        log = root / "vanilla" / "seed-0" / "run-a" / "log.jsonl"
+        record = monitor._new_record()
+        monitor.tail_log(log, record)
+        log.write_text(json.dumps(_entry(5)) + "\n")
+        monitor.tail_log(log, record)
+        assert (record["candidates"], record["failed"], record["best"]) == (1, 0, 0.5)
+
+
+class TestMonitor:
+
+    def test_poll_state_and_rows(self, root):
+        state = monitor.load_state(root)
+        monitor.poll(root, state)
+        _append(root / "vanilla" / "seed-0" / "run-b", [_entry(4)])
+        _append(root / "neutral" / "seed-1" / "run-a", [_entry(1)])
+        monitor.poll(root, state)
+        monitor.save_state(root, state)
+        assert monitor.poll(root, monitor.load_state(root)) == 0  # nothing re-read
+
+        record = state["runs"]["vanilla/seed-0/run-a"]
+        assert record["budget"] == 10 and record["start"] < record["last_write"]
+        rows = monitor.seed_rows(state, now=record["last_write"])
+        assert [(r["condition"], r["seed"], r["candidates"]) for r in rows] == [
+            ("neutral", "1", 1), ("vanilla", "0", 3)]
+        vanilla = rows[1]
+        assert vanilla["best"] == pytest.approx(0.4)
+        assert vanilla["failure_rate"] == pytest.approx(1 / 3)
+        assert vanilla["per_hour"] > 0 and vanilla["eta_s"] > 0
+        assert vanilla["status"] == "running"
+        assert monitor.seed_rows(state, now=record["last_write"] + 10**6)[1]["status"] == "stalled"
+
+    def test_rate_restarts_with_resumed_run(self, root):
+        seed_dir = root / "vanilla" / "seed-0"
+        state = monitor.load_state(root)
+        monitor.poll(root, state)
+        # Requeued: BLADE records a new start_time for the resumed run.
+        restart = datetime.now() - timedelta(hours=1)
+        (seed_dir / "progress.json").write_text(json.dumps({"runs": [
+            {"log_dir": "run-a", "start_time": restart.isoformat(), "budget": 10}]}))
+        _append(seed_dir / "run-a", [_entry(3), _entry(4), _entry(5)])
+        monitor.poll(root, state)
+
+        record = state["runs"]["vanilla/seed-0/run-a"]
+        assert record["start"] == pytest.approx(restart.timestamp())
+        row, = monitor.seed_rows(state, now=record["last_write"])
+        assert row["candidates"] == 5
+        assert row["per_hour"] == pytest.approx(3, rel=0.01)
+        assert row["eta_s"] == pytest.approx(5 / 3 * 3600, rel=0.01)
+
+    def test_main_once(self, root, capsys):
+        assert monitor.main([str(root), "--once", "--budget", "3"]) == 0
+        out = capsys.readouterr().out
+        assert "vanilla" in out and "2/10" in out
+        assert (root / monitor.STATE_FILE).exists()
+        assert monitor.main([str(root / "missing"), "--once"]) == 1
@@ -0,0 +1,73 @@
+"""Tests for the Phase 4 analysis pipeline (analysis.phase4_analysis).
+
+Run with:
+    pytest tests/test_phase4_analysis.py -v
+"""
+
+import numpy as np
+import pytest
+
+from analysis import phase4_analysis
+
+from .test_columnar_store import _entry, _write_log
+
+N_RUNS = 100  # 1 dim x 20 instances x 5 evaluation seeds
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "results_phase4"
+    for cond, scale in (("vanilla", 0.5), ("sage", 1.0)):
+        for seed in range(3):
+            entries = [_entry(i, n_runs=N_RUNS) for i in range(6)]
+            for entry in entries:
+                entry["fitness"] *= scale * (1 + 0.01 * seed)
+            entries[2] = _entry(2, failed=True)
+            _write_log(root, cond, seed, entries)
+    return root
+
+
+class TestAnalyse:
+
+    def test_tables(self, root):
+        tables = phase4_analysis.analyse(root, conditions=["vanilla", "sage"],
+                                         seeds=range(3), thresholds=[0.4])
+        per_seed = tables["best_per_seed"]
+        assert len(per_seed) == 6
+        assert (per_seed["candidates"] == 6).all() and (per_seed["failed"] == 1).all()
+        assert (per_seed["best_evaluation"] == 5).all()
+        sage = per_seed[per_seed["condition"] == "sage"]
+        np.testing.assert_allclose(sage["best_aocc"], [0.5, 0.505, 0.51])
+        # Best-so-far reaches 0.4 at candidate 0.4 (evaluation 4, 1-based 5).
+        assert sage["evals_to_0.4"].tolist() == [5.0, 5.0, 5.0]
+        assert per_seed.loc[per_seed["condition"] == "vanilla", "evals_to_0.4"].isna().all()
+
+        comparison = tables["condition_comparison"].set_index("condition")
+        assert np.isnan(comparison.loc["vanilla", "p_vs_baseline"])
+        assert comparison.loc["sage", "p_vs_baseline"] < 0.2
+        assert comparison.loc["sage", "reached_0.4"] == 3
+        assert comparison.loc["vanilla", "failure_rate"] == pytest.approx(1 / 6)
+        assert comparison.loc["sage", "diff_vs_baseline"] == pytest.approx(0.2525)
+        assert comparison.loc["sage", "p_perm"] < 0.2
+        assert (comparison["aocc_ci_low"] <= comparison["aocc_mean"]).all()
+
+        conv = tables["convergence"]
+        assert len(conv) == 12 and list(conv["condition"].unique()) == ["vanilla", "sage"]
+
+        inst = tables["instance_aocc"]
+        assert len(inst) == 2 * 20 and (inst["seeds"] == 3).all()
+        # Best candidate i=5: AOCC 0.5 + 0.01 * run, runs grouped by 5 per instance.
+        first = inst[(inst["condition"] == "sage")].iloc[0]
+        assert first["mean"] == pytest.approx(0.5 + 0.02)
+
+    def test_missing_results(self, tmp_path):
+        tables = phase4_analysis.analyse(tmp_path / "results_phase4")
+        assert all(t.empty for t in tables.values())
+
+    def test_cli_writes_csvs(self, root, tmp_path):
+        out = tmp_path / "out"
+        assert phase4_analysis.main(["--results", str(root), "--out", str(out)]) == 0
+        assert sorted(p.name for p in out.iterdir()) == [
+            "phase4_best_per_seed.csv", "phase4_condition_comparison.csv",
+            "phase4_convergence.csv", "phase4_instance_aocc.csv"]
+
@@ -0,0 +1,119 @@
+"""Tests for the slim problem descriptor shipped to evaluation workers.
+
+Run with:
+    pytest tests/test_problem_descriptor.py -v
+"""
+
+import cloudpickle
+import pytest
+
+from iohblade.solution import Solution
+
+from experiments.benchmark_eval_overhead import _RANDOM_SEARCH_CODE
+from experiments.eval_workers import WorkerPool, build_problem
+from experiments.feedback import (
+    feedback_features,
+    feedback_from_spec,
+    feedback_spec,
+    make_comparative_feature_feedback,
+    make_multi_feature_neutral_feedback,
+    vanilla_feedback,
+)
+from experiments.mabbob_problem import PROBLEM_DESCRIPTOR_VERSION, MaBBOBProblem
+
+_METRICS = {"avg_improvement": 0.2, "x_spread_early": 1.5}
+
+
+def make_problem(make_feedback=vanilla_feedback, **kwargs):
+    kwargs.setdefault("training_instances", [0])
+    return MaBBOBProblem(make_feedback=make_feedback, eval_seeds=1, dims=[2],
+                         budget_factor=100, **kwargs)
+
+
+class TestFeedbackSpec:
+
+    @pytest.mark.parametrize("fn", [
+        vanilla_feedback,
+        make_comparative_feature_feedback("avg_improvement"),
+        make_multi_feature_neutral_feedback(["avg_improvement", "x_spread_early"]),
+    ])
+    def test_round_trip_formats_identically(self, fn):
+        rebuilt = feedback_from_spec(feedback_spec(fn))
+        assert rebuilt("A", 0.5, 0.1, _METRICS) == fn("A", 0.5, 0.1, _METRICS)
+
+    def test_custom_callable_has_no_spec(self):
+        assert feedback_spec(lambda *a: "x") is None
+
+    def test_features(self):
+        fn = make_multi_feature_neutral_feedback(["avg_improvement", "x_spread_early"])
+        assert feedback_features(feedback_spec(fn)) == ["avg_improvement", "x_spread_early"]
+        assert feedback_features(feedback_spec(vanilla_feedback)) == []
+
+    def test_unknown_spec(self):
+        with pytest.raises(ValueError):
+            feedback_from_spec({"name": "nope", "args": []})
+
+
+class TestDescriptor:
+
+    def test_descriptor_is_small_and_versioned(self):
+        problem = make_problem(make_comparative_feature_feedback("avg_improvement"))
+        desc = problem.descriptor()
+        assert desc["version"] == PROBLEM_DESCRIPTOR_VERSION
+        assert desc["features"] == ["avg_improvement"]
+        assert desc["feedback"] == {"name": "comparative", "args": ["avg_improvement"]}
+        assert len(problem._worker_blob()) < 2000
+
+    def test_equal_configs_share_key(self):
+        assert make_problem()._worker_key == make_problem()._worker_key
+        assert (make_problem()._worker_key
+                != make_problem(training_instances=[1])._worker_key)
+
+    def test_custom_feedback_is_shipped_and_keyed_per_problem(self):
+        custom = lambda name, *a: f"custom {name}"  # noqa: E731
+        a, b = make_problem(custom), make_problem(custom)
+        assert a._worker_key != b._worker_key
+        rebuilt = build_problem(cloudpickle.loads(a._worker_blob()))
+        assert rebuilt.make_feedback("X") == "custom X"
+
+    def test_rejects_other_versions(self):
+        desc = make_problem().descriptor()
+        desc["version"] = PROBLEM_DESCRIPTOR_VERSION + 1
+        with pytest.raises(ValueError):
+            MaBBOBProblem.from_descriptor(desc)
+
+    def test_rebuilt_problem_evaluates_like_the_original(self):
+        problem = make_problem()
+        rebuilt = build_problem(cloudpickle.loads(problem._worker_blob()))
+        a = problem.evaluate(Solution(code=_RANDOM_SEARCH_CODE, name="RandomSearch"))
+        b = rebuilt.evaluate(Solution(code=_RANDOM_SEARCH_CODE, name="RandomSearch"))
+        assert a.fitness == b.fitness
+        assert a.feedback == b.feedback
+
+    def test_env_dir_shared_per_config(self):
+        a, b, c = make_problem(), make_problem(), make_problem(training_instances=[1])
+        for p in (a, b, c):
+            p._ensure_env()
+        assert a._env_path == b._env_path != c._env_path
+        a.cleanup()
+        assert a._env_path.is_dir()
+
+
+class TestPooledIPC:
+
+    def test_worker_rebuilds_from_descriptor(self):
+        problem = make_problem()
+        pool = WorkerPool(standby=0).start()
+        try:
+            for _ in range(2):
+                sol = Solution(code=_RANDOM_SEARCH_CODE, name="RandomSearch")
+                result, error, info = pool.evaluate(
+                    problem._worker_key, problem._worker_blob, sol, 60)
+                assert error is None
+                assert result.fitness > 0
+                assert info["ipc_bytes"] > 0 and info["pickle_s"] >= 0
+        finally:
+            pool.shutdown()
+        ipc = pool.stats["ipc"]
+        assert 0 < ipc["problem_bytes"] < 2000
+        assert ipc["solution_bytes"] > 0 and ipc["result_bytes"] > 0
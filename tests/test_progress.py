@@ -0,0 +1,87 @@
+"""Tests for run-progress records and the results-root index (experiments.progress).
+
+Run with:
+    pytest tests/test_progress.py -v
+"""
+
+import json
+from types import SimpleNamespace
+
+from experiments import progress
+
+
+def _run_dir(root, tag="vanilla", seed=0, name="run-vanilla-MA_BBOB-0"):
+    d = root / tag / f"seed-{seed}" / name
+    d.mkdir(parents=True)
+    return d
+
+
+def _append(run_dir, cid, fitness):
+    with open(run_dir / "log.jsonl", "a") as f:
+        f.write(json.dumps({"id": cid, "fitness": fitness, "code": "x" * 100}) + "\n")
+
+
+class TestRunProgress:
+
+    def test_records_candidates_and_index(self, tmp_path):
+        run_dir = _run_dir(tmp_path)
+        prog = progress.RunProgress.for_dir(run_dir, budget=3)
+        for i, fit in enumerate([0.1, 0.5, float("-inf")]):
+            _append(run_dir, str(i), fit)
+            prog.record_candidate(SimpleNamespace(id=str(i), fitness=fit))
+        prog.record_checkpoint(generation=3, n_history=3)
+
+        data = json.loads((run_dir / "progress.json").read_text())
+        assert data["candidates"] == 3
+        assert data["best_fitness"] == 0.5 and data["best_id"] == "1"
+        assert data["complete"]
+        assert data["checkpoint"] == {"generation": 3, "n_history": 3}
+
+        index = progress.read_index(tmp_path)
+        assert index["vanilla/seed-0"]["candidates"] == 3
+        assert index["vanilla/seed-0"]["run_dir"] == run_dir.name
+        progress.RunProgress.invalidate(run_dir)
+
+    def test_stale_record_is_recounted(self, tmp_path):
+        run_dir = _run_dir(tmp_path)
+        _append(run_dir, "a", 0.2)
+        assert progress.read_run_progress(str(run_dir), budget=5)["candidates"] == 1
+        # Written behind the record's back (e.g. by an older version).
+        _append(run_dir, "b", 0.3)
+        _append(run_dir, "b", 0.3)
+        data = progress.read_run_progress(str(run_dir), budget=5)
+        assert data["candidates"] == 2
+        assert data["best_fitness"] == 0.3
+
+    def test_seed_summary(self, tmp_path):
+        a = _run_dir(tmp_path, name="run-x-0")
+        b = _run_dir(tmp_path, name="run-x-0-1")
+        for i in range(3):
+            _append(a, f"a{i}", 0.1)
+        _append(b, "b0", 0.9)
+        (b / "llamea_journal.pkl").write_bytes(b"")
+        summary = progress.seed_summary(tmp_path / "vanilla" / "seed-0", budget=5)
+        assert summary["candidates"] == 4
+        assert summary["best_fitness"] == 0.9
+        assert summary["resume_dir"] == str(b)
+        assert not summary["complete"]
+
+
+class TestRebuildAndCli:
+
+    def test_rebuild_reads_blade_budget(self, tmp_path):
+        run_dir = _run_dir(tmp_path, tag="neutral-x", seed=2)
+        for i in range(4):
+            _append(run_dir, str(i), i / 10)
+        (run_dir.parent / "progress.json").write_text(
+            json.dumps({"runs": [{"budget": 4}]}))
+        assert progress.rebuild(tmp_path) == 1
+        entry = progress.read_index(tmp_path)["neutral-x/seed-2"]
+        assert entry["budget"] == 4 and entry["complete"]
+
+    def test_check_exit_code(self, tmp_path):
+        run_dir = _run_dir(tmp_path)
+        _append(run_dir, "0", 0.1)
+        args = [str(tmp_path), "vanilla", "0", "--budget"]
+        assert progress.main(["check", *args, "1"]) == 0
+        assert progress.main(["check", *args, "2"]) == 1
@@ -0,0 +1,184 @@
+"""Tests for in-place resume (experiments.resume).
+
+Run with:
+    pytest tests/test_resume.py -v
+"""
+
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from experiments import resume
+from experiments.checkpoint import DeltaCheckpoint
+
+from .test_checkpoint import _ES
+
+
+def _log(run_dir, solutions):
+    with open(run_dir / "log.jsonl", "a") as f:
+        for s in solutions:
+            f.write(json.dumps({"id": s.id, "fitness": s.fitness}) + "\n")
+
+
+def _interrupted_run(tmp_path, generations=5):
+    """A run killed after logging (but before checkpointing) one more candidate."""
+    run_dir = tmp_path / "seed-0" / "run-vanilla-MA_BBOB-0"
+    run_dir.mkdir(parents=True)
+    es = _ES()
+    ckpt = DeltaCheckpoint(run_dir, snapshot_every=3)
+    for _ in range(generations):
+        es.step()
+        _log(run_dir, es.run_history[-1:])
+        with open(run_dir / "conversationlog.jsonl", "a") as f:
+            f.write('{"role": "client"}\n{"role": "model"}\n')
+        ckpt.save(es)
+    expected_rng = random.random()
+    es.step()
+    _log(run_dir, es.run_history[-1:])
+    with open(run_dir / "conversationlog.jsonl", "a") as f:
+        f.write('{"role": "client"}\n')
+    return run_dir, expected_rng
+
+
+class TestProgress:
+
+    def test_sums_across_run_dirs(self, tmp_path):
+        es = _ES()
+        for _ in range(4):
+            es.step()
+        a = tmp_path / "run-x-MA_BBOB-0"
+        b = tmp_path / "run-x-MA_BBOB-0-1"
+        a.mkdir()
+        b.mkdir()
+        _log(a, es.run_history[:3] + es.run_history[2:3])
+        _log(b, es.run_history[3:])
+        assert resume.seed_progress(tmp_path) == 4
+        assert resume.is_seed_complete(tmp_path, 4)
+        assert not resume.is_seed_complete(tmp_path, 5)
+
+    def test_candidate_in_two_run_dirs_counted_once(self, tmp_path):
+        es = _ES()
+        for _ in range(4):
+            es.step()
+        a = tmp_path / "run-x-MA_BBOB-0"
+        b = tmp_path / "run-x-MA_BBOB-0-1"
+        a.mkdir()
+        b.mkdir()
+        _log(a, es.run_history[:3])
+        _log(b, es.run_history[2:])
+        assert resume.seed_progress(tmp_path) == 4
+        assert not resume.is_seed_complete(tmp_path, 5)
+
+    def test_find_resume_dir(self, tmp_path):
+        run_dir, _ = _interrupted_run(tmp_path)
+        assert resume.find_resume_dir(tmp_path / "seed-0", 100) == str(run_dir)
+        assert resume.find_resume_dir(tmp_path / "seed-0", 6) is None
+
+
+class TestRestore:
+
+    def test_restore_drops_interrupted_generation(self, tmp_path):
+        run_dir, expected_rng = _interrupted_run(tmp_path)
+        instance = resume.restore(run_dir)
+        assert len(instance.run_history) == 5
+        assert resume.candidate_ids(run_dir) == [s.id for s in instance.run_history]
+        orphaned = (run_dir / "log.jsonl.orphaned").read_text().splitlines()
+        assert len(orphaned) == 1
+        conv = (run_dir / "conversationlog.jsonl").read_text().splitlines()
+        assert len(conv) == 10
+        # RNG continues exactly where the checkpointed generation left it.
+        assert random.random() == expected_rng
+
+    def test_restore_sets_llm_state(self, tmp_path):
+        run_dir = tmp_path / "run"
+        run_dir.mkdir()
+        es = _ES()
+        es.llm = SimpleNamespace(get_state=lambda: {"calls": 7})
+        es.step()
+        DeltaCheckpoint(run_dir).save(es)
+
+        received = {}
+        llm = SimpleNamespace(set_state=received.update)
+        resume.restore(run_dir, llm=llm)
+        assert received == {"calls": 7}
+
+
+class TestResumableExperimentLogger:
+
+    def test_continues_existing_run_dir(self, tmp_path):
+        run_dir, _ = _interrupted_run(tmp_path)
+        seed_dir = tmp_path / "seed-0"
+        method = SimpleNamespace(name="vanilla")
+        problem = SimpleNamespace(name="MA_BBOB", set_logger=lambda logger: None)
+
+        # An unfinished attempt recorded in progress.json would normally be
+        # deleted by BLADE's open_run.
+        first = resume.ResumableExperimentLogger(str(seed_dir))
+        first.start_progress(1, methods=[method], problems=[problem], seeds=[0], budget=100)
+        entry = first._get_run_entry("vanilla", "MA_BBOB", 0)
+        entry.update(start_time="t0", log_dir=run_dir.name)
+        first._write_progress()
+
+        logger, resume_dir = resume.make_experiment_logger(seed_dir, 100)
+        assert resume_dir == str(run_dir)
+        logger.start_progress(1, methods=[method], problems=[problem], seeds=[0], budget=100)
+        run_logger = logger.open_run(method, problem, budget=100, seed=0)
+
+        assert run_logger.dirname == str(run_dir)
+        assert (run_dir / "log.jsonl").is_file()
+        assert sorted(p.name for p in seed_dir.glob("run-*")) == [run_dir.name]
+
+
+class _Preempted(BaseException):
+    """Stands in for the job being killed mid-evaluation."""
+
+
+class _Problem:
+    """Scores candidates at random; raises after ``stop_after`` evaluations."""
+
+    task_prompt = example_prompt = format_prompt = ""
+
+    def __init__(self, stop_after=None):
+        self.calls = 0
+        self.stop_after = stop_after
+
+    def __call__(self, solution, logger=None):
+        self.calls += 1
+        if self.stop_after is not None and self.calls > self.stop_after:
+            raise _Preempted()
+        solution.set_scores(random.random(), "ok")
+        return solution
+
+
+class TestResumeLLaMEA:
+
+    def test_resume_does_not_reinitialise(self, tmp_path, monkeypatch):
+        pytest.importorskip("iohblade")
+        from llamea.llm import Dummy_LLM
+
+        from experiments import shutdown
+        from experiments.phase1_method import Phase1LLaMEA
+
+        monkeypatch.setattr(shutdown, "_flush_hooks", [])
+
+        llm = Dummy_LLM("dummy")
+        llm.logger = SimpleNamespace(dirname=str(tmp_path))
+        first = Phase1LLaMEA(llm, budget=5, name="x", n_parents=1, n_offspring=1)
+        with pytest.raises(_Preempted):
+            first(_Problem(stop_after=3))
+        assert shutdown._flush_hooks == []  # unregistered when the run ends
+        checkpointed = resume.read_checkpoint(tmp_path)[0]
+        generation = checkpointed.generation
+
+        second = Phase1LLaMEA(llm, budget=5, name="x", resume_dir=str(tmp_path),
+                              n_parents=1, n_offspring=1)
+        problem = _Problem()
+        second(problem)
+        instance = second.llamea_instance
+        ids = [s.id for s in instance.run_history]
+        assert len(ids) == len(set(ids)) == 5
+        assert problem.calls == 5 - len(checkpointed.run_history)
+        assert instance.generation == generation + problem.calls
+        assert shutdown._flush_hooks == []
@@ -0,0 +1,152 @@
+"""Tests for the job-matrix runner (experiments.runner).
+
+The execution tests replace the phase CLI with a tiny Python command that
+writes log lines into the result tree, so no LLM or BLADE install is needed.
+
+Run with:
+    pytest tests/test_runner.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from experiments import runner
+
+
+def _write_log(seed_dir, n_lines, run_name="run-x-MA_BBOB-0", checkpoint=False,
+               first_id=0):
+    run_dir = Path(seed_dir) / run_name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "log.jsonl", "w") as f:
+        for i in range(first_id, first_id + n_lines):
+            f.write(json.dumps({"id": str(i), "fitness": 0.5}) + "\n")
+    if checkpoint:
+        (run_dir / "llamea_config.pkl").write_bytes(b"")
+    return run_dir
+
+
+class TestMatrix:
+
+    def test_phase4_all_is_60_jobs(self):
+        jobs = runner.build_matrix("phase4", ["all"], results_dir="r")
+        assert len(jobs) == 60
+        assert len({runner.job_key(j) for j in jobs}) == 60
+        assert all(j["budget"] == 500 for j in jobs)
+
+    def test_phase3_format_group(self):
+        jobs = runner.build_matrix("phase3", ["neutral"], seeds=[0])
+        assert jobs and all(j["condition"].startswith("neutral-") for j in jobs)
+
+    def test_load_matrix(self, tmp_path):
+        path = tmp_path / "matrix.json"
+        path.write_text(json.dumps([
+            {"phase": "phase4", "conditions": ["vanilla"], "seeds": [0, 1]},
+            {"phase": "phase4", "conditions": ["sage"], "seeds": [3], "budget": 7},
+        ]))
+        jobs = runner.load_matrix(path)
+        assert [runner.job_key(j) for j in jobs] == [
+            "phase4/vanilla/seed-0", "phase4/vanilla/seed-1", "phase4/sage/seed-3",
+        ]
+        assert jobs[-1]["budget"] == 7
+
+    def test_unknown_phase(self):
+        with pytest.raises(ValueError):
+            runner.build_matrix("phase2")
+
+
+class TestJobState:
+
+    def _job(self, tmp_path, budget=5):
+        return {"phase": "phase4", "condition": "vanilla", "seed": 0,
+                "budget": budget, "results_dir": str(tmp_path)}
+
+    def test_pending_when_missing(self, tmp_path):
+        assert runner.job_state(self._job(tmp_path)) == (runner.PENDING, 0)
+
+    def test_resumable_with_checkpoint(self, tmp_path):
+        _write_log(tmp_path / "vanilla" / "seed-0", 3, checkpoint=True)
+        assert runner.job_state(self._job(tmp_path)) == (runner.RESUMABLE, 3)
+
+    def test_complete_sums_resumed_runs(self, tmp_path):
+        seed_dir = tmp_path / "vanilla" / "seed-0"
+        _write_log(seed_dir, 3, run_name="run-a")
+        _write_log(seed_dir, 2, run_name="run-a-1", first_id=3)
+        assert runner.job_state(self._job(tmp_path)) == (runner.COMPLETE, 5)
+
+
+class TestRunMatrix:
+
+    @pytest.fixture
+    def fake_cli(self, monkeypatch):
+        """Replace the phase CLI: fail on the first attempt for seed 1."""
+        script = (
+            "import json, sys, pathlib\n"
+            "root, cond, seed, budget = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])\n"
+            "seed_dir = pathlib.Path(root) / cond / f'seed-{seed}'\n"
+            "marker = seed_dir / 'attempted'\n"
+            "seed_dir.mkdir(parents=True, exist_ok=True)\n"
+            "if seed == '1' and not marker.exists():\n"
+            "    marker.write_text('1')\n"
+            "    sys.exit(3)\n"
+            "run = seed_dir / 'run-fake'\n"
+            "run.mkdir(exist_ok=True)\n"
+            "(run / 'log.jsonl').write_text(''.join(json.dumps({'id': i}) + '\\n' for i in range(budget)))\n"
+        )
+
+        def command(job, extra_args=()):
+            return [sys.executable, "-c", script, job["results_dir"],
+                    job["condition"], str(job["seed"]), str(job["budget"])]
+
+        monkeypatch.setattr(runner, "job_command", command)
+
+    def test_runs_and_retries(self, tmp_path, fake_cli):
+        jobs = runner.build_matrix("phase4", ["vanilla"], seeds=[0, 1, 2], budget=4,
+                                   results_dir=str(tmp_path / "results"))
+        status_file = tmp_path / "status.json"
+        status = runner.run_matrix(
+            jobs, max_concurrent=2, retries=1, retry_delay=0, poll_interval=0.05,
+            status_file=str(status_file), log_dir=str(tmp_path / "logs"),
+        )
+        on_disk = json.loads(status_file.read_text())
+        assert on_disk["jobs"] == status["jobs"]
+        states = {k: v["state"] for k, v in status["jobs"].items()}
+        assert set(states.values()) == {runner.COMPLETE}
+        assert status["jobs"]["phase4/vanilla/seed-1"]["attempts"] == 2
+        assert status["jobs"]["phase4/vanilla/seed-0"]["attempts"] == 1
+
+    def test_gives_up_after_retries(self, tmp_path, fake_cli):
+        jobs = runner.build_matrix("phase4", ["vanilla"], seeds=[1], budget=4,
+                                   results_dir=str(tmp_path / "results"))
+        status = runner.run_matrix(
+            jobs, max_concurrent=1, retries=0, retry_delay=0, poll_interval=0.05,
+            log_dir=str(tmp_path / "logs"),
+        )
+        entry = status["jobs"]["phase4/vanilla/seed-1"]
+        assert entry["state"] == runner.FAILED
+        assert entry["returncode"] == 3
+
+    def test_interrupted_child_uses_up_retries(self, tmp_path, monkeypatch):
+        # A child that keeps exiting with the requeue code while the runner
+        # itself is not stopping must not be restarted forever.
+        monkeypatch.setattr(runner, "job_command", lambda job, extra_args=(): [
+            sys.executable, "-c", f"import sys; sys.exit({runner.shutdown.REQUEUE_EXIT_CODE})"])
+        jobs = runner.build_matrix("phase4", ["vanilla"], seeds=[0], budget=4,
+                                   results_dir=str(tmp_path / "results"))
+        status = runner.run_matrix(
+            jobs, max_concurrent=1, retries=1, retry_delay=0, poll_interval=0.05,
+            log_dir=str(tmp_path / "logs"),
+        )
+        entry = status["jobs"]["phase4/vanilla/seed-0"]
+        assert entry["state"] == runner.FAILED
+        assert entry["attempts"] == 2
+
+    def test_complete_jobs_are_skipped(self, tmp_path, fake_cli):
+        results = tmp_path / "results"
+        _write_log(results / "vanilla" / "seed-0", 4)
+        jobs = runner.build_matrix("phase4", ["vanilla"], seeds=[0], budget=4,
+                                   results_dir=str(results))
+        status = runner.run_matrix(jobs, poll_interval=0.05, log_dir=str(tmp_path / "logs"))
+        assert status["jobs"]["phase4/vanilla/seed-0"]["attempts"] == 0
@@ -0,0 +1,123 @@
+"""Tests for graceful shutdown on SLURM signals (experiments.shutdown).
+
+Signal handling is process-global, so each scenario runs in a subprocess.
+
+Run with:
+    pytest tests/test_shutdown.py -v
+"""
+
+import json
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from experiments import shutdown
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# A fake phase run: one "generation" per 0.1 s, each starting with an LLM call.
+_FAKE_RUN = """
+import sys, time
+from experiments import shutdown
+
+class LLM:
+    calls = 0
+    def query(self, session):
+        LLM.calls += 1
+        return "ok"
+
+llm = shutdown.GatedLLM(LLM())
+shutdown.register_flush(lambda: print("flushed", flush=True))
+with shutdown.graceful(grace=float(sys.argv[1])):
+    print("ready", flush=True)
+    for gen in range(600):
+        llm.query([])
+        time.sleep(float(sys.argv[2]))   # evaluation of the candidate
+        shutdown.check()                 # end of generation / checkpoint
+print("finished", flush=True)
+"""
+
+
+def _start(grace, eval_time):
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _FAKE_RUN, str(grace), str(eval_time)],
+        cwd=str(ROOT), stdout=subprocess.PIPE, text=True,
+    )
+    assert proc.stdout.readline().strip() == "ready"
+    return proc
+
+
+class _SetEvent:
+    def is_set(self):
+        return True
+
+
+class TestShutdown:
+
+    def test_stops_at_generation_boundary(self):
+        proc = _start(grace=30, eval_time=0.1)
+        proc.send_signal(signal.SIGTERM)
+        out, _ = proc.communicate(timeout=20)
+        assert proc.returncode == shutdown.REQUEUE_EXIT_CODE
+        assert "flushed" in out and "finished" not in out
+
+    def test_grace_window_forces_exit(self):
+        proc = _start(grace=0.5, eval_time=60)
+        start = time.monotonic()
+        proc.send_signal(signal.SIGUSR1)
+        out, _ = proc.communicate(timeout=20)
+        assert proc.returncode == shutdown.REQUEUE_EXIT_CODE
+        assert time.monotonic() - start < 10
+        assert "flushed" in out
+
+    def test_gated_llm_refuses_after_signal(self, monkeypatch):
+        class LLM:
+            model = "m"
+
+            def query(self, session):
+                return "response"
+
+        gated = shutdown.GatedLLM(LLM())
+        assert gated.query([]) == "response"
+        assert gated.model == "m"
+        monkeypatch.setattr(shutdown, "_requested", _SetEvent())
+        try:
+            gated.query([])
+        except shutdown.ShutdownRequested:
+            pass
+        else:
+            raise AssertionError("query was not gated")
+
+
+class TestRunnerShutdown:
+
+    def test_runner_forwards_signal_and_exits_for_requeue(self, tmp_path):
+        # Each job runs the fake run above; the runner receives SIGUSR1.
+        script = (
+            "import sys, runpy\n"
+            "from experiments import runner\n"
+            f"fake = {_FAKE_RUN!r}\n"
+            "def command(job, extra_args=()):\n"
+            "    return [sys.executable, '-c', fake, '30', '0.1']\n"
+            "runner.job_command = command\n"
+            "runner.main(sys.argv[1:])\n"
+        )
+        proc = subprocess.Popen(
+            [sys.executable, "-c", script, "phase4", "vanilla", "--seeds", "0", "1",
+             "--budget", "5", "--results-dir", str(tmp_path / "results"),
+             "--max-concurrent", "2", "--log-dir", str(tmp_path / "logs")],
+            cwd=str(ROOT), stdout=subprocess.PIPE, text=True,
+        )
+        for line in proc.stdout:
+            if "START" in line and "seed-1" in line:
+                break
+        time.sleep(1.0)
+        proc.send_signal(signal.SIGUSR1)
+        out, _ = proc.communicate(timeout=60)
+        assert proc.returncode == shutdown.REQUEUE_EXIT_CODE
+        assert "SHUTDOWN" in out and out.count("STOP ") == 2
+        status = json.loads((tmp_path / "logs" / "status.json").read_text())
+        assert status["interrupted"]
+        assert all(e["attempts"] == 0 for e in status["jobs"].values())
@@ -0,0 +1,96 @@
+"""Tests for the stand-in Ollama/OpenAI LLM server (experiments.standin_llm).
+
+Run with:
+    pytest tests/test_standin_llm.py -v
+"""
+
+import json
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+from experiments.standin_llm import Corpus, StandinServer, parse_latency
+
+_CODE = "import numpy as np\n\nclass Mined:\n    def __init__(self, budget, dim):\n        pass\n"
+
+
+@pytest.fixture
+def server():
+    srv = StandinServer(corpus=Corpus(["# Description: mined\n```python\n" + _CODE + "```\n"]))
+    srv.start()
+    yield srv
+    srv.stop()
+
+
+def _post(url, body):
+    req = urllib.request.Request(url, data=json.dumps(body).encode(),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+class TestCorpus:
+
+    def test_mines_valid_candidates_from_logs(self, tmp_path):
+        run = tmp_path / "vanilla" / "seed-0" / "run-x"
+        run.mkdir(parents=True)
+        lines = [
+            {"code": _CODE, "description": "good", "fitness": 0.4},
+            {"code": _CODE.replace("Mined", "Broken"), "fitness": float("-inf")},
+            {"fitness": 0.1},
+            {"code": _CODE, "description": "good", "fitness": 0.4},
+        ]
+        (run / "log.jsonl").write_text(
+            "\n".join(json.dumps(line) for line in lines) + "\nnot json\n")
+        corpus = Corpus.load([tmp_path])
+        assert len(corpus) == 1
+        assert "class Mined" in corpus.responses[0]
+        assert corpus.responses[0].startswith("# Description: good")
+
+    def test_latency_specs(self):
+        rng = random.Random(0)
+        assert parse_latency("0")(rng) == 0.0
+        assert parse_latency("const:2")(rng) == 2.0
+        assert 1 <= parse_latency("uniform:1,3")(rng) <= 3
+        assert parse_latency("empirical", Corpus(latencies=[5.0]))(rng) == 5.0
+        with pytest.raises(ValueError):
+            parse_latency("gamma:1")
+
+
+class TestServer:
+
+    def test_ollama_client(self, server):
+        from iohblade.llm import Ollama_LLM
+        llm = Ollama_LLM(model="standin", port=server.server_address[1])
+        reply = llm.query([{"role": "user", "content": "write an optimizer"}])
+        assert "class Mined" in llm.extract_algorithm_code(reply)
+        assert server.stats["ok"] == 1
+
+    def test_openai_compatible_client(self, server):
+        openai = pytest.importorskip("openai")
+        client = openai.OpenAI(base_url=f"{server.url}/v1", api_key="none")
+        resp = client.chat.completions.create(
+            model="standin", messages=[{"role": "user", "content": "hi"}])
+        assert "class Mined" in resp.choices[0].message.content
+
+    def test_rate_limits_and_errors(self):
+        srv = StandinServer(rate_limit=1.0).start()
+        try:
+            with pytest.raises(urllib.error.HTTPError) as err:
+                _post(f"{srv.url}/api/chat", {"model": "m", "messages": []})
+            assert err.value.code == 429
+            assert err.value.headers["Retry-After"] == "1"
+        finally:
+            srv.stop()
+
+        srv = StandinServer(error_rate=1.0).start()
+        try:
+            with pytest.raises(urllib.error.HTTPError) as err:
+                _post(f"{srv.url}/v1/chat/completions", {"model": "m", "messages": []})
+            assert err.value.code == 500
+            with urllib.request.urlopen(f"{srv.url}/stats", timeout=10) as resp:
+                assert json.loads(resp.read())["errors"] == 1
+        finally:
+            srv.stop()
@@ -0,0 +1,125 @@
+"""Tests for the incremental summary CSVs (experiments.summary).
+
+Run with:
+    pytest tests/test_summary.py -v
+"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from experiments import summary
+
+
+def _entry(i, failed=False):
+    return {"id": f"c{i}", "name": f"Alg{i}", "generation": i,
+            "fitness": float("-inf") if failed else 0.1 * i,
+            "metadata": {} if failed else {"aucs": [0.1 * i],
+                                           "behavioral_features": {"dispersion": float(i)}}}
+
+
+def _append_log(seed_dir, run, entries):
+    run_dir = seed_dir / f"run-{run}-MA_BBOB-0"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "log.jsonl", "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return run_dir / "log.jsonl"
+
+
+def _rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _full_parse(seed_dir):
+    """What a from-scratch write produces, as CSV rows."""
+    out = seed_dir / "full.csv"
+    summary.update_summary(seed_dir, out)
+    return _rows(out)
+
+
+@pytest.fixture
+def seed_dir(tmp_path):
+    seed_dir = tmp_path / "results" / "vanilla" / "seed-0"
+    _append_log(seed_dir, "a", [_entry(1), _entry(2, failed=True)])
+    return seed_dir
+
+
+class TestUpdateSummary:
+
+    def test_rewrite_skip_append(self, seed_dir):
+        path, action, n = summary.update_summary(seed_dir)
+        assert (action, n) == ("rewritten", 2)
+        assert summary.update_summary(seed_dir)[1:] == ("skipped", 2)
+
+        _append_log(seed_dir, "a", [_entry(3), _entry(1)])  # c1 repeats (resume)
+        assert summary.update_summary(seed_dir)[1:] == ("appended", 3)
+        assert _rows(path) == _full_parse(seed_dir)
+        assert summary.summarise_run(seed_dir)[-1]["algorithm_name"] == "Alg3"
+
+    def test_partial_line_is_read_later(self, seed_dir):
+        summary.update_summary(seed_dir)
+        log = seed_dir / "run-a-MA_BBOB-0" / "log.jsonl"
+        line = json.dumps(_entry(4))
+        with open(log, "a") as f:
+            f.write(line[:10])
+        assert summary.update_summary(seed_dir)[1:] == ("appended", 2)
+        with open(log, "a") as f:
+            f.write(line[10:] + "\n")
+        assert summary.update_summary(seed_dir)[1:] == ("appended", 3)
+        assert _rows(seed_dir / "summary.csv") == _full_parse(seed_dir)
+
+    def test_rewritten_log_and_older_run_trigger_rewrite(self, seed_dir):
+        summary.update_summary(seed_dir)
+        _append_log(seed_dir, "b", [_entry(5)])
+        assert summary.update_summary(seed_dir)[1] == "rewritten"
+        _append_log(seed_dir, "a", [_entry(6)])  # not the newest run
+        assert summary.update_summary(seed_dir)[1] == "rewritten"
+
+        log = seed_dir / "run-a-MA_BBOB-0" / "log.jsonl"
+        log.write_text(json.dumps(_entry(7)) + "\n" + json.dumps(_entry(8)) + "\n" * 40)
+        assert summary.update_summary(seed_dir)[1] == "rewritten"
+        assert _rows(seed_dir / "summary.csv") == _full_parse(seed_dir)
+
+    def test_new_column_triggers_rewrite(self, seed_dir):
+        summary.update_summary(seed_dir)
+        entry = _entry(9)
+        entry["metadata"]["behavioral_features"]["success_rate"] = 0.5
+        _append_log(seed_dir, "a", [entry])
+        with pytest.raises(ValueError):  # the header comes from the first record
+            summary.update_summary(seed_dir)
+
+    def test_touched_log_is_rechecked(self, seed_dir):
+        summary.update_summary(seed_dir)
+        log = seed_dir / "run-a-MA_BBOB-0" / "log.jsonl"
+        later = os.stat(seed_dir / "summary.csv").st_mtime_ns + 10**9
+        os.utime(log, ns=(later, later))
+        assert summary.update_summary(seed_dir)[1:] == ("appended", 2)
+        assert summary.update_summary(seed_dir)[1] == "skipped"
+
+
+class TestSummariseResults:
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_merged_table(self, tmp_path, workers):
+        root = tmp_path / "results"
+        for cond in ("vanilla", "neutral-x"):
+            for seed in range(2):
+                _append_log(root / cond / f"seed-{seed}", cond, [_entry(1), _entry(2)])
+        (root / "empty" / "seed-0").mkdir(parents=True)
+
+        path = summary.summarise_results(root, workers=workers)
+        rows = _rows(path)
+        assert len(rows) == 8
+        assert [r["condition"] for r in rows[::2]] == ["neutral-x"] * 2 + ["vanilla"] * 2
+        assert rows[0]["bm_dispersion"] == "1.0"
+
+        mtime = os.stat(path).st_mtime_ns
+        assert summary.summarise_results(root, workers=workers) == path
+        assert os.stat(path).st_mtime_ns == mtime
+
+        _append_log(root / "vanilla" / "seed-1", "vanilla", [_entry(3)])
+        assert len(_rows(summary.summarise_results(root, workers=workers))) == 9
@@ -0,0 +1,120 @@
+"""Tests for the opt-in target-hit short-circuit (experiments.target_hit).
+
+Run with:
+    pytest tests/test_target_hit.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from iohblade.behaviour_metrics import compute_behavior_metrics, coverage_dispersion
+from iohblade.solution import Solution
+
+from experiments.feedback import FEATURE_DESCRIPTIONS, vanilla_feedback
+from experiments.mabbob_problem import MaBBOBProblem
+from experiments.target_hit import (
+    RECOMPUTED,
+    TRUNCATION,
+    UNAFFECTED,
+    saturate_trajectory,
+)
+
+# (1+1)-ES with the 1/5th rule: reaches 1e-8 on easy instances well within
+# a 2000-evaluation budget in 2-D.
+ES_CODE = """
+import numpy as np
+
+class OnePlusOneES:
+    def __init__(self, budget=10000, dim=10):
+        self.budget = budget
+        self.dim = dim
+
+    def __call__(self, func):
+        x = np.random.uniform(func.bounds.lb, func.bounds.ub)
+        f = func(x)
+        sigma = 1.0
+        for _ in range(self.budget - 1):
+            y = np.clip(x + sigma * np.random.randn(self.dim), func.bounds.lb, func.bounds.ub)
+            fy = func(y)
+            if fy <= f:
+                x, f = y, fy
+                sigma *= 1.5
+            else:
+                sigma *= 1.5 ** -0.25
+        return f, x
+"""
+
+
+def _trajectory(n=300, dim=2, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.uniform(-5, 5, size=(n, dim)), columns=[f"x{i}" for i in range(dim)])
+    df.insert(0, "raw_y", rng.exponential(size=n))
+    df.insert(0, "evaluations", np.arange(1, n + 1))
+    return df
+
+
+class TestSaturate:
+
+    def test_pads_with_best_point(self):
+        df = _trajectory()
+        full = saturate_trajectory(df, 1000)
+        assert len(full) == 1000
+        assert list(full["evaluations"]) == list(range(1, 1001))
+        best = df.loc[df["raw_y"].idxmin()]
+        tail = full.iloc[300:]
+        assert (tail["raw_y"] == best["raw_y"]).all()
+        assert (tail[["x0", "x1"]].to_numpy() == best[["x0", "x1"]].to_numpy()).all()
+
+    def test_full_trajectory_unchanged(self):
+        df = _trajectory()
+        assert saturate_trajectory(df, 300) is df
+
+
+class TestTruncationPolicy:
+
+    def test_every_metric_is_documented(self):
+        computed = compute_behavior_metrics(_trajectory(), bounds=[(-5.0, 5.0)] * 2)
+        missing = (set(computed) | set(FEATURE_DESCRIPTIONS)) - set(TRUNCATION)
+        assert not missing
+        assert set(TRUNCATION.values()) <= {UNAFFECTED, RECOMPUTED}
+
+    def test_unaffected_metrics_survive_saturation(self):
+        df = _trajectory()
+        full = saturate_trajectory(df, 3000)
+        bounds = [(-5.0, 5.0)] * 2
+        a = compute_behavior_metrics(df, bounds=bounds)
+        b = compute_behavior_metrics(full, bounds=bounds)
+        for name in a:
+            if TRUNCATION[name] != UNAFFECTED:
+                continue
+            if name == "dispersion":   # random probe points: compare on a fixed set
+                a[name] = coverage_dispersion(df, bounds, rng=np.random.default_rng(1))
+                b[name] = coverage_dispersion(full, bounds, rng=np.random.default_rng(1))
+            assert a[name] == pytest.approx(b[name]), name
+
+
+class TestShortCircuit:
+
+    def test_aocc_identical_and_runs_stop(self):
+        results = {}
+        for stop in (False, True):
+            problem = MaBBOBProblem(
+                make_feedback=vanilla_feedback, training_instances=[4, 5],
+                eval_seeds=2, dims=[2], budget_factor=1000, stop_on_target=stop,
+            )
+            results[stop] = problem.evaluate(Solution(code=ES_CODE, name="OnePlusOneES"))
+        full, short = results[False], results[True]
+        assert short.fitness == full.fitness
+        assert short.metadata["aucs"] == full.metadata["aucs"]
+        assert short.metadata["target_hits"] > 0
+        assert "target_hits" not in full.metadata
+
+    def test_setting_reaches_workers_and_config(self):
+        problem = MaBBOBProblem(make_feedback=vanilla_feedback, training_instances=[0],
+                                stop_on_target=True)
+        assert problem.to_dict()["stop_on_target"] is True
+        rebuilt = MaBBOBProblem.from_descriptor(problem.descriptor())
+        assert rebuilt.stop_on_target is True
+        other = MaBBOBProblem(make_feedback=vanilla_feedback, training_instances=[0])
+        assert other._worker_key != problem._worker_key
@@ -0,0 +1,84 @@
+"""Tests for scoring timed-out pooled evaluations on their completed runs.
+
+Run with:
+    pytest tests/test_timeout_policy.py -v
+"""
+
+import pytest
+
+from iohblade.solution import Solution
+
+from experiments.feedback import vanilla_feedback
+from experiments.mabbob_problem import MaBBOBProblem
+
+# Finishes the smoke test and the first two runs, then stalls.
+STALLING_CODE = """
+import time
+import numpy as np
+
+class Stalling:
+    calls = 0
+
+    def __init__(self, budget=10000, dim=10):
+        self.budget = budget
+        self.dim = dim
+
+    def __call__(self, func):
+        type(self).calls += 1
+        if type(self).calls > 3:
+            time.sleep(60)
+        for _ in range(self.budget):
+            func(np.random.uniform(func.bounds.lb, func.bounds.ub))
+"""
+
+
+def _problem(**kwargs):
+    return MaBBOBProblem(
+        make_feedback=vanilla_feedback, training_instances=[0, 1], eval_seeds=2,
+        dims=[2], budget_factor=50, allowed_imports=["numpy", "time"], **kwargs,
+    )
+
+
+def _runs(n):
+    return [{"dim": 2, "instance": 0, "seed": s, "auc": 0.4 + 0.1 * s,
+             "metrics": {"dispersion": 1.0}, "algorithm_s": 0.1, "behavior_s": 0.1}
+            for s in range(n)]
+
+
+class TestScoreTimeout:
+
+    def test_partial_policy_penalises_completed_mean(self):
+        problem = _problem(timeout_policy="partial", timeout_penalty=0.2)
+        sol = problem._score_timeout(Solution(name="A"), "Evaluation timed out.", _runs(2))
+        assert sol.fitness == pytest.approx(0.45 * 0.8)
+        assert sol.metadata["timeout_partial"] == {"completed": 2, "total": 4, "penalty": 0.2}
+        assert sol.metadata["aucs"] == [0.4, 0.5]
+        assert "2 of 4 runs" in sol.feedback and sol.error == ""
+
+    def test_too_few_runs_or_fail_policy_fail(self):
+        few = _problem(timeout_policy="partial", timeout_min_completed=0.75)
+        assert few._score_timeout(Solution(), "timed out", _runs(2)).fitness == float("-inf")
+        fail = _problem()
+        sol = fail._score_timeout(Solution(), "timed out", _runs(4))
+        assert sol.fitness == float("-inf") and sol.error == "timed out"
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            _problem(timeout_policy="ignore")
+
+
+class TestPooledTimeout:
+
+    @pytest.mark.parametrize("policy", ["fail", "partial"])
+    def test_completed_runs_survive_timeout(self, policy):
+        problem = _problem(timeout_policy=policy, eval_timeout=5)
+        try:
+            sol = problem(Solution(code=STALLING_CODE, name="Stalling"))
+        finally:
+            problem._worker_pool().shutdown()
+        if policy == "fail":
+            assert sol.fitness == float("-inf")
+            return
+        assert sol.metadata["timeout_partial"]["completed"] == 2
+        assert len(sol.metadata["aucs"]) == 2
+        assert 0 < sol.fitness < 1